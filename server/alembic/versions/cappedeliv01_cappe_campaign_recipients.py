@@ -0,0 +1,55 @@
+"""cappe_campaign_recipients — per-recipient delivery state for Cappe campaigns.
+
+Revision ID: cappedeliv01
+Revises: hrisfp01
+Create Date: 2026-10-16
+
+`workers/tasks/cappe_campaign_send` sent a campaign in one Celery task, one
+recipient at a time, with no record of who had been sent to: past ~4k
+subscribers it hit the 540s soft limit, and a crash left the campaign in
+'sending' with no way to finish it except re-sending to everyone.
+
+The recipient list is now frozen into this table when delivery starts, split
+into numbered batches that run as separate tasks. Each batch claims its rows
+atomically (pending → sending), so a duplicate or resumed batch task can't
+send a row another one holds; a claim older than the stale window is treated
+as abandoned by a dead worker and claimed again.
+
+Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "cappedeliv01"
+down_revision = "hrisfp01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cappe_campaign_recipients (
+            campaign_id UUID NOT NULL REFERENCES cappe_campaigns(id) ON DELETE CASCADE,
+            email VARCHAR(320) NOT NULL,
+            name VARCHAR(255),
+            unsubscribe_token VARCHAR(64),
+            batch INTEGER NOT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending'
+                CHECK (status IN ('pending', 'sending', 'sent', 'failed')),
+            attempts SMALLINT NOT NULL DEFAULT 0,
+            error TEXT,
+            claimed_at TIMESTAMPTZ,
+            sent_at TIMESTAMPTZ,
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (campaign_id, email)
+        )
+    """)
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_cappe_campaign_recipients_batch "
+        "ON cappe_campaign_recipients(campaign_id, batch, status)"
+    )
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS cappe_campaign_recipients")
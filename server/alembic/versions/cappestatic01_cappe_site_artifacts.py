@@ -0,0 +1,51 @@
+"""cappe_site_artifacts — publish-time rendered pages for public Cappe sites.
+
+Revision ID: cappestatic01
+Revises: cappedeliv01
+Create Date: 2026-10-16
+
+Every public page view resolved the Host header with a DB query. It then hit
+Redis, and on a miss ran three more queries plus a full render. Pages are now
+rendered when the owner changes something. Each page's HTML is stored here
+alongside its pre-compressed gzip/brotli bodies and a strong ETag, as one
+immutable set per site *version*. `cappe_sites.published_version` names the
+live version. API workers keep it in memory, so a cached view needs no round
+trip at all.
+
+A rebuild inserts the new version, repoints the site, and deletes the old
+rows in one transaction. Existing published sites have no version yet, so each
+one is built lazily on its first view.
+
+Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "cappestatic01"
+down_revision = "cappedeliv01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE cappe_sites ADD COLUMN IF NOT EXISTS published_version VARCHAR(40)")
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS cappe_site_artifacts (
+            site_id UUID NOT NULL REFERENCES cappe_sites(id) ON DELETE CASCADE,
+            version VARCHAR(40) NOT NULL,
+            page_slug VARCHAR(160) NOT NULL,
+            position INTEGER NOT NULL,
+            etag VARCHAR(64) NOT NULL,
+            html BYTEA NOT NULL,
+            gzip BYTEA NOT NULL,
+            br BYTEA,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            PRIMARY KEY (site_id, version, page_slug)
+        )
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS cappe_site_artifacts")
+    op.execute("ALTER TABLE cappe_sites DROP COLUMN IF EXISTS published_version")
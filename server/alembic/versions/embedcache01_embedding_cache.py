@@ -0,0 +1,51 @@
+"""Content-hash embedding cache + compliance_embeddings.content_hash.
+
+Revision ID: embedcache01
+Revises: aiusage01
+Create Date: 2026-10-16
+
+`compliance_embedding_pipeline.embed_requirements` re-embedded every
+jurisdiction_requirements row through Gemini on every run, even when the text
+it embeds (`compose_embedding_text`) had not changed. This adds:
+
+  * `embedding_cache` — sha256(text) → vector, keyed by (model, task_type,
+    dimension) so a model or dimensionality change can never serve a stale
+    vector. Shared by any document-embedding pipeline; identical texts across
+    rows (and across re-creations of a row) embed once.
+  * `compliance_embeddings.content_hash` — the hash the stored vector was built
+    from, so the bulk merge can skip rows whose text and metadata are unchanged.
+
+Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "embedcache01"
+down_revision = "aiusage01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            content_hash TEXT NOT NULL,
+            model        TEXT NOT NULL,
+            task_type    TEXT NOT NULL,
+            dimension    INTEGER NOT NULL,
+            embedding    vector NOT NULL,
+            created_at   TIMESTAMPTZ NOT NULL DEFAULT now(),
+            PRIMARY KEY (content_hash, model, task_type, dimension)
+        )
+        """
+    )
+    op.execute(
+        "ALTER TABLE compliance_embeddings ADD COLUMN IF NOT EXISTS content_hash TEXT"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE compliance_embeddings DROP COLUMN IF EXISTS content_hash")
+    op.execute("DROP TABLE IF EXISTS embedding_cache")
@@ -0,0 +1,104 @@
+"""geocell — geohash cell column on tellus_stores and cappe_locations.
+
+Revision ID: geocell01
+Revises: tellusinbox01
+Create Date: 2026-10-16
+
+Radius search (Tell-Us Discover, Cappe's public directory) prefiltered with a
+lat/lng bounding box over a (lat, lng) btree. That index can only range-scan on
+lat, so every row in the latitude band was read before the lng bound and the
+haversine ran. Both tables now carry `geocell`, the point's 8-character
+geohash. A query scans a few geocell ranges covering the circle instead (see
+app/core/services/geocell.py).
+
+`geohash_encode` is a plain IMMUTABLE plpgsql function, so no extension is
+needed on RDS. `geocell` is a STORED generated column over it. Every existing
+INSERT/UPDATE of lat/lng keeps it current without changes, and adding the
+column computes it for existing rows. `COLLATE "C"` makes text order the
+geohash's Z-order, which is what the range scans depend on. The old (lat, lng)
+indexes are left in place.
+
+Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "geocell01"
+down_revision = "tellusinbox01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mirrors app/core/services/geocell.py:encode bit for bit (bisection, so
+    # boundary points land in the same cell on both sides).
+    op.execute("""
+        CREATE OR REPLACE FUNCTION geohash_encode(lat DOUBLE PRECISION, lng DOUBLE PRECISION, len INTEGER)
+        RETURNS TEXT
+        LANGUAGE plpgsql IMMUTABLE STRICT PARALLEL SAFE
+        AS $$
+        DECLARE
+            alphabet CONSTANT TEXT := '0123456789bcdefghjkmnpqrstuvwxyz';
+            lat_lo DOUBLE PRECISION := -90;
+            lat_hi DOUBLE PRECISION := 90;
+            lng_lo DOUBLE PRECISION := -180;
+            lng_hi DOUBLE PRECISION := 180;
+            mid DOUBLE PRECISION;
+            even BOOLEAN := true;
+            ch INTEGER := 0;
+            nbits INTEGER := 0;
+            cell TEXT := '';
+        BEGIN
+            WHILE length(cell) < len LOOP
+                IF even THEN
+                    mid := (lng_lo + lng_hi) / 2;
+                    IF lng >= mid THEN ch := ch * 2 + 1; lng_lo := mid;
+                    ELSE ch := ch * 2; lng_hi := mid; END IF;
+                ELSE
+                    mid := (lat_lo + lat_hi) / 2;
+                    IF lat >= mid THEN ch := ch * 2 + 1; lat_lo := mid;
+                    ELSE ch := ch * 2; lat_hi := mid; END IF;
+                END IF;
+                even := NOT even;
+                nbits := nbits + 1;
+                IF nbits = 5 THEN
+                    cell := cell || substr(alphabet, ch + 1, 1);
+                    ch := 0;
+                    nbits := 0;
+                END IF;
+            END LOOP;
+            RETURN cell;
+        END
+        $$
+    """)
+
+    op.execute("""
+        ALTER TABLE tellus_stores
+            ADD COLUMN IF NOT EXISTS geocell TEXT COLLATE "C"
+                GENERATED ALWAYS AS (geohash_encode(lat, lng, 8)) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_tellus_stores_geocell
+            ON tellus_stores (geocell)
+         WHERE geocell IS NOT NULL
+    """)
+
+    op.execute("""
+        ALTER TABLE cappe_locations
+            ADD COLUMN IF NOT EXISTS geocell TEXT COLLATE "C"
+                GENERATED ALWAYS AS (geohash_encode(lat, lng, 8)) STORED
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS idx_cappe_locations_geocell
+            ON cappe_locations (geocell)
+         WHERE active AND geocell IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS idx_cappe_locations_geocell")
+    op.execute("ALTER TABLE cappe_locations DROP COLUMN IF EXISTS geocell")
+    op.execute("DROP INDEX IF EXISTS ix_tellus_stores_geocell")
+    op.execute("ALTER TABLE tellus_stores DROP COLUMN IF EXISTS geocell")
+    op.execute("DROP FUNCTION IF EXISTS geohash_encode(DOUBLE PRECISION, DOUBLE PRECISION, INTEGER)")
@@ -0,0 +1,34 @@
+"""external_identities.sync_fingerprint — skip unchanged HRIS workers.
+
+Revision ID: hrisfp01
+Revises: embedcache01
+Create Date: 2026-10-16
+
+`hris_sync_orchestrator.start_hris_sync` rewrote every employee, demographics,
+credentials and external-identity row on every run, even when the HRIS record
+had not changed. The fingerprint is sha256 of the normalized worker record as
+last applied; a worker whose fingerprint matches is skipped entirely.
+
+The sync's resume checkpoint lives in the existing `hris_sync_runs.metadata`
+JSONB, so that table is untouched.
+
+Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "hrisfp01"
+down_revision = "embedcache01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE external_identities ADD COLUMN IF NOT EXISTS sync_fingerprint TEXT"
+    )
+
+
+def downgrade():
+    op.execute("ALTER TABLE external_identities DROP COLUMN IF EXISTS sync_fingerprint")
@@ -0,0 +1,39 @@
+"""Cache each uploaded file's zip CRC-32 by content hash for the streaming packager.
+
+The release packager now streams the zip straight into a multipart upload and
+cannot seek back to patch a local header. Ingest records a row here for every
+master and artwork upload, so each entry gets a complete header up front and
+is checked against it while it streams. Files uploaded before this revision
+are read once by the packager to fill in their row.
+
+Revision ID: oceanlab_app_04
+Revises: geocell01
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+
+revision = "oceanlab_app_04"
+down_revision = "geocell01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS oceanlab_package_entries (
+            sha256 VARCHAR(64) NOT NULL,
+            size_bytes BIGINT NOT NULL,
+            crc32 BIGINT NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            CONSTRAINT pk_oceanlab_package_entries PRIMARY KEY (sha256)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS oceanlab_package_entries")
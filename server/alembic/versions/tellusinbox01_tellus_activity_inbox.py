@@ -0,0 +1,102 @@
+"""tellus_activity_inbox — fan-out-on-write friend activity feed.
+
+Revision ID: tellusinbox01
+Revises: cappestatic01
+Create Date: 2026-10-16
+
+GET /me/feed joined every friendship of the viewer against tellus_reports and
+tellus_brand_follows over 90 days on each request. Activity is now written
+into this inbox per friend when it happens (see
+app/tellus/services/activity_inbox_service.py), so a feed page is one range
+read of ix_tellus_activity_inbox_owner_time.
+
+tellus_activity_pull_actors lists accounts with too many friends to fan out;
+their activity is merged in at read time instead. Pruning rows past the
+window is the `tellus_activity_inbox_prune` scheduler task, seeded enabled
+because it only deletes derived rows.
+
+The upgrade backfills the last 90 days (plus held reviews still waiting out
+their hold) for every existing friendship. Fully reversible.
+"""
+
+from alembic import op
+
+
+revision = "tellusinbox01"
+down_revision = "cappestatic01"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tellus_activity_inbox (
+            owner_account_id UUID NOT NULL REFERENCES tellus_accounts(id) ON DELETE CASCADE,
+            kind TEXT NOT NULL CHECK (kind IN ('review_published', 'place_followed')),
+            item_id UUID NOT NULL,
+            actor_account_id UUID NOT NULL REFERENCES tellus_accounts(id) ON DELETE CASCADE,
+            brand_id UUID NOT NULL REFERENCES tellus_brands(id) ON DELETE CASCADE,
+            happened_at TIMESTAMPTZ NOT NULL,
+            PRIMARY KEY (owner_account_id, kind, item_id, actor_account_id)
+        )
+    """)
+    # WHY: the feed page — keyset range read, newest first.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tellus_activity_inbox_owner_time "
+        "ON tellus_activity_inbox (owner_account_id, happened_at DESC, item_id DESC)"
+    )
+    # WHY: rewrites keyed by the actor (visibility, unfollow) or the item
+    # (withdraw, publish-now) touch every friend's copy.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tellus_activity_inbox_actor "
+        "ON tellus_activity_inbox (actor_account_id, kind)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tellus_activity_inbox_item "
+        "ON tellus_activity_inbox (item_id) WHERE kind = 'review_published'"
+    )
+    # WHY: the retention prune. Rows arrive roughly in time order, so a BRIN
+    # index stays tiny.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tellus_activity_inbox_time_brin "
+        "ON tellus_activity_inbox USING brin (happened_at)"
+    )
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS tellus_activity_pull_actors (
+            account_id UUID PRIMARY KEY REFERENCES tellus_accounts(id) ON DELETE CASCADE,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        )
+    """)
+
+    op.execute("""
+        INSERT INTO tellus_activity_inbox
+            (owner_account_id, kind, item_id, actor_account_id, brand_id, happened_at)
+        SELECT f.account_id, 'review_published', r.id, r.reporter_account_id, r.brand_id, r.publish_at
+          FROM tellus_friendships f
+          JOIN tellus_reports r ON r.reporter_account_id = f.friend_account_id
+         WHERE r.review_state = 'held' AND r.publish_at >= NOW() - INTERVAL '90 days'
+        ON CONFLICT DO NOTHING
+    """)
+    op.execute("""
+        INSERT INTO tellus_activity_inbox
+            (owner_account_id, kind, item_id, actor_account_id, brand_id, happened_at)
+        SELECT f.account_id, 'place_followed', bf.brand_id, bf.consumer_account_id, bf.brand_id, bf.created_at
+          FROM tellus_friendships f
+          JOIN tellus_brand_follows bf ON bf.consumer_account_id = f.friend_account_id
+          JOIN tellus_accounts a ON a.id = bf.consumer_account_id
+         WHERE a.profile_visibility <> 'private' AND bf.created_at >= NOW() - INTERVAL '90 days'
+        ON CONFLICT DO NOTHING
+    """)
+
+    op.execute("""
+        INSERT INTO scheduler_settings (task_key, display_name, description, enabled, max_per_cycle)
+        VALUES ('tellus_activity_inbox_prune', 'Tell-Us Feed Inbox Prune',
+                'Delete friend-feed inbox rows older than the 90-day window.', true, 1)
+        ON CONFLICT (task_key) DO NOTHING
+    """)
+
+
+def downgrade():
+    op.execute("DELETE FROM scheduler_settings WHERE task_key = 'tellus_activity_inbox_prune'")
+    op.execute("DROP TABLE IF EXISTS tellus_activity_pull_actors")
+    op.execute("DROP TABLE IF EXISTS tellus_activity_inbox")
@@ -15,6 +15,7 @@ from ...database import get_connection
 from ..dependencies import require_cappe_account
 from ..models.cappe import CappeAccount, CappeLocation, CappeLocationCreate, CappeLocationUpdate
 from ..services.directory import refresh_site_search
+from ..services.render_cache import invalidate_site_render_cache
 from ._shared import build_patch, get_owned_site, loads_list
 from .render import invalidate_render_cache
 
@@ -78,6 +79,9 @@ async def _geocode_location(site_id: UUID, location_id: UUID) -> None:
             )
             # City/region are indexed at weight D, so "coffee portland" works.
             await refresh_site_search(conn, site_id)
+        # The route invalidated before these coordinates existed, and the
+        # published map embed reads them; artifacts never expire on their own.
+        await invalidate_site_render_cache(site_id)
     except Exception:  # noqa: BLE001 - best-effort, post-response
         logger.warning("cappe: geocode failed for location %s", location_id, exc_info=True)
 
@@ -242,8 +242,8 @@ async def send_campaign(
     account: CappeAccount = Depends(require_cappe_account),
 ):
     """Stage the campaign for sending and dispatch the background blast. The
-    Celery task (cappe_campaign_send) does the throttled per-recipient send and
-    flips status 'sending' → 'sent' with the real recipient count."""
+    Celery tasks (cappe_campaign_send) deliver it in resumable batches and flip
+    status 'sending' → 'sent' with the real recipient count."""
     async with get_connection() as conn:
         await get_owned_site(conn, site_id, account.id)
         campaign = await conn.fetchrow(
@@ -32,6 +32,7 @@ from typing import Any, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Query, Request, status
 
+from ....core.services.geocell import cover_ranges, covering_scan
 from ....core.services.redis_cache import check_rate_limit, client_ip
 from ....database import get_connection
 from ...models.cappe import CappeDirectoryPage, CappeDirectoryCategories
@@ -234,40 +235,40 @@ async def browse_directory(
         loc_distance_expr = (
             _DISTANCE_EXPR.replace("$LAT", lat_param).replace("$LNG", lng_param).replace("geo.", "l.")
         )
-        bbox_predicate = f"""
-                l.lat IS NOT NULL AND l.lng IS NOT NULL
-                AND l.lat BETWEEN {lat_param} - ({radius_param} / 111.045)
-                              AND {lat_param} + ({radius_param} / 111.045)
-                AND l.lng BETWEEN {lng_param} - ({radius_param} / (111.045 * greatest(cos(radians({lat_param})), 0.01)))
-                              AND {lng_param} + ({radius_param} / (111.045 * greatest(cos(radians({lat_param})), 0.01)))
-        """
+        lows, highs = cover_ranges(lat, lng, radius_km)
+        args.append(lows)
+        lows_param = f"${len(args)}"
+        args.append(highs)
+        highs_param = f"${len(args)}"
         # Drive off `cappe_locations` directly rather than picking each site's
         # DEFAULT location and filtering that: a multi-location business whose
         # default is its unmapped HQ has a real location inside the radius that
         # the old per-site-default lateral would never see (its lateral output
         # was one row — the default — and the radius filter then ran against
         # THAT row's lat/lng, dropping the site even though a branch matched).
-        # Filtering on `l.*` (the bbox + `active`) here also means Postgres can
-        # use `idx_cappe_locations_geo` as the driving scan; the old shape ran
-        # the bbox against the output of a per-site `LIMIT 1` lateral, which
-        # can't be pushed into an index scan at all.
+        # The rows come from the geocell cover ranges (one range scan each on
+        # `idx_cappe_locations_geocell`, see core/services/geocell.py) rather
+        # than a lat/lng box, which could only range-scan on lat and read the
+        # whole latitude band. A location without coordinates has no geocell
+        # and never joins.
         geo_cte = f"""
         WITH nearest_loc AS (
             SELECT DISTINCT ON (l.site_id)
                    l.site_id, l.city, l.region, ({loc_distance_expr}) AS distance_km
-              FROM cappe_locations l
-             WHERE l.active AND ({bbox_predicate})
+              FROM {covering_scan("cappe_locations", "l", lows_param, highs_param)}
+             WHERE l.active
              ORDER BY l.site_id, distance_km ASC
         )
         """
-        # INNER join: a site with no geocoded location inside the box has
+        # INNER join: a site with no geocoded location inside the cover has
         # nothing to rank or filter by, and radius search is exactly the query
         # where "no matching location" should mean "not a result", not "show it
         # anyway with a blank distance".
         geo_join = "JOIN nearest_loc loc ON loc.site_id = s.id"
-        # The bbox above is a square approximation; the exact circle is only
-        # knowable once distance_km is computed, so it's enforced here rather
-        # than inside the CTE's WHERE (which runs before that column exists).
+        # The cells above cover a square around the circle; the exact circle
+        # is only knowable once distance_km is computed, so it's enforced here
+        # rather than inside the CTE's WHERE (which runs before that column
+        # exists).
         where.append(f"loc.distance_km <= {radius_param}")
         distance_km_expr = "loc.distance_km"
 
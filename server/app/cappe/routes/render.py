@@ -8,9 +8,11 @@ apex; base domain configurable via CAPPE_BASE_DOMAIN), `<sub>.cappe.localhost` /
 keeps the apex + `www` (and other reserved labels — see RESERVED_SUBDOMAINS);
 non-Cappe hosts get a 404 so normal API/root routes are unaffected.
 
-Rendered HTML is cached in Redis per (site, page) and invalidated by the owner
-CRUD routes via `invalidate_render_cache` — page views cost one indexed site
-lookup + a Redis GET on the hot path.
+Pages are rendered at publish time into immutable, pre-compressed artifacts
+(services/static_site.py), rebuilt by the owner CRUD routes via
+`invalidate_render_cache`. Each worker holds host → site artifacts in memory,
+so a cached page view costs no DB or Redis round trip; a matching
+If-None-Match gets a 304.
 """
 import os
 import time
@@ -18,15 +20,14 @@ import json
 from html import escape
 
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 
-from ...core.services.redis_cache import cache_get, cache_set, get_redis_cache
 from ...database import get_connection
+from ..services import static_site
 from ..services.booking_suggestion_access import canonical_suggestion_host
 from ..services.common import normalize_host_header
-from ..services.render import render_site_html
 from ..services.render_cache import invalidate_site_render_cache
-from ._shared import RESERVED_SUBDOMAINS, loads, loads_list
+from ._shared import RESERVED_SUBDOMAINS
 
 router = APIRouter()
 
@@ -38,8 +39,6 @@ _RESERVED_SUBS = RESERVED_SUBDOMAINS
 # Hosts that always belong to the main app — never looked up as custom domains.
 _APP_HOSTS = {"hey-matcha.com", "www.hey-matcha.com", "localhost", "127.0.0.1", "matcha-backend"}
 
-_RENDER_TTL = 300  # seconds; owner mutations invalidate explicitly
-
 # CSP for published Cappe pages: they ship inline widget scripts + Google Fonts
 # (all user content is HTML-escaped + URL-sanitized by services/render.py). The
 # app-wide security middleware applies the strict policy only when a response
@@ -156,7 +155,7 @@ async def _resolve_published_site(conn, host: str | None):
     sub = subdomain_from_host(host)
     if sub:
         return await conn.fetchrow(
-            "SELECT id, name, slug, subdomain, custom_domain, theme_config, meta_config FROM cappe_sites "
+            "SELECT id, name, slug, subdomain, custom_domain, published_version FROM cappe_sites "
             "WHERE subdomain = $1 AND status = 'published'",
             sub,
         )
@@ -164,37 +163,24 @@ async def _resolve_published_site(conn, host: str | None):
     if not candidates:
         return None
     return await conn.fetchrow(
-        "SELECT id, name, slug, subdomain, custom_domain, theme_config, meta_config FROM cappe_sites "
+        "SELECT id, name, slug, subdomain, custom_domain, published_version FROM cappe_sites "
         "WHERE custom_domain = ANY($1::text[]) AND status = 'published'",
         candidates,
     )
 
 
 async def invalidate_render_cache(site_id) -> None:
-    """Drop cached rendered HTML for a site + reset the custom-domain host
-    cache. Called by owner CRUD (site/page mutations, publish, delete).
+    """Rebuild a site's published pages + reset the custom-domain host cache.
+    Called by owner CRUD (site/page mutations, publish, delete).
 
-    The Redis half now lives in `services/render_cache.py` so a services/
-    caller (the setup concierge's chat-confirm path) can invalidate the
-    rendered-HTML cache without importing routes/ — this wrapper stays the
-    public name because `_host_cache` below is route-local state."""
+    The artifact half lives in `services/render_cache.py` so a services/
+    caller (the setup concierge's chat-confirm path) can invalidate without
+    importing routes/ — this wrapper stays the public name because
+    `_host_cache` below is route-local state."""
     await invalidate_site_render_cache(site_id)
     _host_cache.clear()
 
 
-def _site_dict(site) -> dict:
-    return {
-        "name": site["name"],
-        "slug": site["slug"],
-        "theme_config": loads(site["theme_config"]),
-        "meta_config": loads(site["meta_config"]),
-    }
-
-
-def _page_dict(page) -> dict:
-    return {"title": page["title"], "slug": page["slug"], "content": loads(page["content"])}
-
-
 def _not_found_html(message: str) -> HTMLResponse:
     return HTMLResponse(
         f"<!doctype html><html><body style='font-family:system-ui;text-align:center;padding:6rem'>"
@@ -203,62 +189,38 @@ def _not_found_html(message: str) -> HTMLResponse:
     )
 
 
-async def _render(request: Request, page_slug: str | None) -> HTMLResponse:
+def _artifact_response(request: Request, page: static_site.PageArtifact) -> Response:
+    body, encoding, etag = page.negotiate(request.headers.get("accept-encoding"))
+    headers = {**tenant_security_headers(), "ETag": etag, "Vary": "Accept-Encoding"}
+    if page.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type="text/html; charset=utf-8", headers=headers)
+
+
+async def _render(request: Request, page_slug: str | None) -> Response:
     host = request.headers.get("host")
     if subdomain_from_host(host) is None and not _custom_domain_candidates(host):
         # Not a tenant-shaped host (e.g. the app's own domain) — fall through
         # to normal 404 handling without touching the DB.
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
 
-    redis = get_redis_cache()
-    async with get_connection() as conn:
-        site = await _resolve_published_site(conn, host)
-        if site is None:
-            return _not_found_html("Site not found")
-
-        cache_key = f"cappe:render:{site['id']}:{page_slug or '__home__'}"
-        if redis:
-            cached = await cache_get(redis, cache_key)
-            if isinstance(cached, str):
-                return HTMLResponse(cached, headers=tenant_security_headers())
-
-        nav_rows = await conn.fetch(
-            "SELECT title, slug FROM cappe_pages "
-            "WHERE site_id = $1 AND status = 'published' ORDER BY sort_order, created_at",
-            site["id"],
-        )
-        if not nav_rows:
-            return _not_found_html("Site not found")
-
-        if page_slug is None:
-            # Home = a page slugged 'home', else the first.
-            target = next((r["slug"] for r in nav_rows if r["slug"] == "home"), nav_rows[0]["slug"])
-        elif any(r["slug"] == page_slug for r in nav_rows):
-            target = page_slug
-        else:
-            return _not_found_html("Page not found")
-
-        page = await conn.fetchrow(
-            "SELECT title, slug, content FROM cappe_pages "
-            "WHERE site_id = $1 AND slug = $2 AND status = 'published'",
-            site["id"], target,
-        )
-        if page is None:
-            return _not_found_html("Page not found")
-
-        loc_rows = await conn.fetch(
-            "SELECT id, name, address, lat, lng, timezone, hours, contact_phone, contact_email "
-            "FROM cappe_locations WHERE site_id = $1 AND active = true "
-            "ORDER BY is_default DESC, sort_order, created_at",
-            site["id"],
-        )
+    host_key = _norm_host(host)
+    hit, artifacts, epoch = static_site.cached_host(host_key)
+    if not hit:
+        async with get_connection() as conn:
+            site = await _resolve_published_site(conn, host)
+            if site is not None:
+                artifacts = await static_site.site_artifacts(conn, site["id"], site["published_version"])
+        static_site.remember_host(host_key, artifacts, epoch)
+    if artifacts is None:
+        return _not_found_html("Site not found")
 
-    locations = [{**dict(r), "id": str(r["id"]), "hours": loads_list(r["hours"])} for r in loc_rows]
-    nav = [{"slug": r["slug"], "title": r["title"]} for r in nav_rows]
-    html = render_site_html(_site_dict(site), _page_dict(page), nav, locations=locations)
-    if redis:
-        await cache_set(redis, cache_key, html, ttl=_RENDER_TTL)
-    return HTMLResponse(html, headers=tenant_security_headers())
+    page = artifacts.page(page_slug)
+    if page is None:
+        return _not_found_html("Page not found")
+    return _artifact_response(request, page)
 
 
 @router.get("/", response_class=HTMLResponse)
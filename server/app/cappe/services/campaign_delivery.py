@@ -0,0 +1,361 @@
+"""Cappe campaign delivery engine — per-recipient state, batches, send governor.
+
+A campaign's deliverable subscribers are frozen into `cappe_campaign_recipients`
+when delivery starts, numbered into batches of BATCH_SIZE. Each batch is its
+own Celery task (workers/tasks/cappe_campaign_send), so a list of tens of
+thousands never has to fit in one task's time limit, and batches run on as many
+workers as are free.
+
+A batch task claims its rows in one UPDATE (pending → sending) before sending,
+sends them SEND_CONCURRENCY at a time through the `SendGovernor`, and records
+the outcome every RECORD_EVERY sends. That bounds what a crash can re-send to
+the one window in flight; everything already recorded as sent is never sent
+again. A claim older than CLAIM_STALE_SECONDS belonged to a dead worker and is
+claimed again by the next batch task or the resume sweep. A failed send goes
+back to pending until MAX_ATTEMPTS. The campaign flips to 'sent' once nothing
+is pending or sending.
+
+All functions take the caller's connection; the task module owns connections
+and dispatch.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from .campaigns import deliverable_recipients, personalize_unsubscribe_bulk
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("CAPPE_CAMPAIGN_BATCH_SIZE", "500"))
+SEND_CONCURRENCY = int(os.getenv("CAPPE_CAMPAIGN_SEND_CONCURRENCY", "8"))
+RECORD_EVERY = 50
+MAX_ATTEMPTS = 3
+# Longer than a batch task can live (Celery's hard limit is 600s).
+CLAIM_STALE_SECONDS = 900
+# A batch stops claiming new windows past this, well inside the 540s soft
+# limit, and hands the rest back to pending for its follow-up task.
+BATCH_TIME_BUDGET_SECONDS = 420.0
+
+# Per sending domain, across every worker (Redis), in sends per second.
+DOMAIN_SEND_RATE = float(os.getenv("CAPPE_CAMPAIGN_DOMAIN_RATE", "20"))
+DOMAIN_SEND_BURST = int(os.getenv("CAPPE_CAMPAIGN_DOMAIN_BURST", "40"))
+# After a Redis failure, use the process-local bucket this long before retrying.
+REDIS_RETRY_AFTER = 30.0
+
+Sender = Callable[..., Awaitable[bool]]
+
+
+def unsubscribe_url(slug: str, token: Optional[str]) -> str:
+    base = f"https://{os.getenv('CAPPE_BASE_DOMAIN', 'hey-matcha.com')}"
+    return f"{base}/api/cappe/public/sites/{slug}/unsubscribe/{token or ''}"
+
+
+def sending_domain(from_email: Optional[str]) -> str:
+    return (from_email or "").rpartition("@")[2].lower() or "default"
+
+
+# ── Send governor ────────────────────────────────────────────────────────
+
+# KEYS[1] bucket hash; ARGV: rate per second, burst. Uses the server clock so
+# workers with skewed clocks share one bucket correctly. Returns the wait in ms
+# before a token is available (0 = taken).
+_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 60000)
+return wait
+"""
+
+
+class _LocalBucket:
+    """Process-local token bucket — the fallback when Redis is unreachable.
+    Pure: the caller supplies `now` (time.monotonic())."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated: Optional[float] = None
+
+    def take(self, now: float) -> float:
+        """Take a token; returns 0, or the seconds to wait before asking again."""
+        if self.updated is not None:
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class SendGovernor:
+    """Token bucket per sending domain, replacing the old fixed sleep.
+
+    The bucket lives in Redis so every batch task on every worker draws on one
+    budget per domain. If Redis is down each process falls back to its own
+    bucket at the same rate, so the aggregate can briefly exceed it.
+    """
+
+    def __init__(self, rate: float = DOMAIN_SEND_RATE, burst: int = DOMAIN_SEND_BURST, redis=None):
+        self.rate = rate
+        self.burst = burst
+        self._redis = redis
+        self._redis_down_until = 0.0
+        self._local: dict[str, _LocalBucket] = {}
+
+    def _client(self):
+        if self._redis is None:
+            from app.core.services.rate_limiter import _limiter_redis
+
+            return _limiter_redis()
+        return self._redis
+
+    async def _take(self, domain: str) -> float:
+        if time.monotonic() >= self._redis_down_until:
+            try:
+                wait_ms = await self._client().eval(
+                    _BUCKET_SCRIPT, 1, f"cappe_campaign:send_bucket:{domain}", self.rate, self.burst,
+                )
+                return int(wait_ms) / 1000
+            except Exception as exc:
+                logger.warning("[Cappe Campaign] Redis unavailable, using local send bucket: %s", exc)
+                self._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+        bucket = self._local.setdefault(domain, _LocalBucket(self.rate, self.burst))
+        return bucket.take(time.monotonic())
+
+    async def acquire(self, domain: str) -> None:
+        while True:
+            wait = await self._take(domain)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+# ── Recipient state ──────────────────────────────────────────────────────
+
+_CAMPAIGN_SQL = """
+    SELECT c.id, c.subject, c.body_html, c.from_name, c.status, c.site_id,
+           s.slug, s.name AS site_name
+    FROM cappe_campaigns c JOIN cappe_sites s ON s.id = c.site_id
+    WHERE c.id = $1
+"""
+
+_MATERIALIZE_SQL = """
+    INSERT INTO cappe_campaign_recipients (campaign_id, email, name, unsubscribe_token, batch)
+    SELECT $1, r.email, r.name, r.token, ((r.ord - 1) / $5)::int
+    FROM unnest($2::text[], $3::text[], $4::text[]) WITH ORDINALITY AS r(email, name, token, ord)
+    ON CONFLICT (campaign_id, email) DO NOTHING
+"""
+
+
+def _claimable(stale_param: str) -> str:
+    """Rows a batch task may take: never claimed, or claimed by a worker that died."""
+    return (
+        f"(status = 'pending' OR (status = 'sending' "
+        f"AND claimed_at < NOW() - make_interval(secs => {stale_param})))"
+    )
+
+
+_OPEN_BATCHES_SQL = f"""
+    SELECT DISTINCT batch FROM cappe_campaign_recipients
+    WHERE campaign_id = $1 AND {_claimable("$2")}
+    ORDER BY batch
+"""
+
+_CLAIM_SQL = f"""
+    UPDATE cappe_campaign_recipients
+    SET status = 'sending', claimed_at = NOW(), attempts = attempts + 1, updated_at = NOW()
+    WHERE campaign_id = $1 AND batch = $2 AND {_claimable("$3")}
+      AND EXISTS (SELECT 1 FROM cappe_campaigns WHERE id = $1 AND status = 'sending')
+    RETURNING email, name, unsubscribe_token
+"""
+
+_RECORD_SQL = """
+    UPDATE cappe_campaign_recipients r
+    SET status = CASE WHEN u.ok THEN 'sent' WHEN r.attempts >= $5 THEN 'failed' ELSE 'pending' END,
+        sent_at = CASE WHEN u.ok THEN NOW() ELSE r.sent_at END,
+        error = u.error, claimed_at = NULL, updated_at = NOW()
+    FROM unnest($2::text[], $3::bool[], $4::text[]) AS u(email, ok, error)
+    WHERE r.campaign_id = $1 AND r.email = u.email AND r.status = 'sending'
+"""
+
+_RELEASE_SQL = """
+    UPDATE cappe_campaign_recipients
+    SET status = 'pending', claimed_at = NULL, attempts = attempts - 1, updated_at = NOW()
+    WHERE campaign_id = $1 AND email = ANY($2::text[]) AND status = 'sending'
+"""
+
+_FINALIZE_SQL = """
+    UPDATE cappe_campaigns c
+    SET status = 'sent', sent_at = NOW(), updated_at = NOW(),
+        recipient_count = (
+            SELECT COUNT(*) FROM cappe_campaign_recipients
+            WHERE campaign_id = c.id AND status = 'sent'
+        )
+    WHERE c.id = $1 AND c.status = 'sending'
+      AND NOT EXISTS (
+          SELECT 1 FROM cappe_campaign_recipients
+          WHERE campaign_id = $1 AND status IN ('pending', 'sending')
+      )
+    RETURNING recipient_count
+"""
+
+_STALLED_SQL = """
+    SELECT r.campaign_id
+    FROM cappe_campaign_recipients r
+    JOIN cappe_campaigns c ON c.id = r.campaign_id
+    WHERE c.status = 'sending'
+    GROUP BY r.campaign_id
+    HAVING MAX(r.updated_at) < NOW() - make_interval(secs => $1)
+"""
+
+
+async def get_campaign(conn, campaign_id):
+    return await conn.fetchrow(_CAMPAIGN_SQL, campaign_id)
+
+
+async def materialize_recipients(conn, campaign_id, site_id, *, batch_size: int = BATCH_SIZE) -> int:
+    """Freeze the campaign's deliverable subscribers into recipient rows.
+
+    Only the first call for a campaign writes anything: a resumed delivery keeps
+    the list (and batch numbering) it started with, so subscribers who joined
+    mid-send don't shift rows between batches. Returns the recipient count.
+    """
+    existing = await conn.fetchval(
+        "SELECT COUNT(*) FROM cappe_campaign_recipients WHERE campaign_id = $1", campaign_id,
+    )
+    if existing:
+        return existing
+    subs = await conn.fetch(
+        "SELECT email, name, unsubscribe_token FROM cappe_subscribers "
+        "WHERE site_id = $1 AND status = 'subscribed' ORDER BY created_at, id",
+        site_id,
+    )
+    recipients = deliverable_recipients(subs)
+    if recipients:
+        await conn.execute(
+            _MATERIALIZE_SQL,
+            campaign_id,
+            [r["email"] for r in recipients],
+            [r["name"] for r in recipients],
+            [r["unsubscribe_token"] for r in recipients],
+            batch_size,
+        )
+    return len(recipients)
+
+
+async def open_batches(conn, campaign_id) -> list[int]:
+    """Batch numbers that still have rows to claim."""
+    rows = await conn.fetch(_OPEN_BATCHES_SQL, campaign_id, CLAIM_STALE_SECONDS)
+    return [r["batch"] for r in rows]
+
+
+async def finalize_if_done(conn, campaign_id) -> Optional[int]:
+    """Flip the campaign to 'sent' when no row is pending or in flight.
+    Returns the sent count, or None if delivery isn't finished (or another
+    task already finalized it)."""
+    return await conn.fetchval(_FINALIZE_SQL, campaign_id)
+
+
+async def stalled_campaigns(conn) -> list:
+    """'sending' campaigns whose recipients haven't changed in the stale window —
+    their batch tasks died (a killed worker's task is not redelivered)."""
+    rows = await conn.fetch(_STALLED_SQL, CLAIM_STALE_SECONDS)
+    return [r["campaign_id"] for r in rows]
+
+
+@dataclass
+class BatchResult:
+    claimed: int = 0
+    sent: int = 0
+    failed: int = 0
+    deferred: int = 0  # handed back to pending for a follow-up task
+
+    @property
+    def needs_followup(self) -> bool:
+        return bool(self.deferred or self.failed)
+
+
+async def deliver_batch(
+    conn,
+    campaign_id,
+    batch: int,
+    *,
+    sender: Sender,
+    from_email: Optional[str],
+    governor: Optional[SendGovernor] = None,
+    time_budget: float = BATCH_TIME_BUDGET_SECONDS,
+) -> BatchResult:
+    """Claim and send one batch. `sender` is `EmailService.send_email_with_fallback`
+    (or a stand-in), called with to_email / to_name / subject / html_content /
+    text_content and returning whether the message was accepted."""
+    result = BatchResult()
+    camp = await get_campaign(conn, campaign_id)
+    if camp is None or camp["status"] != "sending":
+        return result
+    claimed = await conn.fetch(_CLAIM_SQL, campaign_id, batch, CLAIM_STALE_SECONDS)
+    result.claimed = len(claimed)
+    if not claimed:
+        return result
+
+    governor = governor or SendGovernor()
+    domain = sending_domain(from_email)
+    subject = camp["subject"] or f"News from {camp['site_name']}"
+    urls = [unsubscribe_url(camp["slug"], r["unsubscribe_token"]) for r in claimed]
+    bodies = personalize_unsubscribe_bulk(camp["body_html"] or "", urls)
+    semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+    async def send_one(index: int) -> tuple[bool, Optional[str]]:
+        row = claimed[index]
+        async with semaphore:
+            await governor.acquire(domain)
+            try:
+                ok = await sender(
+                    to_email=row["email"], to_name=row["name"], subject=subject,
+                    html_content=bodies[index],
+                    text_content=f"View this message in an HTML email client.\n\nUnsubscribe: {urls[index]}",
+                )
+            except Exception as exc:  # one bad address shouldn't halt the batch
+                return False, str(exc)[:500]
+            return bool(ok), None if ok else "rejected by email provider"
+
+    started = time.monotonic()
+    for start in range(0, len(claimed), RECORD_EVERY):
+        if time.monotonic() - started > time_budget:
+            rest = [r["email"] for r in claimed[start:]]
+            await conn.execute(_RELEASE_SQL, campaign_id, rest)
+            result.deferred = len(rest)
+            break
+        window = range(start, min(start + RECORD_EVERY, len(claimed)))
+        outcomes = await asyncio.gather(*(send_one(i) for i in window))
+        await conn.execute(
+            _RECORD_SQL,
+            campaign_id,
+            [claimed[i]["email"] for i in window],
+            [ok for ok, _ in outcomes],
+            [error for _, error in outcomes],
+            MAX_ATTEMPTS,
+        )
+        sent = sum(ok for ok, _ in outcomes)
+        result.sent += sent
+        result.failed += len(outcomes) - sent
+    return result
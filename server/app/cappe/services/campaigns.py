@@ -23,13 +23,23 @@ def deliverable_recipients(rows) -> list[dict]:
     return out
 
 
+_UNSUBSCRIBE_FOOTER = (
+    '<p style="margin:28px 0 0;font-size:12px;color:#9aa0a6;line-height:1.6;">'
+    "You're receiving this because you subscribed. "
+    '<a href="{url}" style="color:#9aa0a6;">Unsubscribe</a>.</p>'
+)
+
+
 def personalize_unsubscribe(body_html: str, unsubscribe_url: str) -> str:
     """Append a one-click unsubscribe footer to a campaign's HTML body. CAN-SPAM
     / deliverability basics: every bulk email needs a working opt-out."""
-    safe = escape(unsubscribe_url or "", quote=True)
-    footer = (
-        '<p style="margin:28px 0 0;font-size:12px;color:#9aa0a6;line-height:1.6;">'
-        "You're receiving this because you subscribed. "
-        f'<a href="{safe}" style="color:#9aa0a6;">Unsubscribe</a>.</p>'
-    )
-    return f"{body_html or ''}{footer}"
+    return personalize_unsubscribe_bulk(body_html, [unsubscribe_url])[0]
+
+
+def personalize_unsubscribe_bulk(body_html: str, unsubscribe_urls: list[str]) -> list[str]:
+    """`personalize_unsubscribe` for a whole delivery batch. The body and the
+    footer around the link are the same for every recipient, so they're split
+    once and each recipient only costs escaping its own URL."""
+    head, tail = _UNSUBSCRIBE_FOOTER.split("{url}")
+    prefix = f"{body_html or ''}{head}"
+    return [f"{prefix}{escape(url or '', quote=True)}{tail}" for url in unsubscribe_urls]
@@ -7,7 +7,6 @@ once, when the order is first paid (per-site counter → e.g. LUM-00042).
 
 from __future__ import annotations
 
-import asyncio
 import base64
 import json
 import logging
@@ -15,7 +14,7 @@ from datetime import datetime, timezone
 from html import escape
 from uuid import UUID
 
-from ...core.services.pdf import render_pdf
+from ...core.services.pdf import render_pdf_async
 from ...database import get_connection
 from .email import _email_shell, _send  # noqa: F401  (shell reused; _send kept for parity)
 from ...core.services.email.client import get_email_service
@@ -203,7 +202,7 @@ async def render_order_receipt_pdf(conn, order_id: UUID) -> tuple[dict, bytes] |
     od = dict(order)
     items = [dict(r) for r in item_rows]
     html = build_receipt_html(od, items)
-    pdf = await asyncio.to_thread(render_pdf, html)
+    pdf = await render_pdf_async(html)
     return od, pdf
 
 
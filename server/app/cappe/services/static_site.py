@@ -0,0 +1,539 @@
+"""Publish-time static artifacts for public Cappe pages.
+
+A public page view used to take a pooled connection to resolve the Host header
+on every request, then either a Redis GET or — on a miss — three more queries
+and a full `render_site_html`. Rendered output is a pure function of the site,
+its published pages and active locations. So this module renders every
+published page once, when the owner changes something, and stores the
+result as an immutable *version* in `cappe_site_artifacts`. Each page is
+stored as HTML plus pre-compressed gzip and brotli bodies, and carries a
+strong ETag.
+
+Each API worker keeps two maps in memory:
+
+* host → site_id — negative entries too, so "Site not found" spam stays off the DB;
+* site_id → `SiteArtifacts` — bounded by total bytes, least recently used first.
+
+A cached view therefore costs no DB or Redis round trip at all.
+`republish_site` rebuilds after a change and broadcasts on
+`cappe_sites:invalidate`; every worker then drops its copy. Entries also
+expire after `HOST_TTL_SECONDS` in case a broadcast is missed. As with the
+company-feature cache, the in-memory maps are live only while this process's
+subscriber is actually subscribed (it is started from the FastAPI lifespan).
+Everywhere else, and while a worker waits on Redis or reconnects, each view
+reads the stored version from the DB.
+
+A version embeds a fingerprint of the renderer's own source. Artifacts stored
+by a previous deploy's renderer are therefore rebuilt lazily on first view,
+not served stale.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - gzip-only until Brotli is installed
+    brotli = None
+
+from .common import loads, loads_list
+from .render import render_site_html
+
+logger = logging.getLogger(__name__)
+
+HOST_TTL_SECONDS = float(os.getenv("CAPPE_STATIC_HOST_TTL_SECONDS", "300"))
+# "Site not found" is cached briefly; any invalidation clears these early.
+MISSING_HOST_TTL_SECONDS = 30.0
+HOST_MAP_MAX = 4096
+CACHE_MAX_BYTES = int(os.getenv("CAPPE_STATIC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+INVALIDATE_CHANNEL = "cappe_sites:invalidate"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+_RENDER_DIR = os.path.join(os.path.dirname(__file__), "render")
+
+
+def _renderer_fingerprint() -> str:
+    """Hash of the renderer's source + bundled assets (changes on deploy)."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(_RENDER_DIR):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith((".py", ".css", ".js")):
+                digest.update(name.encode())
+                with open(os.path.join(root, name), "rb") as fh:
+                    digest.update(fh.read())
+    return digest.hexdigest()[:8]
+
+
+RENDERER_ID = _renderer_fingerprint()
+
+
+# --- Artifacts ---------------------------------------------------------------
+
+def _accepted_encodings(accept_encoding: Optional[str]) -> set[str]:
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().lower().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip())
+    return accepted
+
+
+@dataclass(frozen=True)
+class PageArtifact:
+    """One rendered page: the HTML and its pre-compressed bodies."""
+
+    etag: str  # opaque tag without quotes; per-encoding suffixes are added
+    html: bytes
+    gzip: bytes
+    br: Optional[bytes] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.html) + len(self.gzip) + len(self.br or b"")
+
+    def negotiate(self, accept_encoding: Optional[str]) -> tuple[bytes, Optional[str], str]:
+        """(body, Content-Encoding or None, strong ETag) for a request."""
+        accepted = _accepted_encodings(accept_encoding)
+        if self.br is not None and ("br" in accepted or "*" in accepted):
+            return self.br, "br", f'"{self.etag}-br"'
+        if "gzip" in accepted or "*" in accepted:
+            return self.gzip, "gzip", f'"{self.etag}-gz"'
+        return self.html, None, f'"{self.etag}"'
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match uses weak comparison, and any encoding of this
+        content is a match — the 304 carries the negotiated tag."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            tag = tag.strip('"')
+            for suffix in ("-br", "-gz"):
+                if tag.endswith(suffix):
+                    tag = tag[: -len(suffix)]
+                    break
+            if tag == self.etag:
+                return True
+        return False
+
+
+@dataclass(frozen=True)
+class SiteArtifacts:
+    """Every published page of one site version, in nav order."""
+
+    site_id: str
+    version: str
+    pages: dict[str, PageArtifact]
+    home: str
+    size: int = field(default=0, compare=False)
+
+    def page(self, page_slug: Optional[str]) -> Optional[PageArtifact]:
+        """Home is the page slugged 'home', else the first (as before)."""
+        return self.pages.get(self.home if page_slug is None else page_slug)
+
+
+def _home_slug(slugs: list[str]) -> str:
+    return "home" if "home" in slugs else slugs[0]
+
+
+def _page_artifact(html: str) -> PageArtifact:
+    raw = html.encode("utf-8")
+    return PageArtifact(
+        etag=hashlib.sha256(raw).hexdigest()[:32],
+        html=raw,
+        gzip=gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0),
+        br=brotli.compress(raw, quality=BROTLI_QUALITY) if brotli is not None else None,
+    )
+
+
+def _site_artifacts(site_id, version: str, pages: dict[str, PageArtifact]) -> SiteArtifacts:
+    return SiteArtifacts(
+        site_id=str(site_id),
+        version=version,
+        pages=pages,
+        home=_home_slug(list(pages)),
+        size=sum(p.size for p in pages.values()),
+    )
+
+
+def render_site_artifacts(site: dict, pages: list[dict], locations: list[dict]) -> SiteArtifacts:
+    """Render + compress every page. CPU-only; callers run it off the loop."""
+    site_dict = {
+        "name": site["name"],
+        "slug": site["slug"],
+        "theme_config": loads(site["theme_config"]),
+        "meta_config": loads(site["meta_config"]),
+    }
+    nav = [{"slug": p["slug"], "title": p["title"]} for p in pages]
+    rendered: dict[str, PageArtifact] = {}
+    for page in pages:
+        page_dict = {"title": page["title"], "slug": page["slug"], "content": loads(page["content"])}
+        rendered[page["slug"]] = _page_artifact(
+            render_site_html(site_dict, page_dict, nav, locations=locations)
+        )
+    content = hashlib.sha256(
+        json.dumps([[slug, a.etag] for slug, a in rendered.items()]).encode()
+    ).hexdigest()[:16]
+    return _site_artifacts(site["id"], f"{RENDERER_ID}.{content}", rendered)
+
+
+def is_current(version: Optional[str]) -> bool:
+    """Was this stored version built by the renderer this process runs?"""
+    return bool(version) and version.startswith(f"{RENDERER_ID}.")
+
+
+# --- Storage -----------------------------------------------------------------
+
+async def build_site_artifacts(conn, site_id, *, lazy: bool = False) -> Optional[SiteArtifacts]:
+    """Render a site's published pages and store them as its current version.
+
+    Returns None — and clears any stored version — when the site is gone, not
+    published, or has no published pages. Serialized per site by an advisory
+    lock so two concurrent rebuilds can't store an older read last.
+
+    `lazy` is the first-view path: a view that queued on the lock behind
+    another one's build returns the version that build stored instead of
+    rendering it all again.
+    """
+    async with conn.transaction():
+        await conn.execute(
+            "SELECT pg_advisory_xact_lock(hashtextextended($1, 0))", f"cappe:static:{site_id}"
+        )
+        site = await conn.fetchrow(
+            "SELECT id, name, slug, theme_config, meta_config, status, published_version "
+            "FROM cappe_sites WHERE id = $1",
+            site_id,
+        )
+        if site is None:
+            return None
+        if lazy and is_current(site["published_version"]):
+            stored = await load_site_artifacts(conn, site_id, site["published_version"])
+            if stored is not None:
+                return stored
+        page_rows = []
+        if site["status"] == "published":
+            page_rows = await conn.fetch(
+                "SELECT title, slug, content FROM cappe_pages "
+                "WHERE site_id = $1 AND status = 'published' ORDER BY sort_order, created_at",
+                site_id,
+            )
+        if not page_rows:
+            if site["published_version"] is not None:
+                await conn.execute("UPDATE cappe_sites SET published_version = NULL WHERE id = $1", site_id)
+                await conn.execute("DELETE FROM cappe_site_artifacts WHERE site_id = $1", site_id)
+            return None
+        loc_rows = await conn.fetch(
+            "SELECT id, name, address, lat, lng, timezone, hours, contact_phone, contact_email "
+            "FROM cappe_locations WHERE site_id = $1 AND active = true "
+            "ORDER BY is_default DESC, sort_order, created_at",
+            site_id,
+        )
+        locations = [{**dict(r), "id": str(r["id"]), "hours": loads_list(r["hours"])} for r in loc_rows]
+        artifacts = await asyncio.to_thread(
+            render_site_artifacts, dict(site), [dict(r) for r in page_rows], locations
+        )
+        if site["published_version"] == artifacts.version:
+            return artifacts  # nothing changed that reaches the rendered output
+
+        slugs = list(artifacts.pages)
+        await conn.execute(
+            """INSERT INTO cappe_site_artifacts
+                   (site_id, version, page_slug, position, etag, html, gzip, br)
+               SELECT $1, $2, a.slug, a.position, a.etag, a.html, a.gzip, a.br
+               FROM unnest($3::text[], $4::int[], $5::text[], $6::bytea[], $7::bytea[], $8::bytea[])
+                    AS a(slug, position, etag, html, gzip, br)
+               ON CONFLICT (site_id, version, page_slug) DO NOTHING""",
+            site_id,
+            artifacts.version,
+            slugs,
+            list(range(len(slugs))),
+            [artifacts.pages[s].etag for s in slugs],
+            [artifacts.pages[s].html for s in slugs],
+            [artifacts.pages[s].gzip for s in slugs],
+            [artifacts.pages[s].br for s in slugs],
+        )
+        await conn.execute(
+            "UPDATE cappe_sites SET published_version = $2 WHERE id = $1", site_id, artifacts.version
+        )
+        # Workers still holding the old version in memory keep serving it
+        # until the broadcast lands; nothing reads old rows after this commits.
+        await conn.execute(
+            "DELETE FROM cappe_site_artifacts WHERE site_id = $1 AND version <> $2",
+            site_id, artifacts.version,
+        )
+    return artifacts
+
+
+async def load_site_artifacts(conn, site_id, version: str) -> Optional[SiteArtifacts]:
+    """A stored version, or None if its rows are gone (replaced meanwhile)."""
+    rows = await conn.fetch(
+        "SELECT page_slug, etag, html, gzip, br FROM cappe_site_artifacts "
+        "WHERE site_id = $1 AND version = $2 ORDER BY position",
+        site_id, version,
+    )
+    if not rows:
+        return None
+    pages = {
+        r["page_slug"]: PageArtifact(etag=r["etag"], html=bytes(r["html"]), gzip=bytes(r["gzip"]),
+                                     br=bytes(r["br"]) if r["br"] is not None else None)
+        for r in rows
+    }
+    return _site_artifacts(site_id, version, pages)
+
+
+# --- Per-worker cache --------------------------------------------------------
+
+class StaticSiteCache:
+    """host → site_id and site_id → artifacts, bounded, with counters."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, host_ttl: float = HOST_TTL_SECONDS):
+        self.max_bytes = max_bytes
+        self.host_ttl = host_ttl
+        self._hosts: "OrderedDict[str, tuple[float, Optional[str]]]" = OrderedDict()
+        self._sites: "OrderedDict[str, SiteArtifacts]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+        # Bumped by every drop/clear; a resolve that started before one must
+        # not cache what it read (same contract as CompanyFeatureCache).
+        self.epoch = 0
+
+    def lookup(self, host: str) -> tuple[bool, Optional[SiteArtifacts]]:
+        """(hit, artifacts). A hit with None is a cached "Site not found"."""
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is not None and entry[0] > time.monotonic():
+                site_id = entry[1]
+                if site_id is None:
+                    self.stats["hits"] += 1
+                    return True, None
+                artifacts = self._sites.get(site_id)
+                if artifacts is not None:
+                    self._sites.move_to_end(site_id)
+                    self.stats["hits"] += 1
+                    return True, artifacts
+            self.stats["misses"] += 1
+            return False, None
+
+    def site(self, site_id, version: str) -> Optional[SiteArtifacts]:
+        with self._lock:
+            artifacts = self._sites.get(str(site_id))
+            return artifacts if artifacts is not None and artifacts.version == version else None
+
+    def put(self, host: str, artifacts: Optional[SiteArtifacts], epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            now = time.monotonic()
+            if artifacts is None:
+                self._hosts[host] = (now + min(MISSING_HOST_TTL_SECONDS, self.host_ttl), None)
+            else:
+                self._hosts[host] = (now + self.host_ttl, artifacts.site_id)
+                old = self._sites.pop(artifacts.site_id, None)
+                if old is not None:
+                    self._bytes -= old.size
+                self._sites[artifacts.site_id] = artifacts
+                self._bytes += artifacts.size
+                while self._bytes > self.max_bytes and len(self._sites) > 1:
+                    _, evicted = self._sites.popitem(last=False)
+                    self._bytes -= evicted.size
+                    self.stats["evictions"] += 1
+            self._hosts.move_to_end(host)
+            while len(self._hosts) > HOST_MAP_MAX:
+                self._hosts.popitem(last=False)
+
+    def drop(self, *site_ids) -> None:
+        """Forget these sites, every host pointing at them, and every cached
+        "Site not found" (a publish may have just made one of those real)."""
+        ids = {str(s) for s in site_ids}
+        with self._lock:
+            self.epoch += 1
+            for site_id in ids:
+                artifacts = self._sites.pop(site_id, None)
+                if artifacts is not None:
+                    self._bytes -= artifacts.size
+                    self.stats["invalidations"] += 1
+            for host in [h for h, (_, sid) in self._hosts.items() if sid is None or sid in ids]:
+                del self._hosts[host]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._hosts.clear()
+            self._sites.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hosts": len(self._hosts),
+                "sites": len(self._sites),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache = StaticSiteCache()
+_subscriber_task: Optional[asyncio.Task] = None
+# True only between a successful SUBSCRIBE and the subscription ending.
+_subscribed = False
+
+
+def cache_enabled() -> bool:
+    return _subscribed
+
+
+def cached_host(host: str) -> tuple[bool, Optional[SiteArtifacts], int]:
+    """(hit, artifacts, epoch to hand back to `remember_host` on a miss)."""
+    if not cache_enabled():
+        return False, None, -1
+    hit, artifacts = _cache.lookup(host)
+    return hit, artifacts, _cache.epoch
+
+
+def remember_host(host: str, artifacts: Optional[SiteArtifacts], epoch: int) -> None:
+    if cache_enabled():
+        _cache.put(host, artifacts, epoch)
+
+
+async def site_artifacts(conn, site_id, version: Optional[str]) -> Optional[SiteArtifacts]:
+    """Artifacts for a published site's stored version: from this worker's
+    cache, else the DB, else rendered now (never built, or by an older
+    renderer) — the lazy path only runs once per site per deploy."""
+    if is_current(version):
+        cached = _cache.site(site_id, version) if cache_enabled() else None
+        if cached is not None:
+            return cached
+        loaded = await load_site_artifacts(conn, site_id, version)
+        if loaded is not None:
+            return loaded
+    return await build_site_artifacts(conn, site_id, lazy=True)
+
+
+def get_static_site_stats() -> dict:
+    """Hit/miss/eviction counters and size of this worker's artifact cache."""
+    return {**_cache.snapshot(), "enabled": cache_enabled(), "renderer": RENDERER_ID,
+            "brotli": brotli is not None}
+
+
+async def republish_site(site_id) -> None:
+    """Rebuild a site's artifacts after an owner change and drop every
+    worker's copy. Call after the write commits. Never raises: if the rebuild
+    fails, the stored version is cleared so the next view renders lazily
+    instead of serving the pre-change pages."""
+    from ...core.services.redis_cache import get_redis_cache
+    from ...database import connection_or_direct
+
+    try:
+        async with connection_or_direct() as conn:
+            await build_site_artifacts(conn, site_id)
+    except Exception:
+        logger.exception("[Cappe Static] Rebuild failed for site %s", site_id)
+        try:
+            async with connection_or_direct() as conn:
+                await conn.execute("UPDATE cappe_sites SET published_version = NULL WHERE id = $1", site_id)
+        except Exception:
+            logger.warning("[Cappe Static] Could not clear version for site %s", site_id, exc_info=True)
+    _cache.drop(site_id)
+    redis = get_redis_cache()
+    if redis is None:
+        return
+    try:
+        await redis.publish(INVALIDATE_CHANNEL, json.dumps([str(site_id)]))
+    except Exception:
+        logger.warning("[Cappe Static] Invalidation publish failed for site %s", site_id, exc_info=True)
+
+
+def _mark_unsubscribed() -> None:
+    global _subscribed
+    if _subscribed:
+        _subscribed = False
+        # Broadcasts sent while we are away are lost — start clean.
+        _cache.clear()
+
+
+async def _subscriber_loop() -> None:
+    """Per-worker: apply other workers' invalidations. Self-healing on errors,
+    exits on cancellation (same shape as the feature-cache subscriber)."""
+    global _subscribed
+    from ...core.services.redis_cache import get_redis_cache
+
+    while True:
+        pubsub = None
+        try:
+            redis = get_redis_cache()
+            if redis is None:
+                await asyncio.sleep(5)
+                continue
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+            _subscribed = True
+            async for raw in pubsub.listen():
+                if raw is None or raw.get("type") != "message":
+                    continue
+                try:
+                    ids = json.loads(raw.get("data") or "[]")
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(ids, list):
+                    _cache.drop(*ids)
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            _mark_unsubscribed()
+            logger.exception("[Cappe Static] Subscriber loop error; restarting in 2s")
+            await asyncio.sleep(2)
+        finally:
+            _mark_unsubscribed()
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(INVALIDATE_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def start_static_site_subscriber() -> None:
+    """Start the per-worker subscriber (and with it, the cache). Idempotent."""
+    global _subscriber_task
+    if _subscriber_task and not _subscriber_task.done():
+        return
+    _subscriber_task = asyncio.create_task(_subscriber_loop())
+
+
+async def stop_static_site_subscriber() -> None:
+    global _subscriber_task
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        try:
+            await _subscriber_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _subscriber_task = None
+    _cache.clear()
@@ -66,6 +66,29 @@ def _warn_if_db_unencrypted(database_url: str, database_ssl: str) -> None:
     )
 
 
+# Default (min, max) asyncpg pool size per process role. "realtime" runs the
+# websocket / AI streaming traffic, where a turn holds its connection for the
+# whole stream; "script" is one-off maintenance processes. Celery workers size
+# their own pool (WORKER_DB_POOL_MIN/MAX in workers/utils.py).
+DB_POOL_ROLE_SIZES = {
+    "api": (2, 10),
+    "realtime": (4, 30),
+    "script": (1, 4),
+}
+
+
+def _db_pool_sizes() -> tuple[str, int, int]:
+    """DATABASE_POOL_ROLE's sizes, with DATABASE_POOL_MIN_SIZE/MAX_SIZE overriding either bound."""
+    role = os.getenv("DATABASE_POOL_ROLE", "api").strip().lower() or "api"
+    if role not in DB_POOL_ROLE_SIZES:
+        logger.warning("Unknown DATABASE_POOL_ROLE %r; using 'api' pool sizes", role)
+        role = "api"
+    min_size, max_size = DB_POOL_ROLE_SIZES[role]
+    max_size = max(1, int(os.getenv("DATABASE_POOL_MAX_SIZE", str(max_size))))
+    min_size = min(max_size, max(0, int(os.getenv("DATABASE_POOL_MIN_SIZE", str(min_size)))))
+    return role, min_size, max_size
+
+
 @dataclass
 class Settings:
     # Database
@@ -112,6 +135,15 @@ class Settings:
     # Database SSL
     database_ssl: str = "disable"  # disable | require | verify-full
 
+    # Database pool sizing (see DB_POOL_ROLE_SIZES) and the optional read replica
+    database_pool_role: str = "api"
+    database_pool_min_size: int = 2
+    database_pool_max_size: int = 10
+    database_pool_acquire_timeout: Optional[float] = None  # seconds; None waits
+    database_read_url: Optional[str] = None
+    database_read_pool_max_size: int = 10
+    database_read_pool_acquire_timeout: float = 2.0  # seconds before a read falls back to the primary
+
     # S3 Storage
     s3_bucket: Optional[str] = None
     s3_private_bucket: Optional[str] = None  # Shared private bucket for sensitive docs
@@ -331,10 +363,22 @@ def load_settings() -> Settings:
     database_url_clean = database_url.strip().strip('"')
     database_ssl = os.getenv("DATABASE_SSL", "disable")
     _warn_if_db_unencrypted(database_url_clean, database_ssl)
+    database_read_url = os.getenv("DATABASE_READ_URL", "").strip().strip('"') or None
+    if database_read_url:
+        _warn_if_db_unencrypted(database_read_url, database_ssl)
+    pool_role, pool_min_size, pool_max_size = _db_pool_sizes()
+    acquire_timeout = os.getenv("DATABASE_POOL_ACQUIRE_TIMEOUT", "").strip()
 
     _settings = Settings(
         database_url=database_url_clean,
         database_ssl=database_ssl,
+        database_pool_role=pool_role,
+        database_pool_min_size=pool_min_size,
+        database_pool_max_size=pool_max_size,
+        database_pool_acquire_timeout=float(acquire_timeout) if acquire_timeout else None,
+        database_read_url=database_read_url,
+        database_read_pool_max_size=int(os.getenv("DATABASE_READ_POOL_MAX_SIZE", str(pool_max_size))),
+        database_read_pool_acquire_timeout=float(os.getenv("DATABASE_READ_POOL_ACQUIRE_TIMEOUT", "2")),
         gemini_api_key=api_key if api_key else None,
         use_vertex_ai=os.getenv("USE_VERTEX_AI", "").strip().lower() in ("1", "true", "yes"),
         vertex_ai_project=os.getenv("VERTEX_AI_PROJECT"),
@@ -8,7 +8,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from ..config import get_settings
-from ..database import get_connection, set_is_admin, set_user_id
+from ..database import get_connection, request_connection, set_is_admin, set_user_id
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
@@ -54,7 +54,11 @@ async def session_revoked(conn, user_id, token_iat: Optional[int]) -> bool:
 
 async def revoke_user_sessions(conn, user_id) -> None:
     """Invalidate all of a user's existing access + refresh tokens by advancing
-    the watermark. Best-effort no-op (logged) until authsess01 is applied."""
+    the watermark. Best-effort no-op (logged) until authsess01 is applied.
+    Also bumps the user's principal-cache version so cached auth for the old
+    tokens stops being served."""
+    from .services.principal_cache import bump_principal_version
+
     try:
         await conn.execute(
             "UPDATE users SET tokens_valid_after = NOW() WHERE id = $1", user_id
@@ -63,6 +67,17 @@ async def revoke_user_sessions(conn, user_id) -> None:
         logger.warning(
             "revoke_user_sessions: tokens_valid_after column missing — apply migration authsess01"
         )
+    await bump_principal_version(user_id)
+
+
+async def use_request_connection():
+    """FastAPI yield-dependency — opt a router into one pooled connection per
+    request (see database.pool.request_connection). List it FIRST in the
+    router's `dependencies=[...]` so the auth dependencies already run inside
+    the scope. Not for routes that make long external calls: the connection
+    is held from first use until the response."""
+    async with request_connection():
+        yield
 
 
 async def get_token_payload(
@@ -88,13 +103,46 @@ async def get_token_payload(
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
-    """Dependency to get the current authenticated user."""
+    """Dependency to get the current authenticated user.
+
+    Served from the principal cache (keyed by user + token iat, see
+    services/principal_cache) when nothing about the user has changed since
+    the last request; otherwise the full lookup below, then cached.
+    """
     from .models.auth import CurrentUser
+    from .services import principal_cache
 
     payload = await get_token_payload(credentials)
 
     user_id = UUID(payload.sub)
 
+    fields, version = await principal_cache.lookup_user(user_id, payload.iat)
+    if fields is None:
+        fields = await _load_principal(user_id, payload.iat)
+        await principal_cache.store_user(user_id, payload.iat, version, fields)
+
+    # Propagate identity to contextvars so get_connection() can set
+    # the corresponding PostgreSQL session variables for RLS.
+    set_user_id(fields["id"])
+    # RLS admin bypass is reserved for the single master admin — a stray
+    # role='admin' row gets no elevated DB access.
+    if fields["role"] == "admin" and _is_master_admin(fields["email"]):
+        set_is_admin(True)
+
+    return CurrentUser(
+        id=UUID(fields["id"]),
+        email=fields["email"],
+        role=fields["role"],
+        profile=None,  # Profile loaded on demand
+        beta_features=dict(fields["beta_features"]),
+        interview_prep_tokens=fields["interview_prep_tokens"],
+        allowed_interview_roles=list(fields["allowed_interview_roles"]),
+    )
+
+
+async def _load_principal(user_id: UUID, token_iat: Optional[int]) -> dict:
+    """The uncached half of get_current_user: every check that can reject the
+    token, then the CurrentUser fields as a JSON-safe dict."""
     async with get_connection() as conn:
         # Verify user exists and is active
         user_row = await conn.fetchrow(
@@ -134,40 +182,31 @@ async def get_current_user(
 
         # Session revocation: reject tokens issued before the user logged out or
         # changed their password.
-        if await session_revoked(conn, user_row["id"], payload.iat):
+        if await session_revoked(conn, user_row["id"], token_iat):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Session has been revoked. Please log in again.",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        beta_features = user_row["beta_features"] if user_row["beta_features"] else {}
-        if isinstance(beta_features, str):
-            import json
-            beta_features = json.loads(beta_features)
-
-        allowed_roles = user_row["allowed_interview_roles"] if user_row["allowed_interview_roles"] else []
-        if isinstance(allowed_roles, str):
-            import json
-            allowed_roles = json.loads(allowed_roles)
-
-        # Propagate identity to contextvars so get_connection() can set
-        # the corresponding PostgreSQL session variables for RLS.
-        set_user_id(str(user_row["id"]))
-        # RLS admin bypass is reserved for the single master admin — a stray
-        # role='admin' row gets no elevated DB access.
-        if user_row["role"] == "admin" and _is_master_admin(user_row["email"]):
-            set_is_admin(True)
-
-        return CurrentUser(
-            id=user_row["id"],
-            email=user_row["email"],
-            role=user_row["role"],
-            profile=None,  # Profile loaded on demand
-            beta_features=beta_features,
-            interview_prep_tokens=user_row["interview_prep_tokens"],
-            allowed_interview_roles=allowed_roles
-        )
+    beta_features = user_row["beta_features"] if user_row["beta_features"] else {}
+    if isinstance(beta_features, str):
+        import json
+        beta_features = json.loads(beta_features)
+
+    allowed_roles = user_row["allowed_interview_roles"] if user_row["allowed_interview_roles"] else []
+    if isinstance(allowed_roles, str):
+        import json
+        allowed_roles = json.loads(allowed_roles)
+
+    return {
+        "id": str(user_row["id"]),
+        "email": user_row["email"],
+        "role": user_row["role"],
+        "beta_features": beta_features,
+        "interview_prep_tokens": user_row["interview_prep_tokens"],
+        "allowed_interview_roles": allowed_roles,
+    }
 
 
 def require_roles(*roles):
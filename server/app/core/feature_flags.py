@@ -663,8 +663,24 @@ async def get_company_features(company_id: UUID, *, conn=None) -> dict:
     pooled connection while the caller's is still checked out; N concurrent
     requests then each hold one and block on the other, and the pool deadlocks
     until timeout. Same reason `compliance_status._conn_or_new` exists.
+
+    API workers answer from the per-process feature cache when they can
+    (services/company_feature_cache); an unknown company merges to defaults.
     """
+    features = await fetch_company_features(company_id, conn=conn)
+    return features if features is not None else merge_company_features(None, None)
+
+
+async def fetch_company_features(company_id: UUID, *, conn=None) -> dict | None:
+    """`get_company_features`, but None when the company row doesn't exist —
+    for the gates that answer a missing company with 404 rather than defaults.
+    Same `conn` advice applies."""
     from ..database import get_connection
+    from .services import company_feature_cache
+
+    cached, epoch = company_feature_cache.get_cached(company_id)
+    if cached is not None:
+        return cached
 
     sql = "SELECT enabled_features, signup_source FROM companies WHERE id = $1"
     if conn is not None:
@@ -672,10 +688,14 @@ async def get_company_features(company_id: UUID, *, conn=None) -> dict:
     else:
         async with get_connection() as own:
             company_row = await own.fetchrow(sql, company_id)
-    return merge_company_features(
-        company_row["enabled_features"] if company_row else None,
-        company_row["signup_source"] if company_row else None,
+    if company_row is None:
+        return None
+    features = merge_company_features(
+        company_row["enabled_features"],
+        company_row["signup_source"],
     )
+    company_feature_cache.put_cached(company_id, features, epoch)
+    return features
 
 
 # ── Beta gating ──────────────────────────────────────────────────────────────
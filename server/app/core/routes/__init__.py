@@ -62,6 +62,7 @@ from .billing import (
     products_public_router,
 )
 from ...matcha.dependencies import require_feature, require_any_feature
+from ..dependencies import use_request_connection
 from ..feature_flags import COMPLIANCE_READ_FEATURES, COMPLIANCE_SHARED_FEATURES
 
 # Create main core router
@@ -96,12 +97,18 @@ core_router.include_router(
     compliance_lite_router,
     prefix="/compliance",
     tags=["compliance-lite"],
-    dependencies=[Depends(require_any_feature(*COMPLIANCE_READ_FEATURES))],
+    dependencies=[
+        Depends(use_request_connection),
+        Depends(require_any_feature(*COMPLIANCE_READ_FEATURES)),
+    ],
 )
 # Read-only viewers (requirements, jurisdiction-stack, summary, upcoming-legislation,
 # categories) — admit full `compliance` (Pro) OR `compliance_lite` (Matcha-X taste).
+# Both read-only surfaces share one pooled connection per request across auth,
+# feature gating and the handler (use_request_connection).
 core_router.include_router(compliance_shared_router, prefix="/compliance", tags=["compliance-shared"],
-                           dependencies=[Depends(require_any_feature(*COMPLIANCE_SHARED_FEATURES))])
+                           dependencies=[Depends(use_request_connection),
+                                         Depends(require_any_feature(*COMPLIANCE_SHARED_FEATURES))])
 core_router.include_router(compliance_router, prefix="/compliance", tags=["compliance"],
                            dependencies=[Depends(require_feature("compliance"))])
 core_router.include_router(bulk_import_router, prefix="/bulk", tags=["bulk-import"])
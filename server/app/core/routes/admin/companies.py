@@ -18,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 from app.database import get_connection
 from app.core.dependencies import require_admin
+from app.core.services.company_feature_cache import invalidate_company_features
+from app.core.services.principal_cache import bump_company_principals
 from app.core.services.credential_crypto import decrypt_credential_fields
 from app.core.services.scope_registry.codify import codified_sql
 from app.core.feature_flags import (
@@ -799,6 +801,7 @@ async def delete_company_admin(company_id: UUID):
         )
         if not row:
             raise HTTPException(status_code=404, detail="Company not found or already deleted")
+        await bump_company_principals(conn, company_id)
         from app.matcha.services.matcha_work.matcha_work_document import invalidate_company_profile_cache
         invalidate_company_profile_cache(company_id)
     return {"ok": True}
@@ -1099,6 +1102,7 @@ async def admin_change_tier(
             )
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="Company not found")
+    await invalidate_company_features(company_id)
     logger.info(
         "Admin changed tier: company=%s from=%s to=%s",
         company_id, current_tier, body.tier,
@@ -1204,6 +1208,8 @@ async def admin_soft_delete_company(company_id: UUID):
             "UPDATE companies SET deleted_at = NOW() WHERE id = $1 AND deleted_at IS NULL",
             company_id,
         )
+        if result != "UPDATE 0":
+            await bump_company_principals(conn, company_id)
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="Company not found or already deleted")
     return {"ok": True}
@@ -1217,6 +1223,8 @@ async def admin_restore_company(company_id: UUID):
             "UPDATE companies SET deleted_at = NULL WHERE id = $1 AND deleted_at IS NOT NULL",
             company_id,
         )
+        if result != "UPDATE 0":
+            await bump_company_principals(conn, company_id)
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="Company not deleted")
     return {"ok": True}
@@ -102,7 +102,7 @@ async def deal_flow_proposal(inp: DealInputs):
         html_str = render_proposal_html(inp, quotes)
 
     try:
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(
@@ -111,7 +111,7 @@ async def deal_flow_proposal(inp: DealInputs):
         )
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(html_str)),
+            render_pdf_async(html_str),
             timeout=60,
         )
     except asyncio.TimeoutError:
@@ -151,13 +151,13 @@ async def deal_flow_broker_proposal(inp: BrokerInputs):
 
     html_str = render_broker_proposal_html(inp, compute_broker_quote(inp))
     try:
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(status_code=501, detail="PDF generation not available — install weasyprint on the server.")
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(html_str)), timeout=60,
+            render_pdf_async(html_str), timeout=60,
         )
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="PDF render timed out.")
@@ -195,13 +195,13 @@ async def deal_flow_book_proposal(inp: BookInputs):
 
     html_str = render_book_proposal_html(inp, compute_book_quote(inp))
     try:
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(status_code=501, detail="PDF generation not available — install weasyprint on the server.")
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(html_str)), timeout=60,
+            render_pdf_async(html_str), timeout=60,
         )
     except asyncio.TimeoutError:
         raise HTTPException(status_code=504, detail="PDF render timed out.")
@@ -264,7 +264,7 @@ async def deal_flow_full_proposal(inp: FullDealInputs):
     html_str = render_full_proposal_html(inp, q)
 
     try:
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(
@@ -273,7 +273,7 @@ async def deal_flow_full_proposal(inp: FullDealInputs):
         )
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(html_str)),
+            render_pdf_async(html_str),
             timeout=90,
         )
     except asyncio.TimeoutError:
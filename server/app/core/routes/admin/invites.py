@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 from app.database import get_connection
 from app.core.dependencies import require_admin
+from app.core.services.principal_cache import bump_company_principals, bump_principal_version
 from app.core.services.credential_crypto import decrypt_credential_fields
 from app.core.services.scope_registry.codify import codified_sql
 from app.core.feature_flags import merge_company_features
@@ -264,6 +265,9 @@ async def update_business_registration(
                         detail="Business owner profile not found for this company",
                     )
 
+        if "owner_email" in payload:
+            await bump_principal_version(owner_id)
+
         row = await conn.fetchrow(
             """
             SELECT
@@ -355,6 +359,7 @@ async def approve_business_registration(
             """,
             current_user.id, company_id
         )
+        await bump_company_principals(conn, company_id)
 
         # Send approval email
         email_service = get_email_service()
@@ -414,6 +419,9 @@ async def reject_business_registration(
             """,
             request.reason.strip(), current_user.id, company_id
         )
+        # A cached scope skips the status check; without the bump the
+        # company's users keep access until their cache entries expire.
+        await bump_company_principals(conn, company_id)
 
         # Send rejection email
         email_service = get_email_service()
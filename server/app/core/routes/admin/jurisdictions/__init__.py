@@ -11,8 +11,8 @@ relative order.
 
 Redis cache-key note: writers and invalidators of the same admin cache keys
 (``admin_jurisdictions_list_key``, ``admin_jurisdiction_detail_key``,
-``admin_jurisdiction_policy_overview_key``, the ``admin:quality-audit:v2:``
-pattern) are split across files (e.g. cleanup.py/requirements.py invalidate
+``admin_jurisdiction_policy_overview_key``, the ``ADMIN_QUALITY_AUDIT_TAG``
+tag) are split across files (e.g. cleanup.py/requirements.py invalidate
 keys that crud_listing.py/overviews.py write). This is a pre-existing
 semantic coupling via ``app.core.services.redis_cache``, not a code
 dependency — no code moved to preserve it.
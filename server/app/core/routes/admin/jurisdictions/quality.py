@@ -42,8 +42,8 @@ from app.core.services.compliance_service import (
     admin_add_requirement_to_location,
 )
 from app.core.services.redis_cache import (
-    get_redis_cache, cache_get, cache_set, cache_delete, cache_delete_pattern,
-    admin_jurisdictions_list_key, admin_jurisdiction_detail_key,
+    get_redis_cache, cache_get, cache_set, cache_set_tagged, cache_delete, cache_delete_pattern,
+    ADMIN_QUALITY_AUDIT_TAG, admin_jurisdictions_list_key, admin_jurisdiction_detail_key,
     admin_jurisdiction_data_overview_key, admin_jurisdiction_policy_overview_key,
     admin_bookmarked_requirements_key,
 )
@@ -296,7 +296,7 @@ async def get_quality_audit(
         }
 
     if redis:
-        await cache_set(redis, cache_key, result, ttl=300)
+        await cache_set_tagged(redis, cache_key, result, ttl=300, tags=[ADMIN_QUALITY_AUDIT_TAG])
 
     return result
 
@@ -42,8 +42,8 @@ from app.core.services.compliance_service import (
     admin_add_requirement_to_location,
 )
 from app.core.services.redis_cache import (
-    get_redis_cache, cache_get, cache_set, cache_delete, cache_delete_pattern,
-    admin_jurisdictions_list_key, admin_jurisdiction_detail_key,
+    get_redis_cache, cache_get, cache_set, cache_delete, cache_delete_pattern, invalidate_tags,
+    ADMIN_QUALITY_AUDIT_TAG, admin_jurisdictions_list_key, admin_jurisdiction_detail_key,
     admin_jurisdiction_data_overview_key, admin_jurisdiction_policy_overview_key,
     admin_bookmarked_requirements_key,
 )
@@ -347,9 +347,10 @@ async def resolve_requirement_review(requirement_id: UUID):
         await cache_delete(redis, admin_jurisdiction_policy_overview_key(row["category"]))
         await cache_delete(redis, admin_jurisdiction_policy_overview_key(None))
         # The quality-audit surface (needs_review flag + verified/gemini counters)
-        # is cached per param-combo under a hashed key — drop the whole namespace so
-        # the just-resolved row doesn't read as still pending for up to the TTL.
-        await cache_delete_pattern(redis, "admin:quality-audit:v2:")
+        # is cached per param-combo under a hashed key — every variant is tagged,
+        # drop them all so the just-resolved row doesn't read as still pending
+        # for up to the TTL.
+        await invalidate_tags(redis, ADMIN_QUALITY_AUDIT_TAG)
 
     return {"id": str(row["id"]), "change_status": row["change_status"], "resolved": True}
 
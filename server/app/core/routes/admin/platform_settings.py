@@ -16,7 +16,7 @@ from pydantic import BaseModel, EmailStr, Field
 
 logger = logging.getLogger(__name__)
 
-from app.database import get_connection
+from app.database import get_connection, get_pool_stats
 from app.core.dependencies import require_admin
 from app.core.services.credential_crypto import decrypt_credential_fields
 from app.core.services.scope_registry.codify import codified_sql
@@ -306,6 +306,21 @@ async def trigger_scheduler(task_key: str):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown task key: {task_key}")
 
 
+@router.get("/runtime/db-pool", dependencies=[Depends(require_admin)])
+async def db_pool_stats():
+    """This process's DB pool(s): size, in-use, waiters, acquire-wait and hold histograms."""
+    settings = get_settings()
+    return {"role": settings.database_pool_role, **get_pool_stats()}
+
+
+@router.get("/runtime/turn-latency", dependencies=[Depends(require_admin)])
+async def turn_latency_stats():
+    """This process's matcha-work turns: p50/p95 time-to-first-token, stage timings, omitted context sources."""
+    from app.matcha.services.matcha_work.turn_timing import get_turn_latency_stats
+
+    return get_turn_latency_stats()
+
+
 @router.get("/schedulers/stats", dependencies=[Depends(require_admin)])
 async def scheduler_stats():
     """Aggregate stats and recent activity for schedulers."""
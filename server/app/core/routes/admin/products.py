@@ -38,6 +38,7 @@ from app.core.services.product_definitions import (
     validate_slug,
 )
 from app.core.feature_flags import BUILTIN_TIER_META, BUILTIN_TIER_SLUGS, builtin_tier_composition
+from app.core.services.company_feature_cache import invalidate_company_features
 from app.core.services.feature_beta import load_beta_features
 from app.core.services.feature_provenance import record_feature_changes
 
@@ -336,6 +337,8 @@ async def sync_product_tenants(
                     conn, company["id"], stored, target,
                     source="product_sync", actor_user_id=current_user.id,
                 )
+    if updated and not dry_run:
+        await invalidate_company_features(*updated)
     logger.info(
         "Admin synced product %s: %d updated, %d pending skipped (dry_run=%s)",
         product.slug, len(updated), skipped_pending, dry_run,
@@ -404,6 +407,7 @@ async def activate_product_tenant(
             conn, body.company_id, stored, target,
             source="product_sync", actor_user_id=current_user.id,
         )
+    await invalidate_company_features(body.company_id)
     logger.info(
         "Admin activated company %s on product %s", body.company_id, product.slug
     )
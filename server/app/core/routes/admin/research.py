@@ -16,7 +16,7 @@ from pydantic import BaseModel, EmailStr, Field
 
 logger = logging.getLogger(__name__)
 
-from app.database import get_connection
+from app.database import get_connection, get_read_connection
 from app.core.dependencies import require_admin
 from app.core.services.credential_crypto import decrypt_credential_fields
 from app.core.services.scope_registry.codify import codified_sql
@@ -708,7 +708,7 @@ async def get_pending_research():
     """
     from app.core.services import vertical_coverage
 
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         cat_rows = await conn.fetch(
             """
             SELECT jcr.id, jcr.city, jcr.state, jcr.county, jcr.status,
@@ -849,7 +849,7 @@ async def get_pending_research():
 @router.get("/research-queue", dependencies=[Depends(require_admin)])
 async def get_research_queue():
     """List city-level jurisdictions with research status."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         rows = await conn.fetch("""
             SELECT
                 j.id AS jurisdiction_id,
@@ -1091,7 +1091,7 @@ async def get_research_review():
     """
     from app.core.services import vertical_coverage
 
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         rows = await conn.fetch(
             """
             SELECT r.id, r.jurisdiction_id, r.category, r.title, r.description,
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 from app.database import get_connection
 from app.core.dependencies import require_admin
+from app.core.services.principal_cache import bump_principal_version
 from app.core.services.credential_crypto import decrypt_credential_fields
 from app.core.services.scope_registry.codify import codified_sql
 from app.core.feature_flags import merge_company_features
@@ -213,6 +214,7 @@ async def patch_user_beta_flags(
     # the grant (or revocation) takes effect on the user's next request.
     from app.matcha.services.billing import entitlements_service
     entitlements_service.invalidate_plan_cache(user_id)
+    await bump_principal_version(user_id)
 
     return {"beta_features": dict(row["beta_features"])}
 
@@ -227,6 +229,7 @@ async def admin_suspend_user(user_id: UUID, body: SuspendBody = Body(default=Sus
         )
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="User not found")
+    await bump_principal_version(user_id)
     logger.info("Admin suspended user %s reason=%s", user_id, body.reason or "—")
     return {"ok": True}
 
@@ -240,6 +243,7 @@ async def admin_unsuspend_user(user_id: UUID):
         )
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="User not found")
+    await bump_principal_version(user_id)
     return {"ok": True}
 
 
@@ -280,4 +284,5 @@ async def admin_soft_delete_user(user_id: UUID):
         )
     if result == "UPDATE 0":
         raise HTTPException(status_code=404, detail="User not found")
+    await bump_principal_version(user_id)
     return {"ok": True}
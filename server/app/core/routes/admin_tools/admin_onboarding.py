@@ -1628,7 +1628,7 @@ async def get_session_report_pdf(
 
     full_html = _dossier_to_html(dossier)
     try:
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(
@@ -1637,7 +1637,7 @@ async def get_session_report_pdf(
         )
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(full_html)),
+            render_pdf_async(full_html),
             timeout=60,
         )
     except asyncio.TimeoutError:
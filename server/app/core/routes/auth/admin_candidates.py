@@ -45,6 +45,7 @@ from app.core.feature_flags import (
 )
 from app.core.services.platform_settings import get_visible_features
 from app.core.services.redis_cache import check_rate_limit, client_ip
+from app.core.services.principal_cache import bump_principal_version
 from app.config import get_settings
 
 
@@ -136,6 +137,7 @@ async def toggle_candidate_beta(user_id: UUID, request: BetaToggleRequest):
             "UPDATE users SET beta_features = $1::jsonb WHERE id = $2",
             json.dumps(current_features), user_id
         )
+        await bump_principal_version(user_id)
 
         return {"status": "updated", "beta_features": current_features}
 
@@ -163,6 +165,7 @@ async def award_tokens(user_id: UUID, request: TokenAwardRequest):
             "UPDATE users SET interview_prep_tokens = $1 WHERE id = $2",
             new_total, user_id
         )
+        await bump_principal_version(user_id)
 
         return {"status": "awarded", "new_total": new_total}
 
@@ -186,6 +189,7 @@ async def update_allowed_roles(user_id: UUID, request: AllowedRolesRequest):
             "UPDATE users SET allowed_interview_roles = $1::jsonb WHERE id = $2",
             json.dumps(request.roles), user_id
         )
+        await bump_principal_version(user_id)
 
         return {"status": "updated", "allowed_interview_roles": request.roles}
 
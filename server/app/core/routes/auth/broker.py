@@ -44,6 +44,7 @@ from app.core.feature_flags import (
     merge_company_features,
 )
 from app.core.services.platform_settings import get_visible_features
+from app.core.services.principal_cache import bump_company_principals
 from app.core.services.redis_cache import check_rate_limit, client_ip
 from app.config import get_settings
 
@@ -291,6 +292,7 @@ async def accept_broker_client_invite(token: str, request: BrokerClientInviteAcc
                 user["id"],
                 invite["company_id"],
             )
+            await bump_company_principals(conn, invite["company_id"])
 
             await conn.execute(
                 """
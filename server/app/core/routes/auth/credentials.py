@@ -45,6 +45,7 @@ from app.core.feature_flags import (
 )
 from app.core.services.platform_settings import get_visible_features
 from app.core.services.redis_cache import check_rate_limit, client_ip
+from app.core.services.principal_cache import bump_principal_version
 from app.config import get_settings
 
 
@@ -141,6 +142,7 @@ async def change_email(
             "UPDATE users SET email = $1 WHERE id = $2",
             request.new_email, current_user.id
         )
+        await bump_principal_version(current_user.id)
 
         # Also update email in role-specific table if applicable
         if current_user.role == "candidate":
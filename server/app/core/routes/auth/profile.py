@@ -47,6 +47,7 @@ from app.core.routes.admin._shared import is_test_column_exists
 from app.core.services.feature_beta import load_beta_features
 from app.core.services.platform_settings import get_visible_features
 from app.core.services.redis_cache import check_rate_limit, client_ip
+from app.core.services.principal_cache import bump_principal_version
 from app.config import get_settings
 from app.matcha.services.matcha_work.work_permissions import (
     WorkCapability,
@@ -548,6 +549,7 @@ async def mark_work_onboarded(current_user: CurrentUser = Depends(get_current_us
             """,
             current_user.id,
         )
+    await bump_principal_version(current_user.id)
     return {"ok": True}
 
 
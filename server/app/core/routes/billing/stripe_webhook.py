@@ -8,6 +8,7 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Request, status
 
 from app.core.services.stripe_service import StripeService, StripeServiceError
+from app.core.services.company_feature_cache import invalidate_company_features
 from app.core.services.product_definitions import product_for_pack_id
 from app.core.services.stripe_events import (
     CONSUMER_CORE,
@@ -204,6 +205,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                             _json.dumps(features),
                             company_id,
                         )
+                        await invalidate_company_features(company_id)
                     logger.info(
                         "IR upgrade fulfilled: company=%s sub=%s",
                         company_id_str, stripe_sub_id,
@@ -260,6 +262,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                             _json.dumps(features),
                             company_id,
                         )
+                        await invalidate_company_features(company_id)
                         # Pull the owner's email + display name for the
                         # activation email below. Falls back to the email
                         # if the client.name is null.
@@ -349,6 +352,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                             "UPDATE companies SET enabled_features = $1::jsonb WHERE id = $2",
                             _json.dumps(features), company_id,
                         )
+                        await invalidate_company_features(company_id)
                     if stripe_sub_id:
                         await billing_service.upsert_subscription(
                             company_id=company_id,
@@ -407,6 +411,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                             _json.dumps(features),
                             company_id,
                         )
+                        await invalidate_company_features(company_id)
                     if stripe_sub_id:
                         await billing_service.upsert_subscription(
                             company_id=company_id,
@@ -535,6 +540,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                             "UPDATE companies SET enabled_features = $1::jsonb WHERE id = $2",
                             _json.dumps(_target), company_id,
                         )
+                        await invalidate_company_features(company_id)
                         from app.core.services.feature_provenance import record_feature_changes as _record_feature_changes
                         await _record_feature_changes(
                             conn, company_id, stored, _target, source="stripe_webhook",
@@ -909,6 +915,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                                     "UPDATE companies SET enabled_features = $1::jsonb WHERE id = $2",
                                     _json.dumps(_pending(product)), sub["company_id"],
                                 )
+                                await invalidate_company_features(sub["company_id"])
                             logger.info("Product %s deactivated for company %s", _slug, sub["company_id"])
                         except Exception as exc:
                             logger.error(
@@ -961,6 +968,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                                     "UPDATE companies SET enabled_features = $1::jsonb WHERE id = $2",
                                     _json.dumps(features), sub["company_id"],
                                 )
+                                await invalidate_company_features(sub["company_id"])
                             logger.info("%s deactivated for company %s", _tier_label, sub["company_id"])
                         except Exception as exc:
                             logger.error("Failed to deactivate %s for %s: %s", _tier_label, sub["company_id"], exc)
@@ -1027,6 +1035,7 @@ async def _route_event(event_type: str, event_object: dict) -> dict:
                                     "UPDATE companies SET enabled_features = $1::jsonb WHERE id = $2",
                                     _json.dumps(features), sub["company_id"],
                                 )
+                                await invalidate_company_features(sub["company_id"])
                             logger.info(
                                 "Lite add-on %s deactivated for company %s",
                                 _addon.key, sub["company_id"],
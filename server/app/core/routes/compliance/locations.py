@@ -32,7 +32,7 @@ from app.core.services.compliance_service import (
     update_facility_attributes,
     update_location,
 )
-from app.core.services.redis_cache import check_rate_limit
+from app.core.services.redis_cache import check_rate_limit, invalidate_company_cache
 from app.database import get_connection
 from app.matcha.dependencies import require_admin_or_client
 
@@ -54,6 +54,7 @@ async def create_location_endpoint(
     await check_rate_limit(str(company_id), "compliance_create_location", 30, 3600)
 
     location, has_complete_repository_coverage = await create_location(company_id, data)
+    await invalidate_company_cache(company_id)
 
     # Trigger background research when repository coverage is missing/partial.
     # Live Gemini research only for tenants with the full `compliance` feature
@@ -302,6 +303,7 @@ async def update_location_endpoint(
     location = await update_location(loc_uuid, company_id, data)
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
+    await invalidate_company_cache(company_id)
 
     return {
         "id": str(location.id),
@@ -340,6 +342,7 @@ async def delete_location_endpoint(
     success = await delete_location(loc_uuid, company_id)
     if not success:
         raise HTTPException(status_code=404, detail="Location not found")
+    await invalidate_company_cache(company_id)
 
     return {"message": "Location deleted successfully"}
 
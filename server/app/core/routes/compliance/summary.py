@@ -16,6 +16,8 @@ from app.core.services.compliance_service import (
 from app.core.services.redis_cache import (
     cache_get,
     cache_set,
+    cached,
+    company_cache_tag,
     compliance_dashboard_key,
     get_redis_cache,
     jurisdictions_key,
@@ -322,15 +324,18 @@ async def get_compliance_dashboard_endpoint(
     if company_id is None:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    redis = get_redis_cache()
-    if redis:
-        cached = await cache_get(redis, compliance_dashboard_key(company_id, horizon_days))
-        if cached is not None:
-            return cached
+    return await _cached_compliance_dashboard(company_id, horizon_days)
 
-    result = await get_compliance_dashboard(company_id, horizon_days=horizon_days)
 
-    if redis:
-        await cache_set(redis, compliance_dashboard_key(company_id, horizon_days), result, ttl=180)
-
-    return result
+# Single-flight so a burst of misses (every client admin landing on the page
+# after a deploy) runs the dashboard query once; stale entries are served for
+# up to 2 more minutes while one request refreshes them. Tagged per company so
+# location changes drop it immediately (see locations.py).
+@cached(
+    compliance_dashboard_key,
+    ttl=180,
+    stale_ttl=120,
+    tags=lambda company_id, horizon_days: [company_cache_tag(company_id)],
+)
+async def _cached_compliance_dashboard(company_id, horizon_days: int):
+    return await get_compliance_dashboard(company_id, horizon_days=horizon_days)
@@ -14,7 +14,6 @@ Gating to authed callers prevents anonymous abuse — running an audit always
 requires a Free-tier signup at minimum.
 """
 
-import asyncio
 import html as html_lib
 import json
 import logging
@@ -523,8 +522,8 @@ async def export_handbook_audit_pdf(
 
     html = _build_audit_report_html(report)
     try:
-        from app.core.services.pdf import render_pdf
-        pdf_bytes = await asyncio.to_thread(lambda: render_pdf(html))
+        from app.core.services.pdf import render_pdf_async
+        pdf_bytes = await render_pdf_async(html)
     except Exception as exc:
         logger.exception("Handbook audit PDF render failed for report %s: %s", report_id, exc)
         raise HTTPException(status_code=500, detail="Could not generate the report PDF")
@@ -31,6 +31,7 @@ from app.core.models.handbook import (
     PublicHandbookResponse,
 )
 from app.core.services.handbook_service import GuidedDraftRateLimitError, HandbookService, derive_handbook_scopes_from_employees
+from app.core.services.pdf_render_pool import PdfRendererBusy
 from app.core.services.storage import get_storage
 from app.database import get_connection
 
@@ -93,12 +94,12 @@ async def upload_handbook_file(
         raise HTTPException(status_code=400, detail="No company found")
 
     storage = get_storage()
-    file_bytes = await file.read()
-    if not file_bytes:
+    if not file.size:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-    uploaded_url = await storage.upload_file(
-        file_bytes=file_bytes,
+    # Streamed from the spooled upload: handbook PDFs can run to tens of MB.
+    uploaded_url = await storage.upload_stream(
+        file.file,
         filename=file.filename or "handbook.pdf",
         prefix="handbooks",
         content_type=file.content_type,
@@ -616,6 +617,10 @@ async def download_handbook_pdf(
 
     try:
         pdf_bytes, filename = await HandbookService.generate_handbook_pdf_bytes(handbook_id, str(company_id))
+    except PdfRendererBusy as exc:
+        raise HTTPException(
+            status_code=503, detail="PDF renderer is busy — try again shortly", headers={"Retry-After": "5"},
+        ) from exc
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except ValueError as exc:
@@ -26,6 +26,11 @@ escape hatch: it overrides the label for every wrapped call issued inside the
 Use sparingly (each distinct label is a permanent row in "by feature"); the
 default stack-derived label is right for the other ~100 call sites.
 
+Rows are not inserted inline: `_record_async` / `_record` append them to the
+local spool in `ai_usage_spool.py`, which a background drainer bulk-COPYs into
+`ai_usage_log`. `_insert_row` remains the fallback when the spool is disabled
+(AI_USAGE_SPOOL=0) or the disk write fails.
+
 Set AI_USAGE_LOGGING=0 to disable (read once at import; the client is then
 returned unwrapped).
 """
@@ -40,6 +45,8 @@ from contextlib import contextmanager
 from contextvars import ContextVar
 from typing import Any, Iterator, Optional
 
+from . import ai_usage_spool
+
 logger = logging.getLogger(__name__)
 
 LOGGING_ENABLED = os.getenv("AI_USAGE_LOGGING", "1") != "0"
@@ -252,21 +259,19 @@ async def _insert_row(row: dict[str, Any], *, direct: bool = False) -> None:
 
 
 async def _record_async(row: dict[str, Any]) -> None:
-    """Await the insert directly. `_insert_row` never raises, so this never
-    raises either — safe to await unconditionally from any async call site.
-
-    NOT fire-and-forget: an earlier version did `loop.create_task(...)` here
-    to avoid adding insert latency to the calling coroutine, but every Celery
-    task body is `asyncio.run(_run())` (see app/workers/tasks/*.py — the
-    worker is deliberately pool-free, celery_app.py never calls init_pool()),
-    and asyncio.run() cancels any still-pending task the instant its own
-    coroutine returns. A scheduled Gemini call — compliance research,
-    legislation watch, the exact traffic this dashboard exists to show —
-    recorded ZERO rows every time, silently. Reproduced directly: a coroutine
-    shaped like a Celery task recorded 0/1 expected rows under the old
-    fire-and-forget path. One INSERT is a few ms; `rate_limiter.record_call`
-    already awaits inline on this same call path with no measurable effect on
-    Gemini latency (typically 100s of ms to several seconds)."""
+    """Spool the row, or await the insert directly when the spool can't take
+    it. Never raises — `_insert_row` doesn't either — so it is safe to await
+    unconditionally from any async call site.
+
+    NOT fire-and-forget on the fallback: an earlier version did
+    `loop.create_task(...)` here to avoid adding insert latency to the calling
+    coroutine, but a Celery task body that ends in `asyncio.run()` cancels any
+    still-pending task the instant its own coroutine returns. A scheduled
+    Gemini call — compliance research, legislation watch, the exact traffic
+    this dashboard exists to show — recorded ZERO rows every time, silently.
+    The spool sidesteps that entirely: the row is on disk before this returns."""
+    if ai_usage_spool.append(row):
+        return
     await _insert_row(row)
 
 
@@ -274,9 +279,13 @@ def _record(row: dict[str, Any]) -> None:
     """Sync-only dispatch, for the plain (non-async) `_scall` path. Real SDK
     sync calls in this codebase all run via `asyncio.to_thread(...)` (grep
     `to_thread` in matcha_work_ai.py/recruiting.py/dashboard.py etc.), i.e. off
-    the event-loop thread entirely, so `asyncio.get_running_loop()` reliably
-    raises RuntimeError here and the blocking `asyncio.run()` below only ever
-    blocks that worker thread, never the loop."""
+    the event-loop thread entirely. The spool append is a plain file write, so
+    the usual case needs no event loop and no connection at all; the branches
+    below are the insert fallback, where `asyncio.get_running_loop()` reliably
+    raises RuntimeError and the blocking `asyncio.run()` only ever blocks that
+    worker thread, never the loop."""
+    if ai_usage_spool.append(row):
+        return
     try:
         loop = asyncio.get_running_loop()
     except RuntimeError:
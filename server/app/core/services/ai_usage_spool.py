@@ -0,0 +1,365 @@
+"""Durable local spool for `ai_usage_log` rows — the write side of ai_usage.py.
+
+Recording a model call used to be a single-row INSERT awaited inline after
+every call: a pooled connection in the API, and on the sync `_record` path
+(a blocking SDK call inside `asyncio.to_thread`) or a Celery task with no
+pool, a brand-new raw connection per call. Instead, `append` writes one JSON
+line to a spool file on local disk (a few microseconds, no I/O on the
+network, no event loop needed) and `drain` moves whatever has accumulated
+into `ai_usage_log` with one COPY per batch.
+
+Rows are on disk the moment `append` returns, so they survive `asyncio.run()`
+teardown, a worker recycle (max-tasks-per-child) or a crash; whichever
+process drains next picks them up. Every process on a host shares one spool
+directory:
+
+* writers open `active.jsonl` with O_APPEND, take a SHARED flock, check the
+  path still names the inode they opened, write the line in one `write()`,
+  and close;
+* one drainer at a time (an EXCLUSIVE non-blocking flock on `drain.lock`)
+  renames `active.jsonl` to a `batch-*.jsonl`, waits for an EXCLUSIVE flock
+  on it (so in-flight writers finish), COPYs it and unlinks it. A writer that
+  lost the race to the rename sees the inode mismatch and retries against
+  the fresh `active.jsonl`.
+
+Delivery is at-least-once: a batch whose COPY committed but whose unlink did
+not (process killed in between) is copied again. While the database is
+unreachable every batch stays on disk for the next drain. A batch the database
+rejects (a bad row, schema drift) is retried MAX_BATCH_ATTEMPTS times, the
+count kept in its file name, then renamed to `*.bad` and left for a human;
+batches behind it keep draining either way.
+
+Drained by `start_spool_drainer` (FastAPI lifespan, every
+`DRAIN_INTERVAL_SECONDS`) and, on Celery workers, after tasks once the
+interval has passed, by a trailing one-shot timer `DRAIN_INTERVAL_SECONDS`
+after a task leaves rows behind (`schedule_trailing_drain`, so a worker that
+goes idle doesn't sit on its last burst), and at process shutdown
+(celery_app.py).
+
+AI_USAGE_SPOOL=0 disables the spool; `append` then reports False and
+ai_usage.py falls back to its inline INSERT. AI_USAGE_SPOOL_DIR overrides
+the directory (default: `<tempdir>/matcha-ai-usage`).
+"""
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SPOOL_ENABLED = os.getenv("AI_USAGE_SPOOL", "1") != "0"
+SPOOL_DIR = os.getenv("AI_USAGE_SPOOL_DIR") or os.path.join(tempfile.gettempdir(), "matcha-ai-usage")
+DRAIN_INTERVAL_SECONDS = 5.0
+# Rows per COPY. A batch file is split across several COPYs only when a
+# long outage let it grow past this.
+COPY_CHUNK_ROWS = 5_000
+
+# Rejections (not outages) before a batch is quarantined as `*.bad`.
+MAX_BATCH_ATTEMPTS = 5
+
+_ACTIVE = "active.jsonl"
+_DRAIN_LOCK = "drain.lock"
+_BATCH_PREFIX = "batch-"
+_BATCH_SUFFIX = ".jsonl"
+_BAD_SUFFIX = ".bad"
+
+COLUMNS = (
+    "provider", "model", "feature", "method", "input_tokens", "output_tokens",
+    "thinking_tokens", "cached_tokens", "cost_usd", "latency_ms", "status",
+    "error", "created_at",
+)
+
+_drain_task: Optional[asyncio.Task] = None
+_last_drain = 0.0
+_trailing_timer: Optional[threading.Timer] = None
+_trailing_lock = threading.Lock()
+
+
+def _path(name: str) -> str:
+    return os.path.join(SPOOL_DIR, name)
+
+
+def append(row: dict[str, Any]) -> bool:
+    """Spool one row. Sync, never raises; False means the caller must record
+    the row some other way (spool disabled or the disk write failed)."""
+    if not SPOOL_ENABLED:
+        return False
+    try:
+        line = (json.dumps(
+            {**row, "created_at": datetime.now(timezone.utc).isoformat()},
+            default=str,
+        ) + "\n").encode()
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        active = _path(_ACTIVE)
+        # Bounded: only a drainer rotating the file between our open and our
+        # lock forces another pass.
+        for _ in range(5):
+            fd = os.open(active, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+                try:
+                    current = os.stat(active)
+                except FileNotFoundError:
+                    continue
+                if current.st_ino != os.fstat(fd).st_ino:
+                    continue
+                os.write(fd, line)
+                return True
+            finally:
+                os.close(fd)
+        return False
+    except Exception:  # noqa: BLE001 — telemetry must never break a model call
+        logger.warning("ai_usage: spool append failed", exc_info=True)
+        return False
+
+
+def pending_bytes() -> int:
+    """Bytes waiting in the spool (active file + unfinished batches)."""
+    try:
+        names = os.listdir(SPOOL_DIR)
+    except FileNotFoundError:
+        return 0
+    total = 0
+    for name in names:
+        if name == _ACTIVE or _is_batch(name):
+            try:
+                total += os.path.getsize(_path(name))
+            except FileNotFoundError:
+                pass
+    return total
+
+
+def _is_batch(name: str) -> bool:
+    return name.startswith(_BATCH_PREFIX) and name.endswith(_BATCH_SUFFIX)
+
+
+def _attempts(name: str) -> int:
+    """Rejections so far, from `batch-<ns>-<pid>[.a<n>].jsonl`."""
+    stem = name[: -len(_BATCH_SUFFIX)]
+    _, dot, count = stem.rpartition(".a")
+    return int(count) if dot and count.isdigit() else 0
+
+
+def _db_unavailable(exc: BaseException) -> bool:
+    """True for "could not reach the database", as opposed to "rejected the rows"."""
+    import asyncpg
+
+    return isinstance(exc, (
+        OSError,
+        asyncio.TimeoutError,
+        asyncpg.PostgresConnectionError,
+        asyncpg.CannotConnectNowError,
+        asyncpg.InterfaceError,
+    ))
+
+
+def _reject(name: str) -> None:
+    """Count a rejection against a batch, quarantining it on the last one."""
+    attempts = _attempts(name) + 1
+    if attempts >= MAX_BATCH_ATTEMPTS:
+        os.rename(_path(name), _path(name + _BAD_SUFFIX))
+        logger.error("ai_usage: spool batch %s rejected %d times, quarantined", name, attempts)
+        return
+    stem = name[: -len(_BATCH_SUFFIX)]
+    if _attempts(name):
+        stem = stem.rpartition(".a")[0]
+    os.rename(_path(name), _path(f"{stem}.a{attempts}{_BATCH_SUFFIX}"))
+
+
+def _rotate() -> None:
+    active = _path(_ACTIVE)
+    try:
+        if os.path.getsize(active) == 0:
+            return
+    except FileNotFoundError:
+        return
+    os.rename(active, _path(f"{_BATCH_PREFIX}{time.time_ns()}-{os.getpid()}{_BATCH_SUFFIX}"))
+
+
+def _record(entry: dict[str, Any]) -> tuple:
+    cost = entry.get("cost_usd")
+    created_at = entry.get("created_at")
+    return (
+        entry.get("provider") or "gemini",
+        entry["model"],
+        entry["feature"],
+        entry["method"],
+        entry.get("input_tokens"),
+        entry.get("output_tokens"),
+        entry.get("thinking_tokens"),
+        entry.get("cached_tokens"),
+        Decimal(str(cost)) if cost is not None else None,
+        entry.get("latency_ms"),
+        entry.get("status") or "ok",
+        entry.get("error"),
+        datetime.fromisoformat(created_at) if created_at else datetime.now(timezone.utc),
+    )
+
+
+def _read_batch(path: str) -> list[tuple]:
+    records = []
+    with open(path, "rb") as fh:
+        for raw in fh:
+            try:
+                records.append(_record(json.loads(raw)))
+            except (ValueError, KeyError, TypeError):
+                # A torn line from a crash mid-write; the rest of the file is fine.
+                logger.warning("ai_usage: skipping malformed spool line in %s", path)
+    return records
+
+
+async def _lock_exclusive(fd: int) -> None:
+    # Writers hold their shared lock for one write(); poll instead of a
+    # blocking flock so the event loop is never parked on it.
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            await asyncio.sleep(0.005)
+
+
+async def _copy(records: list[tuple], *, direct: bool = False) -> None:
+    from ...database import connection_or_direct
+
+    async with connection_or_direct(force_direct=direct) as conn:
+        # One transaction per batch: a chunk that fails rolls back the ones
+        # before it, so the retry doesn't copy them twice.
+        async with conn.transaction():
+            for start in range(0, len(records), COPY_CHUNK_ROWS):
+                await conn.copy_records_to_table(
+                    "ai_usage_log",
+                    records=records[start:start + COPY_CHUNK_ROWS],
+                    columns=COLUMNS,
+                )
+
+
+async def drain(*, direct: bool = False) -> int:
+    """Move every spooled row into `ai_usage_log`. Returns rows written.
+
+    Never raises. Returns 0 immediately when another process on this host is
+    already draining. `direct` skips the connection pool, for a drain on a
+    loop other than the one the pool was created on (`_trailing_drain`).
+    """
+    global _last_drain
+    _last_drain = time.monotonic()
+    if not os.path.isdir(SPOOL_DIR):
+        return 0
+    written = 0
+    try:
+        lock_fd = os.open(_path(_DRAIN_LOCK), os.O_WRONLY | os.O_CREAT, 0o644)
+    except OSError:
+        logger.warning("ai_usage: cannot open spool drain lock", exc_info=True)
+        return 0
+    try:
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return 0
+        _rotate()
+        # Oldest first, including batches a crashed drainer left behind.
+        batches = sorted(n for n in os.listdir(SPOOL_DIR) if _is_batch(n))
+        for name in batches:
+            path = _path(name)
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                await _lock_exclusive(fd)
+                records = _read_batch(path)
+                if records:
+                    try:
+                        await _copy(records, direct=direct)
+                    except Exception as exc:  # noqa: BLE001
+                        if _db_unavailable(exc):
+                            raise
+                        logger.warning("ai_usage: spool batch %s rejected", name, exc_info=True)
+                        _reject(name)
+                        continue
+                os.unlink(path)
+                written += len(records)
+            finally:
+                os.close(fd)
+    except Exception:  # noqa: BLE001 — the batch stays on disk for the next drain
+        logger.warning("ai_usage: spool drain failed after %d rows", written, exc_info=True)
+    finally:
+        os.close(lock_fd)
+    return written
+
+
+async def drain_if_due() -> int:
+    """`drain` when the interval has passed and something is spooled — for
+    Celery workers, which have no background loop to run the drainer on."""
+    if time.monotonic() - _last_drain < DRAIN_INTERVAL_SECONDS or not pending_bytes():
+        return 0
+    return await drain()
+
+
+def schedule_trailing_drain() -> None:
+    """Arm a one-shot `drain` DRAIN_INTERVAL_SECONDS from now, unless one is
+    already armed — for Celery workers, whose only other drains run after a
+    task or at shutdown. Runs on a daemon thread with its own loop."""
+    global _trailing_timer
+    with _trailing_lock:
+        if _trailing_timer is not None:
+            return
+        _trailing_timer = threading.Timer(DRAIN_INTERVAL_SECONDS, _trailing_drain)
+        _trailing_timer.daemon = True
+        _trailing_timer.start()
+
+
+def cancel_trailing_drain() -> None:
+    global _trailing_timer
+    with _trailing_lock:
+        if _trailing_timer is not None:
+            _trailing_timer.cancel()
+            _trailing_timer = None
+
+
+def _trailing_drain() -> None:
+    global _trailing_timer
+    with _trailing_lock:
+        _trailing_timer = None
+    if pending_bytes():
+        asyncio.run(drain(direct=True))
+
+
+async def _drain_loop() -> None:
+    while True:
+        try:
+            await asyncio.sleep(DRAIN_INTERVAL_SECONDS)
+            await drain()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.warning("ai_usage: spool drain loop error", exc_info=True)
+
+
+def start_spool_drainer() -> None:
+    """Start the periodic drainer (per uvicorn worker; the drain lock keeps
+    them from overlapping)."""
+    global _drain_task
+    if _drain_task and not _drain_task.done():
+        return
+    _drain_task = asyncio.create_task(_drain_loop())
+
+
+async def stop_spool_drainer() -> None:
+    """Cancel the drainer and drain once more, best-effort. Anything left is
+    still on disk for the next process."""
+    global _drain_task
+    if _drain_task:
+        _drain_task.cancel()
+        try:
+            await _drain_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _drain_task = None
+    await drain()
@@ -5,6 +5,7 @@ import re
 from typing import Any, Optional
 from uuid import UUID
 
+import asyncpg
 from pydantic import ValidationError
 from pypdf import PdfReader
 
@@ -120,45 +121,21 @@ class BulkImporter:
     async def import_companies(
         self, rows: list[dict[str, Any]], conn
     ) -> BulkImportResult:
-        """Import companies from parsed data."""
-        success_count = 0
+        """Import companies from parsed data.
+
+        Every row is validated first; the valid ones are COPYed into a temp
+        staging table and merged in one transaction — names that already
+        exist are rejected with one join, the rest inserted with one
+        `INSERT ... SELECT`. If the merge hits a database error the batch is
+        replayed one row per transaction so the error lands on its row.
+        """
         errors = []
-        imported_ids = []
+        staged: list[tuple[int, str, Optional[str], Optional[str]]] = []
+        seen: set[str] = set()
 
         for i, row in enumerate(rows, start=1):
             try:
-                # Validate with Pydantic
                 company = CompanyBulkRow(**row)
-
-                # Check if company already exists
-                existing = await conn.fetchrow(
-                    "SELECT id FROM companies WHERE name = $1",
-                    company.name,
-                )
-                if existing:
-                    errors.append(
-                        BulkImportError(
-                            row=i,
-                            error=f"Company '{company.name}' already exists",
-                            data=row,
-                        )
-                    )
-                    continue
-
-                # Insert company
-                result = await conn.fetchrow(
-                    """
-                    INSERT INTO companies (name, industry, size)
-                    VALUES ($1, $2, $3)
-                    RETURNING id
-                    """,
-                    company.name,
-                    company.industry,
-                    company.size,
-                )
-                imported_ids.append(str(result["id"]))
-                success_count += 1
-
             except ValidationError as e:
                 errors.append(
                     BulkImportError(
@@ -167,20 +144,89 @@ class BulkImporter:
                         data=row,
                     )
                 )
+                continue
             except Exception as e:
+                errors.append(BulkImportError(row=i, error=str(e), data=row))
+                continue
+            if company.name in seen:
                 errors.append(
-                    BulkImportError(
-                        row=i,
-                        error=str(e),
-                        data=row,
-                    )
+                    BulkImportError(row=i, error=f"Company '{company.name}' already exists", data=row)
                 )
+                continue
+            seen.add(company.name)
+            staged.append((i, company.name, company.industry, company.size))
 
+        ids_by_row: dict[int, UUID] = {}
+        try:
+            async with conn.transaction():
+                existing, inserted = await self._merge_companies(conn, staged)
+        except asyncpg.PostgresError:
+            existing, inserted = [], {}
+            for record in staged:
+                try:
+                    async with conn.transaction():
+                        row_existing, row_inserted = await self._merge_companies(conn, [record])
+                except asyncpg.PostgresError as e:
+                    errors.append(BulkImportError(row=record[0], error=str(e), data=rows[record[0] - 1]))
+                    continue
+                existing += row_existing
+                inserted.update(row_inserted)
+
+        for row_num, name in existing:
+            errors.append(
+                BulkImportError(row=row_num, error=f"Company '{name}' already exists", data=rows[row_num - 1])
+            )
+        for row_num, name, _, _ in staged:
+            if name in inserted:
+                ids_by_row[row_num] = inserted[name]
+
+        errors.sort(key=lambda e: e.row)
         return BulkImportResult(
-            success_count=success_count,
+            success_count=len(ids_by_row),
             error_count=len(errors),
             errors=errors,
-            imported_ids=imported_ids,
+            imported_ids=[str(ids_by_row[row_num]) for row_num in sorted(ids_by_row)],
+        )
+
+    async def _merge_companies(
+        self, conn, staged: list[tuple[int, str, Optional[str], Optional[str]]]
+    ) -> tuple[list[tuple[int, str]], dict[str, UUID]]:
+        """Stage + merge; returns (rows whose name exists, name -> new id).
+        Must run inside a transaction (the stage table empties on commit)."""
+        if not staged:
+            return [], {}
+        await conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS _company_import_stage (
+                row_num INT, name TEXT, industry TEXT, size TEXT
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        await conn.copy_records_to_table(
+            "_company_import_stage",
+            records=staged,
+            columns=["row_num", "name", "industry", "size"],
+        )
+        existing = await conn.fetch(
+            """
+            DELETE FROM _company_import_stage s
+            USING companies c
+            WHERE c.name = s.name
+            RETURNING s.row_num, s.name
+            """
+        )
+        inserted = await conn.fetch(
+            """
+            INSERT INTO companies (name, industry, size)
+            SELECT name, industry, size
+            FROM _company_import_stage
+            ORDER BY row_num
+            RETURNING id, name
+            """
+        )
+        return (
+            [(r["row_num"], r["name"]) for r in existing],
+            {r["name"]: r["id"] for r in inserted},
         )
 
     async def import_positions(
@@ -0,0 +1,207 @@
+"""Process-local cache of merged company feature flags.
+
+`get_company_features` and the `require_feature` family read a company's
+`enabled_features` + `signup_source` and merge defaults on every call —
+one DB round trip on nearly every feature-gated request, channel WS event
+and matcha-work turn. The merged dict changes only when an admin, the
+provisioning paths or a Stripe webhook writes the row, so each API worker
+keeps it for `FEATURE_CACHE_TTL_SECONDS` and drops it early when
+`invalidate_company_features` broadcasts on `company_features:invalidate`.
+
+The cache is live only while this process's invalidation subscriber is
+actually subscribed (it is started from the FastAPI lifespan). Celery
+workers and scripts never start it, and a worker waiting on Redis or
+reconnecting is not listening, so all of them read the row every time —
+they would otherwise never hear about a change. The TTL bounds staleness if
+a broadcast is missed.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+FEATURE_CACHE_TTL_SECONDS = 60.0
+FEATURE_CACHE_MAX_COMPANIES = 10_000
+INVALIDATE_CHANNEL = "company_features:invalidate"
+
+
+class CompanyFeatureCache:
+    """Bounded TTL map of company_id -> merged feature dict, with counters."""
+
+    def __init__(self, ttl: float = FEATURE_CACHE_TTL_SECONDS, max_size: int = FEATURE_CACHE_MAX_COMPANIES):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple[float, dict[str, bool]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        # Bumped by every drop/clear. A reader that started before an
+        # invalidation must not cache what it loaded (see `put`).
+        self.epoch = 0
+
+    def get(self, company_id: UUID | str) -> Optional[dict[str, bool]]:
+        key = str(company_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            # Callers are free to mutate what they get back.
+            return dict(entry[1])
+
+    def put(self, company_id: UUID | str, features: dict[str, bool], epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            self._entries[str(company_id)] = (time.monotonic() + self.ttl, dict(features))
+            self._entries.move_to_end(str(company_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def drop(self, *company_ids: UUID | str) -> None:
+        with self._lock:
+            self.epoch += 1
+            for company_id in company_ids:
+                if self._entries.pop(str(company_id), None) is not None:
+                    self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache = CompanyFeatureCache()
+_subscriber_task: Optional[asyncio.Task] = None
+# True only between a successful SUBSCRIBE and the subscription ending.
+_subscribed = False
+
+
+def cache_enabled() -> bool:
+    return _subscribed
+
+
+def get_cached(company_id: UUID | str) -> tuple[Optional[dict[str, bool]], int]:
+    """(cached features or None, epoch to hand back to `put_cached` on a miss)."""
+    if not cache_enabled():
+        return None, -1
+    return _cache.get(company_id), _cache.epoch
+
+
+def put_cached(company_id: UUID | str, features: dict[str, bool], epoch: int) -> None:
+    if cache_enabled():
+        _cache.put(company_id, features, epoch)
+
+
+def get_feature_cache_stats() -> dict:
+    """Hit/miss/invalidation counters and size of this worker's feature cache."""
+    return {**_cache.snapshot(), "enabled": cache_enabled()}
+
+
+async def invalidate_company_features(*company_ids: UUID | str) -> None:
+    """Drop cached features for these companies on every API worker.
+
+    Call after the write commits. Never raises — a missed broadcast costs at
+    most `FEATURE_CACHE_TTL_SECONDS` of staleness, not the caller's write.
+    """
+    ids = [str(c) for c in company_ids if c is not None]
+    if not ids:
+        return
+    _cache.drop(*ids)
+    from .redis_cache import get_redis_cache
+
+    redis = get_redis_cache()
+    if redis is None:
+        return
+    try:
+        await redis.publish(INVALIDATE_CHANNEL, json.dumps(ids))
+    except Exception:
+        logger.warning("[FeatureCache] Invalidation publish failed for %s", ids, exc_info=True)
+
+
+def _mark_unsubscribed() -> None:
+    global _subscribed
+    if _subscribed:
+        _subscribed = False
+        # Broadcasts sent while we are away are lost — start clean.
+        _cache.clear()
+
+
+async def _subscriber_loop() -> None:
+    """Per-worker: apply other workers' invalidations. Self-healing on errors,
+    exits on cancellation (same shape as the WS fanout loops)."""
+    global _subscribed
+    from .redis_cache import get_redis_cache
+
+    while True:
+        pubsub = None
+        try:
+            redis = get_redis_cache()
+            if redis is None:
+                await asyncio.sleep(5)
+                continue
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+            _subscribed = True
+            async for raw in pubsub.listen():
+                if raw is None or raw.get("type") != "message":
+                    continue
+                try:
+                    ids = json.loads(raw.get("data") or "[]")
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(ids, list):
+                    _cache.drop(*ids)
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            _mark_unsubscribed()
+            logger.exception("[FeatureCache] Subscriber loop error; restarting in 2s")
+            await asyncio.sleep(2)
+        finally:
+            _mark_unsubscribed()
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(INVALIDATE_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def start_feature_invalidation_subscriber() -> None:
+    """Start the per-worker subscriber (and with it, the cache). Idempotent."""
+    global _subscriber_task
+    if _subscriber_task and not _subscriber_task.done():
+        return
+    _subscriber_task = asyncio.create_task(_subscriber_loop())
+
+
+async def stop_feature_invalidation_subscriber() -> None:
+    global _subscriber_task
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        try:
+            await _subscriber_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _subscriber_task = None
+    _cache.clear()
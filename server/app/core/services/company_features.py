@@ -13,6 +13,7 @@ from app.core.feature_flags import (
     feature_dependency_violations,
     merge_company_features,
 )
+from app.core.services.company_feature_cache import invalidate_company_features
 from app.core.services.feature_beta import load_beta_features
 from app.core.services.feature_provenance import record_feature_changes
 
@@ -141,6 +142,7 @@ async def update_company_features(
             source=source,
             actor_user_id=actor_user_id,
         )
+    await invalidate_company_features(company_id)
 
     return CompanyFeatureUpdateResult(
         stored_features={key: bool(value) for key, value in stored.items()},
@@ -2,6 +2,11 @@
 
 Indexes jurisdiction_requirements into compliance_embeddings for RAG Q&A.
 One embedding per requirement (no chunking — each is a self-contained fact).
+
+Vectors come through `embedding_cache.embed_documents_cached`, so a requirement
+whose composed text is unchanged since the last run costs no Gemini call, and
+rows are written with one COPY into a staging table plus a single merge rather
+than an upsert per row.
 """
 
 import json
@@ -11,6 +16,7 @@ from uuid import UUID
 
 import asyncpg
 
+from .embedding_cache import DEFAULT_CONCURRENCY, content_hash, embed_documents_cached
 from .embedding_service import EmbeddingService
 from ...config import get_settings
 
@@ -66,10 +72,135 @@ def compose_embedding_text(req: dict) -> str:
     return ". ".join(parts)
 
 
+def _requirement_metadata(row) -> dict:
+    metadata = {
+        "title": row["title"],
+        "source_url": row["source_url"],
+        "source_name": row["source_name"],
+    }
+    if row.get("statute_citation"):
+        metadata["statute_citation"] = row["statute_citation"]
+    if row.get("effective_date"):
+        metadata["effective_date"] = row["effective_date"].isoformat()
+    return metadata
+
+
+async def _index_requirements(
+    conn: asyncpg.Connection,
+    rows: list,
+    *,
+    batch_size: int,
+    concurrency: int,
+    touch_unchanged: bool = False,
+) -> int:
+    """Embed (cache-first) and bulk-merge `rows` into compliance_embeddings.
+
+    Rows whose stored content_hash, category, industries and metadata already
+    match are left untouched by the merge's WHERE clause, so an unchanged
+    catalog costs one COPY and no row rewrites. `touch_unchanged` still bumps
+    their `updated_at` — `embed_updated_requirements` selects on
+    `jr.updated_at > ce.updated_at`, and a requirement edited in a field the
+    embedding doesn't use would otherwise be re-selected on every run.
+    """
+    embedding_service = _get_embedding_service()
+    total = 0
+    # Chunk the merge so progress is visible on full-catalog runs and a failure
+    # late in the run keeps everything merged before it.
+    chunk = max(batch_size, 1) * max(concurrency, 1)
+    for i in range(0, len(rows), chunk):
+        part = rows[i : i + chunk]
+        texts = [compose_embedding_text(dict(r)) for r in part]
+        embeddings = await embed_documents_cached(
+            conn, embedding_service, texts,
+            task_type=EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
+            batch_size=batch_size, concurrency=concurrency,
+            label="compliance requirements",
+        )
+        records = [
+            (
+                row["id"],
+                row["jurisdiction_id"],
+                text,
+                content_hash(text),
+                embedding,
+                row["category"],
+                row["jurisdiction_level"],
+                row["jurisdiction_name"],
+                row.get("applicable_industries") or [],
+                json.dumps(_requirement_metadata(row)),
+            )
+            for row, text, embedding in zip(part, texts, embeddings)
+        ]
+        async with conn.transaction():
+            await conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS _compliance_embeddings_stage (
+                    requirement_id UUID, jurisdiction_id UUID, content TEXT,
+                    content_hash TEXT, embedding REAL[], category TEXT,
+                    jurisdiction_level TEXT, jurisdiction_name TEXT,
+                    applicable_industries TEXT[], metadata TEXT
+                ) ON COMMIT DELETE ROWS
+                """
+            )
+            await conn.copy_records_to_table(
+                "_compliance_embeddings_stage",
+                records=records,
+                columns=[
+                    "requirement_id", "jurisdiction_id", "content", "content_hash",
+                    "embedding", "category", "jurisdiction_level", "jurisdiction_name",
+                    "applicable_industries", "metadata",
+                ],
+            )
+            await conn.execute(
+                """
+                INSERT INTO compliance_embeddings AS ce
+                    (requirement_id, jurisdiction_id, content, content_hash, embedding,
+                     category, jurisdiction_level, jurisdiction_name,
+                     applicable_industries, metadata)
+                SELECT requirement_id, jurisdiction_id, content, content_hash,
+                       embedding::vector, category, jurisdiction_level,
+                       jurisdiction_name, applicable_industries, metadata::jsonb
+                FROM _compliance_embeddings_stage
+                ON CONFLICT (requirement_id) DO UPDATE SET
+                    jurisdiction_id = EXCLUDED.jurisdiction_id,
+                    content = EXCLUDED.content,
+                    content_hash = EXCLUDED.content_hash,
+                    embedding = EXCLUDED.embedding,
+                    category = EXCLUDED.category,
+                    jurisdiction_level = EXCLUDED.jurisdiction_level,
+                    jurisdiction_name = EXCLUDED.jurisdiction_name,
+                    applicable_industries = EXCLUDED.applicable_industries,
+                    metadata = EXCLUDED.metadata,
+                    updated_at = NOW()
+                WHERE (ce.content_hash, ce.jurisdiction_id, ce.category,
+                       ce.jurisdiction_level, ce.jurisdiction_name,
+                       ce.applicable_industries, ce.metadata)
+                  IS DISTINCT FROM
+                      (EXCLUDED.content_hash, EXCLUDED.jurisdiction_id, EXCLUDED.category,
+                       EXCLUDED.jurisdiction_level, EXCLUDED.jurisdiction_name,
+                       EXCLUDED.applicable_industries, EXCLUDED.metadata)
+                """
+            )
+            if touch_unchanged:
+                # NOW() is the transaction start, so rows the merge just wrote
+                # (updated_at = NOW()) are excluded.
+                await conn.execute(
+                    """
+                    UPDATE compliance_embeddings ce SET updated_at = NOW()
+                    FROM _compliance_embeddings_stage s
+                    WHERE ce.requirement_id = s.requirement_id AND ce.updated_at < NOW()
+                    """
+                )
+        total += len(records)
+        print(f"[Embedding Pipeline] Indexed {min(i + chunk, len(rows))}/{len(rows)} requirements")
+    return total
+
+
 async def embed_requirements(
     conn: asyncpg.Connection,
     jurisdiction_id: Optional[UUID] = None,
     batch_size: int = 50,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> int:
     """Bulk embed jurisdiction_requirements and upsert into compliance_embeddings.
 
@@ -80,13 +211,13 @@ async def embed_requirements(
         If provided, only embed requirements for this jurisdiction.
     batch_size : int
         Number of requirements to embed per Gemini API call.
+    concurrency : int
+        Maximum Gemini embed calls in flight at once.
 
     Returns
     -------
-    int  Number of requirements embedded.
+    int  Number of requirements indexed (cache hits included).
     """
-    embedding_service = _get_embedding_service()
-
     where_clause = ""
     params = []
     if jurisdiction_id:
@@ -109,60 +240,7 @@ async def embed_requirements(
     if not rows:
         return 0
 
-    total = 0
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i : i + batch_size]
-        texts = [compose_embedding_text(dict(r)) for r in batch]
-
-        embeddings = await embedding_service.embed_batch(
-            texts, task_type=EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
-        )
-
-        for row, text, embedding in zip(batch, texts, embeddings):
-            metadata = {
-                "title": row["title"],
-                "source_url": row["source_url"],
-                "source_name": row["source_name"],
-            }
-            if row.get("statute_citation"):
-                metadata["statute_citation"] = row["statute_citation"]
-            if row.get("effective_date"):
-                metadata["effective_date"] = row["effective_date"].isoformat()
-
-            industries = row.get("applicable_industries") or []
-
-            await conn.execute(
-                """
-                INSERT INTO compliance_embeddings
-                    (requirement_id, jurisdiction_id, content, embedding,
-                     category, jurisdiction_level, jurisdiction_name,
-                     applicable_industries, metadata)
-                VALUES ($1, $2, $3, $4::vector, $5, $6, $7, $8, $9::jsonb)
-                ON CONFLICT (requirement_id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    category = EXCLUDED.category,
-                    jurisdiction_level = EXCLUDED.jurisdiction_level,
-                    jurisdiction_name = EXCLUDED.jurisdiction_name,
-                    applicable_industries = EXCLUDED.applicable_industries,
-                    metadata = EXCLUDED.metadata,
-                    updated_at = NOW()
-                """,
-                row["id"],
-                row["jurisdiction_id"],
-                text,
-                "[" + ",".join(str(x) for x in embedding) + "]",
-                row["category"],
-                row["jurisdiction_level"],
-                row["jurisdiction_name"],
-                industries,
-                json.dumps(metadata),
-            )
-            total += 1
-
-        print(f"[Embedding Pipeline] Embedded {min(i + batch_size, len(rows))}/{len(rows)} requirements")
-
-    return total
+    return await _index_requirements(conn, rows, batch_size=batch_size, concurrency=concurrency)
 
 
 async def embed_updated_requirements(
@@ -175,8 +253,6 @@ async def embed_updated_requirements(
     corresponding compliance_embeddings.updated_at, or that have no
     embedding yet.
     """
-    embedding_service = _get_embedding_service()
-
     where_clause = ""
     params = []
     if jurisdiction_id:
@@ -201,58 +277,9 @@ async def embed_updated_requirements(
     if not rows:
         return 0
 
-    total = 0
-    batch_size = 50
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i : i + batch_size]
-        texts = [compose_embedding_text(dict(r)) for r in batch]
-
-        embeddings = await embedding_service.embed_batch(
-            texts, task_type=EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
-        )
-
-        for row, text, embedding in zip(batch, texts, embeddings):
-            metadata = {
-                "title": row["title"],
-                "source_url": row["source_url"],
-                "source_name": row["source_name"],
-            }
-            if row.get("statute_citation"):
-                metadata["statute_citation"] = row["statute_citation"]
-            if row.get("effective_date"):
-                metadata["effective_date"] = row["effective_date"].isoformat()
-
-            industries = row.get("applicable_industries") or []
-
-            await conn.execute(
-                """
-                INSERT INTO compliance_embeddings
-                    (requirement_id, jurisdiction_id, content, embedding,
-                     category, jurisdiction_level, jurisdiction_name,
-                     applicable_industries, metadata)
-                VALUES ($1, $2, $3, $4::vector, $5, $6, $7, $8, $9::jsonb)
-                ON CONFLICT (requirement_id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    category = EXCLUDED.category,
-                    jurisdiction_level = EXCLUDED.jurisdiction_level,
-                    jurisdiction_name = EXCLUDED.jurisdiction_name,
-                    applicable_industries = EXCLUDED.applicable_industries,
-                    metadata = EXCLUDED.metadata,
-                    updated_at = NOW()
-                """,
-                row["id"],
-                row["jurisdiction_id"],
-                text,
-                "[" + ",".join(str(x) for x in embedding) + "]",
-                row["category"],
-                row["jurisdiction_level"],
-                row["jurisdiction_name"],
-                industries,
-                json.dumps(metadata),
-            )
-            total += 1
-
+    total = await _index_requirements(
+        conn, rows, batch_size=50, concurrency=DEFAULT_CONCURRENCY, touch_unchanged=True,
+    )
     if total > 0:
         print(f"[Embedding Pipeline] Updated {total} embeddings")
     return total
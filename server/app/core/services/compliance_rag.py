@@ -11,6 +11,7 @@ from uuid import UUID
 import asyncpg
 
 from .embedding_service import EmbeddingService
+from .vector_search import search_nearest
 
 
 class ComplianceRAGService:
@@ -64,27 +65,6 @@ class ComplianceRAGService:
             query, task_type=EmbeddingService.TASK_RETRIEVAL_QUERY,
         )
 
-        sql = """
-            SELECT
-                ce.requirement_id,
-                ce.content,
-                ce.category,
-                ce.jurisdiction_level,
-                ce.jurisdiction_name,
-                ce.metadata,
-                jr.title,
-                jr.current_value,
-                jr.numeric_value,
-                jr.description,
-                jr.source_url,
-                jr.source_name,
-                jr.effective_date,
-                jr.statute_citation,
-                1 - (ce.embedding <=> $1::vector) AS similarity
-            FROM compliance_embeddings ce
-            JOIN jurisdiction_requirements jr ON ce.requirement_id = jr.id
-            WHERE jr.status = 'active'
-        """
         # This is where the ask-answer's source chips come from, and it reads the
         # catalog rather than any location's projection — so the gate on
         # compliance_requirements never reaches it. Ungated, an answer would cite
@@ -92,50 +72,38 @@ class ComplianceRAGService:
         # would land on nothing.
         from .compliance_service import codified_gate_sql
 
-        sql += await codified_gate_sql("jr", conn=conn)
-
-        embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-        params: list = [embedding_str]
-        idx = 2
-
-        if jurisdiction_ids:
-            sql += f" AND ce.jurisdiction_id = ANY(${idx}::uuid[])"
-            params.append(jurisdiction_ids)
-            idx += 1
-
-        if categories:
-            sql += f" AND ce.category = ANY(${idx}::text[])"
-            params.append(categories)
-            idx += 1
-
-        if industry_tags:
-            # NULL *or empty* applicable_industries means the requirement is
-            # universal (untagged baseline / general labor law — minimum wage,
-            # overtime, etc. are stored as `{}`). Array overlap against NULL
-            # yields NULL, and `{} && $tags` is false, so both silently drop
-            # universal rows unless we let them through explicitly.
-            sql += (
-                f" AND (ce.applicable_industries IS NULL"
-                f" OR cardinality(ce.applicable_industries) = 0"
-                f" OR ce.applicable_industries && ${idx}::text[])"
-            )
-            params.append(industry_tags)
-            idx += 1
-
-        if statuses:
-            sql += f" AND jr.status = ANY(${idx}::requirement_status_enum[])"
-            params.append(statuses)
-            idx += 1
-
-        if min_similarity > 0:
-            sql += f" AND 1 - (ce.embedding <=> $1::vector) >= ${idx}"
-            params.append(min_similarity)
-            idx += 1
-
-        sql += f" ORDER BY ce.embedding <=> $1::vector LIMIT ${idx}"
-        params.append(top_k)
-
-        rows = await conn.fetch(sql, *params)
+        rows = await search_nearest(
+            conn,
+            query_embedding,
+            select="""
+                ce.requirement_id, ce.content, ce.category, ce.jurisdiction_level,
+                ce.jurisdiction_name, ce.metadata,
+                jr.title, jr.current_value, jr.numeric_value, jr.description,
+                jr.source_url, jr.source_name, jr.effective_date, jr.statute_citation
+            """,
+            from_="compliance_embeddings ce JOIN jurisdiction_requirements jr ON ce.requirement_id = jr.id",
+            embedding_column="ce.embedding",
+            where=["jr.status = 'active'"],
+            extra_where=await codified_gate_sql("jr", conn=conn),
+            filters=[
+                ("ce.jurisdiction_id = ANY({}::uuid[])", jurisdiction_ids),
+                ("ce.category = ANY({}::text[])", categories),
+                # NULL *or empty* applicable_industries means the requirement is
+                # universal (untagged baseline / general labor law — minimum wage,
+                # overtime, etc. are stored as `{}`). Array overlap against NULL
+                # yields NULL, and `{} && $tags` is false, so both silently drop
+                # universal rows unless we let them through explicitly.
+                (
+                    "(ce.applicable_industries IS NULL"
+                    " OR cardinality(ce.applicable_industries) = 0"
+                    " OR ce.applicable_industries && {}::text[])",
+                    industry_tags,
+                ),
+                ("jr.status = ANY({}::requirement_status_enum[])", statuses),
+            ],
+            top_k=top_k,
+            min_similarity=min_similarity,
+        )
 
         results = []
         for row in rows:
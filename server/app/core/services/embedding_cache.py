@@ -0,0 +1,143 @@
+"""Persistent content-hash → vector cache for document embeddings.
+
+Indexing pipelines re-embed whole catalogs, but most rows' embedding text does
+not change between runs. `embed_documents_cached` hashes each text, serves hits
+from the `embedding_cache` table, embeds only the misses (deduplicated, in
+concurrent batches behind a semaphore), and writes the new vectors back with a
+single COPY.
+
+Vectors travel as `real[]` (asyncpg's native float4 array codec) and are cast to
+`vector` in SQL, so nothing here builds "[0.1,0.2,...]" strings.
+"""
+
+import asyncio
+import hashlib
+from typing import Optional
+
+import asyncpg
+
+from .embedding_service import EmbeddingService
+
+# Concurrent Gemini embed requests per pipeline run. Each request carries a
+# whole batch, so a small number keeps throughput up without tripping quota.
+DEFAULT_CONCURRENCY = 4
+
+
+def content_hash(text: str) -> str:
+    """sha256 of the exact text that gets embedded."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def fetch_cached_embeddings(
+    conn: asyncpg.Connection,
+    hashes: list[str],
+    *,
+    model: str,
+    task_type: str,
+    dimension: int,
+) -> dict[str, list[float]]:
+    """hash -> vector for every hash already in `embedding_cache`."""
+    if not hashes:
+        return {}
+    rows = await conn.fetch(
+        """
+        SELECT content_hash, embedding::real[] AS embedding
+        FROM embedding_cache
+        WHERE model = $1 AND task_type = $2 AND dimension = $3
+          AND content_hash = ANY($4::text[])
+        """,
+        model, task_type, dimension, list(set(hashes)),
+    )
+    return {r["content_hash"]: list(r["embedding"]) for r in rows}
+
+
+async def store_cached_embeddings(
+    conn: asyncpg.Connection,
+    vectors: dict[str, list[float]],
+    *,
+    model: str,
+    task_type: str,
+    dimension: int,
+) -> None:
+    """COPY new hash -> vector pairs into a staging table and merge them into
+    `embedding_cache` (first writer wins; vectors for one hash are identical)."""
+    if not vectors:
+        return
+    async with conn.transaction():
+        await conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS _embedding_cache_stage (
+                content_hash TEXT, embedding REAL[]
+            ) ON COMMIT DELETE ROWS
+            """
+        )
+        await conn.copy_records_to_table(
+            "_embedding_cache_stage",
+            records=list(vectors.items()),
+            columns=["content_hash", "embedding"],
+        )
+        await conn.execute(
+            """
+            INSERT INTO embedding_cache (content_hash, model, task_type, dimension, embedding)
+            SELECT content_hash, $1, $2, $3, embedding::vector
+            FROM _embedding_cache_stage
+            ON CONFLICT DO NOTHING
+            """,
+            model, task_type, dimension,
+        )
+
+
+async def embed_documents_cached(
+    conn: asyncpg.Connection,
+    embedding_service: EmbeddingService,
+    texts: list[str],
+    *,
+    task_type: str = EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
+    batch_size: int = 50,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    label: Optional[str] = None,
+) -> list[list[float]]:
+    """Embed `texts`, reusing any vector already cached for identical text.
+
+    Returns one vector per input text, in order. Misses are deduplicated, split
+    into `batch_size` chunks and embedded with at most `concurrency` requests in
+    flight; every new vector is persisted before returning.
+    """
+    model = EmbeddingService.MODEL
+    dimension = EmbeddingService.EMBEDDING_DIMENSION
+    hashes = [content_hash(t) for t in texts]
+    vectors = await fetch_cached_embeddings(
+        conn, hashes, model=model, task_type=task_type, dimension=dimension,
+    )
+
+    missing: dict[str, str] = {}
+    for h, text in zip(hashes, texts):
+        if h not in vectors and h not in missing:
+            missing[h] = text
+
+    if missing:
+        items = list(missing.items())
+        batches = [items[i : i + batch_size] for i in range(0, len(items), batch_size)]
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _embed(batch: list[tuple[str, str]]) -> list[tuple[str, list[float]]]:
+            async with semaphore:
+                embeddings = await embedding_service.embed_batch(
+                    [t for _, t in batch], task_type=task_type, batch_size=batch_size,
+                )
+            return [(h, e) for (h, _), e in zip(batch, embeddings)]
+
+        fresh: dict[str, list[float]] = {}
+        for result in await asyncio.gather(*(_embed(b) for b in batches)):
+            fresh.update(result)
+        await store_cached_embeddings(
+            conn, fresh, model=model, task_type=task_type, dimension=dimension,
+        )
+        vectors.update(fresh)
+
+    if label:
+        print(
+            f"[Embedding Cache] {label}: {len(texts)} texts, "
+            f"{len(texts) - len(missing)} cached, {len(missing)} embedded"
+        )
+    return [vectors[h] for h in hashes]
@@ -2,13 +2,148 @@
 
 Generates vector embeddings using Gemini Embeddings API (text-embedding-004).
 Embeddings are 768-dimensional vectors used for semantic similarity search.
+
+Single-text embeds (the RAG query path) go through a two-tier cache: a
+size-bounded in-process LRU, then Redis when the app's cache client is up.
+Copilot users ask the same questions over and over; a hit skips a ~300ms
+Gemini round trip.
 """
 
+import array
+import base64
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from google import genai
 from app.core.services.genai_client import get_genai_client
 
+QUERY_CACHE_SIZE = int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "2048"))
+QUERY_CACHE_TTL = int(os.getenv("EMBEDDING_QUERY_CACHE_TTL", "3600"))
+QUERY_CACHE_REDIS_TTL = int(os.getenv("EMBEDDING_QUERY_CACHE_REDIS_TTL", "86400"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query_text(text: str) -> str:
+    """Collapse whitespace and case so near-identical questions share a key."""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def query_cache_key(model: str, task_type: str, dimension: int, text: str) -> str:
+    digest = hashlib.sha256(normalize_query_text(text).encode("utf-8")).hexdigest()
+    return f"emb:q:{model}:{task_type}:{dimension}:{digest}"
+
+
+class QueryEmbeddingCache:
+    """In-process LRU with per-entry TTL, backed by Redis when available.
+
+    The local tier is guarded by a lock because `embed_text_sync` runs on
+    worker threads. Redis values are base64 float32 (a 768-dim vector is ~4KB
+    instead of ~15KB of JSON). Redis errors are swallowed — the cache is an
+    optimisation, never a reason for a search to fail.
+    """
+
+    def __init__(self, max_size: int = QUERY_CACHE_SIZE, ttl: int = QUERY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+
+    def get_local(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, vector = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.stats["local_hits"] += 1
+            return vector
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def put_local(self, key: str, vector: list[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[list[float]]:
+        vector = self.get_local(key)
+        if vector is not None:
+            return vector
+        redis = _query_cache_redis()
+        if redis is not None:
+            try:
+                raw = await redis.get(key)
+            except Exception:
+                raw = None
+            if raw:
+                vector = array.array("f", base64.b64decode(raw)).tolist()
+                self.put_local(key, vector)
+                with self._lock:
+                    self.stats["redis_hits"] += 1
+                return vector
+        self.record_miss()
+        return None
+
+    async def put(self, key: str, vector: list[float]) -> None:
+        self.put_local(key, vector)
+        redis = _query_cache_redis()
+        if redis is None:
+            return
+        try:
+            packed = base64.b64encode(array.array("f", vector).tobytes()).decode("ascii")
+            await redis.set(key, packed, ex=QUERY_CACHE_REDIS_TTL)
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for k in self.stats:
+                self.stats[k] = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = sum(self.stats.values())
+            hits = self.stats["local_hits"] + self.stats["redis_hits"]
+            return {
+                **self.stats,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _query_cache_redis():
+    # The app's shared client; None in Celery workers and when Redis is not
+    # configured, which leaves the local tier only.
+    from app.core.services.redis_cache import get_redis_cache
+
+    return get_redis_cache()
+
+
+_query_cache = QueryEmbeddingCache()
+
+
+def get_query_cache_stats() -> dict:
+    """Hit/miss counters and size of the process-wide query-embedding cache."""
+    return _query_cache.snapshot()
+
 
 class EmbeddingService:
     """Generate embeddings using Gemini Embeddings API."""
@@ -53,12 +188,19 @@ class EmbeddingService:
         Returns:
             768-dimensional embedding vector.
         """
+        key = query_cache_key(self.MODEL, task_type, self.EMBEDDING_DIMENSION, text)
+        cached = await _query_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
         response = await self.client.aio.models.embed_content(
             model=self.MODEL,
             contents=text,
             config={"task_type": task_type, "output_dimensionality": self.EMBEDDING_DIMENSION},
         )
-        return list(response.embeddings[0].values)
+        vector = list(response.embeddings[0].values)
+        await _query_cache.put(key, vector)
+        return vector
 
     async def embed_batch(
         self,
@@ -107,12 +249,21 @@ class EmbeddingService:
         Returns:
             768-dimensional embedding vector.
         """
+        # Local tier only: there is no event loop here to talk to Redis on.
+        key = query_cache_key(self.MODEL, task_type, self.EMBEDDING_DIMENSION, text)
+        cached = _query_cache.get_local(key)
+        if cached is not None:
+            return list(cached)
+        _query_cache.record_miss()
+
         response = self.client.models.embed_content(
             model=self.MODEL,
             contents=text,
             config={"task_type": task_type, "output_dimensionality": self.EMBEDDING_DIMENSION},
         )
-        return list(response.embeddings[0].values)
+        vector = list(response.embeddings[0].values)
+        _query_cache.put_local(key, vector)
+        return vector
 
     def embed_batch_sync(
         self,
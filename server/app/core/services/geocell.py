@@ -0,0 +1,157 @@
+"""Geohash cells — the index behind radius search, with no PostGIS.
+
+Tell-Us Discover and Cappe's public directory both answer "what's within
+`radius_km` of this point". That used to be a lat/lng bounding box over a
+(lat, lng) btree, which can only range-scan on lat: every row in the whole
+latitude band was read and then checked on lng. In a dense metro that was
+thousands of candidate rows per query before the exact haversine even ran.
+
+`tellus_stores` and `cappe_locations` now carry a `geocell` column: the
+point's geohash at `GEOCELL_PRECISION`, stored with `COLLATE "C"` so the text
+order is the geohash's Z-order curve. The migration (geocell01) computes it
+with a `geohash_encode` SQL function as a STORED generated column, so every
+write path keeps it current without touching any INSERT/UPDATE.
+
+A radius query is turned into a handful of geohash prefixes that cover the
+circle's bounding box (`cover_cells`). Each prefix is one contiguous range of
+`geocell`, and adjacent prefixes are merged (`cover_ranges`), so the scan is
+a few tight btree ranges instead of a latitude band. The exact haversine
+still decides membership; the cells only bound what it has to look at.
+
+Pure — no DB, no network. `encode` mirrors the SQL function bit for bit.
+"""
+import math
+
+# Stored precision: 8 chars is a ~38m x 19m cell, finer than any radius
+# either product offers. Changing it means a new migration — the generated
+# column bakes the number in.
+GEOCELL_PRECISION = 8
+
+# Upper bound on cells in one cover. The finest precision that stays under
+# this is used; a 500km Cappe radius lands on a handful of precision-2 cells,
+# a 1km Discover radius on a dozen or so precision-6 ones.
+MAX_COVER_CELLS = 24
+
+_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Same constants as the SQL bounding box this replaces, so a cover is never
+# narrower than the box the exact filter used to be fed from.
+_KM_PER_DEGREE = 111.045
+_MIN_COS = 0.01
+
+
+def _bits(precision: int) -> tuple[int, int]:
+    """(lat bits, lng bits) — geohash interleaves starting with longitude."""
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def encode(lat: float, lng: float, precision: int = GEOCELL_PRECISION) -> str:
+    """Geohash of a point. Bisection rather than float scaling so the result
+    matches the migration's `geohash_encode` exactly at cell boundaries."""
+    lat_lo, lat_hi, lng_lo, lng_hi = -90.0, 90.0, -180.0, 180.0
+    out, ch, bit, even = [], 0, 0, True
+    while len(out) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                ch, lng_lo = ch * 2 + 1, mid
+            else:
+                ch, lng_hi = ch * 2, mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                ch, lat_lo = ch * 2 + 1, mid
+            else:
+                ch, lat_hi = ch * 2, mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            out.append(_ALPHABET[ch])
+            ch, bit = 0, 0
+    return "".join(out)
+
+
+def _from_indices(lat_i: int, lng_i: int, precision: int) -> str:
+    lat_bits, lng_bits = _bits(precision)
+    value = 0
+    for k in range(5 * precision):
+        if k % 2 == 0:
+            value = value * 2 + ((lng_i >> (lng_bits - 1 - k // 2)) & 1)
+        else:
+            value = value * 2 + ((lat_i >> (lat_bits - 1 - k // 2)) & 1)
+    return "".join(
+        _ALPHABET[(value >> (5 * (precision - 1 - i))) & 31] for i in range(precision)
+    )
+
+
+def _index(value: float, lo: float, span: float, bits: int) -> int:
+    return min(max(int(math.floor((value - lo) / span * (1 << bits))), 0), (1 << bits) - 1)
+
+
+def _cover_at(lat: float, lng: float, radius_km: float, precision: int, limit: int):
+    """Cells of `precision` covering the bounding box, or None past `limit`."""
+    lat_bits, lng_bits = _bits(precision)
+    dlat = radius_km / _KM_PER_DEGREE
+    dlng = radius_km / (_KM_PER_DEGREE * max(math.cos(math.radians(lat)), _MIN_COS))
+    lat0 = _index(lat - dlat, -90.0, 180.0, lat_bits)
+    lat1 = _index(lat + dlat, -90.0, 180.0, lat_bits)
+    lng_cells = 1 << lng_bits
+    if 2 * dlng >= 360.0:
+        lng_range = range(lng_cells)
+    else:
+        # Unclamped so a box crossing the antimeridian wraps onto the far side.
+        lng0 = math.floor((lng - dlng + 180.0) / 360.0 * lng_cells)
+        lng1 = math.floor((lng + dlng + 180.0) / 360.0 * lng_cells)
+        lng_range = range(lng0, min(lng1, lng0 + lng_cells - 1) + 1)
+    if (lat1 - lat0 + 1) * len(lng_range) > limit:
+        return None
+    return sorted({
+        _from_indices(lat_i, lng_i % lng_cells, precision)
+        for lat_i in range(lat0, lat1 + 1)
+        for lng_i in lng_range
+    })
+
+
+def cover_cells(lat: float, lng: float, radius_km: float, max_cells: int = MAX_COVER_CELLS) -> list[str]:
+    """Geohash prefixes whose union contains every point within `radius_km`,
+    at the finest precision that needs no more than `max_cells` of them."""
+    for precision in range(GEOCELL_PRECISION, 0, -1):
+        cells = _cover_at(lat, lng, radius_km, precision, max_cells)
+        if cells is not None:
+            return cells
+    # Precision 1 is 32 cells for the whole planet; a radius that still
+    # doesn't fit just scans all of them.
+    return list(_ALPHABET)
+
+
+def _successor(prefix: str) -> str:
+    """Smallest string greater than every geohash starting with `prefix`."""
+    while prefix and prefix[-1] == _ALPHABET[-1]:
+        prefix = prefix[:-1]
+    if not prefix:
+        return "{"  # sorts after every alphabet character in the C collation
+    return prefix[:-1] + _ALPHABET[_ALPHABET.index(prefix[-1]) + 1]
+
+
+def cover_ranges(lat: float, lng: float, radius_km: float) -> tuple[list[str], list[str]]:
+    """`cover_cells` as merged half-open [lo, hi) geocell ranges — the two
+    arrays `covering_scan` unnests."""
+    lows: list[str] = []
+    highs: list[str] = []
+    for cell in cover_cells(lat, lng, radius_km):
+        hi = _successor(cell)
+        if highs and highs[-1] == cell:
+            highs[-1] = hi
+        else:
+            lows.append(cell)
+            highs.append(hi)
+    return lows, highs
+
+
+def covering_scan(table: str, alias: str, lo_param: str, hi_param: str) -> str:
+    """FROM-clause fragment joining `table` (with a `geocell` column) to the
+    cover ranges bound at `lo_param`/`hi_param` — one index range scan per
+    range. Ranges never overlap, so no row is produced twice."""
+    return f"""unnest({lo_param}::text[], {hi_param}::text[]) AS cell(lo, hi)
+              JOIN {table} {alias} ON {alias}.geocell >= cell.lo AND {alias}.geocell < cell.hi"""
@@ -13,6 +13,7 @@ import asyncpg
 
 from .embedding_service import EmbeddingService
 from ...config import get_settings
+from ...database.vector import ensure_vector_codec
 
 
 def _get_embedding_service() -> EmbeddingService:
@@ -63,6 +64,46 @@ def compose_policy_embedding_text(policy: dict) -> str:
     return ". ".join(parts)
 
 
+_UPSERT_SQL = """
+    INSERT INTO payer_policy_embeddings
+        (policy_id, payer_name, content, embedding, metadata)
+    VALUES ($1, $2, $3, $4::vector, $5::jsonb)
+    ON CONFLICT (policy_id) DO UPDATE SET
+        content = EXCLUDED.content,
+        embedding = EXCLUDED.embedding,
+        payer_name = EXCLUDED.payer_name,
+        metadata = EXCLUDED.metadata,
+        updated_at = NOW()
+"""
+
+
+async def _upsert_policy_embeddings(
+    conn: asyncpg.Connection,
+    batch: list,
+    texts: list[str],
+    embeddings: list[list[float]],
+) -> None:
+    """One executemany per batch; vectors go over the binary codec as lists."""
+    await ensure_vector_codec(conn)
+    await conn.executemany(
+        _UPSERT_SQL,
+        [
+            (
+                row["id"],
+                row["payer_name"],
+                text,
+                embedding,
+                json.dumps({
+                    "policy_title": row["policy_title"],
+                    "policy_number": row["policy_number"],
+                    "source_url": row["source_url"],
+                }),
+            )
+            for row, text, embedding in zip(batch, texts, embeddings)
+        ],
+    )
+
+
 async def embed_policies(
     conn: asyncpg.Connection,
     payer_name: Optional[str] = None,
@@ -103,32 +144,8 @@ async def embed_policies(
             texts, task_type=EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
         )
 
-        for row, text, embedding in zip(batch, texts, embeddings):
-            metadata = {
-                "policy_title": row["policy_title"],
-                "policy_number": row["policy_number"],
-                "source_url": row["source_url"],
-            }
-
-            await conn.execute(
-                """
-                INSERT INTO payer_policy_embeddings
-                    (policy_id, payer_name, content, embedding, metadata)
-                VALUES ($1, $2, $3, $4::vector, $5::jsonb)
-                ON CONFLICT (policy_id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    payer_name = EXCLUDED.payer_name,
-                    metadata = EXCLUDED.metadata,
-                    updated_at = NOW()
-                """,
-                row["id"],
-                row["payer_name"],
-                text,
-                "[" + ",".join(str(x) for x in embedding) + "]",
-                json.dumps(metadata),
-            )
-            total += 1
+        await _upsert_policy_embeddings(conn, batch, texts, embeddings)
+        total += len(batch)
 
         print(f"[Payer Embedding] Embedded {min(i + batch_size, len(rows))}/{len(rows)} policies")
 
@@ -166,32 +183,8 @@ async def embed_updated_policies(conn: asyncpg.Connection) -> int:
             texts, task_type=EmbeddingService.TASK_RETRIEVAL_DOCUMENT,
         )
 
-        for row, text, embedding in zip(batch, texts, embeddings):
-            metadata = {
-                "policy_title": row["policy_title"],
-                "policy_number": row["policy_number"],
-                "source_url": row["source_url"],
-            }
-
-            await conn.execute(
-                """
-                INSERT INTO payer_policy_embeddings
-                    (policy_id, payer_name, content, embedding, metadata)
-                VALUES ($1, $2, $3, $4::vector, $5::jsonb)
-                ON CONFLICT (policy_id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    payer_name = EXCLUDED.payer_name,
-                    metadata = EXCLUDED.metadata,
-                    updated_at = NOW()
-                """,
-                row["id"],
-                row["payer_name"],
-                text,
-                "[" + ",".join(str(x) for x in embedding) + "]",
-                json.dumps(metadata),
-            )
-            total += 1
+        await _upsert_policy_embeddings(conn, batch, texts, embeddings)
+        total += len(batch)
 
     if total > 0:
         print(f"[Payer Embedding] Updated {total} embeddings")
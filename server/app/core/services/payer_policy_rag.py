@@ -11,6 +11,7 @@ from uuid import UUID
 import asyncpg
 
 from .embedding_service import EmbeddingService
+from .vector_search import search_nearest
 
 # Facility attrs store snake_case contract keys ("medi_cal"); the policy corpus
 # stores display payer names. Medicaid programs are DISTINCT from Medicare —
@@ -70,52 +71,24 @@ class PayerPolicyRAGService:
             query, task_type=EmbeddingService.TASK_RETRIEVAL_QUERY,
         )
 
-        sql = """
-            SELECT
-                pe.policy_id,
-                pe.content,
-                pe.payer_name,
-                pe.metadata AS embed_metadata,
-                pp.policy_number,
-                pp.policy_title,
-                pp.payer_type,
-                pp.procedure_codes,
-                pp.diagnosis_codes,
-                pp.procedure_description,
-                pp.coverage_status,
-                pp.requires_prior_auth,
-                pp.clinical_criteria,
-                pp.documentation_requirements,
-                pp.medical_necessity_criteria,
-                pp.age_restrictions,
-                pp.frequency_limits,
-                pp.place_of_service,
-                pp.effective_date,
-                pp.source_url,
-                pp.source_document,
-                1 - (pe.embedding <=> $1::vector) AS similarity
-            FROM payer_policy_embeddings pe
-            JOIN payer_medical_policies pp ON pe.policy_id = pp.id
-            WHERE 1=1
-        """
-        embedding_str = "[" + ",".join(str(x) for x in query_embedding) + "]"
-        params: list = [embedding_str]
-        idx = 2
-
-        if payer_names:
-            sql += f" AND pe.payer_name = ANY(${idx}::text[])"
-            params.append(payer_names)
-            idx += 1
-
-        if min_similarity > 0:
-            sql += f" AND 1 - (pe.embedding <=> $1::vector) >= ${idx}"
-            params.append(min_similarity)
-            idx += 1
-
-        sql += f" ORDER BY pe.embedding <=> $1::vector LIMIT ${idx}"
-        params.append(top_k)
-
-        rows = await conn.fetch(sql, *params)
+        rows = await search_nearest(
+            conn,
+            query_embedding,
+            select="""
+                pe.policy_id, pe.content, pe.payer_name, pe.metadata AS embed_metadata,
+                pp.policy_number, pp.policy_title, pp.payer_type, pp.procedure_codes,
+                pp.diagnosis_codes, pp.procedure_description, pp.coverage_status,
+                pp.requires_prior_auth, pp.clinical_criteria,
+                pp.documentation_requirements, pp.medical_necessity_criteria,
+                pp.age_restrictions, pp.frequency_limits, pp.place_of_service,
+                pp.effective_date, pp.source_url, pp.source_document
+            """,
+            from_="payer_policy_embeddings pe JOIN payer_medical_policies pp ON pe.policy_id = pp.id",
+            embedding_column="pe.embedding",
+            filters=[("pe.payer_name = ANY({}::text[])", payer_names)],
+            top_k=top_k,
+            min_similarity=min_similarity,
+        )
 
         results = []
         for row in rows:
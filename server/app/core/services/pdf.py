@@ -13,7 +13,7 @@ that need them, so legitimate assets are unaffected. This mirrors the original
 one-off guard in `matcha/services/benefits_eligibility.py`.
 """
 
-import asyncio
+from typing import Sequence
 
 from weasyprint import HTML, default_url_fetcher
 
@@ -42,12 +42,17 @@ def render_pdf(html_string: str, **write_pdf_kwargs) -> bytes:
     )
 
 
-async def render_pdf_async(html_string: str, **write_pdf_kwargs) -> bytes:
-    """`render_pdf` off the event loop.
+async def render_pdf_async(html_string: str, *, stylesheets: Sequence[str] = ()) -> bytes:
+    """`render_pdf` off the event loop, on the shared renderer pool.
 
     WeasyPrint render is CPU-bound and blocking; the desktop client awaits the
     bytes inline (see the root CLAUDE.md note on why PDF render stays in the
-    request path), so every async caller wrapped it in `asyncio.to_thread`. This
-    folds that wrapper — and the SSRF-safe fetcher — into one call.
+    request path). Renders run in warmed worker processes and identical
+    html + stylesheets return cached bytes — see `pdf_render_pool`.
+    `stylesheets` are CSS source strings (they cross a process boundary), not
+    `weasyprint.CSS` objects. Raises `PdfRendererBusy` when the pool's queue
+    is full.
     """
-    return await asyncio.to_thread(render_pdf, html_string, **write_pdf_kwargs)
+    from .pdf_render_pool import get_renderer_pool
+
+    return await get_renderer_pool().render(html_string, stylesheets)
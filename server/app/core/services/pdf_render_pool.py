@@ -0,0 +1,307 @@
+"""Worker-process pool for WeasyPrint renders, with a content-hash output cache.
+
+`render_pdf_async` used to run every render in `asyncio.to_thread`. WeasyPrint
+is pure-Python layout on top of pango — CPU-bound and holding the GIL for most
+of the render — so a handbook export on a threadpool thread stalled every other
+request on that uvicorn worker's event loop, and concurrent exports just queued
+on the GIL. Renders now go to a small pool of worker processes:
+
+* each worker imports WeasyPrint and renders a one-line document at start-up,
+  so the fontconfig scan and pango setup are paid before the first export,
+  not during it;
+* stylesheets travel as CSS source and are parsed once per worker (keyed by
+  hash), not once per render;
+* admission is bounded: at most `2 * PROCESSES` renders are handed to the pool
+  at once (one running and one staged per worker), up to `MAX_QUEUED` more
+  callers wait for a slot, and anything past that raises `PdfRendererBusy`
+  immediately instead of growing an unbounded backlog;
+* output is cached by sha256(html + stylesheets). `safe_url_fetcher` only
+  admits `data:` URIs, so the input fully determines the document —
+  re-exporting an unchanged handbook returns the same bytes without a render.
+  Identical renders already in flight are coalesced onto one.
+
+The cache is per process and in memory only (these are tenant documents; they
+are never written to local disk here), bounded by `CACHE_MAX_BYTES`.
+
+Renders run in-process via `asyncio.to_thread` when PDF_RENDER_PROCESSES=0 and
+in daemonic processes — Celery prefork children may not start children of
+their own. Workers are recycled every `_RECYCLE_AFTER` renders (WeasyPrint's
+caches only grow). A worker that dies mid-render (OOM) breaks the pool: that
+render raises RuntimeError and the next one gets a fresh pool.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PROCESSES = int(os.getenv("PDF_RENDER_PROCESSES", str(min(2, os.cpu_count() or 1))))
+MAX_QUEUED = int(os.getenv("PDF_RENDER_MAX_QUEUED", "32"))
+CACHE_MAX_BYTES = int(os.getenv("PDF_RENDER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# A single export bigger than this (a full evidence packet) is a one-off —
+# caching it would only push the handbooks out.
+CACHE_MAX_OBJECT_BYTES = 8 * 1024 * 1024
+_RECYCLE_AFTER = 200
+_MAX_STYLESHEETS = 64
+
+
+class PdfRendererBusy(RuntimeError):
+    """More renders are waiting for the pool than `MAX_QUEUED` allows."""
+
+
+# ── worker-process side ──────────────────────────────────────────────────────
+
+_stylesheets: dict[str, object] = {}
+
+
+def _warm_worker() -> None:
+    try:
+        from .pdf import render_pdf
+
+        render_pdf("<p>warm</p>")
+    except Exception:  # noqa: BLE001 — a cold worker still renders, just slower
+        logger.warning("PDF renderer warm-up failed", exc_info=True)
+
+
+def _render_in_worker(html_string: str, stylesheets: tuple[str, ...]) -> bytes:
+    from weasyprint import CSS
+
+    from .pdf import render_pdf, safe_url_fetcher
+
+    if not stylesheets:
+        return render_pdf(html_string)
+    sheets = []
+    for css in stylesheets:
+        key = hashlib.sha256(css.encode()).hexdigest()
+        sheet = _stylesheets.get(key)
+        if sheet is None:
+            if len(_stylesheets) >= _MAX_STYLESHEETS:
+                _stylesheets.clear()
+            sheet = _stylesheets[key] = CSS(string=css, url_fetcher=safe_url_fetcher)
+        sheets.append(sheet)
+    return render_pdf(html_string, stylesheets=sheets)
+
+
+# ── API-process side ─────────────────────────────────────────────────────────
+
+def _cache_key(html_string: str, stylesheets: tuple[str, ...]) -> str:
+    digest = hashlib.sha256(html_string.encode())
+    for css in stylesheets:
+        digest.update(b"\0")
+        digest.update(css.encode())
+    return digest.hexdigest()
+
+
+class RendererPool:
+    """Bounded process pool + LRU of rendered PDFs. One per process; see
+    `get_renderer_pool`."""
+
+    def __init__(
+        self,
+        processes: int = PROCESSES,
+        max_queued: int = MAX_QUEUED,
+        cache_max_bytes: int = CACHE_MAX_BYTES,
+        render_fn: Callable[[str, tuple[str, ...]], bytes] = _render_in_worker,
+        initializer: Optional[Callable[[], None]] = _warm_worker,
+        mp_context: str = "spawn",
+    ):
+        self.processes = processes
+        self.max_queued = max_queued
+        self.cache_max_bytes = cache_max_bytes
+        self.render_fn = render_fn
+        self.initializer = initializer
+        self.mp_context = mp_context
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._cache_bytes = 0
+        self._in_flight: dict[str, asyncio.Future] = {}
+        # Built lazily, and rebuilt if the loop changes: an asyncio.Semaphore
+        # belongs to the loop that first waits on it.
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+        self.stats = {
+            "renders": 0, "cache_hits": 0, "cache_misses": 0, "coalesced": 0,
+            "rejected": 0, "thread_renders": 0, "pool_restarts": 0,
+        }
+
+    def uses_processes(self) -> bool:
+        return self.processes > 0 and not multiprocessing.current_process().daemon
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(self.mp_context),
+                    initializer=self.initializer,
+                    max_tasks_per_child=_RECYCLE_AFTER if self.mp_context != "fork" else None,
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is not executor:
+                return  # a sibling render already replaced it
+            self._executor = None
+            self.stats["pool_restarts"] += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Spawn and warm every worker now rather than on the first export."""
+        if not self.uses_processes():
+            return
+        executor = self._get_executor()
+        for _ in range(self.processes):
+            executor.submit(os.getpid)
+
+    async def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(max(1, 2 * self.processes))
+            self._slots_loop = loop
+            self._waiting = 0
+        return self._slots
+
+    @asynccontextmanager
+    async def _admit(self):
+        slots = self._get_slots()
+        if slots.locked():
+            if self._waiting >= self.max_queued:
+                self.stats["rejected"] += 1
+                raise PdfRendererBusy(f"PDF renderer is saturated ({self._waiting} renders waiting)")
+            self._waiting += 1
+            try:
+                await slots.acquire()
+            finally:
+                self._waiting -= 1
+        else:
+            await slots.acquire()
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            pdf = self._cache.get(key)
+            if pdf is None:
+                self.stats["cache_misses"] += 1
+                return None
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return pdf
+
+    def _cache_put(self, key: str, pdf: bytes) -> None:
+        if len(pdf) > min(self.cache_max_bytes, CACHE_MAX_OBJECT_BYTES):
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = pdf
+            self._cache_bytes += len(pdf)
+            while self._cache_bytes > self.cache_max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    async def _run(self, html_string: str, stylesheets: tuple[str, ...]) -> bytes:
+        self.stats["renders"] += 1
+        if not self.uses_processes():
+            self.stats["thread_renders"] += 1
+            return await asyncio.to_thread(self.render_fn, html_string, stylesheets)
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, self.render_fn, html_string, stylesheets,
+            )
+        except BrokenProcessPool as exc:
+            self._reset(executor)
+            raise RuntimeError("PDF renderer process died mid-render") from exc
+
+    async def _render_uncached(self, key: str, html_string: str, stylesheets: tuple[str, ...]) -> bytes:
+        async with self._admit():
+            pdf = await self._run(html_string, stylesheets)
+        self._cache_put(key, pdf)
+        return pdf
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved: every waiter may have gone away
+
+    async def render(self, html_string: str, stylesheets: Sequence[str] = ()) -> bytes:
+        sheets = tuple(stylesheets)
+        key = _cache_key(html_string, sheets)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._render_uncached(key, html_string, sheets))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.stats["coalesced"] += 1
+        # Shielded: a caller that disconnects doesn't cancel the render its
+        # coalesced siblings (and the cache) are still waiting on.
+        return await asyncio.shield(task)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["cache_hits"] + self.stats["cache_misses"]
+            return {
+                **self.stats,
+                "processes": self.processes if self.uses_processes() else 0,
+                "waiting": self._waiting,
+                "in_flight": len(self._in_flight),
+                "cache_entries": len(self._cache),
+                "cache_bytes": self._cache_bytes,
+                "cache_hit_rate": round(self.stats["cache_hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+_pool: Optional[RendererPool] = None
+
+
+def get_renderer_pool() -> RendererPool:
+    global _pool
+    if _pool is None:
+        _pool = RendererPool()
+    return _pool
+
+
+def start_pdf_renderer() -> None:
+    """Spawn and warm the render workers (FastAPI lifespan). Renders also
+    start the pool lazily, so scripts and tests never need to call this."""
+    try:
+        get_renderer_pool().start()
+    except Exception:  # noqa: BLE001 — the first render retries
+        logger.warning("PDF renderer pool failed to start", exc_info=True)
+
+
+async def stop_pdf_renderer() -> None:
+    if _pool is not None:
+        await _pool.shutdown()
+
+
+def get_pdf_render_stats() -> dict:
+    """Render/cache/backpressure counters for this process's pool."""
+    return get_renderer_pool().snapshot()
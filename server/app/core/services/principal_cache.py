@@ -0,0 +1,312 @@
+"""Versioned principal cache for get_current_user and company-scope resolution.
+
+Every authenticated request used to cost ~4 queries before the handler ran:
+the `users` lookup (with its correlated clients/companies subquery), the
+session-revocation check, then `resolve_accessible_company_scope`'s fetches.
+None of that changes between requests unless something happens to the user,
+so it is cached at two tiers:
+
+* process-local — a bounded dict, served without any I/O for up to
+  `LOCAL_TTL_SECONDS`;
+* Redis — `principal:user:<uid>:<iat>` / `principal:scope:<uid>` JSON entries
+  stamped with the user's version, shared across workers for
+  `REDIS_TTL_SECONDS`.
+
+Invalidation is a per-user version counter (`principal:ver:<uid>`).
+`bump_principal_version` INCRs it, drops this process's entries and
+publishes on `principal:invalidate` so every other worker drops theirs; a
+Redis entry whose stamp no longer matches the counter is a miss. Callers
+read the version BEFORE querying and store under that version, so a bump
+that lands mid-read makes the new entry stale on arrival instead of
+resurrecting old state.
+
+Bumped by: session revocation (logout, password change/reset), suspension,
+deactivation, and changes to the fields CurrentUser carries (email, beta
+features, interview tokens/roles); per company (every client and employee
+user) on company delete/restore. Anything not wired to a bump is bounded by
+the Redis TTL.
+
+Only successful resolutions are cached — a 401/403 path always re-queries.
+No Redis, no cache: without the counter and the pub/sub channel there is no
+way to invalidate other workers. The local tier is likewise served and
+filled only while this worker's subscriber is actually subscribed; while it
+is waiting on Redis or reconnecting, every lookup goes to Redis, whose
+version stamp catches what the missed broadcasts would have said.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from uuid import UUID
+
+from .redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TTL_SECONDS = 15.0
+LOCAL_MAX_USERS = 5_000
+REDIS_TTL_SECONDS = 300
+
+INVALIDATE_CHANNEL = "principal:invalidate"
+_VERSION_PREFIX = "principal:ver:"
+_USER_PREFIX = "principal:user:"
+_SCOPE_PREFIX = "principal:scope:"
+
+# uid -> {slot: (stored_at, version, value)}; slot is "user:<iat>" or "scope".
+# Grouped by user so an invalidation drops every token's entry in one pop.
+_local: "OrderedDict[str, dict[str, tuple[float, int, Any]]]" = OrderedDict()
+# uid -> newest version this process has seen bumped. A request that read the
+# version before a bump and stores afterwards must not repopulate the local
+# tier with what it loaded (Redis rejects it on its own via the stamp).
+_floors: "OrderedDict[str, int]" = OrderedDict()
+_subscriber_task: Optional[asyncio.Task] = None
+# True only between a successful SUBSCRIBE and the subscription ending.
+_subscribed = False
+# Bumped whenever the subscription ends. A fill that started under an older
+# epoch may carry state a missed broadcast invalidated (see `_local_put`).
+_epoch = 0
+# Epoch at this request's last `_lookup`, for the `_store` that follows it.
+_lookup_epoch: contextvars.ContextVar[int] = contextvars.ContextVar("principal_lookup_epoch", default=-1)
+
+
+def _user_slot(iat: Optional[int]) -> str:
+    return f"user:{iat if iat is not None else '-'}"
+
+
+def _redis_key(uid: str, slot: str) -> str:
+    if slot == "scope":
+        return f"{_SCOPE_PREFIX}{uid}"
+    return f"{_USER_PREFIX}{uid}:{slot[5:]}"
+
+
+def _local_get(uid: str, slot: str) -> Optional[Any]:
+    if not _subscribed:
+        return None
+    entries = _local.get(uid)
+    if not entries or slot not in entries:
+        return None
+    stored_at, _, value = entries[slot]
+    if time.monotonic() - stored_at > LOCAL_TTL_SECONDS:
+        del entries[slot]
+        return None
+    _local.move_to_end(uid)
+    return value
+
+
+def _local_put(uid: str, slot: str, version: int, value: Any, epoch: int) -> None:
+    if not _subscribed or epoch != _epoch or version < _floors.get(uid, 0):
+        return
+    _local.setdefault(uid, {})[slot] = (time.monotonic(), version, value)
+    _local.move_to_end(uid)
+    while len(_local) > LOCAL_MAX_USERS:
+        _local.popitem(last=False)
+
+
+def drop_local(*user_ids: UUID | str, versions: Optional[dict] = None) -> None:
+    """Forget this process's entries for these users (no Redis round trip).
+
+    `versions` ({uid: new_version}) also raises their floors, so stores still
+    in flight under an older version stay out of the local tier.
+    """
+    for user_id in user_ids:
+        _local.pop(str(user_id), None)
+    for uid, version in (versions or {}).items():
+        if int(version) > _floors.get(uid, 0):
+            _floors[uid] = int(version)
+            _floors.move_to_end(uid)
+    while len(_floors) > LOCAL_MAX_USERS:
+        _floors.popitem(last=False)
+
+
+async def _lookup(uid: str, slot: str) -> tuple[Optional[Any], Optional[int]]:
+    """(cached value or None, current version — None when caching is off)."""
+    redis = get_redis_cache()
+    if redis is None:
+        return None, None
+    epoch = _epoch
+    _lookup_epoch.set(epoch)
+    value = _local_get(uid, slot)
+    if value is not None:
+        return value, _local[uid][slot][1]
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.get(f"{_VERSION_PREFIX}{uid}")
+        pipe.get(_redis_key(uid, slot))
+        raw_version, raw_entry = await pipe.execute()
+    except Exception:
+        return None, None
+    version = int(raw_version or 0)
+    if raw_entry is None:
+        return None, version
+    try:
+        entry = json.loads(raw_entry)
+    except (TypeError, ValueError):
+        return None, version
+    if entry.get("ver") != version:
+        return None, version
+    _local_put(uid, slot, version, entry["value"], epoch)
+    return entry["value"], version
+
+
+async def _store(uid: str, slot: str, version: Optional[int], value: Any) -> None:
+    redis = get_redis_cache()
+    if redis is None or version is None:
+        return
+    _local_put(uid, slot, version, value, _lookup_epoch.get())
+    try:
+        await redis.set(
+            _redis_key(uid, slot),
+            json.dumps({"ver": version, "value": value}, default=str),
+            ex=REDIS_TTL_SECONDS,
+        )
+    except Exception:
+        pass
+
+
+# ── get_current_user ───────────────────────────────────────────────────
+
+
+async def lookup_user(user_id: UUID, iat: Optional[int]) -> tuple[Optional[dict], Optional[int]]:
+    """Cached CurrentUser fields for this (user, token), plus the version to
+    pass back to `store_user` on a miss."""
+    return await _lookup(str(user_id), _user_slot(iat))
+
+
+async def store_user(user_id: UUID, iat: Optional[int], version: Optional[int], fields: dict) -> None:
+    await _store(str(user_id), _user_slot(iat), version, fields)
+
+
+# ── resolve_accessible_company_scope ───────────────────────────────────
+
+# Only single-company roles: their scope is one clients/employees row. Admin
+# scope follows whatever company the request names, and broker scope spans
+# link tables this cache has no invalidation hooks for.
+SCOPE_CACHE_ROLES = frozenset({"client", "individual", "employee"})
+_SCOPE_UUID_FIELDS = ("company_id", "broker_id")
+
+
+async def lookup_scope(user_id: UUID) -> tuple[Optional[dict], Optional[int]]:
+    value, version = await _lookup(str(user_id), "scope")
+    if value is None:
+        return None, version
+    scope = dict(value)
+    for field in _SCOPE_UUID_FIELDS:
+        if scope.get(field) is not None:
+            scope[field] = UUID(str(scope[field]))
+    scope["company_ids"] = [UUID(str(cid)) for cid in scope.get("company_ids") or []]
+    return scope, version
+
+
+async def store_scope(user_id: UUID, version: Optional[int], scope: dict) -> None:
+    await _store(str(user_id), "scope", version, dict(scope))
+
+
+# ── Invalidation ───────────────────────────────────────────────────────
+
+
+async def bump_principal_version(*user_ids: UUID | str) -> None:
+    """Invalidate every cached principal/scope for these users, cluster-wide.
+
+    Call AFTER the change is committed. Never raises — an auth-cache hiccup
+    must not fail the write that triggered it.
+    """
+    uids = [str(u) for u in user_ids if u is not None]
+    if not uids:
+        return
+    drop_local(*uids)
+    redis = get_redis_cache()
+    if redis is None:
+        return
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for uid in uids:
+            pipe.incr(f"{_VERSION_PREFIX}{uid}")
+        versions = dict(zip(uids, await pipe.execute()))
+        drop_local(*uids, versions=versions)
+        await redis.publish(INVALIDATE_CHANNEL, json.dumps(versions))
+    except Exception:
+        logger.warning("[PrincipalCache] Version bump failed for %s", uids, exc_info=True)
+
+
+async def bump_company_principals(conn, company_id: UUID) -> None:
+    """`bump_principal_version` for every client and employee user of a company."""
+    rows = await conn.fetch(
+        """
+        SELECT user_id FROM clients WHERE company_id = $1
+        UNION
+        SELECT user_id FROM employees WHERE org_id = $1 AND user_id IS NOT NULL
+        """,
+        company_id,
+    )
+    await bump_principal_version(*(row["user_id"] for row in rows))
+
+
+def _mark_unsubscribed() -> None:
+    global _subscribed, _epoch
+    if _subscribed:
+        _subscribed = False
+        _epoch += 1
+        # Whatever is published while we are away is lost — start clean.
+        _local.clear()
+
+
+async def _subscriber_loop() -> None:
+    """Per-worker: drop local entries other workers invalidated. Self-healing
+    on errors, exits on cancellation (same shape as the WS fanout loops)."""
+    global _subscribed
+    while True:
+        pubsub = None
+        try:
+            redis = get_redis_cache()
+            if redis is None:
+                await asyncio.sleep(5)
+                continue
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(INVALIDATE_CHANNEL)
+            _subscribed = True
+            async for raw in pubsub.listen():
+                if raw is None or raw.get("type") != "message":
+                    continue
+                try:
+                    versions = json.loads(raw.get("data") or "{}")
+                except (TypeError, ValueError):
+                    continue
+                if isinstance(versions, dict):
+                    drop_local(*versions, versions=versions)
+        except asyncio.CancelledError:
+            break
+        except Exception:
+            _mark_unsubscribed()
+            logger.exception("[PrincipalCache] Subscriber loop error; restarting in 2s")
+            await asyncio.sleep(2)
+        finally:
+            _mark_unsubscribed()
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(INVALIDATE_CHANNEL)
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def start_principal_invalidation_subscriber() -> None:
+    """Start the per-worker invalidation subscriber. Idempotent."""
+    global _subscriber_task
+    if _subscriber_task and not _subscriber_task.done():
+        return
+    _subscriber_task = asyncio.create_task(_subscriber_loop())
+
+
+async def stop_principal_invalidation_subscriber() -> None:
+    global _subscriber_task
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        try:
+            await _subscriber_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _subscriber_task = None
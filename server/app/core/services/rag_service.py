@@ -8,6 +8,7 @@ from typing import Optional
 import asyncpg
 
 from .embedding_service import EmbeddingService
+from .vector_search import search_nearest
 
 
 class RAGService:
@@ -51,42 +52,21 @@ class RAGService:
             task_type=EmbeddingService.TASK_RETRIEVAL_QUERY,
         )
 
-        # Build query with optional document type filter
-        base_query = """
-            SELECT
-                ec.id,
-                ec.content,
-                ec.speaker,
-                ec.page_number,
-                ec.line_start,
-                ec.line_end,
-                ec.metadata,
-                ec.chunk_index,
-                ed.id as document_id,
-                ed.filename,
-                ed.document_type,
-                1 - (ec.embedding <=> $1::vector) as similarity
-            FROM er_evidence_chunks ec
-            JOIN er_case_documents ed ON ec.document_id = ed.id
-            WHERE ec.case_id = $2
-        """
-
-        params = [query_embedding, case_id]
-
-        if document_types:
-            base_query += f" AND ed.document_type = ANY($3)"
-            params.append(document_types)
-
-        if min_similarity > 0:
-            base_query += f" AND 1 - (ec.embedding <=> $1::vector) >= ${len(params) + 1}"
-            params.append(min_similarity)
-
-        base_query += """
-            ORDER BY ec.embedding <=> $1::vector
-            LIMIT $""" + str(len(params) + 1)
-        params.append(top_k)
-
-        rows = await conn.fetch(base_query, *params)
+        rows = await search_nearest(
+            conn,
+            query_embedding,
+            select="""
+                ec.id, ec.content, ec.speaker, ec.page_number, ec.line_start,
+                ec.line_end, ec.metadata, ec.chunk_index,
+                ed.id as document_id, ed.filename, ed.document_type
+            """,
+            from_="er_evidence_chunks ec JOIN er_case_documents ed ON ec.document_id = ed.id",
+            embedding_column="ec.embedding",
+            scope=[("ec.case_id = {}", case_id)],
+            filters=[("ed.document_type = ANY({})", document_types)],
+            top_k=top_k,
+            min_similarity=min_similarity,
+        )
 
         results = []
         for row in rows:
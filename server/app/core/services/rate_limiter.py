@@ -1,19 +1,109 @@
 """
 Gemini API Rate Limiter
 
-Database-backed rate limiter to prevent runaway Gemini API costs.
+Redis-backed sliding-window limiter to prevent runaway Gemini API costs, with
+Postgres as the durable audit sink and the fallback counter.
 Uses rolling windows for hourly and daily limits.
+
+Every Gemini call in the codebase gates on this, so the hot path is ONE Redis
+round trip: a Lua script prunes a sorted set of call timestamps, counts the
+hourly/daily windows, and (for record/check_and_record) adds the call — all
+atomically, so two workers racing for the last slot cannot both get it. The old
+path (two `COUNT(*)` range scans over an ever-growing `api_rate_limits` plus a
+separate INSERT per call) is kept verbatim as the fallback for when Redis is
+unreachable.
+
+`api_rate_limits` stays the audit record (admin usage view, per-service
+breakdown). Recorded calls are queued on a Redis list by the same script and
+drained into Postgres in batches by whichever process notices the queue is full
+or stale — a crashed process loses nothing, because the rows live in Redis until
+a drain COPYs them.
 """
 
+import json
+import os
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
+import redis.asyncio as aioredis
+
 # connection_or_direct, not get_connection: EVERY Gemini call in the codebase
 # passes through this limiter, including calls made from Celery tasks — and
 # workers are pool-free by design (celery_app.py), so a hard `get_connection()`
 # here meant no worker could ever call Gemini. It raised in check_limit, before
 # the API call, and looked like a research pass that simply found nothing.
 from ...database import connection_or_direct as get_connection
+from .redis_cache import get_redis_cache
+
+_CALLS_KEY = "gemini_rl:calls"
+_AUDIT_KEY = "gemini_rl:audit"
+_SEEDED_KEY = "gemini_rl:seeded"
+
+_HOUR_MS = 3600 * 1000
+_DAY_MS = 24 * _HOUR_MS
+
+# Drain the audit queue once this many rows are pending, or when this process
+# has not drained for AUDIT_FLUSH_INTERVAL seconds — whichever comes first.
+AUDIT_BATCH_SIZE = 50
+AUDIT_FLUSH_INTERVAL = 30.0
+
+# After a Redis failure, stay on the DB path this long before trying Redis
+# again, so a dead Redis costs one connect timeout per window, not per call.
+REDIS_RETRY_AFTER = 30.0
+
+# ARGV: now_ms, hour_ms, day_ms, hourly_limit, daily_limit, mode, member, audit
+# mode: "check" (count only), "record" (add only), "check_record" (both).
+# Returns {allowed, hourly_count, daily_count, blocked_by, pending_audit_rows}.
+_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local day_ms = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - day_ms)
+local hourly = redis.call('ZCOUNT', KEYS[1], '(' .. (now - tonumber(ARGV[2])), '+inf')
+local daily = redis.call('ZCARD', KEYS[1])
+local mode = ARGV[6]
+if mode ~= 'record' then
+  if hourly >= tonumber(ARGV[4]) then return {0, hourly, daily, 'hourly', 0} end
+  if daily >= tonumber(ARGV[5]) then return {0, hourly, daily, 'daily', 0} end
+end
+local pending = 0
+if mode ~= 'check' then
+  redis.call('ZADD', KEYS[1], now, ARGV[7])
+  redis.call('PEXPIRE', KEYS[1], day_ms)
+  pending = redis.call('RPUSH', KEYS[2], ARGV[8])
+  hourly = hourly + 1
+  daily = daily + 1
+end
+return {1, hourly, daily, '', pending}
+"""
+
+# Celery tasks each run their own asyncio.run() loop and never call
+# init_redis_cache, and a redis.asyncio client is bound to the loop that first
+# used it. So outside the API we keep one client per loop, rebuilt when the loop
+# changes — the worker-side twin of connection_or_direct.
+_loop_redis: Optional[tuple[object, aioredis.Redis]] = None
+
+
+def _limiter_redis() -> aioredis.Redis:
+    global _loop_redis
+    shared = get_redis_cache()
+    if shared is not None:
+        return shared
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    if _loop_redis is None or _loop_redis[0] is not loop:
+        url = os.getenv("REDIS_URL", "").strip()
+        if not url:
+            from ...config import get_settings
+
+            url = get_settings().redis_url
+        _loop_redis = (
+            loop,
+            aioredis.from_url(url, decode_responses=True, socket_connect_timeout=1),
+        )
+    return _loop_redis[1]
 
 
 class RateLimitExceeded(Exception):
@@ -28,19 +118,174 @@ class RateLimitExceeded(Exception):
 
 class GeminiRateLimiter:
     """
-    Database-backed rate limiter for Gemini API calls.
+    Redis-backed rate limiter for Gemini API calls (Postgres fallback).
 
     Enforces two rolling window limits:
     - hourly_limit: Max calls in any 1-hour window
     - daily_limit: Max calls in any 24-hour window
     """
 
+    # Shared across instances: several modules build their own GeminiRateLimiter
+    # rather than using the singleton, and they all draw on one budget.
+    _redis_down_until: float = 0.0
+    _last_flush: float = 0.0
+    _seed_checked: bool = False
+
     def __init__(self):
         from ...config import get_settings
         settings = get_settings()
         self.hourly_limit = settings.gemini_hourly_limit
         self.daily_limit = settings.gemini_daily_limit
 
+    # ── Redis path ─────────────────────────────────────────────────────
+
+    async def _redis_window(
+        self, mode: str, service_name: str, endpoint: Optional[str]
+    ) -> Optional[tuple[bool, int, int, str]]:
+        """Run the window script. Returns (allowed, hourly, daily, blocked_by),
+        or None when Redis is unavailable and the caller should use the DB path."""
+        cls = GeminiRateLimiter
+        if time.monotonic() < cls._redis_down_until:
+            return None
+        try:
+            redis = _limiter_redis()
+            if not cls._seed_checked:
+                await self._seed_from_db(redis)
+            now = datetime.now(timezone.utc)
+            now_ms = int(now.timestamp() * 1000)
+            audit = json.dumps({
+                "service_name": service_name,
+                "endpoint": endpoint[:100] if endpoint else None,
+                "called_at": now.isoformat(),
+            })
+            allowed, hourly, daily, blocked_by, pending = await redis.eval(
+                _WINDOW_SCRIPT,
+                2,
+                _CALLS_KEY,
+                _AUDIT_KEY,
+                now_ms,
+                _HOUR_MS,
+                _DAY_MS,
+                self.hourly_limit,
+                self.daily_limit,
+                mode,
+                f"{now_ms}:{uuid.uuid4().hex}",
+                audit,
+            )
+        except Exception as e:
+            print(f"[RateLimiter] Redis unavailable, using database counts: {e}")
+            cls._redis_down_until = time.monotonic() + REDIS_RETRY_AFTER
+            cls._seed_checked = False
+            return None
+
+        pending = int(pending or 0)
+        if pending >= AUDIT_BATCH_SIZE or (
+            pending and time.monotonic() - cls._last_flush >= AUDIT_FLUSH_INTERVAL
+        ):
+            await self.flush_audit()
+        return bool(int(allowed)), int(hourly), int(daily), str(blocked_by or "")
+
+    async def _seed_from_db(self, redis) -> None:
+        """Load the last 24h of `api_rate_limits` into an empty window.
+
+        A fresh (or restarted) Redis would otherwise start every budget at zero
+        and let a day's worth of calls through again. Exactly one process seeds,
+        guarded by SET NX; rows drained by other processes just before the seed
+        can be counted twice, which errs on the side of blocking.
+
+        The marker has no TTL, so it lives exactly as long as the window it
+        guards: with an expiry, the next process started after it lapsed
+        re-added the last day's rows next to their live members and counted
+        the day twice. A window that already holds members is live and is
+        never seeded, in case the marker alone was evicted.
+        """
+        cls = GeminiRateLimiter
+        if await redis.set(_SEEDED_KEY, "1", nx=True) and not await redis.zcard(_CALLS_KEY):
+            try:
+                async with get_connection() as conn:
+                    rows = await conn.fetch(
+                        "SELECT called_at FROM api_rate_limits WHERE called_at > $1",
+                        datetime.now(timezone.utc) - timedelta(hours=24),
+                    )
+            except Exception as e:
+                # Leave the marker in place: a missing audit table must not turn
+                # every call into a seed attempt. The window simply starts empty.
+                print(f"[RateLimiter] Could not seed Redis window from database: {e}")
+                rows = []
+            if rows:
+                mapping = {
+                    f"db:{i}:{int(r['called_at'].timestamp() * 1000)}": int(r["called_at"].timestamp() * 1000)
+                    for i, r in enumerate(rows)
+                }
+                await redis.zadd(_CALLS_KEY, mapping)
+                await redis.pexpire(_CALLS_KEY, _DAY_MS)
+                print(f"[RateLimiter] Seeded Redis window with {len(rows)} calls from database")
+        cls._seed_checked = True
+
+    async def flush_audit(self) -> int:
+        """Drain queued audit rows from Redis into `api_rate_limits` in one COPY.
+
+        Rows are popped before the write; if the write fails they are pushed back
+        so the next drain retries them. Returns the number of rows written.
+        """
+        cls = GeminiRateLimiter
+        cls._last_flush = time.monotonic()
+        try:
+            redis = _limiter_redis()
+            raw = await redis.lpop(_AUDIT_KEY, AUDIT_BATCH_SIZE * 4)
+        except Exception as e:
+            print(f"[RateLimiter] Audit drain skipped, Redis unavailable: {e}")
+            return 0
+        if not raw:
+            return 0
+        if isinstance(raw, str):
+            raw = [raw]
+        records = []
+        for item in raw:
+            try:
+                row = json.loads(item)
+                records.append((
+                    row["service_name"],
+                    row.get("endpoint"),
+                    datetime.fromisoformat(row["called_at"]),
+                ))
+            except (ValueError, KeyError, TypeError):
+                print(f"[RateLimiter] Dropping malformed audit row: {item!r}")
+        if not records:
+            return 0
+        try:
+            async with get_connection() as conn:
+                await conn.copy_records_to_table(
+                    "api_rate_limits",
+                    records=records,
+                    columns=["service_name", "endpoint", "called_at"],
+                )
+        except Exception as e:
+            print(f"[RateLimiter] Audit drain failed, requeueing {len(raw)} rows: {e}")
+            try:
+                await redis.lpush(_AUDIT_KEY, *reversed(raw))
+            except Exception:
+                pass
+            return 0
+        return len(records)
+
+    def _raise_blocked(
+        self, service_name: str, endpoint: Optional[str], limit_type: str, hourly_count: int, daily_count: int
+    ) -> None:
+        if limit_type == "hourly":
+            count, limit = hourly_count, self.hourly_limit
+        else:
+            count, limit = daily_count, self.daily_limit
+        print(f"[RateLimiter] BLOCKED {service_name}/{endpoint}: {limit_type} limit ({count}/{limit})")
+        raise RateLimitExceeded(
+            f"Gemini API {limit_type} limit exceeded ({count}/{limit})",
+            limit_type=limit_type,
+            current_count=count,
+            limit=limit,
+        )
+
+    # ── Public API ─────────────────────────────────────────────────────
+
     async def check_limit(self, service_name: str, endpoint: Optional[str] = None) -> None:
         """
         Check if rate limit allows another call. Raises RateLimitExceeded if over limit.
@@ -53,6 +298,13 @@ class GeminiRateLimiter:
         Raises:
             RateLimitExceeded: If hourly or daily limit is exceeded
         """
+        result = await self._redis_window("check", service_name, endpoint)
+        if result is not None:
+            allowed, hourly_count, daily_count, blocked_by = result
+            if not allowed:
+                self._raise_blocked(service_name, endpoint, blocked_by, hourly_count, daily_count)
+            return
+
         async with get_connection() as conn:
             now = datetime.now(timezone.utc)
             one_hour_ago = now - timedelta(hours=1)
@@ -70,24 +322,11 @@ class GeminiRateLimiter:
                 one_day_ago,
             )
 
-            # Check limits
-            if hourly_count >= self.hourly_limit:
-                print(f"[RateLimiter] BLOCKED {service_name}/{endpoint}: hourly limit ({hourly_count}/{self.hourly_limit})")
-                raise RateLimitExceeded(
-                    f"Gemini API hourly limit exceeded ({hourly_count}/{self.hourly_limit})",
-                    limit_type="hourly",
-                    current_count=hourly_count,
-                    limit=self.hourly_limit,
-                )
-
-            if daily_count >= self.daily_limit:
-                print(f"[RateLimiter] BLOCKED {service_name}/{endpoint}: daily limit ({daily_count}/{self.daily_limit})")
-                raise RateLimitExceeded(
-                    f"Gemini API daily limit exceeded ({daily_count}/{self.daily_limit})",
-                    limit_type="daily",
-                    current_count=daily_count,
-                    limit=self.daily_limit,
-                )
+        # Check limits
+        if hourly_count >= self.hourly_limit:
+            self._raise_blocked(service_name, endpoint, "hourly", hourly_count, daily_count)
+        if daily_count >= self.daily_limit:
+            self._raise_blocked(service_name, endpoint, "daily", hourly_count, daily_count)
 
     async def record_call(self, service_name: str, endpoint: Optional[str] = None) -> None:
         """
@@ -97,10 +336,14 @@ class GeminiRateLimiter:
             service_name: Name of the calling service (e.g., "gemini_compliance")
             endpoint: Optional endpoint/operation label for monitoring
         """
+        safe_endpoint = endpoint[:100] if endpoint else None
+        if await self._redis_window("record", service_name, endpoint) is not None:
+            return
+        await self._insert_call(service_name, safe_endpoint)
+
+    async def _insert_call(self, service_name: str, safe_endpoint: Optional[str]) -> None:
         async with get_connection() as conn:
             now = datetime.now(timezone.utc)
-            # Truncate endpoint to fit VARCHAR(100)
-            safe_endpoint = endpoint[:100] if endpoint else None
             await conn.execute(
                 """
                 INSERT INTO api_rate_limits (service_name, endpoint, called_at)
@@ -117,6 +360,8 @@ class GeminiRateLimiter:
         Check limits and record the call. For single-call operations (no retries).
         For retry loops, use check_limit() before the loop and record_call() inside.
 
+        On the Redis path the check and the record are one atomic round trip.
+
         Args:
             service_name: Name of the calling service
             endpoint: Optional endpoint/operation label
@@ -124,6 +369,12 @@ class GeminiRateLimiter:
         Raises:
             RateLimitExceeded: If hourly or daily limit is exceeded
         """
+        result = await self._redis_window("check_record", service_name, endpoint)
+        if result is not None:
+            allowed, hourly_count, daily_count, blocked_by = result
+            if not allowed:
+                self._raise_blocked(service_name, endpoint, blocked_by, hourly_count, daily_count)
+            return
         await self.check_limit(service_name, endpoint)
         await self.record_call(service_name, endpoint)
 
@@ -134,6 +385,10 @@ class GeminiRateLimiter:
         Returns:
             Dict with hourly/daily counts, limits, and recent call breakdown by service.
         """
+        # Drain queued audit rows first so the DB view includes recent calls.
+        if time.monotonic() >= GeminiRateLimiter._redis_down_until:
+            while await self.flush_audit() >= AUDIT_BATCH_SIZE * 4:
+                pass
         async with get_connection() as conn:
             now = datetime.now(timezone.utc)
             one_hour_ago = now - timedelta(hours=1)
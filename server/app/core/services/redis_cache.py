@@ -1,11 +1,29 @@
-"""Lightweight Redis cache module for server-side response caching."""
-
+"""Lightweight Redis cache module for server-side response caching.
+
+Besides plain get/set/delete, `cached` / `get_or_compute` layer three things
+on top for read-heavy endpoints:
+
+* tags — each cached key is also SADDed into `cache:tag:<tag>`, so
+  `invalidate_tags("company:<id>")` deletes exactly the tagged keys instead
+  of SCANning the keyspace like `cache_delete_pattern`. It also bumps
+  `cache:tagver:<tag>`; a recompute that started before the bump doesn't
+  write its (pre-invalidation) result back;
+* single-flight — concurrent misses on one key share a single recompute: one
+  future per key inside the process, a `SET NX PX` lock across workers;
+* stale-while-revalidate — entries carry a `fresh_until` stamp and live
+  `stale_ttl` seconds past it; a stale hit is served immediately while one
+  caller refreshes it in the background.
+"""
+
+import asyncio
+import functools
 import json
 import hmac
 import os
 import time as _time
+import uuid
 from collections import defaultdict
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Iterable, Optional
 
 import redis.asyncio as aioredis
 from fastapi import HTTPException, Request
@@ -93,6 +111,339 @@ def admin_bookmarked_requirements_key() -> str:
     return "admin_bookmarked_requirements"
 
 
+# --- Tags ---
+def company_cache_tag(company_id) -> str:
+    return f"company:{company_id}"
+
+ADMIN_QUALITY_AUDIT_TAG = "admin:quality-audit"
+
+_TAG_PREFIX = "cache:tag:"
+_TAG_VERSION_PREFIX = "cache:tagver:"
+# Version counters only need to outlive the longest recompute.
+_TAG_VERSION_TTL_SECONDS = 24 * 3600
+_LOCK_PREFIX = "cache:lock:"
+# How often a worker that lost the recompute lock re-reads the key.
+_LOCK_POLL_SECONDS = 0.05
+
+
+def _tag_key(tag: str) -> str:
+    return f"{_TAG_PREFIX}{tag}"
+
+
+def _tag_version_key(tag: str) -> str:
+    return f"{_TAG_VERSION_PREFIX}{tag}"
+
+
+async def _tag_versions(redis: aioredis.Redis, tags: tuple[str, ...]) -> Optional[tuple]:
+    """Current invalidation counters for `tags`, or None if Redis errored."""
+    if not tags:
+        return ()
+    try:
+        return tuple(await redis.mget([_tag_version_key(tag) for tag in tags]))
+    except Exception:
+        return None
+
+
+def _jsonable(value: Any) -> Any:
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+async def cache_set_tagged(
+    redis: aioredis.Redis, key: str, value: Any, ttl: int = 300, tags: Iterable[str] = ()
+) -> None:
+    """`cache_set` plus membership in each tag set, in one round trip.
+
+    Tag sets are given the longest TTL of their members (NX sets it on a new
+    set, GT only ever extends it), so they age out with the keys they index.
+    """
+    try:
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(key, json.dumps(value, default=str), ex=ttl)
+        for tag in tags:
+            pipe.sadd(_tag_key(tag), key)
+            pipe.expire(_tag_key(tag), ttl, nx=True)
+            pipe.expire(_tag_key(tag), ttl, gt=True)
+        await pipe.execute()
+    except Exception:
+        pass
+
+
+async def invalidate_tags(redis: aioredis.Redis, *tags: str) -> int:
+    """Delete every key filed under any of `tags`. Returns keys deleted.
+
+    Members are SREMed rather than the tag set DELeted, so a key tagged
+    between the read and the delete stays indexed for the next invalidation.
+    Each tag's version is bumped first, even when nothing is cached yet, so
+    a recompute already in flight drops its result instead of caching it.
+    """
+    if not tags:
+        return 0
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.incr(_tag_version_key(tag))
+            pipe.expire(_tag_version_key(tag), _TAG_VERSION_TTL_SECONDS)
+        for tag in tags:
+            pipe.smembers(_tag_key(tag))
+        memberships = (await pipe.execute())[2 * len(tags):]
+        keys = set().union(*memberships)
+        if not keys:
+            return 0
+        pipe = redis.pipeline(transaction=False)
+        pipe.delete(*keys)
+        for tag, members in zip(tags, memberships):
+            if members:
+                pipe.srem(_tag_key(tag), *members)
+        deleted, *_ = await pipe.execute()
+        return int(deleted or 0)
+    except Exception:
+        return 0
+
+
+async def invalidate_company_cache(company_id) -> None:
+    """Drop every tagged cache entry for a company (no-op without Redis)."""
+    redis = get_redis_cache()
+    if redis:
+        await invalidate_tags(redis, company_cache_tag(company_id))
+
+
+# --- Single-flight + stale-while-revalidate ---
+# Per-process, per-key recompute futures. Callers that miss while a recompute
+# is already running await the same future instead of querying again.
+_inflight: dict[str, asyncio.Future] = {}
+# Background stale-while-revalidate refreshes, one per key. Kept apart from
+# `_inflight` (a miss must never await a refresh, which returns nothing) and
+# doubling as the strong refs that keep the tasks from being collected.
+_refreshing: dict[str, asyncio.Task] = {}
+
+
+async def _read_entry(redis: aioredis.Redis, key: str) -> Optional[dict]:
+    entry = await cache_get(redis, key)
+    # Plain `cache_set` values under the same key (written before a route
+    # adopted `cached`) aren't envelopes — treat them as a miss.
+    if isinstance(entry, dict) and "fresh_until" in entry and "value" in entry:
+        return entry
+    return None
+
+
+async def _write_entry(
+    redis: aioredis.Redis, key: str, value: Any, ttl: int, stale_ttl: int, tags: Iterable[str]
+) -> None:
+    entry = {"value": _jsonable(value), "fresh_until": _time.time() + ttl}
+    await cache_set_tagged(redis, key, entry, ttl=ttl + stale_ttl, tags=tags)
+
+
+async def _write_entry_unless_invalidated(
+    redis: aioredis.Redis,
+    key: str,
+    value: Any,
+    ttl: int,
+    stale_ttl: int,
+    tags: tuple[str, ...],
+    versions: Optional[tuple],
+) -> None:
+    """`_write_entry`, skipped if any tag was invalidated since `versions`
+    was read — the value may predate the write that invalidated it."""
+    if versions is None or await _tag_versions(redis, tags) != versions:
+        return
+    await _write_entry(redis, key, value, ttl, stale_ttl, tags)
+
+
+async def _acquire_lock(redis: aioredis.Redis, key: str, timeout: float) -> Optional[str]:
+    """Cross-worker recompute lock. Returns the owner token, or None if held.
+
+    If Redis itself errors, report the lock as ours: computing without the
+    lock is better than every caller waiting on a lock nobody can take.
+    """
+    token = uuid.uuid4().hex
+    try:
+        got = await redis.set(_LOCK_PREFIX + key, token, nx=True, px=int(timeout * 1000))
+    except Exception:
+        return token
+    return token if got else None
+
+
+async def _release_lock(redis: aioredis.Redis, key: str, token: str) -> None:
+    # Only drop the lock if it's still ours; after `timeout` it may have
+    # expired and been taken by another worker.
+    try:
+        if await redis.get(_LOCK_PREFIX + key) == token:
+            await redis.delete(_LOCK_PREFIX + key)
+    except Exception:
+        pass
+
+
+async def _recompute(
+    redis: aioredis.Redis,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    stale_ttl: int,
+    tags: tuple[str, ...],
+    lock_timeout: float,
+) -> Any:
+    token = await _acquire_lock(redis, key, lock_timeout)
+    if token is None:
+        # Another worker is computing this key: wait for its write, then fall
+        # back to computing ourselves if it died or overran the lock.
+        deadline = _time.monotonic() + lock_timeout
+        while _time.monotonic() < deadline:
+            await asyncio.sleep(_LOCK_POLL_SECONDS)
+            entry = await _read_entry(redis, key)
+            if entry is not None:
+                return entry["value"]
+    try:
+        versions = await _tag_versions(redis, tags)
+        value = await compute()
+        await _write_entry_unless_invalidated(redis, key, value, ttl, stale_ttl, tags, versions)
+        return value
+    finally:
+        if token is not None:
+            await _release_lock(redis, key, token)
+
+
+async def _single_flight(key: str, run: Callable[[], Awaitable[Any]]) -> Any:
+    while True:
+        pending = _inflight.get(key)
+        if pending is None or pending.done():
+            break
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # The leader's request was cancelled (client disconnect), not
+            # ours: loop and let one waiter take over as the new leader.
+            if pending.cancelled() and not asyncio.current_task().cancelling():
+                continue
+            raise
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await run()
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as exc:
+        future.set_exception(exc)
+        # Waiters re-raise it; mark retrieved so the loop doesn't log it again.
+        future.exception()
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def _refresh(
+    redis: aioredis.Redis,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    stale_ttl: int,
+    tags: tuple[str, ...],
+    lock_timeout: float,
+) -> None:
+    token = await _acquire_lock(redis, key, lock_timeout)
+    if token is None:
+        return  # someone else is already refreshing it
+    try:
+        versions = await _tag_versions(redis, tags)
+        value = await compute()
+        await _write_entry_unless_invalidated(redis, key, value, ttl, stale_ttl, tags, versions)
+    except Exception as exc:
+        # The stale value stays in place until its hard TTL runs out.
+        print(f"[Cache] Background refresh of {key} failed: {exc}")
+    finally:
+        await _release_lock(redis, key, token)
+
+
+def _spawn_refresh(key: str, run: Callable[[], Awaitable[None]]) -> None:
+    task = _refreshing.get(key)
+    if task is not None and not task.done():
+        return
+    task = asyncio.create_task(run())
+    _refreshing[key] = task
+
+    def _done(t: asyncio.Task) -> None:
+        if _refreshing.get(key) is t:
+            del _refreshing[key]
+
+    task.add_done_callback(_done)
+
+
+async def get_or_compute(
+    redis: aioredis.Redis,
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    tags: Iterable[str] = (),
+    lock_timeout: float = 10.0,
+) -> Any:
+    """Return the cached value for `key`, computing it at most once at a time.
+
+    Fresh hit: returned as-is. Stale hit (past `ttl`, within `stale_ttl`):
+    returned as-is while a background task recomputes it. Miss: one caller
+    per process runs `compute`, guarded by a Redis lock across workers.
+    Values are stored as JSON, so a pydantic model comes back as a dict.
+    """
+    tags = tuple(tags)
+    entry = await _read_entry(redis, key)
+    if entry is not None:
+        if entry["fresh_until"] <= _time.time():
+            _spawn_refresh(
+                key,
+                lambda: _refresh(redis, key, compute, ttl, stale_ttl, tags, lock_timeout),
+            )
+        return entry["value"]
+    return await _single_flight(
+        key,
+        lambda: _recompute(redis, key, compute, ttl, stale_ttl, tags, lock_timeout),
+    )
+
+
+def cached(
+    key: Callable[..., str],
+    *,
+    ttl: int,
+    stale_ttl: int = 0,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    lock_timeout: float = 10.0,
+):
+    """Decorator form of `get_or_compute` for async functions.
+
+    `key` and `tags` are called with the decorated function's arguments::
+
+        @cached(compliance_dashboard_key, ttl=180, stale_ttl=120,
+                tags=lambda company_id, horizon_days: [company_cache_tag(company_id)])
+        async def load_dashboard(company_id, horizon_days): ...
+
+    Without Redis the function is simply called.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            redis = get_redis_cache()
+            if redis is None:
+                return await fn(*args, **kwargs)
+            return await get_or_compute(
+                redis,
+                key(*args, **kwargs),
+                lambda: fn(*args, **kwargs),
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                tags=tags(*args, **kwargs) if tags else (),
+                lock_timeout=lock_timeout,
+            )
+
+        return wrapper
+
+    return decorator
+
+
 _rl_attempts: dict[str, list[float]] = defaultdict(list)
 
 
@@ -188,7 +539,8 @@ async def get_rate_limit_state(key: str, action: str, limit: int, window: int) -
 
 
 async def cache_delete_pattern(redis, prefix: str) -> None:
-    """Delete all keys matching a prefix. Use sparingly."""
+    """Delete all keys matching a prefix. Use sparingly — SCANs the whole
+    keyspace; prefer tagging the keys and `invalidate_tags`."""
     try:
         cursor = b"0"
         while cursor:
@@ -1,17 +1,30 @@
+"""Object storage: S3 (public bucket behind CloudFront + private buckets) with
+a local `app/uploads` fallback.
+
+Every S3/HTTP/disk operation runs off the event loop — boto3 is blocking, so
+its calls go through `asyncio.to_thread`; legacy CloudFront URLs are fetched
+with httpx. Reads of S3 objects go through the host-wide disk cache in
+`storage_cache.py` (keys are write-once, see there) — public-bucket objects
+only, private documents are never written to local disk; `open_stream` serves
+large objects chunk by chunk instead, and `download_many` fetches a set of
+objects concurrently.
+"""
 import asyncio
 import base64
 import logging
 import os
 import re
-import urllib.request
-from typing import Optional
+import shutil
+from typing import IO, AsyncIterator, Optional, Union
 from uuid import uuid4
 
 import boto3
+import httpx
 from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
 from ...config import get_settings
+from .storage_cache import get_object_cache
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +41,11 @@ _IMAGE_EXT_MIME = {
 # Matches the src="..." of an <img> tag (double-quoted attribute value).
 _IMG_SRC_RE = re.compile(r'<img\s+[^>]*src="([^"]+)"', re.IGNORECASE)
 
+# Chunk size for open_stream / streamed uploads, and how many objects
+# download_many keeps in flight at once.
+STREAM_CHUNK_BYTES = 1024 * 1024
+DOWNLOAD_CONCURRENCY = 8
+
 
 class StorageService:
     """Service for storing files in S3 or locally."""
@@ -113,6 +131,55 @@ class StorageService:
         except RuntimeError:
             return False
 
+    def _s3_location(self, path: str) -> Optional[tuple[str, str]]:
+        """(bucket, key) for a CloudFront URL of the public bucket or an
+        s3:// URI; None for anything else."""
+        if self.cloudfront_domain and path.startswith(
+            f"https://{self.cloudfront_domain}/"
+        ):
+            if not self.s3_client or not self.bucket:
+                raise RuntimeError("S3 not configured but CloudFront path provided")
+            return self.bucket, path[len(f"https://{self.cloudfront_domain}/") :]
+        if path.startswith("s3://"):
+            if not self.s3_client:
+                raise RuntimeError("S3 not configured but S3 path provided")
+            parts = path[5:].split("/", 1)
+            return parts[0], parts[1] if len(parts) > 1 else ""
+        return None
+
+    @staticmethod
+    def _is_legacy_cloudfront(path: str) -> bool:
+        return path.startswith("https://") and ".cloudfront.net/" in path
+
+    async def _cache_get(self, path: str) -> Optional[bytes]:
+        cache = get_object_cache()
+        if cache is None:
+            return None
+        return await asyncio.to_thread(cache.get, path)
+
+    async def _cache_put(self, path: str, data: bytes, etag: Optional[str]) -> None:
+        cache = get_object_cache()
+        if cache is not None:
+            await asyncio.to_thread(cache.put, path, data, etag)
+
+    async def _put_object(self, bucket: str, key: str, body: Union[bytes, IO[bytes]],
+                          content_type: Optional[str]) -> Optional[str]:
+        """PUT bytes (one request) or a file object (streamed, multipart past
+        boto3's threshold) without blocking the loop. Returns the ETag when
+        S3 reports one."""
+        extra_args = {"ServerSideEncryption": "AES256"}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if isinstance(body, (bytes, bytearray)):
+            resp = await asyncio.to_thread(
+                lambda: self.s3_client.put_object(Bucket=bucket, Key=key, Body=body, **extra_args)
+            )
+            return resp.get("ETag") if isinstance(resp, dict) else None
+        await asyncio.to_thread(
+            lambda: self.s3_client.upload_fileobj(body, bucket, key, ExtraArgs=extra_args)
+        )
+        return None
+
     async def upload_file(
         self,
         file_bytes: bytes,
@@ -127,37 +194,62 @@ class StorageService:
         """
         if self.s3_client and self.bucket:
             key = self._generate_key(filename, prefix)
-
-            extra_args = {}
-            if content_type:
-                extra_args["ContentType"] = content_type
-
             try:
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    lambda: self.s3_client.put_object(
-                        Bucket=self.bucket,
-                        Key=key,
-                        Body=file_bytes,
-                        ServerSideEncryption="AES256",
-                        **extra_args,
-                    ),
-                )
-                return self._get_cloudfront_url(key)
+                etag = await self._put_object(self.bucket, key, file_bytes, content_type)
             except ClientError as e:
                 raise RuntimeError(f"Failed to upload to S3: {e}")
+            path = self._get_cloudfront_url(key)
+            # Write-through: logos and templates are read back right away.
+            await self._cache_put(path, file_bytes, etag)
+            return path
         else:
             # Local storage fallback
             ext = os.path.splitext(filename)[1].lower()
             unique_id = uuid4().hex
             local_path = os.path.join(self.local_dir, f"{unique_id}{ext}")
 
-            with open(local_path, "wb") as f:
-                f.write(file_bytes)
+            def _write():
+                with open(local_path, "wb") as f:
+                    f.write(file_bytes)
 
+            await asyncio.to_thread(_write)
             return f"/uploads/resumes/{unique_id}{ext}"
 
+    async def upload_stream(
+        self,
+        fileobj: IO[bytes],
+        filename: str,
+        prefix: str = "resumes",
+        content_type: Optional[str] = None,
+        private: bool = False,
+    ) -> str:
+        """`upload_file` / `upload_private_file` for a file object (e.g. an
+        UploadFile's spooled `.file`), streamed instead of read into memory."""
+        if private:
+            bucket = self.private_bucket or self.bucket
+            if not self.s3_client or not bucket:
+                raise RuntimeError("S3 not configured for private uploads")
+        else:
+            bucket = self.bucket if self.s3_client else None
+        if bucket:
+            key = self._generate_key(filename, prefix)
+            try:
+                await self._put_object(bucket, key, fileobj, content_type)
+            except ClientError as e:
+                raise RuntimeError(f"Failed to upload to S3: {e}")
+            return f"s3://{bucket}/{key}" if private else self._get_cloudfront_url(key)
+
+        ext = os.path.splitext(filename)[1].lower()
+        unique_id = uuid4().hex
+        local_path = os.path.join(self.local_dir, f"{unique_id}{ext}")
+
+        def _copy():
+            with open(local_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, STREAM_CHUNK_BYTES)
+
+        await asyncio.to_thread(_copy)
+        return f"/uploads/resumes/{unique_id}{ext}"
+
     async def download_file(self, path: str) -> bytes:
         """Download a file from storage.
 
@@ -167,48 +259,102 @@ class StorageService:
         Returns:
             File contents as bytes
         """
-        # Handle CloudFront URLs - convert back to S3 path
-        if self.cloudfront_domain and path.startswith(
-            f"https://{self.cloudfront_domain}/"
-        ):
-            key = path[len(f"https://{self.cloudfront_domain}/") :]
-            if not self.s3_client or not self.bucket:
-                raise RuntimeError("S3 not configured but CloudFront path provided")
+        location = self._s3_location(path)
+        if location is not None:
+            bucket, key = location
+            # Public-bucket objects only: private-bucket documents (medical,
+            # ER, contracts) never land in the on-disk cache.
+            cacheable = bucket == self.bucket
+            if cacheable:
+                cached = await self._cache_get(path)
+                if cached is not None:
+                    return cached
+
+            def _get():
+                response = self.s3_client.get_object(Bucket=bucket, Key=key)
+                return response["Body"].read(), response.get("ETag")
+
             try:
-                response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                return response["Body"].read()
+                data, etag = await asyncio.to_thread(_get)
             except ClientError as e:
                 raise RuntimeError(f"Failed to download from S3: {e}")
+            if cacheable:
+                await self._cache_put(path, data, etag)
+            return data
 
         # Handle legacy CloudFront URLs from a previous distribution via HTTP
-        if path.startswith("https://") and ".cloudfront.net/" in path:
+        if self._is_legacy_cloudfront(path):
+            cached = await self._cache_get(path)
+            if cached is not None:
+                return cached
             try:
-                req = urllib.request.Request(path)
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    return resp.read()
+                async with httpx.AsyncClient(timeout=30) as client:
+                    resp = await client.get(path)
+                    resp.raise_for_status()
+                    data = resp.content
             except Exception as e:
                 raise RuntimeError(
                     f"Failed to download from legacy CloudFront URL: {e}"
                 )
+            await self._cache_put(path, data, resp.headers.get("etag"))
+            return data
 
-        if path.startswith("s3://"):
-            if not self.s3_client:
-                raise RuntimeError("S3 not configured but S3 path provided")
+        local_path = self._resolve_local_upload_path(path)
 
-            # Parse s3://bucket/key
-            parts = path[5:].split("/", 1)
-            bucket = parts[0]
-            key = parts[1] if len(parts) > 1 else ""
+        def _read():
+            with open(local_path, "rb") as f:
+                return f.read()
 
+        return await asyncio.to_thread(_read)
+
+    async def open_stream(
+        self, path: str, chunk_size: int = STREAM_CHUNK_BYTES
+    ) -> AsyncIterator[bytes]:
+        """Open `path` for a chunked read. Not-found / access errors raise
+        HERE, before anything is yielded — so a route can still answer 404
+        before handing the iterator to a StreamingResponse.
+
+        Streamed reads bypass the disk cache (they are for the big objects),
+        but a cached copy is served from it.
+        """
+        location = self._s3_location(path)
+        if location is not None:
+            bucket, key = location
+            if bucket == self.bucket:
+                cached = await self._cache_get(path)
+                if cached is not None:
+                    return _iter_bytes(cached, chunk_size)
             try:
-                response = self.s3_client.get_object(Bucket=bucket, Key=key)
-                return response["Body"].read()
+                response = await asyncio.to_thread(
+                    lambda: self.s3_client.get_object(Bucket=bucket, Key=key)
+                )
             except ClientError as e:
                 raise RuntimeError(f"Failed to download from S3: {e}")
+            return _iter_body(response["Body"], chunk_size)
+
+        if self._is_legacy_cloudfront(path):
+            return _iter_bytes(await self.download_file(path), chunk_size)
 
         local_path = self._resolve_local_upload_path(path)
-        with open(local_path, "rb") as f:
-            return f.read()
+        fh = await asyncio.to_thread(open, local_path, "rb")
+        return _iter_body(fh, chunk_size)
+
+    async def download_many(
+        self, paths: list[str], concurrency: int = DOWNLOAD_CONCURRENCY
+    ) -> list[Union[bytes, Exception]]:
+        """`download_file` for each path, at most `concurrency` in flight.
+        Results line up with `paths`; a failed download is its exception
+        (like `gather(..., return_exceptions=True)`), never a raise."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _one(path: str) -> Union[bytes, Exception]:
+            async with sem:
+                try:
+                    return await self.download_file(path)
+                except Exception as e:  # noqa: BLE001
+                    return e
+
+        return list(await asyncio.gather(*(_one(p) for p in paths)))
 
     async def inline_image_data_uri(self, src: Optional[str]) -> Optional[str]:
         """Return a base64 `data:` URI for a storage-owned image, else None.
@@ -229,10 +375,7 @@ class StorageService:
             return None  # external URL — leave it for safe_url_fetcher to block
         try:
             data = await self.download_file(src)
-            ext = src.rsplit(".", 1)[-1].lower() if "." in src else "png"
-            mime = _IMAGE_EXT_MIME.get(ext, "image/png")
-            b64 = base64.b64encode(data).decode("ascii")
-            return f"data:{mime};base64,{b64}"
+            return _data_uri(src, data)
         except Exception:
             logger.warning(
                 "Could not inline storage image for PDF: %s", src, exc_info=True
@@ -246,15 +389,27 @@ class StorageService:
         Non-storage (external) image URLs are left untouched so the SSRF-safe
         fetcher blocks them at render time. A failed download leaves that one
         `<img>` unchanged (it then gets blocked) rather than aborting the pass.
+        Distinct srcs are fetched concurrently, each once.
         """
         if not html:
             return html
-        result = html
-        for match in reversed(list(_IMG_SRC_RE.finditer(result))):
-            src = match.group(1)
-            if not self.is_supported_storage_path(src):
+        matches = [
+            m for m in _IMG_SRC_RE.finditer(html)
+            if self.is_supported_storage_path(m.group(1))
+        ]
+        srcs = list(dict.fromkeys(m.group(1) for m in matches))
+        fetched = await self.download_many(srcs)
+        data_uris = {}
+        for src, data in zip(srcs, fetched):
+            if isinstance(data, Exception):
+                logger.warning(
+                    "Could not inline storage image for PDF: %s", src, exc_info=data
+                )
                 continue
-            data_uri = await self.inline_image_data_uri(src)
+            data_uris[src] = _data_uri(src, data)
+        result = html
+        for match in reversed(matches):
+            data_uri = data_uris.get(match.group(1))
             if data_uri:
                 result = result[: match.start(1)] + data_uri + result[match.end(1) :]
         return result
@@ -265,29 +420,19 @@ class StorageService:
         Returns:
             True if deleted, False if not found
         """
-        # Handle CloudFront URLs - convert back to S3 path
-        if self.cloudfront_domain and path.startswith(
-            f"https://{self.cloudfront_domain}/"
-        ):
-            if not self.s3_client or not self.bucket:
-                return False
-            key = path[len(f"https://{self.cloudfront_domain}/") :]
-            try:
-                self.s3_client.delete_object(Bucket=self.bucket, Key=key)
-                return True
-            except ClientError:
-                return False
-
-        if path.startswith("s3://"):
-            if not self.s3_client:
-                return False
-
-            parts = path[5:].split("/", 1)
-            bucket = parts[0]
-            key = parts[1] if len(parts) > 1 else ""
-
+        try:
+            location = self._s3_location(path)
+        except RuntimeError:
+            return False
+        if location is not None:
+            bucket, key = location
+            cache = get_object_cache()
+            if cache is not None:
+                cache.drop(path)
             try:
-                self.s3_client.delete_object(Bucket=bucket, Key=key)
+                await asyncio.to_thread(
+                    lambda: self.s3_client.delete_object(Bucket=bucket, Key=key)
+                )
                 return True
             except ClientError:
                 return False
@@ -321,21 +466,7 @@ class StorageService:
             raise RuntimeError("S3 not configured for private uploads")
 
         key = self._generate_key(filename, prefix)
-        extra_args = {}
-        if content_type:
-            extra_args["ContentType"] = content_type
-
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(
-            None,
-            lambda: self.s3_client.put_object(
-                Bucket=bucket,
-                Key=key,
-                Body=file_bytes,
-                ServerSideEncryption="AES256",
-                **extra_args,
-            ),
-        )
+        await self._put_object(bucket, key, file_bytes, content_type)
         return f"s3://{bucket}/{key}"
 
     def get_presigned_download_url(
@@ -367,8 +498,13 @@ class StorageService:
         bucket = parts[0]
         key = parts[1] if len(parts) > 1 else ""
 
+        cache = get_object_cache()
+        if cache is not None:
+            cache.drop(path)
         try:
-            self.s3_client.delete_object(Bucket=bucket, Key=key)
+            await asyncio.to_thread(
+                lambda: self.s3_client.delete_object(Bucket=bucket, Key=key)
+            )
             return True
         except ClientError:
             return False
@@ -430,6 +566,30 @@ class StorageService:
             return None
 
 
+def _data_uri(src: str, data: bytes) -> str:
+    ext = src.rsplit(".", 1)[-1].lower() if "." in src else "png"
+    mime = _IMAGE_EXT_MIME.get(ext, "image/png")
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+async def _iter_bytes(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+async def _iter_body(body, chunk_size: int) -> AsyncIterator[bytes]:
+    """Chunks of a blocking file-like (S3 StreamingBody or an open file), each
+    read in a worker thread. Closes it when exhausted or abandoned."""
+    try:
+        while True:
+            chunk = await asyncio.to_thread(body.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        await asyncio.to_thread(body.close)
+
+
 # Singleton instance
 _storage: Optional[StorageService] = None
 
@@ -0,0 +1,227 @@
+"""Bounded on-disk LRU cache for objects read through `StorageService`.
+
+Company logos, handbook PDFs and offer-letter templates are fetched from S3
+over and over — every PDF render inlines the same logo, every handbook audit
+re-downloads the same file. Objects StorageService writes are keyed
+`<prefix>/<uuid4><ext>` and never overwritten, so a cached copy of a key is
+valid until the key is deleted; the ETag S3 returned is kept alongside it as
+the object's identity. Only public-bucket objects (and legacy CloudFront
+URLs) are cached — StorageService never hands private-bucket documents to
+this cache.
+
+Layout (shared by every process on the host — writes are tmp + rename):
+
+* `blobs/<sha256>` — object bytes, content-addressed, so the same asset
+  uploaded under two keys is stored once;
+* `refs/<sha256(path)>` — JSON `{path, etag, blob, size}`; its mtime is the
+  LRU clock (touched on every hit).
+
+When the total blob size passes `STORAGE_CACHE_MAX_BYTES` the least recently
+used refs are dropped and unreferenced blobs deleted. Objects larger than
+`STORAGE_CACHE_MAX_OBJECT_BYTES` are never cached.
+
+STORAGE_CACHE=0 disables it; STORAGE_CACHE_DIR overrides the directory
+(default: `<tempdir>/matcha-storage-cache`).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("STORAGE_CACHE", "1") != "0"
+CACHE_DIR = os.getenv("STORAGE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "matcha-storage-cache")
+MAX_BYTES = int(os.getenv("STORAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+MAX_OBJECT_BYTES = int(os.getenv("STORAGE_CACHE_MAX_OBJECT_BYTES", str(25 * 1024 * 1024)))
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ObjectCache:
+    """Disk LRU of storage path -> bytes. Blocking file I/O — call from a
+    worker thread (StorageService does), never directly on the event loop."""
+
+    def __init__(self, root: str = CACHE_DIR, max_bytes: int = MAX_BYTES,
+                 max_object_bytes: int = MAX_OBJECT_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self._lock = threading.Lock()
+        # Bytes this process has added since it last measured the directory;
+        # a full scan only happens once that could have pushed it over.
+        self._approx_size: Optional[int] = None
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def _ref_path(self, path: str) -> str:
+        return os.path.join(self.root, "refs", _sha256(path.encode()))
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, "blobs", digest)
+
+    def get(self, path: str) -> Optional[bytes]:
+        ref_path = self._ref_path(path)
+        try:
+            with open(ref_path, "rb") as fh:
+                ref = json.load(fh)
+            with open(self._blob_path(ref["blob"]), "rb") as fh:
+                data = fh.read()
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        if ref.get("path") != path or _sha256(data) != ref["blob"]:
+            # Hash collision on the ref name, or a blob damaged on disk.
+            self.drop(path)
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        try:
+            os.utime(ref_path)
+        except OSError:
+            pass
+        with self._lock:
+            self.stats["hits"] += 1
+        return data
+
+    def put(self, path: str, data: bytes, etag: Optional[str] = None) -> None:
+        if len(data) > self.max_object_bytes:
+            return
+        try:
+            os.makedirs(os.path.join(self.root, "refs"), exist_ok=True)
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            digest = _sha256(data)
+            blob_path = self._blob_path(digest)
+            added = 0
+            if not os.path.exists(blob_path):
+                _write_atomic(blob_path, data)
+                added = len(data)
+            ref = {"path": path, "etag": etag, "blob": digest, "size": len(data)}
+            _write_atomic(self._ref_path(path), json.dumps(ref).encode())
+        except OSError:
+            logger.warning("storage cache: could not store %s", path, exc_info=True)
+            return
+        with self._lock:
+            self.stats["stores"] += 1
+            if self._approx_size is None:
+                self._approx_size = self._measure()
+            else:
+                self._approx_size += added
+            over = self._approx_size > self.max_bytes
+        if over:
+            self.evict()
+
+    def drop(self, path: str) -> None:
+        """Forget `path`. Its blob goes at the next eviction if nothing else
+        references it."""
+        try:
+            os.unlink(self._ref_path(path))
+        except OSError:
+            pass
+
+    def _measure(self) -> int:
+        try:
+            return sum(e.stat().st_size for e in os.scandir(os.path.join(self.root, "blobs")) if e.is_file())
+        except FileNotFoundError:
+            return 0
+
+    def evict(self) -> None:
+        """Drop least-recently-used refs until the blobs fit `max_bytes`
+        (with 10% headroom so the next few stores don't rescan)."""
+        refs_dir = os.path.join(self.root, "refs")
+        target = int(self.max_bytes * 0.9)
+        refs = []
+        try:
+            for entry in os.scandir(refs_dir):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    with open(entry.path, "rb") as fh:
+                        ref = json.load(fh)
+                    refs.append((entry.stat().st_mtime, entry.path, ref["blob"]))
+                except (OSError, ValueError, KeyError):
+                    continue
+        except FileNotFoundError:
+            return
+        refs.sort()
+        live = {blob for _, _, blob in refs}
+        blob_sizes = {}
+        for blob in live:
+            try:
+                blob_sizes[blob] = os.path.getsize(self._blob_path(blob))
+            except OSError:
+                blob_sizes[blob] = 0
+        total = sum(blob_sizes.values())
+        refcount: dict[str, int] = {}
+        for _, _, blob in refs:
+            refcount[blob] = refcount.get(blob, 0) + 1
+        evicted = 0
+        for _, ref_path, blob in refs:
+            if total <= target:
+                break
+            try:
+                os.unlink(ref_path)
+            except OSError:
+                continue
+            evicted += 1
+            refcount[blob] -= 1
+            if refcount[blob] == 0:
+                live.discard(blob)
+                total -= blob_sizes[blob]
+        # Unreferenced blobs: the ones just orphaned plus any left by drop().
+        try:
+            for entry in os.scandir(os.path.join(self.root, "blobs")):
+                if entry.name not in live and not entry.name.startswith(".tmp-"):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.stats["evictions"] += evicted
+            self._approx_size = total
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache: Optional[ObjectCache] = ObjectCache() if CACHE_ENABLED else None
+
+
+def get_object_cache() -> Optional[ObjectCache]:
+    return _cache
+
+
+def get_storage_cache_stats() -> dict:
+    """Hit/miss/store/eviction counters of this process's view of the cache."""
+    if _cache is None:
+        return {"enabled": False}
+    return {**_cache.snapshot(), "enabled": True}
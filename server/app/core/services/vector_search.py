@@ -0,0 +1,114 @@
+"""Shared nearest-neighbour query for the pgvector-backed RAG services.
+
+ER evidence, compliance requirements and payer policies each ran their own copy
+of the same query: cosine similarity in the SELECT, optional filters appended
+with hand-counted `$n` placeholders, a min-similarity predicate, ORDER BY
+distance, LIMIT. `search_nearest` builds that once.
+
+  * Scope predicates (the case, the tenant) are always bound. Optional filters
+    are pushed into the same WHERE clause next to the vector ordering, so
+    Postgres prunes before ranking; one whose value is None or an empty list is
+    skipped (the callers' "no filter" convention). Keeping the two apart means
+    a None case_id can never silently widen a search to every case.
+  * min_similarity is expressed as a distance bound (`<=> $1 <= 1 - min`), the
+    same expression the ORDER BY uses, instead of a second `1 - (...)` per row.
+  * The query vector is bound once as `$1` and travels in pgvector's binary
+    format (see app.database.vector); `ensure_vector_codec` covers raw worker
+    connections that did not come from the pool.
+"""
+
+from typing import Any, Iterable, Optional, Sequence
+
+import asyncpg
+
+from app.database.vector import ensure_vector_codec
+
+
+def build_nearest_query(
+    *,
+    select: str,
+    from_: str,
+    embedding_column: str,
+    where: Iterable[str] = (),
+    scope: Iterable[tuple[str, Any]] = (),
+    filters: Iterable[tuple[str, Any]] = (),
+    top_k: int,
+    min_similarity: float = 0.0,
+) -> tuple[str, list]:
+    """SQL + params (minus the `$1` query vector) for a top-k cosine search.
+
+    `where` holds static predicates. `scope` and `filters` entries are a
+    predicate template with one `{}` for its placeholder, e.g.
+    `("ce.category = ANY({}::text[])", categories)`; only `filters` entries
+    are dropped when their value is empty.
+    """
+    distance = f"{embedding_column} <=> $1::vector"
+    clauses = [w for w in where if w]
+    params: list = []
+
+    for template, value in scope:
+        params.append(value)
+        clauses.append(template.format(f"${len(params) + 1}"))
+
+    for template, value in filters:
+        if value is None or (isinstance(value, (list, tuple, set)) and not value):
+            continue
+        params.append(list(value) if isinstance(value, (tuple, set)) else value)
+        clauses.append(template.format(f"${len(params) + 1}"))
+
+    if min_similarity > 0:
+        params.append(1.0 - float(min_similarity))
+        clauses.append(f"{distance} <= ${len(params) + 1}")
+
+    params.append(top_k)
+    sql = (
+        f"SELECT {select}, 1 - ({distance}) AS similarity FROM {from_}"
+        + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        + f" ORDER BY {distance} LIMIT ${len(params) + 1}"
+    )
+    return sql, params
+
+
+async def search_nearest(
+    conn: asyncpg.Connection,
+    query_embedding: Sequence[float],
+    *,
+    select: str,
+    from_: str,
+    embedding_column: str,
+    where: Iterable[str] = (),
+    scope: Iterable[tuple[str, Any]] = (),
+    filters: Iterable[tuple[str, Any]] = (),
+    top_k: int = 10,
+    min_similarity: float = 0.0,
+    extra_where: Optional[str] = None,
+) -> list[asyncpg.Record]:
+    """Rows nearest to `query_embedding`, each with a `similarity` column.
+
+    `extra_where` takes a pre-rendered SQL fragment that starts with AND (the
+    shape `codified_gate_sql` returns) and is ANDed in verbatim.
+    """
+    clauses = list(where)
+    if extra_where:
+        fragment = extra_where.strip()
+        if fragment.upper().startswith("AND "):
+            fragment = fragment[4:]
+        clauses.append(f"({fragment})")
+
+    sql, params = build_nearest_query(
+        select=select,
+        from_=from_,
+        embedding_column=embedding_column,
+        where=clauses,
+        scope=scope,
+        filters=filters,
+        top_k=top_k,
+        min_similarity=min_similarity,
+    )
+    if await ensure_vector_codec(conn):
+        vector = list(query_embedding)
+    else:
+        # No pgvector type to bind a codec to (extension not created yet):
+        # fall back to the text literal so the error is Postgres's, not ours.
+        vector = "[" + ",".join(str(x) for x in query_embedding) + "]"
+    return await conn.fetch(sql, vector, *params)
@@ -18,8 +18,18 @@ from app.database.pool import (  # noqa: F401
     get_pool,
     close_pool,
     has_pool,
+    has_read_pool,
+    get_pool_stats,
     connection_or_direct,
     get_connection,
+    get_read_connection,
+    request_connection,
+)
+from app.database.vector import (  # noqa: F401
+    encode_vector,
+    decode_vector,
+    register_vector_codec,
+    ensure_vector_codec,
 )
 from app.database.handbook import _ensure_handbook_tables  # noqa: F401
 from app.database.bootstrap import init_db  # noqa: F401
@@ -4,15 +4,37 @@ Verbatim split of app/database.py lines 1-200 (one rewritten import: line 140
 `from .config import get_settings` -> `from app.config import get_settings`,
 since this module is now one package level deeper).
 """
+import asyncio
 import contextvars
 import json
+import logging
 import ssl as _ssl
 from contextlib import asynccontextmanager
 from typing import Optional
 
 import asyncpg
 
+from app.database.pool_metrics import PoolMetrics
+from app.database.vector import register_vector_codec
+
+logger = logging.getLogger(__name__)
+
 _pool: Optional[asyncpg.Pool] = None
+# Optional read-only pool (a streaming replica) for heavy read paths; see
+# `get_read_connection`. None when DATABASE_READ_URL is unset.
+_read_pool: Optional[asyncpg.Pool] = None
+# None waits for a free connection indefinitely (asyncpg's default).
+_acquire_timeout: Optional[float] = None
+# Replica acquires always time out, so a saturated replica falls back to the
+# primary instead of queueing; see `get_read_connection`.
+DEFAULT_READ_ACQUIRE_TIMEOUT = 2.0
+_read_acquire_timeout: float = DEFAULT_READ_ACQUIRE_TIMEOUT
+_metrics = PoolMetrics()
+_read_metrics = PoolMetrics()
+# A Celery worker process's own pool, bound to its persistent loop
+# (workers/utils.start_worker_runtime). Only usable from that loop.
+_worker_pool: Optional[asyncpg.Pool] = None
+_worker_loop = None
 
 # ── Request-scoped tenant context (set by auth dependencies) ──────────
 _tenant_id_var: contextvars.ContextVar[str] = contextvars.ContextVar(
@@ -64,19 +86,67 @@ def _make_ssl_context(mode: str):
     return None
 
 
-async def init_pool(database_url: str, *, ssl_mode: str = "disable"):
-    """Initialize the connection pool."""
-    global _pool
+# Replica failures that degrade to the primary rather than fail startup or the
+# request: replica down or restarting, network, or the pool saturated.
+_READ_FALLBACK_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.CannotConnectNowError,
+    asyncpg.InterfaceError,
+)
+
+
+async def init_pool(
+    database_url: str,
+    *,
+    ssl_mode: str = "disable",
+    min_size: int = 2,
+    max_size: int = 10,
+    acquire_timeout: Optional[float] = None,
+    read_url: Optional[str] = None,
+    read_min_size: int = 1,
+    read_max_size: int = 10,
+    read_acquire_timeout: float = DEFAULT_READ_ACQUIRE_TIMEOUT,
+):
+    """Initialize the connection pool, and the read-only pool when `read_url` is set.
+
+    The API sizes both from settings (DATABASE_POOL_ROLE and its overrides, see
+    `app.config`); scripts keep the 2/10 defaults. A replica that can't be
+    reached at startup is logged and skipped: reads use the primary until the
+    next restart rather than keeping the API down.
+    """
+    global _pool, _read_pool, _acquire_timeout, _read_acquire_timeout
     if _pool is None:
         ssl_ctx = _make_ssl_context(ssl_mode)
+        _acquire_timeout = acquire_timeout
+        _read_acquire_timeout = read_acquire_timeout
         _pool = await asyncpg.create_pool(
             database_url,
-            min_size=2,
-            max_size=10,
+            min_size=min_size,
+            max_size=max_size,
             max_inactive_connection_lifetime=60,
             command_timeout=30,
             ssl=ssl_ctx,
+            init=register_vector_codec,
         )
+        if read_url:
+            # Read-only at the session level too, so a write routed here by
+            # mistake fails loudly even against a writable test database.
+            try:
+                _read_pool = await asyncpg.create_pool(
+                    read_url,
+                    min_size=min(read_min_size, read_max_size),
+                    max_size=read_max_size,
+                    max_inactive_connection_lifetime=60,
+                    command_timeout=30,
+                    ssl=ssl_ctx,
+                    init=register_vector_codec,
+                    server_settings={"default_transaction_read_only": "on"},
+                )
+            except _READ_FALLBACK_ERRORS as exc:
+                _read_pool = None
+                logger.error("Read replica unavailable at startup, reads will use the primary: %s", exc)
     return _pool
 
 
@@ -89,8 +159,11 @@ async def get_pool() -> asyncpg.Pool:
 
 
 async def close_pool():
-    """Close the connection pool."""
-    global _pool
+    """Close the connection pool(s)."""
+    global _pool, _read_pool
+    if _read_pool:
+        await _read_pool.close()
+        _read_pool = None
     if _pool:
         await _pool.close()
         _pool = None
@@ -99,13 +172,66 @@ async def close_pool():
 def has_pool() -> bool:
     """Is the app connection pool initialized in this process?
 
-    False inside Celery workers, which are pool-free BY DESIGN (see the NOTE in
-    workers/celery_app.py: each task runs its own asyncio.run() loop, and an
-    asyncpg pool bound to a different loop cannot be reused).
+    False inside Celery workers: they never call init_pool(). Their own pool
+    (see `register_worker_pool`) lives on the worker loop and is reached
+    through `connection_or_direct` / `workers/utils.get_db_connection`, not
+    `get_connection`, which also applies the request-scoped RLS context.
     """
     return _pool is not None
 
 
+def has_read_pool() -> bool:
+    """Is a read-only replica pool configured in this process?"""
+    return _read_pool is not None
+
+
+def get_pool_stats() -> dict:
+    """Size, in-use, waiters and acquire-wait / hold histograms for each pool."""
+    return {
+        "acquire_timeout": _acquire_timeout,
+        "read_acquire_timeout": _read_acquire_timeout,
+        "primary": _metrics.snapshot(_pool),
+        "replica": _read_metrics.snapshot(_read_pool) if _read_pool is not None else None,
+    }
+
+
+async def _acquire(pool: asyncpg.Pool, metrics: PoolMetrics, timeout: Optional[float]):
+    """`pool.acquire()` with wait accounting; returns (conn, checked_out_at)."""
+    started = metrics.acquire_started()
+    try:
+        conn = await pool.acquire(timeout=timeout)
+    except asyncio.TimeoutError:
+        metrics.acquire_finished(started, ok=False, timed_out=True)
+        raise
+    except BaseException:
+        metrics.acquire_finished(started, ok=False)
+        raise
+    return conn, metrics.acquire_finished(started, ok=True)
+
+
+async def _release(pool: asyncpg.Pool, metrics: PoolMetrics, conn, checked_out_at: float) -> None:
+    try:
+        await pool.release(conn)
+    finally:
+        metrics.released(checked_out_at)
+
+
+def register_worker_pool(pool: Optional[asyncpg.Pool], loop) -> None:
+    """Called by the worker runtime once its per-process pool is open."""
+    global _worker_pool, _worker_loop
+    _worker_pool = pool
+    _worker_loop = loop
+
+
+def _on_worker_loop() -> bool:
+    if _worker_pool is None:
+        return False
+    try:
+        return asyncio.get_running_loop() is _worker_loop
+    except RuntimeError:
+        return False
+
+
 @asynccontextmanager
 async def connection_or_direct(*, force_direct: bool = False):
     """A connection that works in BOTH the API and a Celery worker.
@@ -116,8 +242,9 @@ async def connection_or_direct(*, force_direct: bool = False):
     could ever call Gemini**. It failed at `check_limit`, before the API call, and
     surfaced only as a research pass that mysteriously produced nothing.
 
-    Pooled connection when a pool exists; otherwise a raw one, opened and closed
-    per use inside the caller's own loop.
+    Pooled connection when a pool exists — the app pool in the API, the worker
+    process's pool when running on a Celery worker's loop; otherwise a raw one,
+    opened and closed per use inside the caller's own loop.
 
     `force_direct` skips the pool even when one exists. Needed by callers running
     on a DIFFERENT event loop than the one the pool was created on — an asyncpg
@@ -134,6 +261,10 @@ async def connection_or_direct(*, force_direct: bool = False):
         async with get_connection() as conn:
             yield conn
         return
+    if not force_direct and _on_worker_loop():
+        async with _worker_pool.acquire() as conn:
+            yield conn
+        return
 
     # Env first, settings second: a Celery worker may not have called
     # load_settings() (get_settings() raises when it hasn't), but DATABASE_URL is
@@ -156,6 +287,108 @@ async def connection_or_direct(*, force_direct: bool = False):
         await conn.close()
 
 
+# One statement for the whole RLS context, in both directions. Fixed SQL text,
+# so asyncpg's per-connection statement cache prepares it once per connection
+# and every later acquire is a single bind/execute round trip. Unset values are
+# written as '' — what the old per-variable reset left behind anyway, and what
+# the policies' `current_setting(..., true)` comparisons already treat as "no
+# match".
+_APPLY_RLS_CONTEXT_SQL = (
+    "SELECT set_config('app.current_tenant_id', $1, false), "
+    "set_config('app.current_user_id', $2, false), "
+    "set_config('app.is_admin', $3, false)"
+)
+_RESET_RLS_CONTEXT_SQL = (
+    "SELECT set_config('app.current_tenant_id', '', false), "
+    "set_config('app.current_user_id', '', false), "
+    "set_config('app.is_admin', '', false)"
+)
+_EMPTY_RLS_CONTEXT = ("", "", "")
+
+
+def _rls_context(tenant_id: str | None) -> tuple[str, str, str]:
+    effective_tenant = tenant_id or _tenant_id_var.get() or ""
+    return (
+        str(effective_tenant),
+        _user_id_var.get() or "",
+        "true" if _is_admin_var.get() else "",
+    )
+
+
+async def _apply_rls_context(conn, context: tuple[str, str, str]) -> None:
+    if context == _EMPTY_RLS_CONTEXT:
+        await conn.execute(_RESET_RLS_CONTEXT_SQL)
+    else:
+        await conn.execute(_APPLY_RLS_CONTEXT_SQL, *context)
+
+
+class _RequestConnection:
+    """The connection a request has opted to reuse (see `request_connection`).
+
+    Acquired lazily on the first `get_connection()` and released when the scope
+    exits. `applied` is the RLS context currently on the session so each block
+    only re-sends it when it changed (typically once: empty → user → tenant as
+    the auth dependencies resolve). `in_use` hands nested or concurrent blocks
+    (`asyncio.gather` copies the contextvar into its tasks) their own pooled
+    connection — one asyncpg connection can't run two queries at once.
+
+    A task spawned inside the scope can still be in a block on the shared
+    connection when the scope exits. The scope then only marks the holder
+    `closed`, and that block releases the connection on its way out.
+    """
+
+    __slots__ = ("conn", "checked_out_at", "applied", "in_use", "closed")
+
+    def __init__(self):
+        self.conn = None
+        self.checked_out_at = 0.0
+        self.applied = _EMPTY_RLS_CONTEXT
+        self.in_use = False
+        self.closed = False
+
+
+_request_conn_var: contextvars.ContextVar[Optional[_RequestConnection]] = (
+    contextvars.ContextVar("request_conn", default=None)
+)
+
+
+@asynccontextmanager
+async def request_connection():
+    """Opt-in: share one pooled connection across a request's `get_connection()` blocks.
+
+    Wrap a request (the `use_request_connection` dependency does this) and the
+    auth dependencies, scope resolution and the handler all run on the same
+    connection instead of 3–5 acquire/release cycles. Blocks still see exactly
+    the RLS context they would have on a fresh connection; it is reset once,
+    when the connection goes back to the pool. Safe to nest — an inner scope
+    reuses the outer one.
+    """
+    if _request_conn_var.get() is not None:
+        yield
+        return
+    holder = _RequestConnection()
+    token = _request_conn_var.set(holder)
+    try:
+        yield
+    finally:
+        _request_conn_var.reset(token)
+        holder.closed = True
+        if not holder.in_use:
+            await _release_request_connection(holder)
+
+
+async def _release_request_connection(holder: _RequestConnection) -> None:
+    conn = holder.conn
+    holder.conn = None
+    if conn is not None:
+        pool = await get_pool()
+        try:
+            if holder.applied != _EMPTY_RLS_CONTEXT:
+                await conn.execute(_RESET_RLS_CONTEXT_SQL)
+        finally:
+            await _release(pool, _metrics, conn, holder.checked_out_at)
+
+
 @asynccontextmanager
 async def get_connection(tenant_id: str | None = None):
     """Get a database connection from the pool.
@@ -166,41 +399,76 @@ async def get_connection(tenant_id: str | None = None):
             that PostgreSQL row-level security policies can filter rows
             automatically.  The setting is session-level (connection-scoped)
             and is reset when the connection returns to the pool.
+
+    Inside a `request_connection()` scope the request's shared connection is
+    used (when it is free) rather than a fresh acquire.
     """
     pool = await get_pool()
-    effective_tenant = tenant_id or _tenant_id_var.get() or None
-    effective_user = _user_id_var.get() or None
-    is_admin = _is_admin_var.get()
-
-    async with pool.acquire() as conn:
-        if effective_tenant:
-            await conn.execute(
-                "SELECT set_config('app.current_tenant_id', $1, false)",
-                str(effective_tenant),
-            )
-        if effective_user:
-            await conn.execute(
-                "SELECT set_config('app.current_user_id', $1, false)",
-                str(effective_user),
-            )
-        if is_admin:
-            await conn.execute(
-                "SELECT set_config('app.is_admin', 'true', false)"
-            )
+    context = _rls_context(tenant_id)
+
+    holder = _request_conn_var.get()
+    if holder is not None and not holder.closed and not holder.in_use:
+        holder.in_use = True
+        try:
+            if holder.conn is None:
+                holder.conn, holder.checked_out_at = await _acquire(pool, _metrics, _acquire_timeout)
+            if holder.applied != context:
+                await _apply_rls_context(holder.conn, context)
+                holder.applied = context
+            yield holder.conn
+        finally:
+            holder.in_use = False
+            if holder.closed:
+                # The scope ended while this block (in a task spawned from
+                # it) was still running; the release was left to us.
+                await _release_request_connection(holder)
+        return
+
+    conn, checked_out_at = await _acquire(pool, _metrics, _acquire_timeout)
+    try:
+        if context != _EMPTY_RLS_CONTEXT:
+            await conn.execute(_APPLY_RLS_CONTEXT_SQL, *context)
         try:
             yield conn
         finally:
-            if effective_tenant:
-                await conn.execute(
-                    "SELECT set_config('app.current_tenant_id', '', false)"
-                )
-            if effective_user:
-                await conn.execute(
-                    "SELECT set_config('app.current_user_id', '', false)"
-                )
-            if is_admin:
-                await conn.execute(
-                    "SELECT set_config('app.is_admin', '', false)"
-                )
+            if context != _EMPTY_RLS_CONTEXT:
+                await conn.execute(_RESET_RLS_CONTEXT_SQL)
+    finally:
+        await _release(pool, _metrics, conn, checked_out_at)
+
+
+@asynccontextmanager
+async def get_read_connection(tenant_id: str | None = None):
+    """A connection for heavy, read-only work — the replica when one is configured.
+
+    Same contract as `get_connection` (RLS context applied and reset), but the
+    session is read-only and may lag the primary by replication delay, so use
+    it only for views that don't read back a write the same request just made:
+    dashboards, portfolio roll-ups, admin lists. Without DATABASE_READ_URL, or
+    when the replica can't hand out a connection, this is `get_connection`.
+    """
+    if _read_pool is None:
+        async with get_connection(tenant_id) as conn:
+            yield conn
+        return
 
+    try:
+        conn, checked_out_at = await _acquire(_read_pool, _read_metrics, _read_acquire_timeout)
+    except _READ_FALLBACK_ERRORS as exc:
+        _read_metrics.fallbacks += 1
+        logger.warning("Read replica unavailable, using primary: %s", exc)
+        async with get_connection(tenant_id) as conn:
+            yield conn
+        return
 
+    context = _rls_context(tenant_id)
+    try:
+        if context != _EMPTY_RLS_CONTEXT:
+            await conn.execute(_APPLY_RLS_CONTEXT_SQL, *context)
+        try:
+            yield conn
+        finally:
+            if context != _EMPTY_RLS_CONTEXT:
+                await conn.execute(_RESET_RLS_CONTEXT_SQL)
+    finally:
+        await _release(_read_pool, _read_metrics, conn, checked_out_at)
@@ -0,0 +1,131 @@
+"""Acquire/hold accounting for the app's asyncpg pools.
+
+asyncpg exposes the pool's size and idle count but nothing about the callers:
+how long an acquire waited, how many are queued right now, how long a
+connection stays checked out. Long AI streaming turns hold a connection for
+the whole turn, and once they fill the pool every other request queues inside
+`pool.acquire()` with no trace of why it was slow.
+
+`app.database.pool` reports every acquire and release of the primary (and
+replica, when configured) pool here; `get_pool_stats()` there returns the
+snapshot. Everything runs on the app's event loop, so plain counters suffice.
+"""
+
+import time
+from typing import Optional
+
+import asyncpg
+
+# Upper bounds, in milliseconds; the last bucket is everything above.
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# A checkout held this long is counted as a long hold (a streaming turn, a
+# request that forgot to release before awaiting something slow).
+LONG_HOLD_SECONDS = 5.0
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are read off the buckets."""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the pct-th sample, capped at the max seen."""
+        if not self.count:
+            return None
+        rank = pct * self.count
+        seen = 0
+        for bound, n in zip(self.buckets_ms, self.counts):
+            seen += n
+            if n and seen >= rank:
+                return round(min(bound, self.max_ms), 3)
+        return round(self.max_ms, 3)
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{b}ms" for b in self.buckets_ms] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class PoolMetrics:
+    """Live counters for one pool: in-use, waiters, acquire waits and hold times."""
+
+    def __init__(self):
+        self.in_use = 0
+        self.waiting = 0
+        self.waiting_peak = 0
+        self.acquires = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.fallbacks = 0  # replica only: acquires that fell back to the primary
+        self.long_holds = 0
+        self.acquire_wait = LatencyHistogram()
+        self.hold = LatencyHistogram()
+
+    def acquire_started(self) -> float:
+        self.waiting += 1
+        self.waiting_peak = max(self.waiting_peak, self.waiting)
+        return time.monotonic()
+
+    def acquire_finished(self, started: float, *, ok: bool, timed_out: bool = False) -> float:
+        """Close out one acquire; returns the checkout timestamp for `released`."""
+        now = time.monotonic()
+        self.waiting -= 1
+        self.acquire_wait.observe(now - started)
+        if ok:
+            self.acquires += 1
+            self.in_use += 1
+        elif timed_out:
+            self.timeouts += 1
+        else:
+            self.errors += 1
+        return now
+
+    def released(self, checked_out_at: float) -> None:
+        held = time.monotonic() - checked_out_at
+        self.in_use -= 1
+        self.hold.observe(held)
+        if held >= LONG_HOLD_SECONDS:
+            self.long_holds += 1
+
+    def snapshot(self, pool: Optional[asyncpg.Pool]) -> dict:
+        return {
+            "size": pool.get_size() if pool is not None else 0,
+            "idle": pool.get_idle_size() if pool is not None else 0,
+            "min_size": pool.get_min_size() if pool is not None else None,
+            "max_size": pool.get_max_size() if pool is not None else None,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "waiting_peak": self.waiting_peak,
+            "acquires": self.acquires,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+            "long_holds": self.long_holds,
+            "acquire_wait": self.acquire_wait.snapshot(),
+            "hold": self.hold.snapshot(),
+        }
@@ -0,0 +1,83 @@
+"""app.database.vector — binary asyncpg codec for the pgvector `vector` type.
+
+Without a codec asyncpg treats `vector` as an unknown type and speaks its text
+form: every query embedding went out as a 768-float "[0.1,0.2,...]" string
+built in Python, and every stored embedding came back as one to be parsed.
+The binary codec sends the wire format pgvector uses natively (int16 dim,
+int16 unused, dim x float4, network byte order), so callers pass and receive
+plain `list[float]`.
+
+Registered on every pooled connection by `init_pool` (asyncpg `init=` hook).
+Raw connections — Celery workers, `connection_or_direct` — call
+`ensure_vector_codec` first; it registers once per connection and is a set
+lookup afterwards.
+"""
+import struct
+import weakref
+from typing import Sequence, Union
+
+import asyncpg
+
+_HEADER = struct.Struct(">HH")
+
+# Underlying asyncpg.Connection objects that already carry the codec. Weak so a
+# closed connection drops out on its own.
+_registered: "weakref.WeakSet[asyncpg.Connection]" = weakref.WeakSet()
+
+
+def encode_vector(value: Union[Sequence[float], str]) -> bytes:
+    """list[float] (or a legacy "[0.1,0.2]" literal) -> pgvector binary."""
+    if isinstance(value, str):
+        body = value.strip()[1:-1]
+        value = [float(x) for x in body.split(",")] if body.strip() else []
+    elif hasattr(value, "tolist"):
+        value = value.tolist()
+    dim = len(value)
+    return _HEADER.pack(dim, 0) + struct.pack(f">{dim}f", *value)
+
+
+def decode_vector(data: bytes) -> list[float]:
+    """pgvector binary -> list[float]."""
+    dim, _ = _HEADER.unpack_from(data)
+    return list(struct.unpack_from(f">{dim}f", data, _HEADER.size))
+
+
+def _unwrap(conn) -> asyncpg.Connection:
+    # Pool connections are PoolConnectionProxy wrappers; the codec lives on the
+    # connection they wrap, which outlives any single acquire().
+    return getattr(conn, "_con", None) or conn
+
+
+async def register_vector_codec(conn) -> bool:
+    """Install the binary `vector` codec on `conn`.
+
+    Returns False (and leaves the connection on text I/O) when the pgvector
+    extension is not installed in this database yet — the bootstrap creates it
+    after the pool is up on a fresh database.
+    """
+    schema = await conn.fetchval(
+        """
+        SELECT n.nspname FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typname = 'vector'
+        LIMIT 1
+        """
+    )
+    if schema is None:
+        return False
+    await conn.set_type_codec(
+        "vector",
+        schema=schema,
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format="binary",
+    )
+    _registered.add(_unwrap(conn))
+    return True
+
+
+async def ensure_vector_codec(conn) -> bool:
+    """Register the codec on `conn` unless it already has it."""
+    if _unwrap(conn) in _registered:
+        return True
+    return await register_vector_codec(conn)
@@ -85,7 +85,7 @@ from .core.services.usage_tracker import (
     start_usage_flusher,
     stop_usage_flusher,
 )
-from .database import close_pool, get_connection, init_db, init_pool
+from .database import close_pool, get_connection, has_read_pool, init_db, init_pool
 from .core.services.notification_manager import (
     close_notification_manager,
     get_notification_manager,
@@ -110,9 +110,22 @@ async def lifespan(app: FastAPI):
     print(f"[Matcha] Gemini client: {_gemini_mode}")
 
     # Initialize database
-    await init_pool(settings.database_url, ssl_mode=settings.database_ssl)
+    await init_pool(
+        settings.database_url,
+        ssl_mode=settings.database_ssl,
+        min_size=settings.database_pool_min_size,
+        max_size=settings.database_pool_max_size,
+        acquire_timeout=settings.database_pool_acquire_timeout,
+        read_url=settings.database_read_url,
+        read_max_size=settings.database_read_pool_max_size,
+        read_acquire_timeout=settings.database_read_pool_acquire_timeout,
+    )
     await init_db()
-    print("[Matcha] Database initialized")
+    print(
+        f"[Matcha] Database initialized (pool role={settings.database_pool_role} "
+        f"{settings.database_pool_min_size}-{settings.database_pool_max_size}"
+        f"{', read replica' if has_read_pool() else ''})"
+    )
 
     # Install root logger handler that persists ERROR+ logs to server_error_reports.
     # Must run AFTER init_pool so the handler's first write has a working pool.
@@ -212,6 +225,26 @@ async def lifespan(app: FastAPI):
     start_project_fanout_subscriber()
     print("[Matcha] Project WS fanout subscriber started")
 
+    # Cross-worker principal-cache invalidation (auth lookups cached per user).
+    from .core.services.principal_cache import (
+        start_principal_invalidation_subscriber, stop_principal_invalidation_subscriber,
+    )
+    start_principal_invalidation_subscriber()
+
+    # Same for merged company feature flags; starting it is what turns the
+    # per-worker feature cache on (see services/company_feature_cache).
+    from .core.services.company_feature_cache import (
+        start_feature_invalidation_subscriber, stop_feature_invalidation_subscriber,
+    )
+    start_feature_invalidation_subscriber()
+
+    # Cappe published-page artifacts (see cappe/services/static_site): the
+    # per-worker host/artifact cache is live only while this subscriber runs.
+    from .cappe.services.static_site import (
+        start_static_site_subscriber, stop_static_site_subscriber,
+    )
+    start_static_site_subscriber()
+
     # Start channel inactivity checker (runs every 12h)
     from .werk.services.inactivity_worker import start_inactivity_scheduler
     inactivity_task = await start_inactivity_scheduler()
@@ -220,6 +253,16 @@ async def lifespan(app: FastAPI):
     start_usage_flusher()
     print("[Matcha] Usage-event flusher started")
 
+    # AI usage spool → ai_usage_log (see services/ai_usage_spool). One drain
+    # at a time per host; every worker runs the loop so any of them can.
+    from .core.services.ai_usage_spool import start_spool_drainer, stop_spool_drainer
+    start_spool_drainer()
+
+    # WeasyPrint worker processes (see services/pdf_render_pool) — spawned and
+    # font-warmed now so the first export doesn't pay for it.
+    from .core.services.pdf_render_pool import start_pdf_renderer, stop_pdf_renderer
+    start_pdf_renderer()
+
     yield
 
     # Cancel background tasks
@@ -229,8 +272,13 @@ async def lifespan(app: FastAPI):
     await stop_fanout_subscriber()
     await stop_server_ping_loop()
     await stop_project_fanout_subscriber()
+    await stop_principal_invalidation_subscriber()
+    await stop_feature_invalidation_subscriber()
+    await stop_static_site_subscriber()
     # Drains whatever is still buffered (best-effort — analytics is droppable).
     await stop_usage_flusher()
+    await stop_spool_drainer()
+    await stop_pdf_renderer()
 
     # Merlin's headless Chromium is a process-wide singleton, launched lazily on
     # the first agent screenshot — release it so a reload doesn't strand one.
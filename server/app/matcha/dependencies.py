@@ -5,8 +5,9 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 
-from ..core.feature_flags import default_company_features_json, merge_company_features
+from ..core.feature_flags import fetch_company_features
 from ..core.dependencies import get_current_user, require_roles
+from ..core.services import principal_cache
 from ..database import get_connection, set_tenant_id
 
 # Matcha role dependencies
@@ -74,7 +75,31 @@ async def resolve_accessible_company_scope(
     Returns scope metadata used by company-scoped routes and dependencies.
     Also sets the tenant contextvar so that subsequent ``get_connection()``
     calls automatically propagate the tenant to PostgreSQL RLS.
+
+    Client/individual/employee scopes come from the principal cache when the
+    user's version hasn't moved (see core/services/principal_cache).
     """
+    if current_user.role not in principal_cache.SCOPE_CACHE_ROLES:
+        return await _resolve_company_scope(current_user, requested_company_id)
+
+    scope, version = await principal_cache.lookup_scope(current_user.id)
+    if scope is None:
+        scope = await _resolve_company_scope(current_user, None)
+        if scope["company_id"] is None:
+            # Not linked to a company (yet) — nothing a later link would bump.
+            return scope
+        await principal_cache.store_scope(current_user.id, version, scope)
+
+    if requested_company_id and requested_company_id != scope["company_id"]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied for requested company")
+    set_tenant_id(str(scope["company_id"]))
+    return scope
+
+
+async def _resolve_company_scope(
+    current_user,
+    requested_company_id: Optional[UUID] = None,
+) -> dict:
     async with get_connection() as conn:
         if current_user.role == "admin":
             selected_company_id = requested_company_id
@@ -418,6 +443,17 @@ async def require_interview_prep_access(
     )
 
 
+async def _company_features_or_404(company_id: UUID) -> dict:
+    """Merged feature flags for the gates below (cached per API worker)."""
+    features = await fetch_company_features(company_id)
+    if features is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Company not found",
+        )
+    return features
+
+
 def require_feature(feature_name: str):
     """Factory that returns a dependency checking if a company feature is enabled.
 
@@ -459,34 +495,14 @@ def require_feature(feature_name: str):
                 detail="No company associated with this account"
             )
 
-        async with get_connection() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT COALESCE(enabled_features, $2::jsonb) AS enabled_features,
-                       signup_source
-                FROM companies
-                WHERE id = $1
-                """,
-                company_id,
-                default_company_features_json(),
-            )
-            if row is None or row["enabled_features"] is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Company not found",
-                )
+        features = await _company_features_or_404(company_id)
 
-            features = merge_company_features(
-                row["enabled_features"],
-                row["signup_source"],
+        if not features.get(feature_name, False):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"The '{feature_name}' feature is not enabled for your company"
             )
 
-            if not features.get(feature_name, False):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"The '{feature_name}' feature is not enabled for your company"
-                )
-
         return current_user
     return checker
 
@@ -510,29 +526,13 @@ def require_any_feature(*feature_names: str):
                 detail="No company associated with this account",
             )
 
-        async with get_connection() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT COALESCE(enabled_features, $2::jsonb) AS enabled_features,
-                       signup_source
-                FROM companies
-                WHERE id = $1
-                """,
-                company_id,
-                default_company_features_json(),
-            )
-            if row is None or row["enabled_features"] is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Company not found",
-                )
+        features = await _company_features_or_404(company_id)
 
-            features = merge_company_features(row["enabled_features"], row["signup_source"])
-            if not any(features.get(name, False) for name in feature_names):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"None of the required features ({', '.join(feature_names)}) are enabled for your company",
-                )
+        if not any(features.get(name, False) for name in feature_names):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"None of the required features ({', '.join(feature_names)}) are enabled for your company",
+            )
 
         return current_user
     return checker
@@ -561,30 +561,14 @@ def require_all_features(*feature_names: str):
                 detail="No company associated with this account",
             )
 
-        async with get_connection() as conn:
-            row = await conn.fetchrow(
-                """
-                SELECT COALESCE(enabled_features, $2::jsonb) AS enabled_features,
-                       signup_source
-                FROM companies
-                WHERE id = $1
-                """,
-                company_id,
-                default_company_features_json(),
-            )
-            if row is None or row["enabled_features"] is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Company not found",
-                )
+        features = await _company_features_or_404(company_id)
 
-            features = merge_company_features(row["enabled_features"], row["signup_source"])
-            missing = [name for name in feature_names if not features.get(name, False)]
-            if missing:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"All required features ({', '.join(feature_names)}) must be enabled; missing: {', '.join(missing)}",
-                )
+        missing = [name for name in feature_names if not features.get(name, False)]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"All required features ({', '.join(feature_names)}) must be enabled; missing: {', '.join(missing)}",
+            )
 
         return current_user
 
@@ -13,6 +13,7 @@ from pydantic import BaseModel, EmailStr, Field
 from app.config import get_settings
 from app.core.feature_flags import default_company_features_json, merge_company_features
 from app.core.models.auth import CurrentUser
+from app.core.services.company_feature_cache import invalidate_company_features
 from app.core.services.email import get_email_service
 from app.core.services.feature_beta import load_beta_features
 from app.database import get_connection
@@ -380,6 +381,7 @@ async def update_broker_client_setup(
                 json.dumps(merged_features),
                 setup_row["company_id"],
             )
+            await invalidate_company_features(setup_row["company_id"])
 
         company_updates = []
         company_values: list = []
@@ -14,7 +14,7 @@ from app.config import get_settings
 from app.core.feature_flags import default_company_features_json, merge_company_features
 from app.core.models.auth import CurrentUser
 from app.core.services.email import get_email_service
-from app.database import get_connection
+from app.database import get_connection, get_read_connection
 from app.matcha.dependencies import require_broker
 
 from app.matcha.routes.broker.brokers._models import *  # noqa: F401,F403
@@ -319,7 +319,7 @@ async def set_client_renewal_date(
 @router.get("/referred-clients")
 async def list_referred_clients(current_user: CurrentUser = Depends(require_broker)):
     """List all companies that came through this broker's referral link or client setup flow."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         membership = await _get_broker_membership(conn, user_id=current_user.id)
         broker_id = membership["broker_id"]
 
@@ -381,7 +381,7 @@ async def list_referred_clients(current_user: CurrentUser = Depends(require_brok
 async def get_broker_handbook_coverage(current_user: CurrentUser = Depends(require_broker)):
     from app.core.services.handbook_service import HandbookService
 
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         membership = await _get_broker_membership(conn, user_id=current_user.id)
 
         company_ids = [
@@ -18,7 +18,7 @@ import time
 from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import (APIRouter, Depends, File, HTTPException, Query, Request, Response,
+from fastapi import (APIRouter, Depends, File, HTTPException, Query, Request,
                      UploadFile)
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
@@ -718,8 +718,8 @@ async def download_packet(session_id: str, packet_id: str, request: Request,
             raise HTTPException(status_code=404, detail="Packet not found")
         await _audit(conn, session_id, current_user, request, "export",
                      {"packet_id": packet_id})
-    data = await get_storage().download_file(pkt["storage_path"])
-    return Response(
-        content=data, media_type="application/pdf",
+    body = await get_storage().open_stream(pkt["storage_path"])
+    return StreamingResponse(
+        body, media_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{_safe_filename(pkt["filename"])}"'},
     )
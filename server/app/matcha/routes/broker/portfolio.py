@@ -15,7 +15,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile
 from pydantic import BaseModel, Field
 
-from ....database import get_connection
+from ....database import get_connection, get_read_connection
 from ...dependencies import require_broker
 from ..ir_incidents import compute_wc_metrics
 from ...services.insurance.wc_benchmarks import SEVERITY_BAND_RANK
@@ -108,7 +108,7 @@ async def _assert_broker_owns_company(conn, user_id, company_id: UUID) -> dict:
 @router.get("/wc-portfolio")
 async def get_wc_portfolio(current_user=Depends(require_broker)):
     """Per-client WC posture for the broker's active book."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         # Resolve broker_id from broker_members.
         broker_id = await conn.fetchval(
             """
@@ -385,7 +385,7 @@ _EPL_BAND_RANK = {"exposed": 0, "developing": 1, "adequate": 2, "strong": 3}
 @router.get("/epl-portfolio")
 async def get_epl_portfolio(current_user=Depends(require_broker)):
     """EPL-readiness rollup across the broker's active book — one row per client."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         _, clients = await _broker_clients(conn, current_user.id)
         results = []
         for company_id, meta in clients.items():
@@ -463,7 +463,7 @@ async def get_risk_index_portfolio(current_user=Depends(require_broker)):
 async def get_property_portfolio(current_user=Depends(require_broker)):
     """Per-client commercial-property posture across the book — TIV, COPE grade,
     insurance-to-value, and worst catastrophe tier. Batched (no per-client build_sov)."""
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         _, clients = await _broker_clients(conn, current_user.id)
         ids = list(clients.keys())
         rollups = await property_sov.book_sov_rollups(conn, ids)
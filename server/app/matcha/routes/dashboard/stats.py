@@ -4,7 +4,7 @@ import logging
 import asyncpg
 from fastapi import APIRouter, Depends
 
-from app.database import get_connection
+from app.database import get_read_connection
 from app.matcha.dependencies import require_admin_or_client, get_client_company_id
 from app.core.models.auth import CurrentUser
 from app.core.services.redis_cache import get_redis_cache, cache_get, cache_set, dashboard_stats_key
@@ -66,7 +66,7 @@ async def get_dashboard_stats(
         if cached is not None:
             return cached
 
-    async with get_connection() as conn:
+    async with get_read_connection() as conn:
         # Active policies
         active_policies = await conn.fetchval(
             "SELECT COUNT(*) FROM policies WHERE company_id = $1 AND status = 'active'",
@@ -179,7 +179,7 @@ async def get_dashboard_stats(
     critical_compliance_alerts = 0
     warning_compliance_alerts = 0
     try:
-        async with get_connection() as conn3:
+        async with get_read_connection() as conn3:
             alert_rows = await conn3.fetch(
                 """SELECT severity, COUNT(*) AS cnt
                    FROM compliance_alerts
@@ -200,7 +200,7 @@ async def get_dashboard_stats(
     # ER Copilot open cases
     er_case_summary = None
     try:
-        async with get_connection() as conn4:
+        async with get_read_connection() as conn4:
             er_rows = await conn4.fetch(
                 """SELECT status, COUNT(*) AS cnt
                    FROM er_cases
@@ -223,7 +223,7 @@ async def get_dashboard_stats(
     # Stale policies (not updated in 180+ days)
     stale_policies = None
     try:
-        async with get_connection() as conn5:
+        async with get_read_connection() as conn5:
             stale_row = await conn5.fetchrow(
                 """SELECT COUNT(*) AS cnt,
                           EXTRACT(DAY FROM NOW() - MIN(updated_at))::int AS oldest_days
@@ -246,7 +246,7 @@ async def get_dashboard_stats(
     try:
         from app.core.services.compliance_service import get_employee_impact_for_location
 
-        async with get_connection() as conn2:
+        async with get_read_connection() as conn2:
             location_ids = await conn2.fetch(
                 "SELECT id FROM business_locations WHERE company_id = $1 AND is_active = true",
                 company_id,
@@ -325,7 +325,7 @@ async def get_dashboard_stats(
     escalated_queries_open = 0
     escalated_queries_high = 0
     try:
-        async with get_connection() as conn6:
+        async with get_read_connection() as conn6:
             esc_rows = await conn6.fetch(
                 """SELECT severity, COUNT(*) AS cnt
                    FROM mw_escalated_queries
@@ -29,10 +29,10 @@ logger = logging.getLogger(__name__)
 
 # All three moved to services/employees/ (refactor round 2, stage 3) and
 # re-imported here: `_send_invitation_with_conn` + `INVITATION_SEND_FAILED_DETAIL`
-# because send_single_invitation (below) wraps them, `STATE_NAME_TO_CODE` because
-# _normalize_work_state (below) uses it, and `decide_pto_request_core` purely as a
-# re-export so pto_admin.py's `from ._shared import decide_pto_request_core` keeps
-# working. E402 because they sit after `logger`, not because they're stranded at a
+# because send_single_invitation (below) wraps them, `STATE_NAME_TO_CODE` and
+# `_normalize_work_state` because callers import them from here, and
+# `decide_pto_request_core` purely as a re-export so pto_admin.py's
+# `from ._shared import decide_pto_request_core` keeps working. E402 because they sit after `logger`, not because they're stranded at a
 # deletion site — keep new relocated imports in this block.
 from app.matcha.services.employees.invitations import (  # noqa: F401,E402
     INVITATION_SEND_FAILED_DETAIL,
@@ -42,6 +42,7 @@ from app.matcha.services.employees.pto_decisions import decide_pto_request_core
 from app.matcha.services.employees.us_states import (  # noqa: F401,E402
     STATE_NAME_TO_CODE,
     STATE_NAME_TO_CODE as _STATE_NAME_TO_CODE,  # legacy private alias
+    normalize_work_state as _normalize_work_state,
 )
 
 # `work_state` values (CSV bulk-upload and single-employee create/update) are
@@ -51,25 +52,6 @@ from app.matcha.services.employees.us_states import (  # noqa: F401,E402
 _VALID_WORK_STATE_CODES = US_STATE_CODES
 
 
-def _normalize_work_state(raw: Optional[str]) -> tuple[Optional[str], bool]:
-    """Normalize a `work_state` value to a 2-letter USPS code.
-
-    Returns `(normalized_code_or_None, is_valid)`. Blank/None input is valid
-    (no work location provided — counted separately by callers, e.g. as
-    `rows_missing_work_location` in bulk upload). A non-blank value that
-    isn't a recognized state/territory abbreviation or full name is invalid.
-    """
-    s = (raw or "").strip()
-    if not s:
-        return None, True
-    if len(s) == 2 and s.isalpha() and s.upper() in _VALID_WORK_STATE_CODES:
-        return s.upper(), True
-    mapped = STATE_NAME_TO_CODE.get(s.lower())
-    if mapped:
-        return mapped, True
-    return None, False
-
-
 def _json_object(value) -> dict:
     if isinstance(value, dict):
         return value
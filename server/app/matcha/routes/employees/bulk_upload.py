@@ -14,22 +14,25 @@ won't bounce-storm.
 import asyncio
 import csv
 import io
-import json
 import logging
-import re
-from datetime import datetime
-from decimal import Decimal
-from typing import Optional
+from typing import Callable
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.core.models.auth import CurrentUser
-from app.core.services.credential_crypto import encrypt_credential_fields
 from app.database import get_connection
 from app.matcha.dependencies import get_client_company_id, require_admin_or_client
 from app.core.services.roster_jurisdictions import run_jurisdiction_drift_check
+from app.matcha.services.employees.bulk_import import (
+    CSVTooLarge,
+    ParsedUpload,
+    merge_credentials,
+    merge_employees,
+    parse_credentials_csv,
+    parse_employee_csv,
+)
 
 from ._shared import (
     _coerce_bool,
@@ -38,8 +41,6 @@ from ._shared import (
     _employee_org_fields_available,
     _exception_message,
     _json_object,
-    _normalize_work_state,
-    _parse_csv_date,
     _run_provisioning_and_notify,
     _sync_employee_location_for_compliance,
     send_single_invitation,
@@ -53,6 +54,46 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MAX_BULK_ROWS = 10_000
+# Uploads that send invitations: one email per row.
+MAX_INVITE_ROWS = 1_000
+
+
+def _check_csv_upload(file: UploadFile) -> None:
+    if not file.filename.endswith('.csv'):
+        raise HTTPException(status_code=400, detail="File must be a CSV")
+    file.file.seek(0, io.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
+
+
+async def _parse_csv_upload(
+    file: UploadFile,
+    parse: Callable[..., ParsedUpload],
+    max_rows: int,
+) -> ParsedUpload:
+    """Stream the spooled upload through `parse` in a worker thread (CSV
+    parsing and credential encryption are CPU work)."""
+
+    def run() -> ParsedUpload:
+        text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        try:
+            return parse(text, max_rows=max_rows)
+        finally:
+            text.detach()  # the UploadFile still owns the underlying file
+
+    try:
+        return await asyncio.to_thread(run)
+    except CSVTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(e)}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 class BulkEmployeeCSVUpload(BaseModel):
     """Model for CSV upload response."""
@@ -161,65 +202,33 @@ async def bulk_upload_employees_csv(
     - work_state (2-letter US state/territory code or full state name, e.g.,
       "CA" or "California"; blank is allowed but counted in
       `rows_missing_work_location`; an unrecognized value is a per-row error)
-    - employment_type (full_time, part_time, contractor)
+    - employment_type (full_time, part_time, contractor, intern)
     - start_date (YYYY-MM-DD format)
-    - manager_email (must be existing employee email)
+    - manager_email (an existing employee, or another row in the same file)
     - job_title
     - phone
+
+    Rows are validated up front and merged set-based in one transaction (see
+    services/employees/bulk_import.py); per-row errors are reported as before.
     """
     company_id = await get_client_company_id(current_user)
+    _check_csv_upload(file)
+
+    # Invitations go out one email per row, so an upload that sends them keeps
+    # the small cap (bounds the email blast radius); a roster-only import can
+    # be a whole company.
+    max_rows = MAX_INVITE_ROWS if send_invitations else MAX_BULK_ROWS
+    parsed = await _parse_csv_upload(file, parse_employee_csv, max_rows)
+    if parsed.total_rows == 0:
+        raise HTTPException(status_code=400, detail="No data rows found in CSV")
 
-    # Validate file format
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be a CSV")
-
-    # Check file size (10MB max)
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
-
-    # Parse CSV
-    try:
-        csv_content = contents.decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(e)}")
-
-    # Validate required columns
-    required_columns = ['email', 'first_name', 'last_name']
-    if not csv_reader.fieldnames:
-        raise HTTPException(status_code=400, detail="CSV file is empty")
-
-    missing_columns = [col for col in required_columns if col not in csv_reader.fieldnames]
-    if missing_columns:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Missing required columns: {', '.join(missing_columns)}"
-        )
-
-    # Cap rows per upload — bounds the work + email blast radius when
-    # send_invitations is on. Split larger rosters into multiple files.
-    rows = list(csv_reader)
-    MAX_BULK_ROWS = 1000
-    if len(rows) > MAX_BULK_ROWS:
-        raise HTTPException(
-            status_code=413,
-            detail=f"Too many rows: {len(rows)} (max {MAX_BULK_ROWS} per upload). Split into smaller files.",
-        )
-
-    # Process rows
-    created = 0
-    failed = 0
-    credentials_created = 0
-    rows_missing_work_location = 0
-    errors = []
-    employee_ids = []
-
-    logger.info("[BulkUpload] Starting bulk CSV upload for company %s by user %s (send_invitations=%s)",
-                company_id, current_user.id, send_invitations)
+    errors = list(parsed.errors)
+    logger.info("[BulkUpload] Starting bulk CSV upload for company %s by user %s (%d rows, send_invitations=%s)",
+                company_id, current_user.id, parsed.total_rows, send_invitations)
 
     async with get_connection() as conn:
         compensation_fields_available = await _employee_compensation_fields_available(conn)
+        org_fields_available = await _employee_org_fields_available(conn)
         external_uid_available = await _column_exists(conn, "employees", "external_uid")
 
         google_workspace_auto_provision = False
@@ -252,349 +261,82 @@ async def bulk_upload_employees_csv(
         logger.info("[BulkUpload] Integration flags: google_auto_provision=%s, slack_auto_provision=%s",
                     google_workspace_auto_provision, slack_auto_provision)
 
-        for row_num, row in enumerate(rows, start=2):  # Start at 2 to account for header
-            try:
-                # Validate email format
-                email = (row.get('email') or '').strip()
-                personal_email = (row.get('personal_email') or '').strip() or None
-                if not email:
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "Email is required"
-                    })
-                    failed += 1
-                    continue
+        merged = await merge_employees(
+            conn,
+            company_id,
+            parsed.rows,
+            compensation_fields=compensation_fields_available,
+            org_fields=org_fields_available,
+            external_uid=external_uid_available,
+        )
+        errors.extend(merged.errors)
+        employee_ids = [employee_id for _, employee_id in merged.created]
+        logger.info("[BulkUpload] Merged %d employees (%d credentials) for company %s",
+                    len(employee_ids), merged.credentials_written, company_id)
+
+        # One compliance-location sync per distinct work location, not per hire.
+        synced_locations = set()
+        for staged, employee_id in merged.created:
+            location_key = (staged.work_state, staged.work_city)
+            if location_key in synced_locations:
+                continue
+            synced_locations.add(location_key)
+            await _sync_employee_location_for_compliance(
+                conn,
+                company_id=company_id,
+                employee_id=employee_id,
+                work_state=staged.work_state,
+                work_city=staged.work_city,
+                background_tasks=background_tasks,
+            )
 
-                # Basic email validation
-                if not re.match(r'^[\w\.\-\+]+@[\w\.-]+\.\w+$', email):
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "Invalid email format"
-                    })
-                    failed += 1
-                    continue
+        # Auto-assign new-hire training per training_assignment_rules
+        if employee_ids:
+            try:
+                from app.matcha.services.training.training_assignment import evaluate_new_hire_rules_bulk
 
-                if personal_email and not re.match(r'^[\w\.\-\+]+@[\w\.-]+\.\w+$', personal_email):
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "Invalid personal_email format"
-                    })
-                    failed += 1
-                    continue
+                await evaluate_new_hire_rules_bulk(conn, company_id, employee_ids)
+            except Exception:
+                logger.exception("[BulkUpload] failed to auto-assign new-hire training for company %s", company_id)
 
-                # Check if email already exists
-                existing = await conn.fetchval(
-                    "SELECT id FROM employees WHERE org_id = $1 AND email = $2",
-                    company_id, email
+        for staged, employee_id in merged.created:
+            # Schedule Google Workspace / Slack provisioning
+            if google_workspace_auto_provision or slack_auto_provision:
+                background_tasks.add_task(
+                    _run_provisioning_and_notify,
+                    company_id=company_id,
+                    employee_id=employee_id,
+                    triggered_by=current_user.id,
+                    personal_email=staged.personal_email,
+                    employee_name=f"{staged.first_name} {staged.last_name}".strip(),
+                    work_email=staged.email,
+                    run_google=google_workspace_auto_provision,
+                    run_slack=slack_auto_provision,
                 )
-                if existing:
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "Employee with this email already exists"
-                    })
-                    failed += 1
-                    continue
-
-                # Validate required fields
-                first_name = (row.get('first_name') or '').strip()
-                last_name = (row.get('last_name') or '').strip()
 
-                if not first_name or not last_name:
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "First name and last name are required"
-                    })
-                    failed += 1
-                    continue
-
-                # Parse optional fields
-                work_state_raw = (row.get('work_state') or '')
-                work_state, work_state_valid = _normalize_work_state(work_state_raw)
-                if not work_state_valid:
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": (
-                            f"Invalid work_state '{work_state_raw.strip()}' — use a 2-letter "
-                            "US state/territory code (e.g. 'CA') or the full state name"
-                        )
-                    })
-                    failed += 1
-                    continue
-                if work_state is None:
-                    rows_missing_work_location += 1
-                employment_type = (row.get('employment_type') or '').strip() or None
-                job_title = (row.get('job_title') or '').strip() or None
-                department_val = (row.get('department') or '').strip() or None
-                phone = (row.get('phone') or '').strip() or None
-
-                # Parse compensation fields
-                pay_classification = (row.get('pay_classification') or '').strip().lower() or None
-                if pay_classification and pay_classification not in ('hourly', 'exempt'):
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": f"Invalid pay_classification '{pay_classification}'. Must be 'hourly' or 'exempt'"
-                    })
-                    failed += 1
-                    continue
-
-                pay_rate = None
-                pay_rate_str = (row.get('pay_rate') or '').strip()
-                if pay_rate_str:
-                    try:
-                        pay_rate = Decimal(pay_rate_str)
-                        if pay_rate < 0:
-                            raise ValueError("negative")
-                    except (ValueError, Exception):
-                        errors.append({
-                            "row": row_num,
-                            "email": email,
-                            "error": f"Invalid pay_rate '{pay_rate_str}'. Must be a non-negative number"
-                        })
-                        failed += 1
-                        continue
-
-                if pay_rate is not None and pay_classification is None:
-                    errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": "pay_classification is required when pay_rate is provided"
-                    })
-                    failed += 1
-                    continue
-
-                work_city = (row.get('work_city') or '').strip() or None
-
-                # Parse start_date
-                start_date = None
-                if (row.get('start_date') or '').strip():
-                    try:
-                        start_date = datetime.strptime(row['start_date'].strip(), "%Y-%m-%d").date()
-                    except ValueError:
-                        # Log warning but continue
-                        pass
-
-                # Resolve manager_email to manager_id
-                manager_id = None
-                if (row.get('manager_email') or '').strip():
-                    manager = await conn.fetchrow(
-                        "SELECT id FROM employees WHERE org_id = $1 AND email = $2",
-                        company_id, row['manager_email'].strip()
-                    )
-                    if manager:
-                        manager_id = manager['id']
-
-                # Optional HR-internal badge/employee number for IR-only
-                # tenants. Skipped silently if column doesn't exist yet
-                # (pre-migration). Empty strings → None.
-                external_uid = (row.get('uid') or row.get('external_uid') or '').strip() or None
-
-                # Create employee record
-                bulk_cols = [
-                    "org_id", "email", "personal_email", "first_name", "last_name",
-                    "work_state", "employment_type", "start_date", "manager_id", "phone",
-                ]
-                bulk_vals: list = [
-                    company_id, email, personal_email, first_name, last_name,
-                    work_state, employment_type, start_date, manager_id, phone,
-                ]
-                if compensation_fields_available:
-                    bulk_cols.extend(["pay_classification", "pay_rate", "work_city"])
-                    bulk_vals.extend([pay_classification, pay_rate, work_city])
-                org_fields_avail = await _employee_org_fields_available(conn)
-                if org_fields_avail:
-                    bulk_cols.extend(["job_title", "department"])
-                    bulk_vals.extend([job_title, department_val])
-                if external_uid is not None and external_uid_available:
-                    bulk_cols.append("external_uid")
-                    bulk_vals.append(external_uid)
-                bulk_placeholders = ", ".join(f"${i}" for i in range(1, len(bulk_vals) + 1))
-                bulk_col_list = ", ".join(bulk_cols)
-                employee = await conn.fetchrow(
-                    f"INSERT INTO employees ({bulk_col_list}) VALUES ({bulk_placeholders}) RETURNING id",
-                    *bulk_vals
-                    )
-
-                employee_ids.append(employee['id'])
-                created += 1
-                logger.info("[BulkUpload] Row %d: created employee %s (%s)", row_num, employee['id'], email)
-
-                # Process credential fields if any are present in the CSV row
+            # Send invitation if requested
+            if send_invitations:
                 try:
-                    cred_license_type = (row.get('license_type') or '').strip() or None
-                    cred_license_number = (row.get('license_number') or '').strip() or None
-                    cred_license_state = (row.get('license_state') or '').strip() or None
-                    cred_license_expiration = _parse_csv_date((row.get('license_expiration') or ''))
-                    cred_npi_number = (row.get('npi_number') or '').strip() or None
-                    cred_dea_number = (row.get('dea_number') or '').strip() or None
-                    cred_dea_expiration = _parse_csv_date((row.get('dea_expiration') or ''))
-                    cred_board_certification = (row.get('board_certification') or '').strip() or None
-                    cred_board_certification_expiration = _parse_csv_date((row.get('board_certification_expiration') or ''))
-                    cred_clinical_specialty = (row.get('clinical_specialty') or '').strip() or None
-                    cred_malpractice_carrier = (row.get('malpractice_carrier') or '').strip() or None
-                    cred_malpractice_policy_number = (row.get('malpractice_policy_number') or '').strip() or None
-                    cred_malpractice_expiration = _parse_csv_date((row.get('malpractice_expiration') or ''))
-
-                    health_clearances_str = (row.get('health_clearances') or '').strip()
-                    cred_health_clearances: dict = {}
-                    if health_clearances_str:
-                        try:
-                            parsed_hc = json.loads(health_clearances_str)
-                            cred_health_clearances = parsed_hc if isinstance(parsed_hc, dict) else {}
-                        except json.JSONDecodeError:
-                            logger.warning("[BulkUpload] Row %d: invalid health_clearances JSON for %s, storing {}", row_num, email)
-
-                    scalar_cred_fields = [
-                        cred_license_type, cred_license_number, cred_license_state, cred_license_expiration,
-                        cred_npi_number, cred_dea_number, cred_dea_expiration,
-                        cred_board_certification, cred_board_certification_expiration, cred_clinical_specialty,
-                        cred_malpractice_carrier, cred_malpractice_policy_number, cred_malpractice_expiration,
-                    ]
-                    if any(v is not None for v in scalar_cred_fields) or cred_health_clearances:
-                        enc_creds = encrypt_credential_fields({
-                            "license_number": cred_license_number,
-                            "npi_number": cred_npi_number,
-                            "dea_number": cred_dea_number,
-                            "malpractice_policy_number": cred_malpractice_policy_number,
-                        })
-                        await conn.execute("""
-                            INSERT INTO employee_credentials (
-                                employee_id, org_id,
-                                license_type, license_number, license_state, license_expiration,
-                                npi_number, dea_number, dea_expiration,
-                                board_certification, board_certification_expiration,
-                                clinical_specialty,
-                                oig_last_checked, oig_status,
-                                malpractice_carrier, malpractice_policy_number, malpractice_expiration,
-                                health_clearances,
-                                updated_at
-                            ) VALUES (
-                                $1, $2,
-                                $3, $4, $5, $6,
-                                $7, $8, $9,
-                                $10, $11,
-                                $12,
-                                $13, $14,
-                                $15, $16, $17,
-                                $18::jsonb,
-                                NOW()
-                            )
-                            ON CONFLICT (employee_id) DO UPDATE SET
-                                license_type = COALESCE(EXCLUDED.license_type, employee_credentials.license_type),
-                                license_number = COALESCE(EXCLUDED.license_number, employee_credentials.license_number),
-                                license_state = COALESCE(EXCLUDED.license_state, employee_credentials.license_state),
-                                license_expiration = COALESCE(EXCLUDED.license_expiration, employee_credentials.license_expiration),
-                                npi_number = COALESCE(EXCLUDED.npi_number, employee_credentials.npi_number),
-                                dea_number = COALESCE(EXCLUDED.dea_number, employee_credentials.dea_number),
-                                dea_expiration = COALESCE(EXCLUDED.dea_expiration, employee_credentials.dea_expiration),
-                                board_certification = COALESCE(EXCLUDED.board_certification, employee_credentials.board_certification),
-                                board_certification_expiration = COALESCE(EXCLUDED.board_certification_expiration, employee_credentials.board_certification_expiration),
-                                clinical_specialty = COALESCE(EXCLUDED.clinical_specialty, employee_credentials.clinical_specialty),
-                                oig_last_checked = COALESCE(EXCLUDED.oig_last_checked, employee_credentials.oig_last_checked),
-                                oig_status = COALESCE(EXCLUDED.oig_status, employee_credentials.oig_status),
-                                malpractice_carrier = COALESCE(EXCLUDED.malpractice_carrier, employee_credentials.malpractice_carrier),
-                                malpractice_policy_number = COALESCE(EXCLUDED.malpractice_policy_number, employee_credentials.malpractice_policy_number),
-                                malpractice_expiration = COALESCE(EXCLUDED.malpractice_expiration, employee_credentials.malpractice_expiration),
-                                health_clearances = COALESCE(EXCLUDED.health_clearances, employee_credentials.health_clearances),
-                                updated_at = NOW()
-                        """,
-                            employee['id'], company_id,
-                            cred_license_type, enc_creds["license_number"], cred_license_state, cred_license_expiration,
-                            enc_creds["npi_number"], enc_creds["dea_number"], cred_dea_expiration,
-                            cred_board_certification, cred_board_certification_expiration, cred_clinical_specialty,
-                            None, None,
-                            cred_malpractice_carrier, enc_creds["malpractice_policy_number"], cred_malpractice_expiration,
-                            json.dumps(cred_health_clearances) if cred_health_clearances else None,
-                        )
-                        credentials_created += 1
-                        logger.info("[BulkUpload] Row %d: created credentials for employee %s", row_num, employee['id'])
+                    logger.info("[BulkUpload] Row %d: sending invitation to %s", staged.row_num, staged.email)
+                    await send_single_invitation(
+                        employee_id,
+                        company_id,
+                        current_user.id,
+                        conn,
+                        raise_on_email_failure=False,
+                    )
+                    await asyncio.sleep(0.15)  # rate-limit guard for MailerSend
                 except Exception as e:
-                    logger.warning("[BulkUpload] Row %d: employee %s created but credential save failed: %s", row_num, email, e)
+                    logger.warning("[BulkUpload] Row %d: invitation failed for %s: %s", staged.row_num, staged.email, e)
+                    # Log error but don't fail the employee creation
                     errors.append({
-                        "row": row_num,
-                        "email": email,
-                        "error": f"Employee created but credentials failed: {_exception_message(e)}"
+                        "row": staged.row_num,
+                        "email": staged.email,
+                        "error": f"Employee created but invitation failed: {_exception_message(e)}"
                     })
 
-                await _sync_employee_location_for_compliance(
-                    conn,
-                    company_id=company_id,
-                    employee_id=employee["id"],
-                    work_state=work_state,
-                    work_city=work_city,
-                    background_tasks=background_tasks,
-                )
-
-                # Auto-assign new-hire training per training_assignment_rules
-                try:
-                    from app.matcha.services.training.training_assignment import evaluate_new_hire_rules
-
-                    await evaluate_new_hire_rules(conn, company_id, employee["id"])
-                except Exception:
-                    logger.exception(
-                        "[BulkUpload] Row %d: failed to auto-assign new-hire training for %s",
-                        row_num, email,
-                    )
-
-                # Schedule Google Workspace / Slack provisioning
-                run_google = google_workspace_auto_provision
-                run_slack = slack_auto_provision
-                if run_google or run_slack:
-                    logger.info("[BulkUpload] Row %d: scheduling provisioning for %s (google=%s, slack=%s)",
-                                row_num, email, run_google, run_slack)
-                    background_tasks.add_task(
-                        _run_provisioning_and_notify,
-                        company_id=company_id,
-                        employee_id=employee['id'],
-                        triggered_by=current_user.id,
-                        personal_email=personal_email,
-                        employee_name=f"{first_name} {last_name}".strip(),
-                        work_email=email,
-                        run_google=run_google,
-                        run_slack=run_slack,
-                    )
-                else:
-                    logger.info("[BulkUpload] Row %d: no integrations enabled, skipping provisioning for %s",
-                                row_num, email)
-
-                # Send invitation if requested
-                if send_invitations:
-                    try:
-                        logger.info("[BulkUpload] Row %d: sending invitation to %s", row_num, email)
-                        await send_single_invitation(
-                            employee['id'],
-                            company_id,
-                            current_user.id,
-                            conn,
-                            raise_on_email_failure=False,
-                        )
-                        await asyncio.sleep(0.15)  # rate-limit guard for MailerSend
-                    except Exception as e:
-                        logger.warning("[BulkUpload] Row %d: invitation failed for %s: %s", row_num, email, e)
-                        # Log error but don't fail the employee creation
-                        errors.append({
-                            "row": row_num,
-                            "email": email,
-                            "error": f"Employee created but invitation failed: {_exception_message(e)}"
-                        })
-
-            except Exception as e:
-                errors.append({
-                    "row": row_num,
-                    "email": (row.get('email') or ''),
-                    "error": str(e)
-                })
-                failed += 1
-
-    # Check if there were any rows
-    if created == 0 and failed == 0:
-        raise HTTPException(status_code=400, detail="No data rows found in CSV")
+    created = len(employee_ids)
+    failed = len(parsed.errors) + len(merged.errors)
 
     # D4: one cheap post-upload drift check for the whole batch (not per-row) —
     # alert-only, never triggers research.
@@ -603,7 +345,7 @@ async def bulk_upload_employees_csv(
 
     logger.info(
         "[BulkUpload] Complete: %d created, %d failed, %d errors, %d missing work location, %d background tasks queued",
-        created, failed, len(errors), rows_missing_work_location,
+        created, failed, len(errors), parsed.rows_missing_work_location,
         len(background_tasks.tasks) if hasattr(background_tasks, 'tasks') else -1,
     )
 
@@ -611,10 +353,10 @@ async def bulk_upload_employees_csv(
         total_rows=created + failed,
         created=created,
         failed=failed,
-        errors=errors,
+        errors=sorted(errors, key=lambda e: e["row"]),
         employee_ids=employee_ids,
-        credentials_created=credentials_created,
-        rows_missing_work_location=rows_missing_work_location,
+        credentials_created=merged.credentials_written,
+        rows_missing_work_location=parsed.rows_missing_work_location,
     )
 
 
@@ -671,127 +413,17 @@ async def bulk_upload_credentials_csv(
     re-creating employee records.
     """
     company_id = await get_client_company_id(current_user)
+    _check_csv_upload(file)
 
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="File must be a CSV")
-
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
-
-    try:
-        csv_content = contents.decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid CSV format: {str(e)}")
-
-    if not csv_reader.fieldnames or 'email' not in csv_reader.fieldnames:
-        raise HTTPException(status_code=400, detail="CSV must include an 'email' column")
-
-    updated = 0
-    failed = 0
-    not_found = 0
-    errors = []
+    parsed = await _parse_csv_upload(file, parse_credentials_csv, MAX_BULK_ROWS)
+    if parsed.total_rows == 0:
+        raise HTTPException(status_code=400, detail="No data rows found in CSV")
 
     async with get_connection() as conn:
-        for row_num, row in enumerate(csv_reader, start=2):
-            email = (row.get('email') or '').strip()
-            if not email:
-                errors.append({"row": row_num, "email": "", "error": "Email is required"})
-                failed += 1
-                continue
-
-            emp_id = await conn.fetchval(
-                "SELECT id FROM employees WHERE org_id = $1 AND email = $2",
-                company_id, email,
-            )
-            if not emp_id:
-                errors.append({"row": row_num, "email": email, "error": "Employee not found"})
-                not_found += 1
-                continue
-
-            try:
-                health_clearances_str = (row.get('health_clearances') or '').strip()
-                health_clearances: dict = {}
-                if health_clearances_str:
-                    try:
-                        parsed_hc = json.loads(health_clearances_str)
-                        health_clearances = parsed_hc if isinstance(parsed_hc, dict) else {}
-                    except json.JSONDecodeError:
-                        logger.warning("[BulkCredentials] Row %d: invalid health_clearances JSON for %s, storing {}", row_num, email)
-
-                enc_creds = encrypt_credential_fields({
-                    "license_number": (row.get('license_number') or '').strip() or None,
-                    "npi_number": (row.get('npi_number') or '').strip() or None,
-                    "dea_number": (row.get('dea_number') or '').strip() or None,
-                    "malpractice_policy_number": (row.get('malpractice_policy_number') or '').strip() or None,
-                })
-                await conn.execute("""
-                    INSERT INTO employee_credentials (
-                        employee_id, org_id,
-                        license_type, license_number, license_state, license_expiration,
-                        npi_number, dea_number, dea_expiration,
-                        board_certification, board_certification_expiration,
-                        clinical_specialty,
-                        oig_last_checked, oig_status,
-                        malpractice_carrier, malpractice_policy_number, malpractice_expiration,
-                        health_clearances,
-                        updated_at
-                    ) VALUES (
-                        $1, $2,
-                        $3, $4, $5, $6,
-                        $7, $8, $9,
-                        $10, $11,
-                        $12,
-                        $13, $14,
-                        $15, $16, $17,
-                        $18::jsonb,
-                        NOW()
-                    )
-                    ON CONFLICT (employee_id) DO UPDATE SET
-                        license_type = COALESCE(EXCLUDED.license_type, employee_credentials.license_type),
-                        license_number = COALESCE(EXCLUDED.license_number, employee_credentials.license_number),
-                        license_state = COALESCE(EXCLUDED.license_state, employee_credentials.license_state),
-                        license_expiration = COALESCE(EXCLUDED.license_expiration, employee_credentials.license_expiration),
-                        npi_number = COALESCE(EXCLUDED.npi_number, employee_credentials.npi_number),
-                        dea_number = COALESCE(EXCLUDED.dea_number, employee_credentials.dea_number),
-                        dea_expiration = COALESCE(EXCLUDED.dea_expiration, employee_credentials.dea_expiration),
-                        board_certification = COALESCE(EXCLUDED.board_certification, employee_credentials.board_certification),
-                        board_certification_expiration = COALESCE(EXCLUDED.board_certification_expiration, employee_credentials.board_certification_expiration),
-                        clinical_specialty = COALESCE(EXCLUDED.clinical_specialty, employee_credentials.clinical_specialty),
-                        oig_last_checked = COALESCE(EXCLUDED.oig_last_checked, employee_credentials.oig_last_checked),
-                        oig_status = COALESCE(EXCLUDED.oig_status, employee_credentials.oig_status),
-                        malpractice_carrier = COALESCE(EXCLUDED.malpractice_carrier, employee_credentials.malpractice_carrier),
-                        malpractice_policy_number = COALESCE(EXCLUDED.malpractice_policy_number, employee_credentials.malpractice_policy_number),
-                        malpractice_expiration = COALESCE(EXCLUDED.malpractice_expiration, employee_credentials.malpractice_expiration),
-                        health_clearances = COALESCE(EXCLUDED.health_clearances, employee_credentials.health_clearances),
-                        updated_at = NOW()
-                """,
-                    emp_id, company_id,
-                    (row.get('license_type') or '').strip() or None,
-                    enc_creds["license_number"],
-                    (row.get('license_state') or '').strip() or None,
-                    _parse_csv_date((row.get('license_expiration') or '')),
-                    enc_creds["npi_number"],
-                    enc_creds["dea_number"],
-                    _parse_csv_date((row.get('dea_expiration') or '')),
-                    (row.get('board_certification') or '').strip() or None,
-                    _parse_csv_date((row.get('board_certification_expiration') or '')),
-                    (row.get('clinical_specialty') or '').strip() or None,
-                    None, None,
-                    (row.get('malpractice_carrier') or '').strip() or None,
-                    enc_creds["malpractice_policy_number"],
-                    _parse_csv_date((row.get('malpractice_expiration') or '')),
-                    json.dumps(health_clearances) if health_clearances else None,
-                )
-                updated += 1
-            except Exception as e:
-                errors.append({"row": row_num, "email": email, "error": str(e)})
-                failed += 1
-
-    if updated == 0 and failed == 0 and not_found == 0:
-        raise HTTPException(status_code=400, detail="No data rows found in CSV")
+        updated, not_found_errors, failed_errors = await merge_credentials(conn, company_id, parsed.rows)
 
+    failed = len(parsed.errors) + len(failed_errors)
+    not_found = len(not_found_errors)
     logger.info("[BulkCredentials] Complete: %d updated, %d not_found, %d failed", updated, not_found, failed)
 
     return BulkCredentialsUploadResponse(
@@ -799,5 +431,5 @@ async def bulk_upload_credentials_csv(
         updated=updated,
         failed=failed,
         not_found=not_found,
-        errors=errors,
+        errors=sorted(parsed.errors + not_found_errors + failed_errors, key=lambda e: e["row"]),
     )
@@ -31,6 +31,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from pydantic import BaseModel, EmailStr, model_validator
 
 from app.core.models.auth import CurrentUser
+from app.core.services.principal_cache import bump_principal_version
 from app.database import get_connection
 from app.matcha.dependencies import get_client_company_id, require_admin_or_client
 from app.matcha.services.onboarding.onboarding_orchestrator import (
@@ -1192,12 +1193,15 @@ async def delete_employee(
     company_id = await get_client_company_id(current_user)
 
     async with get_connection() as conn:
-        result = await conn.execute(
-            "DELETE FROM employees WHERE id = $1 AND org_id = $2",
+        deleted = await conn.fetchrow(
+            "DELETE FROM employees WHERE id = $1 AND org_id = $2 RETURNING user_id",
             employee_id, company_id
         )
 
-        if result == "DELETE 0":
+        if deleted is None:
             raise HTTPException(status_code=404, detail="Employee not found")
 
+        # Their cached company scope still points at this org.
+        await bump_principal_version(deleted["user_id"])
+
         return {"message": "Employee deleted successfully"}
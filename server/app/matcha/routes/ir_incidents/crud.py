@@ -354,7 +354,7 @@ async def export_incidents(
 
     # PDF — WeasyPrint render
     try:
-        from ....core.services.pdf import render_pdf
+        from ....core.services.pdf import render_pdf_async
     except ImportError:
         raise HTTPException(status_code=500, detail="PDF generation unavailable on server")
 
@@ -366,7 +366,7 @@ async def export_incidents(
 
     html_str = _build_incidents_export_html(rows, period_label, EXPORT_ROW_LIMIT)
 
-    pdf_bytes = await asyncio.to_thread(lambda: render_pdf(html_str))
+    pdf_bytes = await render_pdf_async(html_str)
     return StreamingResponse(
         io.BytesIO(pdf_bytes),
         media_type="application/pdf",
@@ -443,13 +443,13 @@ async def export_incident_pdf(
     )
 
     try:
-        from ....core.services.pdf import render_pdf
+        from ....core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(status_code=501, detail="PDF generation not available on this server")
     try:
         pdf_bytes = await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(html_str)),
+            render_pdf_async(html_str),
             timeout=60.0,
         )
     except asyncio.TimeoutError:
@@ -279,7 +279,7 @@ async def render_300a_pdf(summary: dict) -> bytes:
         # the old 4-dot relative silently resolved to `app.matcha.core.services.pdf`
         # (nonexistent) — swallowed by the except below, so every 300A PDF request
         # returned 501 "install weasyprint" on a server that has it.
-        from app.core.services.pdf import render_pdf
+        from app.core.services.pdf import render_pdf_async
     except ImportError as ie:
         logger.error("weasyprint import failed: %s", ie)
         raise HTTPException(
@@ -289,7 +289,7 @@ async def render_300a_pdf(summary: dict) -> bytes:
 
     try:
         return await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(full_html)),
+            render_pdf_async(full_html),
             timeout=60.0,
         )
     except asyncio.TimeoutError:
@@ -181,15 +181,14 @@ async def upload_cba_document(
     company_id: Optional[UUID] = Depends(get_client_company_id),
 ):
     company_id = _require_company(company_id)
-    file_bytes = await file.read()
-    if not file_bytes:
+    if not file.size:
         raise HTTPException(status_code=400, detail="Empty file")
 
     storage = get_storage()
     try:
-        path = await storage.upload_private_file(
-            file_bytes, file.filename or "cba.pdf",
-            prefix="cba-documents", content_type=file.content_type,
+        path = await storage.upload_stream(
+            file.file, file.filename or "cba.pdf",
+            prefix="cba-documents", content_type=file.content_type, private=True,
         )
     except Exception as exc:  # noqa: BLE001
         logger.error("CBA document upload failed for %s: %s", cba_id, exc)
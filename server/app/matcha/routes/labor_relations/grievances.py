@@ -612,14 +612,13 @@ async def upload_grievance_document(
     so a caller cannot point a grievance at an arbitrary bucket/object.
     """
     company_id = _require_company(company_id)
-    file_bytes = await file.read()
-    if not file_bytes:
+    if not file.size:
         raise HTTPException(status_code=400, detail="Empty file")
     storage = get_storage()
     try:
-        path = await storage.upload_private_file(
-            file_bytes, file.filename or "evidence",
-            prefix="grievance-documents", content_type=file.content_type,
+        path = await storage.upload_stream(
+            file.file, file.filename or "evidence",
+            prefix="grievance-documents", content_type=file.content_type, private=True,
         )
     except Exception as exc:  # noqa: BLE001
         logger.error("Grievance document upload failed for %s: %s", grievance_id, exc)
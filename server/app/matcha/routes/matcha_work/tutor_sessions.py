@@ -35,6 +35,7 @@ import json
 from fastapi import APIRouter, HTTPException, Depends
 
 from app.core.dependencies import get_current_user, require_admin
+from app.core.services.principal_cache import bump_principal_version
 from app.core.models.auth import CurrentUser
 
 from app.database import get_connection
@@ -148,6 +149,7 @@ async def create_tutor_session(
                         detail="Culture interview must be completed first. Complete at least one culture interview and aggregate the culture profile before running candidate interviews."
                     )
 
+        token_row = None
         async with conn.transaction():
             # For candidates using interview prep, consume a token atomically.
             # Skip token consumption for practice mode.
@@ -181,6 +183,11 @@ async def create_tutor_session(
             )
             interview_id = row["id"]
 
+        if token_row is not None:
+            # CurrentUser carries interview_prep_tokens — the cached principal
+            # must not keep admitting a candidate who just spent their last one.
+            await bump_principal_version(current_user.id)
+
         # Calculate duration in seconds
         # Default: 5 min for interview prep, 2 min for language test, 8 min for company interview modes.
         if request.duration_minutes:
@@ -21,7 +21,7 @@ from pathlib import Path
 from typing import Optional
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import StreamingResponse
 
 from ....database import get_connection
@@ -993,6 +993,6 @@ async def download_packet(session_id: str, packet_id: str, request: Request,
         if not pkt:
             raise HTTPException(status_code=404, detail="Report not found")
         await _audit(conn, session_id, current_user, request, "export", {"packet_id": packet_id})
-    data = await get_storage().download_file(pkt["storage_path"])
-    return Response(content=data, media_type="application/pdf",
-                    headers={"Content-Disposition": f'attachment; filename="{_safe_filename(pkt["filename"])}"'})
+    body = await get_storage().open_stream(pkt["storage_path"])
+    return StreamingResponse(body, media_type="application/pdf",
+                             headers={"Content-Disposition": f'attachment; filename="{_safe_filename(pkt["filename"])}"'})
@@ -19,7 +19,7 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, Response, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from app.matcha.models.pilots.chat import PilotChatIn as ChatIn
@@ -529,10 +529,10 @@ async def download_packet(matter_id: str, packet_id: str, request: Request, curr
     async with get_connection() as conn:
         pkt = await _owned_packet(conn, matter_id, packet_id, company_id)
         await _audit(conn, matter_id, current_user, request, "export", {"packet_id": packet_id})
-    data = await get_storage().download_file(pkt["storage_path"])
+    body = await get_storage().open_stream(pkt["storage_path"])
     mime = "application/zip" if pkt["kind"] == "zip" else "application/pdf"
-    return Response(
-        content=data, media_type=mime,
+    return StreamingResponse(
+        body, media_type=mime,
         headers={"Content-Disposition": f'attachment; filename="{_safe_filename(pkt["filename"])}"'},
     )
 
@@ -643,9 +643,9 @@ async def download_shared_packet(token: str, request: Request, background_tasks:
             filename=row["filename"] or "packet",
             recipient_email=row["recipient_email"],
         )
-    data = await get_storage().download_file(row["storage_path"])
+    body = await get_storage().open_stream(row["storage_path"])
     mime = "application/zip" if row["kind"] == "zip" else "application/pdf"
-    return Response(
-        content=data, media_type=mime,
+    return StreamingResponse(
+        body, media_type=mime,
         headers={"Content-Disposition": f'attachment; filename="{_safe_filename(row["filename"])}"'},
     )
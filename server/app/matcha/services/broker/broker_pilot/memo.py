@@ -2,11 +2,10 @@
 context, native sources, jurisdictions), the memo HTML, and build_memo_pdf.
 Appendices render from DB rows / re-gathered context, never from model text.
 """
-import asyncio
 import json
 import logging
 from datetime import datetime, timezone
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 from app.matcha.services._shared.pdf import _PDF_CSS, _esc, _fmt_dt
 
 from ._config import DISCLAIMER, _GAP_SEVERITIES
@@ -357,9 +356,7 @@ def _memo_html(session: dict, subject_name: str, corpus: dict, memo: dict,
 
 
 async def _render_pdf(html_str: str) -> bytes:
-    def _r() -> bytes:
-        return render_pdf(html_str)
-    return await asyncio.to_thread(_r)
+    return await render_pdf_async(html_str)
 
 
 async def build_memo_pdf(session: dict, subject_name: str, corpus: dict, memo: dict,
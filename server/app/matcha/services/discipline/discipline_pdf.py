@@ -263,13 +263,13 @@ async def render_discipline_letter(
     full_html = _render_html(record, employee, company, issuer, logo_src=logo_src)
 
     try:
-        from ....core.services.pdf import render_pdf
+        from ....core.services.pdf import render_pdf_async
     except ImportError:
         raise HTTPException(status_code=500, detail="PDF generation not available (weasyprint missing)")
 
     try:
         return await asyncio.wait_for(
-            asyncio.to_thread(lambda: render_pdf(full_html)),
+            render_pdf_async(full_html),
             timeout=timeout_seconds,
         )
     except asyncio.TimeoutError:
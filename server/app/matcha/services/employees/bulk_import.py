@@ -0,0 +1,552 @@
+"""Staged, set-based engine behind the employee CSV bulk-upload routes
+(`routes/employees/bulk_upload.py`).
+
+The routes used to walk the CSV one row at a time: an existence `fetchval`,
+a manager `fetchrow`, an `INSERT ... RETURNING` and a credentials upsert per
+row — four or five round trips per employee, so a 10k-person onboarding was
+~50k statements. The import now runs in stages:
+
+1. `parse_employee_csv` / `parse_credentials_csv` stream the upload through
+   `csv.DictReader` and validate every row in Python — the row loop's checks
+   and messages, plus the column constraints (employment_type, VARCHAR
+   widths) that used to surface as database errors. Each row becomes a staged
+   record or a per-row error; nothing touches the DB.
+2. `merge_employees` / `merge_credentials` COPY the staged records into
+   session temp tables and, in one transaction, drop rows whose email already
+   exists, INSERT the rest with one `INSERT ... SELECT`, link managers with
+   one join (a manager anywhere in the file or already on the roster), and
+   upsert credentials with one more.
+
+If the set-based merge hits a database error (a value the validation didn't
+anticipate — a column length, a constraint added later) it is rolled back and
+the batch is replayed one row per transaction, so the bad rows are reported
+individually and the good ones still land, as before.
+
+FastAPI-free, like the rest of services/: callers map errors to responses.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Iterable, Iterator, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.core.services.credential_crypto import encrypt_credential_fields
+from app.matcha.services.employees.us_states import normalize_work_state
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r'^[\w\.\-\+]+@[\w\.-]+\.\w+$')
+EMPLOYMENT_TYPES = ("full_time", "part_time", "contractor", "intern")
+# VARCHAR widths on `employees` (7c1de748641e); longer values would fail the
+# whole set-based INSERT, so they are per-row errors up front.
+_MAX_LENGTHS = {"email": 255, "first_name": 100, "last_name": 100, "phone": 50}
+DUPLICATE_EMAIL_ERROR = "Employee with this email already exists"
+
+CREDENTIAL_FIELDS = (
+    "license_type", "license_number", "license_state", "license_expiration",
+    "npi_number", "dea_number", "dea_expiration",
+    "board_certification", "board_certification_expiration", "clinical_specialty",
+    "malpractice_carrier", "malpractice_policy_number", "malpractice_expiration",
+)
+_CREDENTIAL_DATE_FIELDS = {
+    "license_expiration", "dea_expiration", "board_certification_expiration", "malpractice_expiration",
+}
+
+EMPLOYEE_STAGE_COLUMNS = [
+    "row_num", "email", "personal_email", "first_name", "last_name", "work_state",
+    "employment_type", "start_date", "manager_email", "phone", "pay_classification",
+    "pay_rate", "work_city", "job_title", "department", "external_uid",
+]
+CREDENTIAL_STAGE_COLUMNS = ["row_num", "email", *CREDENTIAL_FIELDS, "health_clearances"]
+
+
+class CSVTooLarge(ValueError):
+    """The upload has more data rows than the caller allows."""
+
+    def __init__(self, max_rows: int):
+        super().__init__(f"Too many rows (max {max_rows} per upload). Split into smaller files.")
+        self.max_rows = max_rows
+
+
+@dataclass
+class StagedEmployee:
+    row_num: int
+    email: str
+    personal_email: Optional[str]
+    first_name: str
+    last_name: str
+    work_state: Optional[str]
+    employment_type: Optional[str]
+    start_date: Optional[date]
+    manager_email: Optional[str]
+    phone: Optional[str]
+    pay_classification: Optional[str]
+    pay_rate: Optional[Decimal]
+    work_city: Optional[str]
+    job_title: Optional[str]
+    department: Optional[str]
+    external_uid: Optional[str]
+    credentials: Optional[dict] = None
+
+    def stage_record(self) -> tuple:
+        return tuple(getattr(self, col) for col in EMPLOYEE_STAGE_COLUMNS)
+
+
+@dataclass
+class ParsedUpload:
+    rows: list = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    total_rows: int = 0
+    rows_missing_work_location: int = 0
+
+
+@dataclass
+class MergeResult:
+    created: list[tuple[StagedEmployee, UUID]] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    credentials_written: int = 0
+
+
+# ── parse + validate ─────────────────────────────────────────────────────────
+
+def _cell(row: dict, key: str) -> Optional[str]:
+    return (row.get(key) or "").strip() or None
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _parse_credentials(row_num: int, row: dict) -> Optional[dict]:
+    """Credential columns of one row, or None when the row has none. Values
+    are plaintext here; they are encrypted when staged."""
+    creds = {}
+    for name in CREDENTIAL_FIELDS:
+        value = _cell(row, name)
+        creds[name] = _parse_date(value) if name in _CREDENTIAL_DATE_FIELDS else value
+    health_clearances = {}
+    raw = _cell(row, "health_clearances")
+    if raw:
+        try:
+            parsed = json.loads(raw)
+            health_clearances = parsed if isinstance(parsed, dict) else {}
+        except json.JSONDecodeError:
+            logger.warning("[BulkUpload] Row %d: invalid health_clearances JSON, storing {}", row_num)
+    creds["health_clearances"] = health_clearances
+    if not health_clearances and all(v is None for k, v in creds.items() if k != "health_clearances"):
+        return None
+    return creds
+
+
+def validate_employee_row(row_num: int, row: dict) -> tuple[Optional[StagedEmployee], Optional[str]]:
+    """One CSV row -> (staged employee, None) or (None, error message)."""
+    email = _cell(row, "email") or ""
+    personal_email = _cell(row, "personal_email")
+    if not email:
+        return None, "Email is required"
+    if not EMAIL_RE.match(email):
+        return None, "Invalid email format"
+    if personal_email and not EMAIL_RE.match(personal_email):
+        return None, "Invalid personal_email format"
+
+    first_name = _cell(row, "first_name")
+    last_name = _cell(row, "last_name")
+    if not first_name or not last_name:
+        return None, "First name and last name are required"
+
+    work_state_raw = row.get("work_state") or ""
+    work_state, work_state_valid = normalize_work_state(work_state_raw)
+    if not work_state_valid:
+        return None, (
+            f"Invalid work_state '{work_state_raw.strip()}' — use a 2-letter "
+            "US state/territory code (e.g. 'CA') or the full state name"
+        )
+
+    employment_type = _cell(row, "employment_type")
+    if employment_type and employment_type not in EMPLOYMENT_TYPES:
+        return None, f"Invalid employment_type '{employment_type}'. Must be one of: {', '.join(EMPLOYMENT_TYPES)}"
+
+    pay_classification = (_cell(row, "pay_classification") or "").lower() or None
+    if pay_classification and pay_classification not in ("hourly", "exempt"):
+        return None, f"Invalid pay_classification '{pay_classification}'. Must be 'hourly' or 'exempt'"
+
+    pay_rate = None
+    pay_rate_str = _cell(row, "pay_rate")
+    if pay_rate_str:
+        try:
+            pay_rate = Decimal(pay_rate_str)
+        except InvalidOperation:
+            pay_rate = None
+        if pay_rate is None or not pay_rate.is_finite() or pay_rate < 0:
+            return None, f"Invalid pay_rate '{pay_rate_str}'. Must be a non-negative number"
+    if pay_rate is not None and pay_classification is None:
+        return None, "pay_classification is required when pay_rate is provided"
+
+    phone = _cell(row, "phone")
+    for name, value in (("email", email), ("first_name", first_name), ("last_name", last_name), ("phone", phone)):
+        if value and len(value) > _MAX_LENGTHS[name]:
+            return None, f"{name} is too long (max {_MAX_LENGTHS[name]} characters)"
+
+    return StagedEmployee(
+        row_num=row_num,
+        email=email,
+        personal_email=personal_email,
+        first_name=first_name,
+        last_name=last_name,
+        work_state=work_state,
+        employment_type=employment_type,
+        start_date=_parse_date(_cell(row, "start_date")),
+        manager_email=_cell(row, "manager_email"),
+        phone=phone,
+        pay_classification=pay_classification,
+        pay_rate=pay_rate,
+        work_city=_cell(row, "work_city"),
+        job_title=_cell(row, "job_title"),
+        department=_cell(row, "department"),
+        external_uid=_cell(row, "uid") or _cell(row, "external_uid"),
+        credentials=_parse_credentials(row_num, row),
+    ), None
+
+
+def _data_rows(reader: csv.DictReader, max_rows: int) -> Iterator[tuple[int, dict]]:
+    for row_num, row in enumerate(reader, start=2):  # row 1 is the header
+        if row_num - 1 > max_rows:
+            raise CSVTooLarge(max_rows)
+        yield row_num, row
+
+
+def parse_employee_csv(stream: IO[str], *, max_rows: int) -> ParsedUpload:
+    """Stream-parse and validate a bulk-upload CSV. Blocking (CSV parsing and
+    field encryption are CPU work) — run it in a worker thread.
+
+    Raises ValueError when the header is missing a required column and
+    `CSVTooLarge` past `max_rows`.
+    """
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames:
+        raise ValueError("CSV file is empty")
+    missing = [col for col in ("email", "first_name", "last_name") if col not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+    parsed = ParsedUpload()
+    seen: set[str] = set()
+    for row_num, row in _data_rows(reader, max_rows):
+        parsed.total_rows += 1
+        staged, error = validate_employee_row(row_num, row)
+        if error is None and staged.email in seen:
+            error = DUPLICATE_EMAIL_ERROR
+        if error is not None:
+            parsed.errors.append({"row": row_num, "email": (row.get("email") or "").strip(), "error": error})
+            continue
+        seen.add(staged.email)
+        if staged.work_state is None:
+            parsed.rows_missing_work_location += 1
+        parsed.rows.append(staged)
+    return parsed
+
+
+def parse_credentials_csv(stream: IO[str], *, max_rows: int) -> ParsedUpload:
+    """Stream-parse a credentials-only CSV into `(row_num, email, creds)`
+    tuples. Rows naming the same email are applied in file order, so a later
+    non-blank value wins field by field — what the old per-row upserts did."""
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or "email" not in reader.fieldnames:
+        raise ValueError("CSV must include an 'email' column")
+    parsed = ParsedUpload()
+    for row_num, row in _data_rows(reader, max_rows):
+        parsed.total_rows += 1
+        email = _cell(row, "email")
+        if not email:
+            parsed.errors.append({"row": row_num, "email": "", "error": "Email is required"})
+            continue
+        creds = _parse_credentials(row_num, row) or {**{f: None for f in CREDENTIAL_FIELDS}, "health_clearances": {}}
+        parsed.rows.append((row_num, email, creds))
+    return parsed
+
+
+def _credential_record(row_num: int, email: str, creds: dict) -> tuple:
+    encrypted = encrypt_credential_fields({k: creds.get(k) for k in CREDENTIAL_FIELDS})
+    health_clearances = creds.get("health_clearances")
+    return (
+        row_num, email,
+        *(encrypted[k] for k in CREDENTIAL_FIELDS),
+        json.dumps(health_clearances) if health_clearances else None,
+    )
+
+
+def _collapse_credentials(rows: Iterable[tuple[int, str, dict]]) -> list[tuple[int, str, dict, list[int]]]:
+    """Fold rows that name the same email into one (per-field last non-blank
+    wins). Returns (first row, email, merged creds, every row number)."""
+    merged: dict[str, tuple[int, dict, list[int]]] = {}
+    for row_num, email, creds in rows:
+        if email not in merged:
+            merged[email] = (row_num, dict(creds), [row_num])
+            continue
+        first_row, current, row_nums = merged[email]
+        for key, value in creds.items():
+            if value:
+                current[key] = value
+        row_nums.append(row_num)
+    return [(first_row, email, creds, row_nums) for email, (first_row, creds, row_nums) in merged.items()]
+
+
+# ── stage + merge ────────────────────────────────────────────────────────────
+
+_CREATE_EMPLOYEE_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS _employee_import_stage (
+        row_num INT, email TEXT, personal_email TEXT, first_name TEXT, last_name TEXT,
+        work_state TEXT, employment_type TEXT, start_date DATE, manager_email TEXT,
+        phone TEXT, pay_classification TEXT, pay_rate NUMERIC, work_city TEXT,
+        job_title TEXT, department TEXT, external_uid TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+_CREATE_CREDENTIAL_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS _employee_credentials_stage (
+        row_num INT, email TEXT,
+        license_type TEXT, license_number TEXT, license_state TEXT, license_expiration DATE,
+        npi_number TEXT, dea_number TEXT, dea_expiration DATE,
+        board_certification TEXT, board_certification_expiration DATE, clinical_specialty TEXT,
+        malpractice_carrier TEXT, malpractice_policy_number TEXT, malpractice_expiration DATE,
+        health_clearances TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+# One employee per staged row (DISTINCT ON): `employees` has no unique
+# (org_id, email), and the old lookup also took the first match.
+_UPSERT_STAGED_CREDENTIALS = """
+    INSERT INTO employee_credentials (
+        employee_id, org_id,
+        license_type, license_number, license_state, license_expiration,
+        npi_number, dea_number, dea_expiration,
+        board_certification, board_certification_expiration, clinical_specialty,
+        malpractice_carrier, malpractice_policy_number, malpractice_expiration,
+        health_clearances, updated_at
+    )
+    SELECT DISTINCT ON (c.row_num)
+        e.id, $1,
+        c.license_type, c.license_number, c.license_state, c.license_expiration,
+        c.npi_number, c.dea_number, c.dea_expiration,
+        c.board_certification, c.board_certification_expiration, c.clinical_specialty,
+        c.malpractice_carrier, c.malpractice_policy_number, c.malpractice_expiration,
+        c.health_clearances::jsonb, NOW()
+    FROM _employee_credentials_stage c
+    JOIN employees e ON e.org_id = $1 AND e.email = c.email
+    ORDER BY c.row_num, e.created_at, e.id
+    ON CONFLICT (employee_id) DO UPDATE SET
+        license_type = COALESCE(EXCLUDED.license_type, employee_credentials.license_type),
+        license_number = COALESCE(EXCLUDED.license_number, employee_credentials.license_number),
+        license_state = COALESCE(EXCLUDED.license_state, employee_credentials.license_state),
+        license_expiration = COALESCE(EXCLUDED.license_expiration, employee_credentials.license_expiration),
+        npi_number = COALESCE(EXCLUDED.npi_number, employee_credentials.npi_number),
+        dea_number = COALESCE(EXCLUDED.dea_number, employee_credentials.dea_number),
+        dea_expiration = COALESCE(EXCLUDED.dea_expiration, employee_credentials.dea_expiration),
+        board_certification = COALESCE(EXCLUDED.board_certification, employee_credentials.board_certification),
+        board_certification_expiration = COALESCE(EXCLUDED.board_certification_expiration, employee_credentials.board_certification_expiration),
+        clinical_specialty = COALESCE(EXCLUDED.clinical_specialty, employee_credentials.clinical_specialty),
+        malpractice_carrier = COALESCE(EXCLUDED.malpractice_carrier, employee_credentials.malpractice_carrier),
+        malpractice_policy_number = COALESCE(EXCLUDED.malpractice_policy_number, employee_credentials.malpractice_policy_number),
+        malpractice_expiration = COALESCE(EXCLUDED.malpractice_expiration, employee_credentials.malpractice_expiration),
+        health_clearances = COALESCE(EXCLUDED.health_clearances, employee_credentials.health_clearances),
+        updated_at = NOW()
+"""
+
+
+def _employee_insert_columns(*, compensation_fields: bool, org_fields: bool, external_uid: bool) -> list[str]:
+    cols = [
+        "email", "personal_email", "first_name", "last_name", "work_state",
+        "employment_type", "start_date", "phone",
+    ]
+    if compensation_fields:
+        cols += ["pay_classification", "pay_rate", "work_city"]
+    if org_fields:
+        cols += ["job_title", "department"]
+    if external_uid:
+        cols.append("external_uid")
+    return cols
+
+
+async def _merge_employee_batch(
+    conn, company_id: UUID, rows: list[StagedEmployee], insert_cols: list[str],
+) -> tuple[list[tuple[StagedEmployee, UUID]], list[dict], int]:
+    """Stage + merge `rows`. Must run inside a transaction (the stage tables
+    empty on commit)."""
+    await conn.execute(_CREATE_EMPLOYEE_STAGE)
+    await conn.copy_records_to_table(
+        "_employee_import_stage",
+        records=[r.stage_record() for r in rows],
+        columns=EMPLOYEE_STAGE_COLUMNS,
+    )
+    duplicates = await conn.fetch(
+        """
+        DELETE FROM _employee_import_stage s
+        USING employees e
+        WHERE e.org_id = $1 AND e.email = s.email
+        RETURNING s.row_num, s.email
+        """,
+        company_id,
+    )
+    errors = [{"row": d["row_num"], "email": d["email"], "error": DUPLICATE_EMAIL_ERROR} for d in duplicates]
+    rejected = {d["row_num"] for d in duplicates}
+
+    inserted = await conn.fetch(
+        f"""
+        INSERT INTO employees (org_id, {", ".join(insert_cols)})
+        SELECT $1, {", ".join(f"s.{c}" for c in insert_cols)}
+        FROM _employee_import_stage s
+        ORDER BY s.row_num
+        RETURNING id, email
+        """,
+        company_id,
+    )
+    ids_by_email = {r["email"]: r["id"] for r in inserted}
+    new_ids = list(ids_by_email.values())
+    if not new_ids:
+        return [], errors, 0
+
+    await conn.execute(
+        """
+        UPDATE employees e
+        SET manager_id = m.id
+        FROM _employee_import_stage s
+        JOIN employees m ON m.org_id = $1 AND m.email = s.manager_email
+        WHERE e.id = ANY($2::uuid[])
+          AND e.email = s.email
+          AND m.id <> e.id
+        """,
+        company_id,
+        new_ids,
+    )
+
+    credential_rows = [
+        _credential_record(r.row_num, r.email, r.credentials)
+        for r in rows if r.credentials and r.row_num not in rejected
+    ]
+    if credential_rows:
+        await conn.execute(_CREATE_CREDENTIAL_STAGE)
+        await conn.copy_records_to_table(
+            "_employee_credentials_stage", records=credential_rows, columns=CREDENTIAL_STAGE_COLUMNS,
+        )
+        await conn.execute(_UPSERT_STAGED_CREDENTIALS, company_id)
+
+    created = [(r, ids_by_email[r.email]) for r in rows if r.row_num not in rejected and r.email in ids_by_email]
+    return created, errors, len(credential_rows)
+
+
+async def merge_employees(
+    conn,
+    company_id: UUID,
+    rows: list[StagedEmployee],
+    *,
+    compensation_fields: bool,
+    org_fields: bool,
+    external_uid: bool,
+) -> MergeResult:
+    """Create `rows` (already validated) on `conn` — see the module docstring.
+
+    Duplicates of existing employees come back as per-row errors; `created`
+    is in file order.
+    """
+    result = MergeResult()
+    if not rows:
+        return result
+    insert_cols = _employee_insert_columns(
+        compensation_fields=compensation_fields, org_fields=org_fields, external_uid=external_uid,
+    )
+    try:
+        async with conn.transaction():
+            created, errors, credentials = await _merge_employee_batch(conn, company_id, rows, insert_cols)
+    except asyncpg.PostgresError as exc:
+        logger.warning(
+            "[BulkUpload] set-based merge of %d rows failed (%s); replaying row by row",
+            len(rows), exc,
+        )
+    else:
+        result.created, result.errors, result.credentials_written = created, errors, credentials
+        return result
+
+    for row in rows:
+        try:
+            async with conn.transaction():
+                created, errors, credentials = await _merge_employee_batch(conn, company_id, [row], insert_cols)
+        except asyncpg.PostgresError as exc:
+            result.errors.append({"row": row.row_num, "email": row.email, "error": str(exc)})
+            continue
+        result.created += created
+        result.errors += errors
+        result.credentials_written += credentials
+    return result
+
+
+async def merge_credentials(conn, company_id: UUID, rows: list[tuple[int, str, dict]]) -> tuple[int, list[dict], list[dict]]:
+    """Upsert credentials for existing employees by email.
+
+    Returns (rows applied, not-found errors, failed-row errors).
+    """
+    if not rows:
+        return 0, [], []
+    collapsed = _collapse_credentials(rows)
+    row_nums_by_first = {first: row_nums for first, _, _, row_nums in collapsed}
+    records = [_credential_record(first, email, creds) for first, email, creds, _ in collapsed]
+
+    async def apply(batch: list[tuple]) -> list[asyncpg.Record]:
+        await conn.execute(_CREATE_CREDENTIAL_STAGE)
+        await conn.copy_records_to_table(
+            "_employee_credentials_stage", records=batch, columns=CREDENTIAL_STAGE_COLUMNS,
+        )
+        missing = await conn.fetch(
+            """
+            DELETE FROM _employee_credentials_stage c
+            WHERE NOT EXISTS (
+                SELECT 1 FROM employees e WHERE e.org_id = $1 AND e.email = c.email
+            )
+            RETURNING c.row_num, c.email
+            """,
+            company_id,
+        )
+        await conn.execute(_UPSERT_STAGED_CREDENTIALS, company_id)
+        return missing
+
+    def not_found_errors(missing) -> list[dict]:
+        return [
+            {"row": row_num, "email": m["email"], "error": "Employee not found"}
+            for m in missing for row_num in row_nums_by_first[m["row_num"]]
+        ]
+
+    try:
+        async with conn.transaction():
+            missing = await apply(records)
+    except asyncpg.PostgresError as exc:
+        logger.warning("[BulkCredentials] set-based upsert failed (%s); replaying row by row", exc)
+    else:
+        not_found = not_found_errors(missing)
+        return len(rows) - len(not_found), not_found, []
+
+    applied, not_found, failed = 0, [], []
+    for record in records:
+        row_nums = row_nums_by_first[record[0]]
+        try:
+            async with conn.transaction():
+                missing = await apply([record])
+        except asyncpg.PostgresError as exc:
+            failed += [{"row": n, "email": record[1], "error": str(exc)} for n in row_nums]
+            continue
+        if missing:
+            not_found += not_found_errors(missing)
+        else:
+            applied += len(row_nums)
+    return applied, not_found, failed
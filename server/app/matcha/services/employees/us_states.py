@@ -6,7 +6,14 @@ public in the same stage's audit — it is imported across packages
 a leading underscore signalled "do not import me" at its only reason to exist.
 `routes/employees/_shared.py` keeps a `_STATE_NAME_TO_CODE` alias for anything
 still reaching for the old private name.
+
+`normalize_work_state` moved here from the same module when the bulk-import
+engine (`services/employees/bulk_import.py`) needed it; `_shared` re-exports
+it as `_normalize_work_state`.
 """
+from typing import Optional
+
+from app.core.us_states import US_STATE_CODES
 
 STATE_NAME_TO_CODE = {
     "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
@@ -26,3 +33,22 @@ STATE_NAME_TO_CODE = {
     "american samoa": "AS", "guam": "GU", "northern mariana islands": "MP",
     "puerto rico": "PR", "virgin islands": "VI", "us virgin islands": "VI",
 }
+
+
+def normalize_work_state(raw: Optional[str]) -> tuple[Optional[str], bool]:
+    """Normalize a `work_state` value to a 2-letter USPS code.
+
+    Returns `(normalized_code_or_None, is_valid)`. Blank/None input is valid
+    (no work location provided — counted separately by callers, e.g. as
+    `rows_missing_work_location` in bulk upload). A non-blank value that
+    isn't a recognized state/territory abbreviation or full name is invalid.
+    """
+    s = (raw or "").strip()
+    if not s:
+        return None, True
+    if len(s) == 2 and s.isalpha() and s.upper() in US_STATE_CODES:
+        return s.upper(), True
+    mapped = STATE_NAME_TO_CODE.get(s.lower())
+    if mapped:
+        return mapped, True
+    return None, False
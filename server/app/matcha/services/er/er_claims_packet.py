@@ -4,11 +4,10 @@ The ER-case counterpart of `ir/ir_claims_packet.py`; see that module's
 docstring for the shared rationale. Assembled from `er_cases` and its satellite
 tables, deterministic PDF, ``None`` when not found / not owned.
 """
-import asyncio
 import logging
 from uuid import UUID
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 from app.matcha.services._shared.pdf import _PDF_CSS, _esc, _fmt_dt
 from app.matcha.services._shared.jsonio import loads_or_none as _loads
@@ -109,8 +108,4 @@ def _er_html(data: dict) -> str:
 
 
 async def render_er_packet_pdf(data: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_er_html(data))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_er_html(data))
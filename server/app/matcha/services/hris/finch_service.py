@@ -27,7 +27,7 @@ import asyncio
 import logging
 import os
 from decimal import Decimal, InvalidOperation
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import httpx
 
@@ -157,8 +157,23 @@ class FinchHRISService:
     async def fetch_workers(self, config: dict, secrets: dict) -> list[dict]:
         """List the employer directory, then hydrate each individual with
         identity + employment detail. Returns a list of merged raw Finch records."""
+        workers: list[dict] = []
+        async for batch, _ in self.fetch_worker_pages(config, secrets):
+            workers.extend(batch)
+        logger.info("[Finch] Fetched %d employees", len(workers))
+        return workers
+
+    async def fetch_worker_pages(
+        self, config: dict, secrets: dict, cursor: Optional[dict] = None,
+    ) -> AsyncIterator[tuple[list[dict], Optional[dict]]]:
+        """`fetch_workers` a directory page at a time: each page is hydrated
+        and yielded with the cursor (directory offset) that resumes after it,
+        None after the last page. The hydration calls dominate a large
+        directory, so a sync that times out part-way resumes from the last
+        page it applied instead of re-hydrating everyone."""
         if is_mock_mode(config):
-            return _FINCH_MOCK_EMPLOYEES
+            yield _FINCH_MOCK_EMPLOYEES, None
+            return
 
         token = await self.authenticate(config, secrets)
         headers = self._headers(token)
@@ -166,8 +181,7 @@ class FinchHRISService:
         try:
             async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
                 # 1. Directory — paginated list of individuals (id + lightweight fields).
-                ids: list[str] = []
-                offset = 0
+                offset = int((cursor or {}).get("offset") or 0)
                 page_limit = 100
                 while True:
                     resp = await self._request_with_retry(
@@ -183,39 +197,40 @@ class FinchHRISService:
                         )
                     body = resp.json()
                     individuals = body.get("individuals") or []
-                    ids.extend(i["id"] for i in individuals if i.get("id"))
+                    ids = [i["id"] for i in individuals if i.get("id")]
                     # Terminate on a short page. Finch's sandbox (and some providers)
                     # omit paging.total, and requesting an out-of-range offset 500s —
                     # so never rely on total; stop as soon as a page is under-full.
                     total = (body.get("paging") or {}).get("total")
                     offset += len(individuals)
-                    if (
+                    done = (
                         not individuals
                         or len(individuals) < page_limit
                         or (total is not None and offset >= total)
-                    ):
-                        break
+                    )
 
-                # 2. Hydrate identity + employment in batches.
-                identities = await self._batch_detail(client, headers, "individual", ids)
-                employments = await self._batch_detail(client, headers, "employment", ids)
+                    # 2. Hydrate identity + employment in batches.
+                    identities = await self._batch_detail(client, headers, "individual", ids)
+                    employments = await self._batch_detail(client, headers, "employment", ids)
+
+                    # 3. Merge identity + employment per id into one raw record for normalize_worker.
+                    workers = [
+                        {
+                            "id": fid,
+                            "individual": identities.get(fid, {}),
+                            "employment": employments.get(fid, {}),
+                        }
+                        for fid in ids
+                    ]
+                    if workers:
+                        yield workers, None if done else {"offset": offset}
+                    if done:
+                        break
         except HRISProvisioningError:
             raise
         except Exception as e:
             raise HRISProvisioningError("fetch_error", f"Finch fetch error: {str(e)}")
 
-        # 3. Merge identity + employment per id into one raw record for normalize_worker.
-        workers: list[dict] = []
-        for fid in ids:
-            workers.append({
-                "id": fid,
-                "individual": identities.get(fid, {}),
-                "employment": employments.get(fid, {}),
-            })
-
-        logger.info("[Finch] Fetched %d employees", len(workers))
-        return workers
-
     async def _batch_detail(
         self, client: httpx.AsyncClient, headers: dict, kind: str, ids: list[str]
     ) -> dict[str, dict]:
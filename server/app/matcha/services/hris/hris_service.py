@@ -5,7 +5,7 @@ import logging
 import os
 import re
 from decimal import Decimal, InvalidOperation
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import httpx
 
@@ -117,11 +117,22 @@ class HRISService:
 
     async def fetch_workers(self, config: dict, secrets: dict) -> list[dict]:
         """Fetch all workers from the HRIS API with pagination."""
+        workers = []
+        async for batch, _ in self.fetch_worker_pages(config, secrets):
+            workers.extend(batch)
+        logger.info("[HRIS] Fetched %d workers from %s", len(workers), config.get("base_url", ""))
+        return workers
+
+    async def fetch_worker_pages(
+        self, config: dict, secrets: dict, cursor: Optional[dict] = None,
+    ) -> AsyncIterator[tuple[list[dict], Optional[dict]]]:
+        """Yield workers a page at a time, each with the cursor that resumes
+        after it (None after the last page). `cursor` restarts a sync that
+        timed out part-way — see hris_sync_orchestrator."""
         token = await self.authenticate(config, secrets)
         base_url = config.get("base_url", "").rstrip("/")
 
-        workers = []
-        skip = 0
+        skip = int((cursor or {}).get("skip") or 0)
         top = 100
 
         try:
@@ -139,20 +150,17 @@ class HRISService:
                     batch = data.get("workers", [])
                     if not batch:
                         break
-                    workers.extend(batch)
-
+                    skip += top
                     # If we got fewer than requested, we're done
-                    if len(batch) < top:
+                    done = len(batch) < top
+                    yield batch, None if done else {"skip": skip}
+                    if done:
                         break
-                    skip += top
         except HRISProvisioningError:
             raise
         except Exception as e:
             raise HRISProvisioningError("fetch_error", f"Error fetching workers: {str(e)}")
 
-        logger.info("[HRIS] Fetched %d workers from %s", len(workers), base_url)
-        return workers
-
     @staticmethod
     def normalize_worker(adp_worker: dict) -> dict:
         """Convert an ADP worker record to flat Matcha employee format.
@@ -348,6 +356,17 @@ class GustoHRISService:
             return None, f"Company auto-discovery failed: {str(e)}"
 
     async def fetch_workers(self, config: dict, secrets: dict) -> list[dict]:
+        workers: list[dict] = []
+        async for batch, _ in self.fetch_worker_pages(config, secrets):
+            workers.extend(batch)
+        logger.info("[Gusto] Fetched %d employees for company %s", len(workers), config.get("gusto_company_id", ""))
+        return workers
+
+    async def fetch_worker_pages(
+        self, config: dict, secrets: dict, cursor: Optional[dict] = None,
+    ) -> AsyncIterator[tuple[list[dict], Optional[dict]]]:
+        """Yield employees a page at a time with the resume cursor (the next
+        Link URL; None after the last page) — see HRISService.fetch_worker_pages."""
         gusto_company_id = config.get("gusto_company_id", "")
 
         if not gusto_company_id and not is_mock_mode(config):
@@ -355,12 +374,12 @@ class GustoHRISService:
 
         # Mock mode: return a small representative set (no auth needed)
         if is_mock_mode(config):
-            return _GUSTO_MOCK_EMPLOYEES
+            yield _GUSTO_MOCK_EMPLOYEES, None
+            return
 
         token = await self.authenticate(config, secrets)
 
-        workers: list[dict] = []
-        url: Optional[str] = (
+        url: Optional[str] = (cursor or {}).get("url") or (
             f"{GUSTO_BASE_URL}/v1/companies/{gusto_company_id}/employees"
             "?include=all&per_page=200"
         )
@@ -374,19 +393,16 @@ class GustoHRISService:
                     batch = resp.json()
                     if not isinstance(batch, list):
                         raise HRISProvisioningError("fetch_failed", f"Gusto returned unexpected response shape: {type(batch).__name__}")
-                    workers.extend(batch)
                     # Follow Link: <url>; rel="next" pagination
                     link_header = resp.headers.get("Link", "")
                     next_match = re.search(r'<([^>]+)>;\s*rel="next"', link_header)
                     url = next_match.group(1) if next_match else None
+                    yield batch, {"url": url} if url else None
         except HRISProvisioningError:
             raise
         except Exception as e:
             raise HRISProvisioningError("fetch_error", f"Gusto fetch error: {str(e)}")
 
-        logger.info("[Gusto] Fetched %d employees for company %s", len(workers), gusto_company_id)
-        return workers
-
     async def fetch_locations(self, config: dict, secrets: dict) -> list[dict]:
         """Company work locations, normalized to the shared HRIS location shape.
 
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 from typing import Any, Optional
 from uuid import UUID
 
+
 from ....core.services.secret_crypto import decrypt_secret
 from ....core.services.roster_jurisdictions import run_jurisdiction_drift_check
 from ....core.us_states import US_STATE_CODES
@@ -16,6 +21,17 @@ from .hris_service import PROVIDER_HRIS, HRISProvisioningError, get_hris_service
 
 logger = logging.getLogger(__name__)
 
+# A stored worker fingerprint older than this is ignored and the worker is
+# re-applied, so an edit made by hand in Matcha is brought back in line with the
+# HRIS at least this often even when the HRIS record never changes.
+FINGERPRINT_MAX_AGE_DAYS = int(os.getenv("HRIS_FINGERPRINT_MAX_AGE_DAYS", "7"))
+# A run the provider cut short is resumed by the next sync within this window;
+# after it, the next sync starts over.
+RESUME_WINDOW_HOURS = int(os.getenv("HRIS_SYNC_RESUME_WINDOW_HOURS", "24"))
+# Part of every fingerprint. Bump it when the apply step starts reading the
+# normalized record differently, so every worker is re-applied once.
+_FINGERPRINT_VERSION = "1"
+
 
 def _json_object(value: Any) -> dict:
     """Safely coerce a DB column (dict, JSON string, or None) to a plain dict."""
@@ -315,14 +331,16 @@ async def _upsert_external_identity(
     hris_id: str,
     email: Optional[str],
     raw_worker: dict,
+    fingerprint: Optional[str] = None,
 ) -> None:
     """Insert or update the external_identities row linking this employee to the HRIS record."""
     await conn.execute(
         """
         INSERT INTO external_identities (
-            company_id, employee_id, provider, external_user_id, external_email, status, raw_profile
+            company_id, employee_id, provider, external_user_id, external_email, status, raw_profile,
+            sync_fingerprint
         )
-        VALUES ($1, $2, $3, $4, $5, 'active', $6::jsonb)
+        VALUES ($1, $2, $3, $4, $5, 'active', $6::jsonb, $7)
         ON CONFLICT (employee_id, provider)
         DO UPDATE SET
             company_id = EXCLUDED.company_id,
@@ -330,6 +348,7 @@ async def _upsert_external_identity(
             external_email = EXCLUDED.external_email,
             status = 'active',
             raw_profile = EXCLUDED.raw_profile,
+            sync_fingerprint = EXCLUDED.sync_fingerprint,
             updated_at = NOW()
         """,
         company_id,
@@ -338,7 +357,153 @@ async def _upsert_external_identity(
         hris_id,
         email,
         json.dumps(raw_worker),
+        fingerprint,
+    )
+
+
+def _worker_fingerprint(normalized: dict) -> str:
+    """sha256 of a normalized worker record — everything the apply step reads.
+
+    Hashes the normalized record rather than the raw payload: providers put
+    volatile fields (timestamps, paging metadata) in the raw record that would
+    make every worker look changed. The raw_profile stored on
+    external_identities therefore refreshes only when the normalized record
+    does.
+    """
+    payload = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(f"{_FINGERPRINT_VERSION}:{payload}".encode()).hexdigest()
+
+
+async def _stored_fingerprints(conn, company_id: UUID, hris_ids: list[str]) -> dict[str, str]:
+    """{hris_id: fingerprint} as last applied, for fingerprints young enough to trust."""
+    if not hris_ids:
+        return {}
+    rows = await conn.fetch(
+        """
+        SELECT ei.external_user_id, ei.sync_fingerprint
+        FROM external_identities ei
+        JOIN employees e ON e.id = ei.employee_id AND e.org_id = $1 AND e.hris_id = ei.external_user_id
+        WHERE ei.company_id = $1 AND ei.provider = $2
+          AND ei.external_user_id = ANY($3::text[])
+          AND ei.sync_fingerprint IS NOT NULL
+          AND ei.updated_at > NOW() - make_interval(days => $4)
+        """,
+        company_id,
+        PROVIDER_HRIS,
+        hris_ids,
+        FINGERPRINT_MAX_AGE_DAYS,
     )
+    return {r["external_user_id"]: r["sync_fingerprint"] for r in rows}
+
+
+@dataclass
+class _SyncProgress:
+    """Running totals for one sync run. Everything but the last two fields is
+    persisted to the run row after every page (counts and errors in their
+    columns, the rest under metadata.checkpoint) so a run cut short by the
+    provider can be resumed."""
+
+    cursor: Optional[dict] = None
+    pages: int = 0
+    total_records: int = 0
+    created_count: int = 0
+    updated_count: int = 0
+    skipped_count: int = 0
+    unchanged_count: int = 0
+    error_count: int = 0
+    errors: list[dict] = field(default_factory=list)
+    # {employee_hris_id: manager_hris_id} whose manager had no employees row
+    # yet (they arrive on a later page) — retried after every page.
+    pending_manager_links: dict[str, str] = field(default_factory=dict)
+    resumed: bool = False
+    # This invocation only — the demotion pass needs the whole roster, which a
+    # resumed run never saw in one process.
+    synced_hris_ids: list[str] = field(default_factory=list)
+    manager_ids: set = field(default_factory=set)
+
+    def checkpoint(self) -> dict:
+        return {
+            "cursor": self.cursor,
+            "pages": self.pages,
+            "unchanged_count": self.unchanged_count,
+            "pending_manager_links": self.pending_manager_links,
+        }
+
+    @classmethod
+    def from_run(cls, run_row) -> "_SyncProgress":
+        checkpoint = _json_object(run_row["metadata"]).get("checkpoint") or {}
+        errors = run_row["errors"]
+        if isinstance(errors, str):
+            errors = json.loads(errors)
+        return cls(
+            cursor=checkpoint.get("cursor"),
+            pages=checkpoint.get("pages") or 0,
+            total_records=run_row["total_records"] or 0,
+            created_count=run_row["created_count"] or 0,
+            updated_count=run_row["updated_count"] or 0,
+            skipped_count=run_row["skipped_count"] or 0,
+            unchanged_count=checkpoint.get("unchanged_count") or 0,
+            error_count=run_row["error_count"] or 0,
+            # The provider error that stopped the run is not a worker error.
+            errors=[e for e in errors or [] if "code" not in e],
+            pending_manager_links=checkpoint.get("pending_manager_links") or {},
+            resumed=True,
+        )
+
+
+async def _save_checkpoint(conn, run_id: UUID, progress: _SyncProgress) -> None:
+    await conn.execute(
+        """
+        UPDATE hris_sync_runs
+        SET total_records = $2,
+            created_count = $3,
+            updated_count = $4,
+            skipped_count = $5,
+            error_count = $6,
+            errors = $7::jsonb,
+            metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('checkpoint', $8::jsonb),
+            updated_at = NOW()
+        WHERE id = $1
+        """,
+        run_id,
+        progress.total_records,
+        progress.created_count,
+        progress.updated_count,
+        progress.skipped_count,
+        progress.error_count,
+        json.dumps(progress.errors),
+        json.dumps(progress.checkpoint()),
+    )
+
+
+async def _mark_run_failed(run_id: UUID, errors: list[dict], last_error: str) -> None:
+    """Close a run as failed. Its checkpoint (saved after each applied page)
+    stays in metadata, so the next sync can resume from it."""
+    async with get_connection() as conn:
+        await conn.execute(
+            """
+            UPDATE hris_sync_runs
+            SET status = 'failed', completed_at = NOW(), updated_at = NOW(),
+                errors = $2::jsonb, last_error = $3
+            WHERE id = $1
+            """,
+            run_id,
+            json.dumps(errors),
+            last_error,
+        )
+
+
+async def _abandon_run(run_id: UUID, progress: "_SyncProgress", exc: Exception) -> None:
+    """Mark a run failed after an unexpected error, best-effort. A run left
+    'running' would make the concurrency guard refuse every later sync for
+    the company."""
+    logger.exception("[HRIS] Sync run %s failed", run_id)
+    try:
+        await _mark_run_failed(
+            run_id, progress.errors + [{"code": "sync_error", "message": str(exc)}], str(exc),
+        )
+    except Exception:
+        logger.exception("[HRIS] Could not mark sync run %s failed", run_id)
 
 
 async def start_hris_sync(
@@ -346,6 +511,8 @@ async def start_hris_sync(
     company_id: UUID,
     triggered_by: Optional[UUID] = None,
     trigger_source: str = "manual",
+    full_resync: bool = False,
+    resume: bool = True,
 ) -> dict:
     """Run a full HRIS sync for a company.
 
@@ -353,6 +520,25 @@ async def start_hris_sync(
     employees, upserts credentials and external identities, and logs everything
     to hris_sync_runs + provisioning_audit_logs.
 
+    Workers arrive a provider page at a time and each page is applied before
+    the next is fetched:
+
+    * every normalized worker is fingerprinted (`_worker_fingerprint`); one
+      whose fingerprint matches the one stored on its external identity is
+      skipped entirely — no employee, demographics, credentials, identity or
+      audit write (counted in skipped_count). Stored fingerprints older than
+      FINGERPRINT_MAX_AGE_DAYS are ignored, so hand edits in Matcha are
+      brought back in line with the HRIS at least that often;
+      `full_resync=True` ignores them all.
+    * the changed workers are applied set-based (`_merge_worker_batch`), with
+      a row-by-row replay through `_sync_single_employee` if the batch hits a
+      database error.
+    * after each page the run row records the provider's resume cursor. If
+      the provider fails part-way (a timeout), the run is marked failed with
+      that checkpoint, and the next sync for the company — within
+      RESUME_WINDOW_HOURS, on the same connection — continues the same run
+      from the cursor instead of starting over (`resume=False` opts out).
+
     Returns the sync run summary dict.
     """
     # ── Phase 1: Setup (short connection) ──────────────────────────
@@ -376,20 +562,52 @@ async def start_hris_sync(
         if running:
             raise ValueError("An HRIS sync is already in progress for this company")
 
-        # Create sync run
-        run_row = await conn.fetchrow(
-            """
-            INSERT INTO hris_sync_runs (
-                company_id, connection_id, status, trigger_source, triggered_by, started_at
+        # Resume the latest run if the provider cut it short part-way through.
+        run_row = None
+        if resume and not full_resync:
+            run_row = await conn.fetchrow(
+                """
+                UPDATE hris_sync_runs
+                SET status = 'running', completed_at = NULL, last_error = NULL, updated_at = NOW()
+                WHERE id = (
+                    SELECT id FROM hris_sync_runs
+                    WHERE company_id = $1
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                )
+                  AND status = 'failed'
+                  AND connection_id = $2
+                  AND jsonb_typeof(metadata -> 'checkpoint' -> 'cursor') = 'object'
+                  AND updated_at > NOW() - make_interval(hours => $3)
+                RETURNING *
+                """,
+                company_id,
+                connection_id,
+                RESUME_WINDOW_HOURS,
             )
-            VALUES ($1, $2, 'running', $3, $4, NOW())
-            RETURNING *
-            """,
-            company_id,
-            connection_id,
-            trigger_source,
-            triggered_by,
-        )
+
+        if run_row is not None:
+            progress = _SyncProgress.from_run(run_row)
+            logger.info(
+                "[HRIS] Resuming sync run %s for company %s after page %d",
+                run_row["id"], company_id, progress.pages,
+            )
+        else:
+            # Create sync run
+            run_row = await conn.fetchrow(
+                """
+                INSERT INTO hris_sync_runs (
+                    company_id, connection_id, status, trigger_source, triggered_by, started_at
+                )
+                VALUES ($1, $2, 'running', $3, $4, NOW())
+                RETURNING *
+                """,
+                company_id,
+                connection_id,
+                trigger_source,
+                triggered_by,
+            )
+            progress = _SyncProgress()
         run_id = run_row["id"]
 
         # Decrypt secrets
@@ -408,21 +626,48 @@ async def start_hris_sync(
 
         service = get_hris_service(config.get("mode", "adp"))
 
-    # ── Phase 2: Fetch workers (no DB connection held) ─────────────
+    # ── Phase 2: Company work locations (no DB connection held) ────
+    # Fetched before the workers so a first-sync company has establishment
+    # rows for _resolve_work_location_id to match. Never fails the sync.
+    raw_locations = await _fetch_company_locations(
+        service, config, secrets_decrypted, company_id
+    )
+    if raw_locations:
+        async with get_connection() as conn:
+            try:
+                await _sync_company_locations(conn, company_id, raw_locations)
+            except Exception:
+                logger.exception("[HRIS] Location ingest failed for company %s — continuing sync", company_id)
+
+    # ── Phase 3: Fetch + apply workers a page at a time ────────────
+    # The connection is taken per page, after the provider has answered, so a
+    # slow provider never pins a pooled connection.
     try:
-        raw_workers = await service.fetch_workers(config, secrets_decrypted)
+        async for raw_workers, next_cursor in service.fetch_worker_pages(
+            config, secrets_decrypted, cursor=progress.cursor,
+        ):
+            async with get_connection() as conn:
+                await _apply_worker_page(
+                    conn,
+                    company_id=company_id,
+                    service=service,
+                    raw_workers=raw_workers,
+                    triggered_by=triggered_by,
+                    source=config.get("mode", "adp"),
+                    progress=progress,
+                    full_resync=full_resync,
+                )
+                progress.cursor = next_cursor
+                progress.pages += 1
+                await _save_checkpoint(conn, run_id, progress)
     except HRISProvisioningError as exc:
+        fetch_error = {"code": exc.code, "message": str(exc)}
+        errors = progress.errors + [fetch_error]
+        # Resumable only if pages were applied and more remain; otherwise the
+        # next sync starts a fresh run.
+        resumable = progress.cursor is not None
+        await _mark_run_failed(run_id, errors, str(exc))
         async with get_connection() as conn:
-            await conn.execute(
-                """
-                UPDATE hris_sync_runs
-                SET status = 'failed', completed_at = NOW(), updated_at = NOW(),
-                    errors = $2::jsonb
-                WHERE id = $1
-                """,
-                run_id,
-                json.dumps([{"code": exc.code, "message": str(exc)}]),
-            )
             await _insert_audit_log(
                 conn,
                 company_id=company_id,
@@ -435,135 +680,27 @@ async def start_hris_sync(
                 status="error",
                 detail=str(exc),
                 error_code=exc.code,
+                payload={"pages_applied": progress.pages, "resumable": resumable},
             )
         return {
             "run_id": str(run_id),
             "status": "failed",
-            "errors": [{"code": exc.code, "message": str(exc)}],
+            "errors": errors,
+            "resumable": resumable,
         }
+    except Exception as exc:
+        await _abandon_run(run_id, progress, exc)
+        raise
 
-    # Company work locations — fetched here, alongside the workers, so the
-    # provider HTTP call doesn't happen while the Phase 3 connection is held.
-    raw_locations = await _fetch_company_locations(
-        service, config, secrets_decrypted, company_id
-    )
-
-    total_records = len(raw_workers)
-    created_count = 0
-    updated_count = 0
-    skipped_count = 0
-    error_count = 0
-    errors: list[dict] = []
-    # {employee_hris_id: manager_hris_id} — collected during import, resolved to
-    # manager_id (employee.id) in a second pass once every row exists.
-    manager_links: dict[str, str] = {}
-    # Every hris_id this run actually wrote. The manager pass needs to know the
-    # roster is complete before it can conclude someone manages nobody.
-    synced_hris_ids: list[str] = []
-
-    # ── Phase 3: Import workers (new connection) ───────────────────
-    async with get_connection() as conn:
-        # 3a. Company locations first, so a first-sync company has establishment
-        # rows for _resolve_work_location_id to match. Never fails the sync.
-        try:
-            await _sync_company_locations(conn, company_id, raw_locations)
-        except Exception:
-            logger.exception("[HRIS] Location ingest failed for company %s — continuing sync", company_id)
-
-        for raw_worker in raw_workers:
-            try:
-                normalized = service.normalize_worker(raw_worker)
-            except Exception as exc:
-                error_count += 1
-                # Provider-specific id keys: Finch merged records use `id`,
-                # Gusto `uuid`, ADP `associateOID`.
-                oid = (
-                    raw_worker.get("id")
-                    or raw_worker.get("uuid")
-                    or raw_worker.get("associateOID")
-                    or "unknown"
-                )
-                errors.append({"hris_id": oid, "error": f"Normalization failed: {exc}"})
-                logger.warning("[HRIS] Failed to normalize worker %s: %s", oid, exc)
-                continue
-
-            email = normalized.get("email")
-            if not email:
-                skipped_count += 1
-                logger.info("[HRIS] Skipping worker %s — no email", normalized.get("hris_id"))
-                continue
-
-            try:
-                async with conn.transaction():
-                    action_label = await _sync_single_employee(
-                        conn,
-                        company_id=company_id,
-                        normalized=normalized,
-                        raw_worker=raw_worker,
-                        triggered_by=triggered_by,
-                        source=config.get("mode", "adp"),
-                    )
-                if action_label == "created":
-                    created_count += 1
-                elif action_label == "updated":
-                    updated_count += 1
-                else:
-                    skipped_count += 1
-                # Record manager edge for the post-import resolution pass.
-                emp_hid = normalized.get("hris_id")
-                mgr_hid = normalized.get("manager_hris_id")
-                if emp_hid:
-                    synced_hris_ids.append(emp_hid)
-                if emp_hid and mgr_hid:
-                    manager_links[emp_hid] = mgr_hid
-            except Exception as exc:
-                error_count += 1
-                errors.append({
-                    "hris_id": normalized.get("hris_id"),
-                    "email": email,
-                    "error": str(exc),
-                })
-                logger.exception("[HRIS] Error syncing worker %s (%s)", normalized.get("hris_id"), email)
-
-        # ── Phase 3b: Resolve manager edges ────────────────────────
-        # HRIS reports managers by their own HRIS id. Now that every worker has an
-        # employees row, map manager_hris_id → employees.id and set manager_id.
-        if manager_links:
-            id_rows = await conn.fetch(
-                "SELECT hris_id, id FROM employees WHERE org_id = $1 AND hris_id = ANY($2::text[])",
-                company_id,
-                list(set(manager_links.keys()) | set(manager_links.values())),
-            )
-            hid_to_id = {r["hris_id"]: r["id"] for r in id_rows}
-            resolved = 0
-            manager_ids: set = set()
-            for emp_hid, mgr_hid in manager_links.items():
-                emp_id = hid_to_id.get(emp_hid)
-                mgr_id = hid_to_id.get(mgr_hid)
-                # Skip if either side missing, or self-reference (would violate the org chart).
-                if not emp_id or not mgr_id or emp_id == mgr_id:
-                    continue
-                await conn.execute(
-                    "UPDATE employees SET manager_id = $1, updated_at = NOW() WHERE id = $2 AND org_id = $3",
-                    mgr_id, emp_id, company_id,
-                )
-                manager_ids.add(mgr_id)
-                resolved += 1
-            logger.info("[HRIS] Resolved %d/%d manager edges", resolved, len(manager_links))
-
-            # Derive is_manager from the edges. Finch — our primary provider — has no
-            # "is a manager" flag at all; it only names each worker's manager, so the
-            # fact exists only in aggregate, and this pass is the one place the whole
-            # org graph is known. Set-based (ANY), not a loop: per server/CLAUDE.md a
-            # row-by-row pass here is thousands of sequential round-trips against prod.
-            if manager_ids:
-                await conn.execute(
-                    "UPDATE employees SET is_manager = TRUE, updated_at = NOW() "
-                    "WHERE org_id = $1 AND id = ANY($2::uuid[]) "
-                    "AND COALESCE(is_manager, FALSE) IS DISTINCT FROM TRUE",
-                    company_id, list(manager_ids),
+    # ── Phase 4: Finish (new connection) ───────────────────────────
+    try:
+        async with get_connection() as conn:
+            # Manager edges whose manager only appeared on a later page.
+            await _resolve_manager_edges(conn, company_id, progress, {})
+            if progress.pending_manager_links:
+                logger.info(
+                    "[HRIS] %d manager edges point outside the roster", len(progress.pending_manager_links),
                 )
-                logger.info("[HRIS] Marked %d employees as managers from org edges", len(manager_ids))
 
             # Demote whoever no longer appears as anyone's manager. Promotion alone
             # would leave is_manager TRUE forever after someone's last report moves
@@ -572,72 +709,96 @@ async def start_hris_sync(
             # Only safe when this run saw the WHOLE roster: "nobody reports to X" is a
             # conclusion about absence, so a partial sync (any worker errored) could
             # demote a real manager whose only report failed to import. fetch_workers
-            # pulls the full directory, so a clean run is complete by construction.
+            # pulls the full directory, so a clean run is complete by construction —
+            # unless it was resumed: the pages before the checkpoint were applied by
+            # an earlier invocation, so this one never held the full edge set. The
+            # next clean run demotes instead.
             # Scoped to rows this run wrote — never touches non-HRIS/manual employees.
             #
             # `manager_ids` must be non-empty too: edges existed but none resolved means
             # the graph is broken (manager ids outside the roster), not that the company
             # has no managers — and with an empty exclusion set this demotes everyone.
-            if error_count == 0 and synced_hris_ids and manager_ids:
+            if (
+                progress.error_count == 0
+                and not progress.resumed
+                and progress.synced_hris_ids
+                and progress.manager_ids
+            ):
                 demoted = await conn.execute(
                     "UPDATE employees SET is_manager = FALSE, updated_at = NOW() "
                     "WHERE org_id = $1 AND hris_id = ANY($2::text[]) "
                     "AND NOT (id = ANY($3::uuid[])) AND is_manager IS DISTINCT FROM FALSE",
-                    company_id, synced_hris_ids, list(manager_ids),
+                    company_id, progress.synced_hris_ids, list(progress.manager_ids),
                 )
                 logger.info("[HRIS] is_manager demotion pass: %s", demoted)
 
-        # ── Finalize sync run ──────────────────────────────────────
-        final_status = "completed" if error_count == 0 else "partial"
-        final_row = await conn.fetchrow(
-            """
-            UPDATE hris_sync_runs
-            SET status = $2,
-                total_records = $3,
-                created_count = $4,
-                updated_count = $5,
-                skipped_count = $6,
-                error_count = $7,
-                errors = $8::jsonb,
-                completed_at = NOW(),
-                updated_at = NOW()
-            WHERE id = $1
-            RETURNING *
-            """,
-            run_id,
-            final_status,
-            total_records,
-            created_count,
-            updated_count,
-            skipped_count,
-            error_count,
-            json.dumps(errors) if errors else "[]",
-        )
+            # ── Finalize sync run ──────────────────────────────────────
+            final_status = "completed" if progress.error_count == 0 else "partial"
+            final_row = await conn.fetchrow(
+                """
+                UPDATE hris_sync_runs
+                SET status = $2,
+                    total_records = $3,
+                    created_count = $4,
+                    updated_count = $5,
+                    skipped_count = $6,
+                    error_count = $7,
+                    errors = $8::jsonb,
+                    metadata = (COALESCE(metadata, '{}'::jsonb) - 'checkpoint') || $9::jsonb,
+                    completed_at = NOW(),
+                    updated_at = NOW()
+                WHERE id = $1
+                RETURNING *
+                """,
+                run_id,
+                final_status,
+                progress.total_records,
+                progress.created_count,
+                progress.updated_count,
+                progress.skipped_count,
+                progress.error_count,
+                json.dumps(progress.errors),
+                json.dumps({
+                    "unchanged_count": progress.unchanged_count,
+                    "pages": progress.pages,
+                    "resumed": progress.resumed,
+                }),
+            )
 
-        # Summary audit log
-        await _insert_audit_log(
-            conn,
-            company_id=company_id,
-            employee_id=None,
-            run_id=None,
-            step_id=None,
-            actor_user_id=triggered_by,
-            provider=PROVIDER_HRIS,
-            action="sync_complete",
-            status="success" if error_count == 0 else "info",
-            detail=f"Synced {total_records} workers: {created_count} created, {updated_count} updated, {skipped_count} skipped, {error_count} errors",
-            payload={
-                "total_records": total_records,
-                "created_count": created_count,
-                "updated_count": updated_count,
-                "skipped_count": skipped_count,
-                "error_count": error_count,
-            },
-        )
+            # Summary audit log
+            await _insert_audit_log(
+                conn,
+                company_id=company_id,
+                employee_id=None,
+                run_id=None,
+                step_id=None,
+                actor_user_id=triggered_by,
+                provider=PROVIDER_HRIS,
+                action="sync_complete",
+                status="success" if progress.error_count == 0 else "info",
+                detail=(
+                    f"Synced {progress.total_records} workers: {progress.created_count} created, "
+                    f"{progress.updated_count} updated, {progress.skipped_count} skipped "
+                    f"({progress.unchanged_count} unchanged), {progress.error_count} errors"
+                ),
+                payload={
+                    "total_records": progress.total_records,
+                    "created_count": progress.created_count,
+                    "updated_count": progress.updated_count,
+                    "skipped_count": progress.skipped_count,
+                    "unchanged_count": progress.unchanged_count,
+                    "error_count": progress.error_count,
+                },
+            )
+    except Exception as exc:
+        await _abandon_run(run_id, progress, exc)
+        raise
 
     logger.info(
-        "[HRIS] Sync run %s complete for company %s — %d total, %d created, %d updated, %d skipped, %d errors",
-        run_id, company_id, total_records, created_count, updated_count, skipped_count, error_count,
+        "[HRIS] Sync run %s complete for company %s — %d total, %d created, %d updated, "
+        "%d skipped (%d unchanged), %d errors",
+        run_id, company_id, progress.total_records, progress.created_count, progress.updated_count,
+        progress.skipped_count, progress.unchanged_count, progress.error_count,
     )
 
     # D4: cheap post-sync drift check (own connection, self-guarded) — alert
@@ -648,7 +809,7 @@ async def start_hris_sync(
     # (which this codebase avoids for HRIS work — see the webhook re-sync
     # comment in provisioning.py — since it can be cancelled when the
     # request/task that spawned it returns).
-    if created_count or updated_count:
+    if progress.created_count or progress.updated_count:
         await run_jurisdiction_drift_check(company_id)
 
     return {
@@ -658,14 +819,638 @@ async def start_hris_sync(
         "created_count": final_row["created_count"] or 0,
         "updated_count": final_row["updated_count"] or 0,
         "skipped_count": final_row["skipped_count"] or 0,
+        "unchanged_count": progress.unchanged_count,
         "error_count": final_row["error_count"] or 0,
-        "errors": errors if errors else [],
+        "errors": progress.errors,
         "started_at": final_row["started_at"],
         "completed_at": final_row["completed_at"],
         "created_at": final_row["created_at"],
     }
 
 
+async def _apply_worker_page(
+    conn,
+    *,
+    company_id: UUID,
+    service,
+    raw_workers: list[dict],
+    triggered_by: Optional[UUID],
+    source: Optional[str],
+    progress: _SyncProgress,
+    full_resync: bool = False,
+) -> None:
+    """Normalize one provider page, skip the unchanged workers, apply the rest."""
+    progress.total_records += len(raw_workers)
+    candidates: list[tuple[dict, dict, str]] = []
+    for raw_worker in raw_workers:
+        try:
+            normalized = service.normalize_worker(raw_worker)
+        except Exception as exc:
+            progress.error_count += 1
+            # Provider-specific id keys: Finch merged records use `id`,
+            # Gusto `uuid`, ADP `associateOID`.
+            oid = (
+                raw_worker.get("id")
+                or raw_worker.get("uuid")
+                or raw_worker.get("associateOID")
+                or "unknown"
+            )
+            progress.errors.append({"hris_id": oid, "error": f"Normalization failed: {exc}"})
+            logger.warning("[HRIS] Failed to normalize worker %s: %s", oid, exc)
+            continue
+
+        if not normalized.get("email"):
+            progress.skipped_count += 1
+            logger.info("[HRIS] Skipping worker %s — no email", normalized.get("hris_id"))
+            continue
+        candidates.append((normalized, raw_worker, _worker_fingerprint(normalized)))
+
+    stored = {} if full_resync else await _stored_fingerprints(
+        conn, company_id, [n["hris_id"] for n, _, _ in candidates if n.get("hris_id")],
+    )
+    unchanged: list[dict] = []
+    changed: list[tuple[dict, dict, str]] = []
+    for normalized, raw_worker, fingerprint in candidates:
+        hris_id = normalized.get("hris_id")
+        if hris_id and stored.get(hris_id) == fingerprint:
+            unchanged.append(normalized)
+        else:
+            changed.append((normalized, raw_worker, fingerprint))
+    progress.unchanged_count += len(unchanged)
+    progress.skipped_count += len(unchanged)
+
+    applied, errors = await _apply_changed_workers(
+        conn,
+        company_id=company_id,
+        workers=changed,
+        triggered_by=triggered_by,
+        source=source,
+    )
+    for _, action_label in applied:
+        if action_label == "created":
+            progress.created_count += 1
+        elif action_label == "updated":
+            progress.updated_count += 1
+        else:
+            progress.skipped_count += 1
+    progress.error_count += len(errors)
+    progress.errors += errors
+
+    # Record manager edges — unchanged workers included: their edge still
+    # counts toward the org graph even though nothing about them was written.
+    page_links: dict[str, str] = {}
+    for normalized in unchanged + [n for n, _ in applied]:
+        emp_hid = normalized.get("hris_id")
+        mgr_hid = normalized.get("manager_hris_id")
+        if emp_hid:
+            progress.synced_hris_ids.append(emp_hid)
+        if emp_hid and mgr_hid:
+            page_links[emp_hid] = mgr_hid
+    await _resolve_manager_edges(conn, company_id, progress, page_links)
+
+
+async def _apply_changed_workers(
+    conn,
+    *,
+    company_id: UUID,
+    workers: list[tuple[dict, dict, str]],
+    triggered_by: Optional[UUID],
+    source: Optional[str],
+) -> tuple[list[tuple[dict, str]], list[dict]]:
+    """Apply (normalized, raw_worker, fingerprint) triples. Returns
+    ([(normalized, action_label)], errors).
+
+    One transaction for the whole page; if it fails for any reason the page
+    is replayed one worker per transaction, so the bad workers are reported
+    individually and the good ones still land, as before.
+    """
+    if not workers:
+        return [], []
+    try:
+        async with conn.transaction():
+            applied = await _merge_worker_batch(
+                conn, company_id=company_id, workers=workers, triggered_by=triggered_by, source=source,
+            )
+        return applied, []
+    except Exception as exc:
+        logger.warning(
+            "[HRIS] Set-based apply of %d workers failed for company %s (%s); replaying one by one",
+            len(workers), company_id, exc,
+        )
+
+    applied: list[tuple[dict, str]] = []
+    errors: list[dict] = []
+    for normalized, raw_worker, fingerprint in workers:
+        try:
+            async with conn.transaction():
+                action_label = await _sync_single_employee(
+                    conn,
+                    company_id=company_id,
+                    normalized=normalized,
+                    raw_worker=raw_worker,
+                    triggered_by=triggered_by,
+                    source=source,
+                    fingerprint=fingerprint,
+                )
+            applied.append((normalized, action_label))
+        except Exception as exc:
+            errors.append({
+                "hris_id": normalized.get("hris_id"),
+                "email": normalized.get("email"),
+                "error": str(exc),
+            })
+            logger.exception(
+                "[HRIS] Error syncing worker %s (%s)", normalized.get("hris_id"), normalized.get("email"),
+            )
+    return applied, errors
+
+
+async def _resolve_manager_edges(
+    conn, company_id: UUID, progress: _SyncProgress, links: dict[str, str],
+) -> None:
+    """Set manager_id / is_manager for `links` plus any still-pending edges.
+
+    HRIS reports managers by their own HRIS id, so an edge resolves once both
+    ends have an employees row; the rest stay pending for the next page.
+    Set-based, and only rows whose manager actually changed are written.
+    """
+    links = {**progress.pending_manager_links, **links}
+    if not links:
+        return
+    rows = await conn.fetch(
+        """
+        SELECT l.emp_hid, e.id AS emp_id, m.id AS mgr_id, e.manager_id
+        FROM unnest($2::text[], $3::text[]) AS l(emp_hid, mgr_hid)
+        JOIN employees e ON e.org_id = $1 AND e.hris_id = l.emp_hid
+        JOIN employees m ON m.org_id = $1 AND m.hris_id = l.mgr_hid
+        """,
+        company_id,
+        list(links.keys()),
+        list(links.values()),
+    )
+    resolved = {r["emp_hid"] for r in rows}
+    progress.pending_manager_links = {e: m for e, m in links.items() if e not in resolved}
+
+    # Skip self-reference (would violate the org chart).
+    edges = [r for r in rows if r["emp_id"] != r["mgr_id"]]
+    moved = [r for r in edges if r["manager_id"] != r["mgr_id"]]
+    if moved:
+        await conn.execute(
+            """
+            UPDATE employees e
+            SET manager_id = l.mgr_id, updated_at = NOW()
+            FROM unnest($2::uuid[], $3::uuid[]) AS l(emp_id, mgr_id)
+            WHERE e.id = l.emp_id AND e.org_id = $1
+            """,
+            company_id,
+            [r["emp_id"] for r in moved],
+            [r["mgr_id"] for r in moved],
+        )
+    manager_ids = {r["mgr_id"] for r in edges}
+    progress.manager_ids |= manager_ids
+    logger.info("[HRIS] Resolved %d/%d manager edges (%d changed)", len(edges), len(links), len(moved))
+
+    # Derive is_manager from the edges. Finch — our primary provider — has no
+    # "is a manager" flag at all; it only names each worker's manager, so the
+    # fact exists only in aggregate, across the whole org graph. Set-based (ANY),
+    # not a loop: per server/CLAUDE.md a row-by-row pass here is thousands of
+    # sequential round-trips against prod.
+    if manager_ids:
+        await conn.execute(
+            "UPDATE employees SET is_manager = TRUE, updated_at = NOW() "
+            "WHERE org_id = $1 AND id = ANY($2::uuid[]) "
+            "AND COALESCE(is_manager, FALSE) IS DISTINCT FROM TRUE",
+            company_id, list(manager_ids),
+        )
+
+
+# ── set-based apply ───────────────────────────────────────────────────────────
+#
+# `_merge_worker_batch` is `_sync_single_employee` for a page of workers: the
+# same matching, COALESCE rules and side tables, as one COPY into a session
+# temp table and a fixed number of statements, instead of ~10 round trips per
+# worker. The staged row carries every normalized key the single path reads
+# (tests/hris/test_sync_orchestrator.py checks both paths).
+
+_WORKER_STAGE_COLUMNS = [
+    "seq", "employee_id",
+    "email", "personal_email", "first_name", "last_name", "work_state", "employment_type",
+    "start_date", "phone", "job_title", "department", "hris_id", "employment_status",
+    "work_city", "pay_rate", "pay_classification", "address", "termination_date",
+    "work_location_id", "is_manager",
+    "date_of_birth", "gender", "ethnicity",
+    "has_credentials",
+    "license_type", "license_number", "license_expiration",
+    "npi_number", "dea_number", "dea_expiration",
+    "board_certification", "board_certification_expiration", "clinical_specialty",
+    "malpractice_carrier", "malpractice_policy_number", "malpractice_expiration",
+    "raw_profile", "fingerprint",
+]
+
+_CREATE_WORKER_STAGE = """
+    CREATE TEMP TABLE IF NOT EXISTS _hris_worker_stage (
+        seq INT, employee_id UUID, created BOOLEAN NOT NULL DEFAULT FALSE,
+        email TEXT, personal_email TEXT, first_name TEXT, last_name TEXT,
+        work_state TEXT, employment_type TEXT, start_date DATE, phone TEXT,
+        job_title TEXT, department TEXT, hris_id TEXT, employment_status TEXT,
+        work_city TEXT, pay_rate NUMERIC, pay_classification TEXT, address TEXT,
+        termination_date DATE, work_location_id UUID, is_manager BOOLEAN,
+        date_of_birth DATE, gender TEXT, ethnicity TEXT,
+        has_credentials BOOLEAN,
+        license_type TEXT, license_number TEXT, license_expiration DATE,
+        npi_number TEXT, dea_number TEXT, dea_expiration DATE,
+        board_certification TEXT, board_certification_expiration DATE, clinical_specialty TEXT,
+        malpractice_carrier TEXT, malpractice_policy_number TEXT, malpractice_expiration DATE,
+        raw_profile TEXT, fingerprint TEXT
+    ) ON COMMIT DELETE ROWS
+"""
+
+# Same SET list as the UPDATE in `_sync_single_employee` — see the comments there.
+_UPDATE_STAGED_EMPLOYEES = """
+    UPDATE employees e
+    SET job_title = COALESCE(s.job_title, e.job_title),
+        department = COALESCE(s.department, e.department),
+        employment_type = COALESCE(s.employment_type, e.employment_type),
+        work_state = COALESCE(s.work_state, e.work_state),
+        phone = COALESCE(s.phone, e.phone),
+        hris_id = COALESCE(s.hris_id, e.hris_id),
+        employment_status = CASE
+            WHEN s.employment_status = 'terminated' THEN 'terminated'
+            WHEN e.employment_status = 'terminated' AND s.employment_status = 'active' THEN 'active'
+            ELSE e.employment_status
+        END,
+        work_city = COALESCE(s.work_city, e.work_city),
+        pay_rate = COALESCE(s.pay_rate, e.pay_rate),
+        pay_classification = COALESCE(s.pay_classification, e.pay_classification),
+        address = COALESCE(s.address, e.address),
+        termination_date = COALESCE(s.termination_date, e.termination_date),
+        work_location_id = COALESCE(s.work_location_id, e.work_location_id),
+        is_manager = COALESCE(s.is_manager, e.is_manager),
+        updated_at = NOW()
+    FROM _hris_worker_stage s
+    WHERE s.employee_id IS NOT NULL AND e.id = s.employee_id AND e.org_id = $1
+"""
+
+# New workers: INSERT, then write the new ids back onto their staged rows so
+# every later statement joins on employee_id. Emails are unique among the new
+# staged rows (`_merge_worker_batch` defers repeats).
+_INSERT_STAGED_EMPLOYEES = """
+    WITH inserted AS (
+        INSERT INTO employees (
+            org_id, email, personal_email, first_name, last_name,
+            work_state, employment_type, start_date, phone, job_title, department, hris_id,
+            employment_status, work_city, pay_rate, pay_classification,
+            address, termination_date, work_location_id, is_manager
+        )
+        SELECT
+            $1, s.email, s.personal_email, s.first_name, s.last_name,
+            s.work_state, s.employment_type, s.start_date, s.phone, s.job_title, s.department, s.hris_id,
+            COALESCE(s.employment_status, 'active'), s.work_city, s.pay_rate, s.pay_classification,
+            s.address, s.termination_date, s.work_location_id, s.is_manager
+        FROM _hris_worker_stage s
+        WHERE s.employee_id IS NULL
+        ORDER BY s.seq
+        RETURNING id, email
+    )
+    UPDATE _hris_worker_stage s
+    SET employee_id = i.id, created = TRUE
+    FROM inserted i
+    WHERE s.employee_id IS NULL AND s.email = i.email
+    RETURNING s.seq, s.employee_id
+"""
+
+_UPSERT_STAGED_DEMOGRAPHICS = """
+    INSERT INTO employee_demographics (
+        employee_id, org_id, date_of_birth, gender, ethnicity, source, updated_at
+    )
+    SELECT s.employee_id, $1, s.date_of_birth, s.gender, s.ethnicity, $2, NOW()
+    FROM _hris_worker_stage s
+    WHERE COALESCE(s.date_of_birth::text, s.gender, s.ethnicity) IS NOT NULL
+    ON CONFLICT (employee_id) DO UPDATE
+    SET date_of_birth = COALESCE(EXCLUDED.date_of_birth, employee_demographics.date_of_birth),
+        gender        = COALESCE(EXCLUDED.gender, employee_demographics.gender),
+        ethnicity     = COALESCE(EXCLUDED.ethnicity, employee_demographics.ethnicity),
+        source        = EXCLUDED.source,
+        updated_at    = NOW()
+"""
+
+_UPSERT_STAGED_CREDENTIALS = """
+    INSERT INTO employee_credentials (
+        employee_id, org_id,
+        license_type, license_number, license_expiration,
+        npi_number, dea_number, dea_expiration,
+        board_certification, board_certification_expiration,
+        clinical_specialty,
+        malpractice_carrier, malpractice_policy_number, malpractice_expiration,
+        updated_at
+    )
+    SELECT
+        s.employee_id, $1,
+        s.license_type, s.license_number, s.license_expiration,
+        s.npi_number, s.dea_number, s.dea_expiration,
+        s.board_certification, s.board_certification_expiration,
+        s.clinical_specialty,
+        s.malpractice_carrier, s.malpractice_policy_number, s.malpractice_expiration,
+        NOW()
+    FROM _hris_worker_stage s
+    WHERE s.has_credentials
+    ON CONFLICT (employee_id) DO UPDATE SET
+        license_type = COALESCE(EXCLUDED.license_type, employee_credentials.license_type),
+        license_number = COALESCE(EXCLUDED.license_number, employee_credentials.license_number),
+        license_expiration = COALESCE(EXCLUDED.license_expiration, employee_credentials.license_expiration),
+        npi_number = COALESCE(EXCLUDED.npi_number, employee_credentials.npi_number),
+        dea_number = COALESCE(EXCLUDED.dea_number, employee_credentials.dea_number),
+        dea_expiration = COALESCE(EXCLUDED.dea_expiration, employee_credentials.dea_expiration),
+        board_certification = COALESCE(EXCLUDED.board_certification, employee_credentials.board_certification),
+        board_certification_expiration = COALESCE(EXCLUDED.board_certification_expiration, employee_credentials.board_certification_expiration),
+        clinical_specialty = COALESCE(EXCLUDED.clinical_specialty, employee_credentials.clinical_specialty),
+        malpractice_carrier = COALESCE(EXCLUDED.malpractice_carrier, employee_credentials.malpractice_carrier),
+        malpractice_policy_number = COALESCE(EXCLUDED.malpractice_policy_number, employee_credentials.malpractice_policy_number),
+        malpractice_expiration = COALESCE(EXCLUDED.malpractice_expiration, employee_credentials.malpractice_expiration),
+        updated_at = NOW()
+"""
+
+_UPSERT_STAGED_IDENTITIES = """
+    INSERT INTO external_identities (
+        company_id, employee_id, provider, external_user_id, external_email, status, raw_profile,
+        sync_fingerprint
+    )
+    SELECT $1, s.employee_id, $2, s.hris_id, s.email, 'active', s.raw_profile::jsonb, s.fingerprint
+    FROM _hris_worker_stage s
+    WHERE s.hris_id IS NOT NULL
+    ON CONFLICT (employee_id, provider)
+    DO UPDATE SET
+        company_id = EXCLUDED.company_id,
+        external_user_id = EXCLUDED.external_user_id,
+        external_email = EXCLUDED.external_email,
+        status = 'active',
+        raw_profile = EXCLUDED.raw_profile,
+        sync_fingerprint = EXCLUDED.sync_fingerprint,
+        updated_at = NOW()
+"""
+
+_INSERT_STAGED_AUDIT_LOGS = """
+    INSERT INTO provisioning_audit_logs (
+        company_id, employee_id, actor_user_id, provider, action, status, detail, payload
+    )
+    SELECT
+        $1, s.employee_id, $2, $3,
+        CASE WHEN s.created THEN 'employee_created' ELSE 'employee_updated' END,
+        'success',
+        'Employee ' || s.email || CASE WHEN s.created THEN ' created' ELSE ' updated' END || ' via HRIS sync',
+        jsonb_build_object('hris_id', s.hris_id, 'email', s.email)
+    FROM _hris_worker_stage s
+    ORDER BY s.seq
+"""
+
+
+def _stage_text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _stage_decimal(value: Any) -> Optional[Decimal]:
+    if value is None or value == "":
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _stage_record(
+    seq: int,
+    employee_id: Optional[UUID],
+    normalized: dict,
+    *,
+    work_state: Optional[str],
+    work_location_id: Optional[UUID],
+    raw_worker: dict,
+    fingerprint: str,
+) -> tuple:
+    """One `_hris_worker_stage` row, in `_WORKER_STAGE_COLUMNS` order."""
+    demographics = normalized.get("demographics") or {}
+    creds = normalized.get("credentials") or {}
+    is_manager = normalized.get("is_manager")
+    values = {
+        "seq": seq,
+        "employee_id": employee_id,
+        "email": normalized["email"].strip().lower(),
+        "personal_email": _stage_text(normalized.get("personal_email")),
+        "first_name": _stage_text(normalized.get("first_name")),
+        "last_name": _stage_text(normalized.get("last_name")),
+        "work_state": work_state,
+        "employment_type": _stage_text(normalized.get("employment_type")),
+        "start_date": _parse_date(normalized.get("start_date")),
+        "phone": _stage_text(normalized.get("phone")),
+        "job_title": _stage_text(normalized.get("job_title")),
+        "department": _stage_text(normalized.get("department")),
+        "hris_id": _stage_text(normalized.get("hris_id")),
+        "employment_status": _stage_text(normalized.get("employment_status")),
+        "work_city": _stage_text(normalized.get("work_city")),
+        "pay_rate": _stage_decimal(normalized.get("pay_rate")),
+        "pay_classification": _stage_text(normalized.get("pay_classification")),
+        "address": _stage_text(normalized.get("address")),
+        "termination_date": _parse_date(normalized.get("termination_date")),
+        "work_location_id": work_location_id,
+        "is_manager": None if is_manager is None else bool(is_manager),
+        "date_of_birth": _parse_date(demographics.get("date_of_birth")),
+        # `or None`: the single path writes no demographics row for blanks.
+        "gender": _stage_text(demographics.get("gender") or None),
+        "ethnicity": _stage_text(demographics.get("ethnicity") or None),
+        "has_credentials": bool(creds),
+        "license_type": _stage_text(creds.get("license_type")),
+        "license_number": _stage_text(creds.get("license_number")),
+        "license_expiration": _parse_date(creds.get("license_expiration")),
+        "npi_number": _stage_text(creds.get("npi_number")),
+        "dea_number": _stage_text(creds.get("dea_number")),
+        "dea_expiration": _parse_date(creds.get("dea_expiration")),
+        "board_certification": _stage_text(creds.get("board_certification")),
+        "board_certification_expiration": _parse_date(creds.get("board_cert_expiration")),
+        "clinical_specialty": _stage_text(creds.get("clinical_specialty")),
+        "malpractice_carrier": _stage_text(creds.get("malpractice_carrier")),
+        "malpractice_policy_number": _stage_text(creds.get("malpractice_policy_number")),
+        "malpractice_expiration": _parse_date(creds.get("malpractice_expiration")),
+        "raw_profile": json.dumps(raw_worker, default=str),
+        "fingerprint": fingerprint,
+    }
+    return tuple(values[c] for c in _WORKER_STAGE_COLUMNS)
+
+
+async def _merge_worker_batch(
+    conn,
+    *,
+    company_id: UUID,
+    workers: list[tuple[dict, dict, str]],
+    triggered_by: Optional[UUID],
+    source: Optional[str],
+) -> list[tuple[dict, str]]:
+    """Set-based `_sync_single_employee` for a page of changed workers. Must
+    run inside a transaction (the stage table empties on commit).
+
+    A worker that would touch the same employee (or claim the same email or
+    hris_id) as an earlier one in the page is deferred to the single path
+    after the merge, so repeats apply in feed order exactly as before.
+    """
+    emails = [n["email"].strip().lower() for n, _, _ in workers]
+    hris_ids = [n["hris_id"] for n, _, _ in workers if n.get("hris_id")]
+
+    # Match by hris_id first (stable across email changes), then email — the
+    # single path's order.
+    matches = await conn.fetch(
+        """
+        SELECT id, hris_id, email FROM employees
+        WHERE org_id = $1 AND (hris_id = ANY($2::text[]) OR email = ANY($3::text[]))
+        """,
+        company_id,
+        hris_ids,
+        emails,
+    )
+    by_hris = {r["hris_id"]: r["id"] for r in matches if r["hris_id"]}
+    by_email: dict[str, UUID] = {}
+    for r in matches:
+        by_email.setdefault(r["email"], r["id"])
+
+    # `_resolve_work_location_id` for the whole page: confident-or-nothing.
+    location_rows = await conn.fetch(
+        """
+        SELECT id, LOWER(city) AS city, UPPER(state) AS state FROM business_locations
+        WHERE company_id = $1 AND is_active = true
+        """,
+        company_id,
+    )
+    locations: dict[tuple[str, str], list[UUID]] = {}
+    for r in location_rows:
+        locations.setdefault((r["city"], r["state"]), []).append(r["id"])
+
+    records: list[tuple] = []
+    staged: list[tuple[dict, Optional[UUID]]] = []
+    deferred: list[tuple[dict, dict, str]] = []
+    claimed: set[tuple[str, Any]] = set()
+    for seq, ((normalized, raw_worker, fingerprint), email) in enumerate(zip(workers, emails)):
+        hris_id = normalized.get("hris_id")
+        employee_id = (by_hris.get(hris_id) if hris_id else None) or by_email.get(email)
+        keys = {("id", employee_id) if employee_id else ("email", email)}
+        if hris_id:
+            keys.add(("hris_id", hris_id))
+        if keys & claimed:
+            deferred.append((normalized, raw_worker, fingerprint))
+            continue
+        claimed |= keys
+
+        work_state = _normalize_us_state(normalized.get("work_state"))
+        work_city = normalized.get("work_city")
+        location_ids = (
+            locations.get((work_city.lower(), work_state), []) if work_city and work_state else []
+        )
+        records.append(_stage_record(
+            seq, employee_id, normalized,
+            work_state=work_state,
+            work_location_id=location_ids[0] if len(location_ids) == 1 else None,
+            raw_worker=raw_worker,
+            fingerprint=fingerprint,
+        ))
+        staged.append((normalized, employee_id))
+
+    await conn.execute(_CREATE_WORKER_STAGE)
+    await conn.copy_records_to_table(
+        "_hris_worker_stage", records=records, columns=_WORKER_STAGE_COLUMNS,
+    )
+    await conn.execute(_UPDATE_STAGED_EMPLOYEES, company_id)
+    created_rows = await conn.fetch(_INSERT_STAGED_EMPLOYEES, company_id)
+    created_ids = {r["seq"]: r["employee_id"] for r in created_rows}
+    await conn.execute(_UPSERT_STAGED_DEMOGRAPHICS, company_id, source)
+    await conn.execute(_UPSERT_STAGED_CREDENTIALS, company_id)
+    await conn.execute(_UPSERT_STAGED_IDENTITIES, company_id, PROVIDER_HRIS)
+    await conn.execute(_INSERT_STAGED_AUDIT_LOGS, company_id, triggered_by, PROVIDER_HRIS)
+
+    applied: list[tuple[dict, str]] = []
+    employees: list[tuple[UUID, dict]] = []
+    for record, (normalized, employee_id) in zip(records, staged):
+        seq = record[0]
+        if employee_id is None:
+            employee_id = created_ids[seq]
+            applied.append((normalized, "created"))
+        else:
+            applied.append((normalized, "updated"))
+        employees.append((employee_id, normalized))
+
+    await _assign_credential_requirements_bulk(conn, company_id, employees)
+
+    # Auto-assign new-hire training — created rows only, as in the single path.
+    new_hires = [created_ids[seq] for seq in sorted(created_ids)]
+    if new_hires:
+        try:
+            from ..training.training_assignment import evaluate_new_hire_rules_bulk
+
+            async with conn.transaction():
+                await evaluate_new_hire_rules_bulk(conn, company_id, new_hires)
+        except Exception:
+            logger.exception("[HRIS] Failed to auto-assign new-hire training for %d hires", len(new_hires))
+
+    await _reconcile_credential_requirements_bulk(
+        conn,
+        [(employee_id, n["credentials"]) for employee_id, n in employees if n.get("credentials")],
+    )
+
+    for normalized, raw_worker, fingerprint in deferred:
+        action_label = await _sync_single_employee(
+            conn,
+            company_id=company_id,
+            normalized=normalized,
+            raw_worker=raw_worker,
+            triggered_by=triggered_by,
+            source=source,
+            fingerprint=fingerprint,
+        )
+        applied.append((normalized, action_label))
+    return applied
+
+
+async def _assign_credential_requirements_bulk(
+    conn, company_id: UUID, employees: list[tuple[UUID, dict]],
+) -> None:
+    """The single path's credential-requirement fan-out for a page: one query
+    finds who already has requirements, and each (state, city, title) is
+    resolved once. Each assignment runs in a savepoint so a failure skips that
+    employee without aborting the page."""
+    titled = [(employee_id, n) for employee_id, n in employees if n.get("job_title")]
+    if not titled:
+        return
+    has_reqs = {
+        r["employee_id"]
+        for r in await conn.fetch(
+            "SELECT DISTINCT employee_id FROM employee_credential_requirements WHERE employee_id = ANY($1::uuid[])",
+            [employee_id for employee_id, _ in titled],
+        )
+    }
+    from ....core.services.credential_template_service import (
+        resolve_credential_requirements,
+        assign_credential_requirements_to_employee,
+    )
+
+    resolved: dict[tuple, list] = {}
+    for employee_id, normalized in titled:
+        if employee_id in has_reqs:
+            continue
+        email = normalized["email"]
+        job_title = normalized["job_title"]
+        work_state = _normalize_us_state(normalized.get("work_state"))
+        key = (work_state, normalized.get("work_city"), job_title)
+        try:
+            async with conn.transaction():
+                if key not in resolved:
+                    resolved[key] = await resolve_credential_requirements(conn, company_id, *key)
+                cred_reqs = resolved[key]
+                if cred_reqs:
+                    count = await assign_credential_requirements_to_employee(
+                        conn, employee_id, company_id, cred_reqs, _parse_date(normalized.get("start_date")),
+                    )
+                    if count:
+                        logger.info("[HRIS] Assigned %d credential requirements for %s (%s)", count, email, job_title)
+        except Exception:
+            logger.exception("[HRIS] Failed to assign credential requirements for %s", email)
+
+
 async def _sync_single_employee(
     conn,
     *,
@@ -674,10 +1459,13 @@ async def _sync_single_employee(
     raw_worker: dict,
     triggered_by: UUID,
     source: Optional[str] = None,
+    fingerprint: Optional[str] = None,
 ) -> str:
     """Create or update a single employee from normalized HRIS data.
 
     Must be called inside a transaction. Returns 'created' or 'updated'.
+    `fingerprint` (see `_worker_fingerprint`) is stored on the external
+    identity so the next sync can skip the worker if nothing changed.
 
     ── Adding a field the HRIS provides ───────────────────────────────────────
     `normalized` is a plain dict and every read below is an explicit
@@ -695,10 +1483,14 @@ async def _sync_single_employee(
       3. Add it HERE, to BOTH the UPDATE SET list and the INSERT column list —
          each with its arg in matching positional order. Both are hand-maintained
          parallel lists; an off-by-one silently writes the wrong value into the
-         wrong column instead of raising.
+         wrong column instead of raising. Then add it to the set-based twin:
+         `_WORKER_STAGE_COLUMNS`, `_CREATE_WORKER_STAGE`, `_stage_record` and
+         the `_UPDATE_STAGED_EMPLOYEES` / `_INSERT_STAGED_EMPLOYEES` lists.
       4. Cover it in tests/hris/test_sync_orchestrator.py, which asserts every
-         normalizer key reaches a SQL param — that test is what makes step 3
-         impossible to forget.
+         normalizer key reaches a SQL param (and a staged column) — that test is
+         what makes step 3 impossible to forget.
+      5. Bump `_FINGERPRINT_VERSION`: workers whose stored fingerprint predates
+         the new field would otherwise be skipped as unchanged and never get it.
 
     Nested keys (e.g. `demographics`) are the exception: they route to their own
     table below rather than onto `employees`, and stay out of both lists.
@@ -890,6 +1682,7 @@ async def _sync_single_employee(
             hris_id=hris_id,
             email=email,
             raw_worker=raw_worker,
+            fingerprint=fingerprint,
         )
 
     # Auto-verify credential requirements that are satisfied by imported data
@@ -982,3 +1775,46 @@ async def _reconcile_credential_requirements(
 
     logger.info("[HRIS] Auto-verified %d credential requirements for employee %s", len(ids), employee_id)
     return len(ids)
+
+
+async def _reconcile_credential_requirements_bulk(
+    conn, employees: list[tuple[UUID, dict]]
+) -> int:
+    """`_reconcile_credential_requirements` for a page of (employee_id,
+    credentials) pairs, in one statement. Returns the number verified."""
+    pairs = [
+        (employee_id, cred_key)
+        for employee_id, credentials in employees
+        for cred_key, fields in _CRED_KEY_TO_FIELDS.items()
+        if any(credentials.get(f) for f in fields)
+    ]
+    if not pairs:
+        return 0
+
+    rows = await conn.fetch(
+        """
+        WITH verified AS (
+            UPDATE employee_credential_requirements ecr
+            SET status = 'verified', verified_at = NOW()
+            FROM credential_types ct,
+                 unnest($1::uuid[], $2::text[]) AS s(employee_id, ct_key)
+            WHERE ct.id = ecr.credential_type_id
+              AND ecr.employee_id = s.employee_id
+              AND ct.key = s.ct_key
+              AND ecr.status = 'pending'
+            RETURNING ecr.id, ecr.onboarding_task_id
+        ),
+        tasks AS (
+            -- Also mark linked onboarding tasks as completed
+            UPDATE employee_onboarding_tasks
+            SET status = 'completed', completed_at = NOW()
+            WHERE id IN (SELECT onboarding_task_id FROM verified WHERE onboarding_task_id IS NOT NULL)
+        )
+        SELECT id FROM verified
+        """,
+        [employee_id for employee_id, _ in pairs],
+        [cred_key for _, cred_key in pairs],
+    )
+    if rows:
+        logger.info("[HRIS] Auto-verified %d credential requirements for %d employees", len(rows), len(employees))
+    return len(rows)
@@ -8,11 +8,10 @@ submission packet + fleet PDF. Best-effort: a missing data source renders an
 empty section, never a 500.
 """
 
-import asyncio
 import html
 from uuid import UUID
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 from . import wc_depth
 from ..property import property_sov
 
@@ -143,6 +142,4 @@ def _form_html(form: str, ctx: dict) -> str:
 
 
 async def render_acord_pdf(form: str, ctx: dict) -> bytes:
-    def _render() -> bytes:
-        return render_pdf(_form_html(form, ctx))
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_form_html(form, ctx))
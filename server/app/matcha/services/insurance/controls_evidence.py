@@ -8,13 +8,12 @@ the per-control verification overrides in ``company_control_evidence``.
 Deterministic PDF (WeasyPrint, SSRF-guarded). Never raises on the read path.
 """
 
-import asyncio
 import html
 import logging
 from uuid import UUID
 
 from app.core.feature_flags import merge_company_features
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 from . import resident_care
 from ..broker import epl_readiness
@@ -272,8 +271,4 @@ def _controls_html(company_name: str, register: dict) -> str:
 
 
 async def render_controls_packet(company_name: str, register: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_controls_html(company_name, register))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_controls_html(company_name, register))
@@ -12,7 +12,6 @@ empty only when the table isn't provisioned; real DB errors propagate)
 a pulled motor-vehicle record (that needs a paid provider; future integration).
 """
 
-import asyncio
 import html
 import logging
 import math
@@ -20,7 +19,7 @@ from uuid import UUID
 
 import asyncpg
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 logger = logging.getLogger(__name__)
 
@@ -217,8 +216,4 @@ def _fleet_html(company_name: str, fleet: dict) -> str:
 
 
 async def render_fleet_pdf(company_name: str, fleet: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_fleet_html(company_name, fleet))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_fleet_html(company_name, fleet))
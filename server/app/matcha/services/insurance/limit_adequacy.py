@@ -17,13 +17,12 @@ Pure ``analyze`` (unit-tested) + a DB ``build_review`` wrapper (never raises) +
 a deterministic PDF. Mirrors controls_evidence / exclusion_gap structure.
 """
 
-import asyncio
 import html
 import logging
 from typing import Optional
 from uuid import UUID
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 logger = logging.getLogger(__name__)
 
@@ -535,8 +534,4 @@ def _limits_html(company_name: str, review: dict) -> str:
 
 
 async def render_review_pdf(company_name: str, review: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_limits_html(company_name, review))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_limits_html(company_name, review))
@@ -12,7 +12,6 @@ raises) + a deterministic PDF. Directional — labelled as such; a company's own
 triangle from its own loss runs, no licensed benchmark data needed.
 """
 
-import asyncio
 import html
 import logging
 import math
@@ -20,7 +19,7 @@ import re
 from datetime import date
 from typing import Optional
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 logger = logging.getLogger(__name__)
 
@@ -604,8 +603,4 @@ def _triangle_html(subject_name: str, tri: dict) -> str:
 
 
 async def render_triangle_pdf(subject_name: str, tri: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_triangle_html(subject_name, tri))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_triangle_html(subject_name, tri))
@@ -33,7 +33,6 @@ dispute resolution — the same lane a broker stays in. Every rendered surface
 carries ``DISCLAIMER``.
 """
 
-import asyncio
 import json
 import logging
 from typing import Optional, get_args
@@ -41,7 +40,7 @@ from typing import Optional, get_args
 from fastapi import HTTPException, UploadFile
 
 from app.config import get_settings
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 from app.core.services.storage import get_storage
 from app.matcha.models.insurance import limit_adequacy as _models
 
@@ -729,8 +728,4 @@ def _contract_review_html(review: dict) -> str:
 
 
 async def render_contract_review_pdf(review: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_contract_review_html(review))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_contract_review_html(review))
@@ -12,12 +12,11 @@ so each half sits in its own domain package. `services/claims_readiness.py`
 remains as a re-export shim — `broker/submission.py` imports it as `cr` and two
 route files import it by module.
 """
-import asyncio
 import json
 import logging
 from uuid import UUID
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 from app.matcha.services._shared.pdf import _PDF_CSS, _esc, _fmt_dt
 
@@ -161,8 +160,4 @@ def _incident_html(data: dict) -> str:
 
 
 async def render_incident_packet_pdf(data: dict) -> bytes:
-    def _render() -> bytes:
-
-        return render_pdf(_incident_html(data))
-
-    return await asyncio.to_thread(_render)
+    return await render_pdf_async(_incident_html(data))
@@ -689,8 +689,8 @@ class LeaveNoticeService:
             raise ValueError(f"Unhandled notice_type: {notice_type}")
 
         # Generate PDF via WeasyPrint
-        from ....core.services.pdf import render_pdf
-        pdf_bytes = render_pdf(html_content)
+        from ....core.services.pdf import render_pdf_async
+        pdf_bytes = await render_pdf_async(html_content)
 
         # Upload to S3
         emp_name_slug = f"{employee['first_name']}-{employee['last_name']}".replace(" ", "-").lower()
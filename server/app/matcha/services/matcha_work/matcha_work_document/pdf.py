@@ -86,37 +86,32 @@ async def generate_pdf(
             parsed = _parse_date_str(val)
             render_state[date_field] = parsed  # None if unparseable → shows "TBD"
 
-    def _render_pdf() -> Optional[bytes]:
-        try:
-            html_content = _generate_offer_letter_html(render_state, logo_src=logo_src)
-            if is_draft:
-                watermark_css = """
-                body::before {
-                    content: 'DRAFT';
-                    position: fixed;
-                    top: 50%;
-                    left: 50%;
-                    transform: translate(-50%, -50%) rotate(-45deg);
-                    font-size: 120pt;
-                    color: rgba(200, 200, 200, 0.3);
-                    font-weight: bold;
-                    z-index: -1;
-                    pointer-events: none;
-                }
-                """
-                html_content = html_content.replace("</style>", watermark_css + "</style>")
-            from app.core.services.pdf import render_pdf
-
-            return render_pdf(html_content)
-        except ImportError:
-            logger.error("WeasyPrint not installed — PDF generation skipped")
-            return None
-        except Exception as e:
-            logger.error("PDF generation failed: %s", e, exc_info=True)
-            return None
+    try:
+        html_content = _generate_offer_letter_html(render_state, logo_src=logo_src)
+        if is_draft:
+            watermark_css = """
+            body::before {
+                content: 'DRAFT';
+                position: fixed;
+                top: 50%;
+                left: 50%;
+                transform: translate(-50%, -50%) rotate(-45deg);
+                font-size: 120pt;
+                color: rgba(200, 200, 200, 0.3);
+                font-weight: bold;
+                z-index: -1;
+                pointer-events: none;
+            }
+            """
+            html_content = html_content.replace("</style>", watermark_css + "</style>")
+        from app.core.services.pdf import render_pdf_async
 
-    pdf_bytes = await asyncio.to_thread(_render_pdf)
-    if pdf_bytes is None:
+        pdf_bytes = await render_pdf_async(html_content)
+    except ImportError:
+        logger.error("WeasyPrint not installed — PDF generation skipped")
+        return None
+    except Exception as e:
+        logger.error("PDF generation failed: %s", e, exc_info=True)
         return None
 
     filename = f"v{version}{'_draft' if is_draft else '_final'}.pdf"
@@ -260,7 +255,7 @@ async def generate_presentation_pdf(
         return cached
 
     # Inline the storage-owned cover image to a `data:` URI BEFORE the render
-    # thread — the SSRF-safe fetcher blocks raw storage URLs, so the cover would
+    # — the SSRF-safe fetcher blocks raw storage URLs, so the cover would
     # otherwise silently drop. Inlining returns None for external/failed URLs,
     # in which case the cover is omitted gracefully (None falls back to the
     # original value so a data:/non-storage URL is left as-is for the fetcher).
@@ -271,24 +266,17 @@ async def generate_presentation_pdf(
         render_state = dict(state)
         render_state["cover_image_url"] = inlined_cover  # None → cover omitted
 
-    def _render() -> Optional[bytes]:
-        try:
-            from weasyprint import CSS
-            from app.core.services.pdf import render_pdf
-            html_content = _render_presentation_html(render_state)
-            return render_pdf(
-                html_content,
-                stylesheets=[CSS(string="@page { size: 1280px 720px; margin: 0; }")],
-            )
-        except ImportError:
-            logger.error("WeasyPrint not installed — presentation PDF skipped")
-            return None
-        except Exception as e:
-            logger.error("Presentation PDF render failed: %s", e, exc_info=True)
-            return None
-
-    pdf_bytes = await asyncio.to_thread(_render)
-    if pdf_bytes is None:
+    try:
+        from app.core.services.pdf import render_pdf_async
+        pdf_bytes = await render_pdf_async(
+            _render_presentation_html(render_state),
+            stylesheets=["@page { size: 1280px 720px; margin: 0; }"],
+        )
+    except ImportError:
+        logger.error("WeasyPrint not installed — presentation PDF skipped")
+        return None
+    except Exception as e:
+        logger.error("Presentation PDF render failed: %s", e, exc_info=True)
         return None
 
     filename = f"presentation_v{version}.pdf"
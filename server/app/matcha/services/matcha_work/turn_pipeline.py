@@ -11,6 +11,7 @@ import asyncio
 import json
 import logging
 import os
+import time
 from dataclasses import dataclass, field
 from uuid import UUID
 
@@ -61,6 +62,7 @@ from app.matcha.services.scheduling.schedule_assistant_session import (
     resolve_schedule_assistant_scope,
 )
 from app.matcha.services.billing.model_pricing import calculate_call_cost
+from app.matcha.services.matcha_work.turn_timing import record_turn
 
 logger = logging.getLogger(__name__)
 
@@ -531,6 +533,16 @@ class TurnContext:
     stream_payer_sources: list = field(default_factory=list)
     active_modes: list = field(default_factory=list)
     hr_pilot_mode_active: bool = False
+    # Context sources that timed out or failed this turn (see
+    # CONTEXT_SOURCE_BUDGETS) — the model ran without them.
+    omitted_sources: list = field(default_factory=list)
+
+    # Timing: seconds per stage / context source, reported per turn by
+    # _record_turn_timings. started_at is when the turn was accepted, the
+    # zero point for time-to-first-token.
+    started_at: float = field(default_factory=time.monotonic)
+    stage_timings: dict = field(default_factory=dict)
+    first_token_at: float | None = None
 
     # Generation
     estimated_usage: dict | None = None
@@ -1108,57 +1120,155 @@ async def _run_huume_dispatch(tc: TurnContext):
     tc.terminated = True
 
 
+# Per-source time budgets (seconds) for _inject_mode_contexts. Every source
+# runs concurrently; one that blows its budget is cancelled and the turn
+# continues without it (status notice + tc.omitted_sources) rather than
+# holding the whole turn behind the slowest subsystem.
+CONTEXT_SOURCE_BUDGETS = {
+    "features": 3.0,
+    "mode": 8.0,
+    "compliance": 12.0,
+    "compliance_rag": 6.0,
+    "payer": 10.0,
+    "payer_staff": 5.0,
+}
+
+
+async def _bounded_source(tc: TurnContext, source: str, awaitable, budget: float):
+    """Await one context source under its budget, recording its wall time in
+    tc.stage_timings. Timeouts and failures are recorded in tc.omitted_sources
+    and re-raised for the caller's status handling."""
+    started = time.monotonic()
+    try:
+        return await asyncio.wait_for(awaitable, budget)
+    except asyncio.TimeoutError:
+        tc.omitted_sources.append(source)
+        logger.warning(
+            "[TIMING] %s context exceeded its %.1fs budget for thread %s — omitted",
+            source, budget, tc.thread_id,
+        )
+        raise
+    except Exception:
+        tc.omitted_sources.append(source)
+        raise
+    finally:
+        tc.stage_timings[f"context.{source}"] = round(time.monotonic() - started, 3)
+
+
+async def _drain_sources(tasks: list, events: "asyncio.Queue"):
+    """Yield SSE events as the concurrent sources queue them, until every
+    source task has finished. Cancels whatever is still running if the
+    consumer goes away (client disconnect)."""
+    pending = set(tasks)
+    getter = None
+    try:
+        while True:
+            while not events.empty():
+                yield events.get_nowait()
+            if not pending:
+                return
+            if getter is None:
+                getter = asyncio.ensure_future(events.get())
+            done, pending = await asyncio.wait(pending | {getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                getter = None
+            else:
+                pending.discard(getter)
+    finally:
+        if getter is not None:
+            getter.cancel()
+        for task in pending:
+            task.cancel()
+
+
 async def _inject_mode_contexts(tc: TurnContext):
-    """Build every active thread mode's grounding context, emitting a status
-    event per mode. Registry-driven loop first, then the two custom_dispatch
-    modes (compliance, payer) that keep bespoke blocks.
+    """Build every active thread mode's grounding context, emitting status
+    events as each source progresses. Registry-driven modes, the compliance
+    block and the payer block run as one concurrent set, each under its
+    CONTEXT_SOURCE_BUDGETS entry; the feature-flag read only gates the
+    registry modes that declare a required_feature.
 
     Accumulates into tc.dyn_ctx — NOT tc.ctx, which feeds the cacheable static
     prompt (H4: per-turn context in the static prompt broke the cache every
-    turn). Each block is guarded: a context-builder failure (bad trigger data,
-    DB hiccup) degrades to a status notice instead of killing the SSE stream.
+    turn) — in a fixed order (registry modes, compliance, regulations RAG)
+    regardless of which source finished first. Each source is guarded: a
+    context-builder failure (bad trigger data, DB hiccup) or an exhausted
+    budget degrades to a status notice instead of killing the SSE stream.
     """
     thread = tc.thread
     company_id = tc.company_id
     body = tc.body
+    started = time.monotonic()
+    tc.stage_timings["prepare"] = round(started - tc.started_at, 3)
+
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(message: str) -> None:
+        events.put_nowait(_sse_data({"type": "status", "message": message}))
 
     # Registry-driven modes (node, benefits, legal, risk, training, …).
-    # Compliance and payer are custom_dispatch — their bespoke blocks
+    # Compliance and payer are custom_dispatch — their bespoke sources
     # follow below (reasoning-chain statuses + RAG; prompt-swap path).
     #
     # The toggle route gates on required_feature, but the column stays
     # true if the flag is later revoked — so re-check here too, or a
     # downgraded company keeps getting the paid subsystem injected.
-    _active_modes = [
+    candidates = [
         m for m in THREAD_MODES
         if not m.custom_dispatch and m.build_context is not None and thread.get(m.column)
     ]
-    if any(m.required_feature for m in _active_modes):
-        _features = await get_company_features(company_id)
-        _active_modes = [
-            m for m in _active_modes
-            if not m.required_feature or _features.get(m.required_feature, False)
-        ]
-    tc.active_modes = _active_modes
-    # HR Pilot mode active for this turn (column on + feature present).
-    # Gates the model's HR-action vocabulary + server-side execution.
-    tc.hr_pilot_mode_active = any(m.key == "hr_pilot" for m in _active_modes)
-    for _mode in _active_modes:
-        yield _sse_data({"type": "status", "message": _mode.status_loading})
+    features_task = None
+    if any(m.required_feature for m in candidates):
+        async def _features() -> dict:
+            try:
+                return await _bounded_source(
+                    tc, "features", get_company_features(company_id),
+                    CONTEXT_SOURCE_BUDGETS["features"],
+                )
+            except Exception:
+                # Fail closed: gated modes are skipped, ungated ones still run.
+                logger.warning("Feature lookup failed for company %s — gated modes skipped", company_id, exc_info=True)
+                return {}
+
+        features_task = asyncio.create_task(_features())
+
+    gated_in: set[str] = set()
+    mode_ctx: dict[str, str] = {}
+
+    async def _mode_source(mode) -> None:
+        if mode.required_feature:
+            features = await features_task
+            if not features.get(mode.required_feature, False):
+                return
+        gated_in.add(mode.key)
+        emit(mode.status_loading)
         try:
-            _mode_ctx = await _mode.build_context(company_id)
-            if _mode_ctx:
-                tc.dyn_ctx += "\n\n" + _mode_ctx
-            else:
-                yield _sse_data({"type": "status", "message": f"No {_mode.label.lower()} data on file yet — continuing without it..."})
+            text = await _bounded_source(
+                tc, f"mode.{mode.key}", mode.build_context(company_id),
+                CONTEXT_SOURCE_BUDGETS["mode"],
+            )
+        except asyncio.TimeoutError:
+            emit(f"{mode.label} data is taking too long — continuing without it...")
+            return
         except Exception:
-            logger.exception("%s context failed for company %s", _mode.label, company_id)
-            yield _sse_data({"type": "status", "message": _mode.status_unavailable})
+            logger.exception("%s context failed for company %s", mode.label, company_id)
+            emit(mode.status_unavailable)
+            return
+        if text:
+            mode_ctx[mode.key] = text
+        else:
+            emit(f"No {mode.label.lower()} data on file yet — continuing without it...")
 
-    if thread.get("compliance_mode"):
-        yield _sse_data({"type": "status", "message": "Loading compliance data for your locations..."})
+    compliance_parts: list[str] = []
+
+    async def _compliance_source() -> None:
+        emit("Loading compliance data for your locations...")
         try:
-            tc.compliance_result = await build_compliance_context(company_id)
+            tc.compliance_result = await _bounded_source(
+                tc, "compliance", build_compliance_context(company_id),
+                CONTEXT_SOURCE_BUDGETS["compliance"],
+            )
             compliance_ctx = tc.compliance_result.context_text
             # Counts come from the structured reasoning chains, not
             # substring-matching prose another module formats.
@@ -1176,30 +1286,45 @@ async def _inject_mode_contexts(tc: TurnContext):
                 parts = [f"{cat_count} regulatory categories across {loc_count} location{'s' if loc_count != 1 else ''}"]
                 if trigger_count > 0:
                     parts.append(f"{trigger_count} triggered requirement{'s' if trigger_count != 1 else ''}")
-                yield _sse_data({"type": "status", "message": f"Found {' with '.join(parts)} — building reasoning chains..."})
+                emit(f"Found {' with '.join(parts)} — building reasoning chains...")
             elif "legacy format" in compliance_ctx:
-                yield _sse_data({"type": "status", "message": "Loaded compliance data (legacy format) — cross-referencing..."})
+                emit("Loaded compliance data (legacy format) — cross-referencing...")
             else:
-                yield _sse_data({"type": "status", "message": "No compliance data found — will suggest running a check..."})
-            tc.dyn_ctx += "\n\n" + compliance_ctx
-
-            # RAG augmentation — only when the primary dump was
-            # truncated or some location lacks jurisdiction data;
-            # otherwise it re-retrieves what the full dump already
-            # contains (extra embedding hop + vector scan per turn).
-            if tc.compliance_result.truncated or tc.compliance_result.has_legacy_locations:
-                yield _sse_data({"type": "status", "message": "Searching relevant regulations..."})
-                rag_ctx = await _get_rag_context(body.content, company_id)
-                if rag_ctx:
-                    tc.dyn_ctx += "\n\n=== RELEVANT REGULATIONS (semantic search) ===\n" + rag_ctx
+                emit("No compliance data found — will suggest running a check...")
+            compliance_parts.append(compliance_ctx)
+        except asyncio.TimeoutError:
+            tc.compliance_result = None
+            emit("Compliance data is taking too long — continuing without it...")
+            return
         except Exception:
             logger.exception("Compliance context failed for company %s", company_id)
             tc.compliance_result = None
-            yield _sse_data({"type": "status", "message": "Compliance data unavailable — continuing without it..."})
+            emit("Compliance data unavailable — continuing without it...")
+            return
 
-    # Payer mode — build payer prompt inside stream for status events
-    if thread.get("payer_mode"):
-        yield _sse_data({"type": "status", "message": "Searching payer coverage data..."})
+        # RAG augmentation — only when the primary dump was truncated or
+        # some location lacks jurisdiction data; otherwise it re-retrieves
+        # what the full dump already contains (extra embedding hop + vector
+        # scan per turn). Depends on the dump, so it chains inside this
+        # source under its own budget; losing it keeps the dump.
+        if tc.compliance_result.truncated or tc.compliance_result.has_legacy_locations:
+            emit("Searching relevant regulations...")
+            try:
+                rag_ctx = await _bounded_source(
+                    tc, "compliance_rag", _get_rag_context(body.content, company_id),
+                    CONTEXT_SOURCE_BUDGETS["compliance_rag"],
+                )
+            except asyncio.TimeoutError:
+                return
+            except Exception:
+                logger.exception("Compliance RAG context failed for company %s", company_id)
+                return
+            if rag_ctx:
+                compliance_parts.append("=== RELEVANT REGULATIONS (semantic search) ===\n" + rag_ctx)
+
+    # Payer mode — build the payer prompt inside the stream for status events
+    async def _payer_source() -> None:
+        emit("Searching payer coverage data...")
         try:
             import os as _os2
             from app.core.services.embedding_service import get_embedding_service as _ges2
@@ -1209,33 +1334,74 @@ async def _inject_mode_contexts(tc: TurnContext):
             from datetime import date as _d2
 
             _ak2 = _os2.getenv("GEMINI_API_KEY") or _gs2().gemini_api_key
-            if _ak2 and body.content:
+            if not (_ak2 and body.content):
+                return
+
+            async def _payer_rag():
                 _r2 = _PRAG2(_ges2(_ak2))
                 async with get_connection() as _pc2:
-                    _pctx, tc.stream_payer_sources = await _r2.get_context_for_query(
+                    return await _r2.get_context_for_query(
                         query=body.content, conn=_pc2,
                         company_id=company_id, max_tokens=6000,
                     )
-                # Payer turns bypass the generic company context, so the
-                # roster grounding must ride the payer prompt itself.
-                if thread.get("node_mode"):
-                    try:
-                        _staff_ctx = await build_payer_staff_context(company_id)
-                        if _staff_ctx:
-                            _pctx = ((_pctx + "\n\n") if _pctx else "") + _staff_ctx
-                    except Exception:
-                        logger.warning("Payer-staff context failed for company %s", company_id, exc_info=True)
-                cn2 = tc.profile.get("name", "your company")
-                tc.stream_payer_prompt = _PMSP.format(
-                    company_name=cn2,
-                    today=_d2.today().isoformat(),
-                    payer_context=_pctx or "No matching payer policy data found.",
-                )
-                if tc.stream_payer_sources:
-                    yield _sse_data({"type": "status", "message": f"Found {len(tc.stream_payer_sources)} relevant payer policies"})
+
+            # Payer turns bypass the generic company context, so the
+            # roster grounding must ride the payer prompt itself. It does
+            # not depend on the policy search, so the two run together.
+            async def _staff():
+                if not thread.get("node_mode"):
+                    return None
+                try:
+                    return await _bounded_source(
+                        tc, "payer_staff", build_payer_staff_context(company_id),
+                        CONTEXT_SOURCE_BUDGETS["payer_staff"],
+                    )
+                except Exception:
+                    logger.warning("Payer-staff context failed for company %s", company_id, exc_info=True)
+                    return None
+
+            (_pctx, tc.stream_payer_sources), _staff_ctx = await asyncio.gather(
+                _bounded_source(tc, "payer", _payer_rag(), CONTEXT_SOURCE_BUDGETS["payer"]),
+                _staff(),
+            )
+            if _staff_ctx:
+                _pctx = ((_pctx + "\n\n") if _pctx else "") + _staff_ctx
+            cn2 = tc.profile.get("name", "your company")
+            tc.stream_payer_prompt = _PMSP.format(
+                company_name=cn2,
+                today=_d2.today().isoformat(),
+                payer_context=_pctx or "No matching payer policy data found.",
+            )
+            if tc.stream_payer_sources:
+                emit(f"Found {len(tc.stream_payer_sources)} relevant payer policies")
+        except asyncio.TimeoutError:
+            emit("Payer coverage search is taking too long — continuing without it...")
         except Exception as _pe:
             logger.warning("Stream payer context failed: %s", _pe)
 
+    sources = [asyncio.create_task(_mode_source(m)) for m in candidates]
+    if thread.get("compliance_mode"):
+        sources.append(asyncio.create_task(_compliance_source()))
+    if thread.get("payer_mode"):
+        sources.append(asyncio.create_task(_payer_source()))
+    if features_task is not None:
+        sources.append(features_task)
+
+    async for _evt in _drain_sources(sources, events):
+        yield _evt
+
+    # Post-gate list: a mode whose feature was revoked injected nothing.
+    tc.active_modes = [m for m in candidates if m.key in gated_in]
+    # HR Pilot mode active for this turn (column on + feature present).
+    # Gates the model's HR-action vocabulary + server-side execution.
+    tc.hr_pilot_mode_active = any(m.key == "hr_pilot" for m in tc.active_modes)
+    for _mode in tc.active_modes:
+        if _mode.key in mode_ctx:
+            tc.dyn_ctx += "\n\n" + mode_ctx[_mode.key]
+    for _part in compliance_parts:
+        tc.dyn_ctx += "\n\n" + _part
+    tc.stage_timings["context"] = round(time.monotonic() - started, 3)
+
 
 def _schedule_cancel_finalizer(tc: TurnContext) -> None:
     # Client disconnected (stop button / tab close). The Gemini call
@@ -1271,12 +1437,14 @@ async def _generate_turn(tc: TurnContext):
     current_user = tc.current_user
     ai_provider = tc.ai_provider
 
+    _estimate_started = time.monotonic()
     tc.estimated_usage = await ai_provider.estimate_usage(
         tc.msg_dicts, thread["current_state"], company_context=tc.ctx,
         slide_index=body.slide_index, dynamic_context=tc.dyn_ctx,
         model_override=body.model,
         company_id=str(company_id), user_id=str(current_user.id),
     )
+    tc.stage_timings["estimate"] = round(time.monotonic() - _estimate_started, 3)
     yield _sse_data(
         {
             "type": "usage",
@@ -1288,8 +1456,7 @@ async def _generate_turn(tc: TurnContext):
     )
 
     yield _sse_data({"type": "status", "message": "Generating response..."})
-    import time as _time
-    tc.generate_started_at = _time.monotonic()
+    tc.generate_started_at = time.monotonic()
     stream_blog_mode_state = _blog_mode_state_from_meta(tc.project_meta)
     tc.ai_task = asyncio.create_task(ai_provider.generate(
         tc.msg_dicts, thread["current_state"], company_context=tc.ctx,
@@ -1319,6 +1486,9 @@ async def _generate_turn(tc: TurnContext):
                 break
             yield _sse_data({"type": "keepalive"})
         tc.ai_resp = await tc.ai_task
+        # The provider call is not streamed: the whole reply is the first token.
+        tc.first_token_at = time.monotonic()
+        tc.stage_timings["generate"] = round(tc.first_token_at - tc.generate_started_at, 3)
     except asyncio.CancelledError:
         _schedule_cancel_finalizer(tc)
         raise
@@ -1336,6 +1506,17 @@ async def _generate_turn(tc: TurnContext):
         raise
 
 
+def _record_turn_timings(tc: TurnContext) -> None:
+    """One [TIMING] line per turn (every stage + TTFT) and a sample for
+    turn_timing.get_turn_latency_stats."""
+    ttft = round(tc.first_token_at - tc.started_at, 3) if tc.first_token_at else None
+    logger.info(
+        "[TIMING] turn thread=%s ttft=%ss stages=%s omitted=%s",
+        tc.thread_id, ttft, json.dumps(tc.stage_timings, sort_keys=True), tc.omitted_sources or "-",
+    )
+    record_turn(tc.stage_timings, ttft, tc.omitted_sources)
+
+
 async def _audit_and_persist(tc: TurnContext) -> None:
     """Everything after the model returns: HR-Pilot citation audit, state
     updates + operations, metadata assembly, message persistence, WS broadcast,
@@ -1353,9 +1534,8 @@ async def _audit_and_persist(tc: TurnContext) -> None:
     ai_resp = tc.ai_resp
     user_msg = tc.user_msg
 
+    persist_started = time.monotonic()
     try:
-        import time as _time
-        logger.info("[TIMING] AI generate took %.2fs for thread %s", _time.monotonic() - tc.generate_started_at, thread_id)
         _scope_slide_update(ai_resp, thread["current_state"], body.slide_index)
 
         current_version = thread["version"]
@@ -1537,6 +1717,8 @@ async def _audit_and_persist(tc: TurnContext) -> None:
             final_usage=ai_resp.token_usage or tc.estimated_usage,
             operation="send_message",
         )
+        tc.stage_timings["persist"] = round(time.monotonic() - persist_started, 3)
+        _record_turn_timings(tc)
     except asyncio.CancelledError:
         _schedule_cancel_finalizer(tc)
         raise
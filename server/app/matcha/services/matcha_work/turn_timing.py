@@ -0,0 +1,75 @@
+"""Per-turn latency accounting for the matcha-work AI turn pipeline.
+
+Every turn that reaches generation records its stage timings (prepare,
+context assembly and each grounding source inside it, estimate, generate,
+persist) and its time-to-first-token — seconds from the turn being accepted
+to the first assistant content being available. The provider call is not
+streamed, so the first token is the model response; everything in front of
+it (context sources especially) is what the user waits on.
+
+Samples live in a bounded process-local window; `get_turn_latency_stats()`
+reports p50/p95 per stage plus how often each context source was omitted
+for blowing its budget or failing.
+"""
+
+import threading
+from collections import Counter, deque
+from typing import Optional
+
+TURN_SAMPLE_WINDOW = 500
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+class TurnLatencyStats:
+    """Rolling window of per-turn stage timings and time-to-first-token."""
+
+    def __init__(self, window: int = TURN_SAMPLE_WINDOW):
+        self._samples: "deque[tuple[Optional[float], dict[str, float]]]" = deque(maxlen=window)
+        self._omitted: Counter = Counter()
+        self._turns = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage_timings: dict[str, float], ttft: Optional[float], omitted: list[str]) -> None:
+        with self._lock:
+            self._samples.append((ttft, dict(stage_timings)))
+            self._omitted.update(omitted)
+            self._turns += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = list(self._samples)
+            omitted = dict(self._omitted)
+            turns = self._turns
+        ttfts = [t for t, _ in samples if t is not None]
+        by_stage: dict[str, list[float]] = {}
+        for _, stages in samples:
+            for stage, seconds in stages.items():
+                by_stage.setdefault(stage, []).append(seconds)
+        return {
+            "turns": turns,
+            "window": len(samples),
+            "ttft_p50": _percentile(ttfts, 0.5) if ttfts else None,
+            "ttft_p95": _percentile(ttfts, 0.95) if ttfts else None,
+            "stages": {
+                stage: {"p50": _percentile(vals, 0.5), "p95": _percentile(vals, 0.95)}
+                for stage, vals in sorted(by_stage.items())
+            },
+            "omitted_sources": omitted,
+        }
+
+
+_stats = TurnLatencyStats()
+
+
+def record_turn(stage_timings: dict[str, float], ttft: Optional[float], omitted: list[str]) -> None:
+    _stats.record(stage_timings, ttft, omitted)
+
+
+def get_turn_latency_stats() -> dict:
+    """p50/p95 time-to-first-token and stage timings over recent turns."""
+    return _stats.snapshot()
@@ -28,7 +28,7 @@ import json
 import logging
 from datetime import datetime, timezone
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 
 from . import analysis_packs as packs
 from .analysis_packs.base import to_float
@@ -786,9 +786,7 @@ def _report_html(session: dict, corpus: dict, memo: dict, datasets: list[dict],
 
 
 async def _render_pdf(html_str: str) -> bytes:
-    def _r() -> bytes:
-        return render_pdf(html_str)
-    return await asyncio.to_thread(_r)
+    return await render_pdf_async(html_str)
 
 
 async def build_analysis_report(session: dict, corpus: dict, memo: dict, datasets: list[dict],
@@ -9,7 +9,7 @@ import zipfile
 from datetime import datetime, timezone
 from uuid import UUID
 
-from app.core.services.pdf import render_pdf
+from app.core.services.pdf import render_pdf_async
 from app.core.services.storage import get_storage
 
 from ..._shared.pdf import _PDF_CSS, _esc, _fmt_dt
@@ -326,9 +326,7 @@ def _memo_html(matter: dict, corpus: dict, memo: dict, details: dict, cited: lis
       <div class="foot">{_esc(DISCLAIMER)}</div>
     </body></html>"""
 async def _render_pdf(html_str: str) -> bytes:
-    def _r() -> bytes:
-        return render_pdf(html_str)
-    return await asyncio.to_thread(_r)
+    return await render_pdf_async(html_str)
 
 
 async def _collect_source_files(conn, cited: list[str]) -> list[tuple[str, str]]:
@@ -528,13 +526,13 @@ async def build_defense_packet(conn, matter: dict, corpus: dict, memo: dict,
 
     files = await _collect_source_files(conn, appendix_ids)
     fetched, skipped = [], []
-    storage = get_storage()
-    for arc, path in files:
-        try:
-            fetched.append((arc, await storage.download_file(path)))
-        except Exception as e:  # noqa: BLE001
-            logger.warning("legal_defense: skip source file %s: %s", arc, e)
-            skipped.append(f"{arc} ({e})")
+    downloads = await get_storage().download_many([path for _, path in files])
+    for (arc, _), data in zip(files, downloads):
+        if isinstance(data, Exception):
+            logger.warning("legal_defense: skip source file %s: %s", arc, data)
+            skipped.append(f"{arc} ({data})")
+        else:
+            fetched.append((arc, data))
 
     # A generated case-file PDF per in-scope incident / ER case / discipline
     # record: without it, records with no uploaded documents (all 21 IRs for
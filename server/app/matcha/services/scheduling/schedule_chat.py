@@ -64,7 +64,13 @@ from .schedule_rules import (
     INACTIVE_EMPLOYMENT_STATUSES, availability_violations, sunday_indexed_weekday,
     template_windows,
 )
-from .shift_compliance import _approved_db_rules, _fair_workweek_advisories, _week_hours, check_shift_compliance
+from .shift_compliance import (
+    _approved_db_rules,
+    _fair_workweek_advisories,
+    _week_hours_by_employee,
+    check_schedule_compliance_batch,
+    check_shift_compliance,
+)
 from .shift_writes import (
     apply_assignment_core, cancel_shift_core, create_shift_core, fetch_availability,
     find_conflicts, generate_week_template_shifts, log_audit, remove_assignment_core,
@@ -883,9 +889,7 @@ async def build_proposal(
         # Reused again in CandidateContext below instead of re-querying it,
         # since check_shift_compliance already computes the same figure
         # internally for its own violation checks.
-        hours_by_id: dict[str, float] = {}
-        for r in free:
-            hours_by_id[str(r["id"])] = await _week_hours(conn, company_id, r["id"], starts_at, 0.0, None)
+        hours_by_id = await _week_hours_by_employee(conn, company_id, [r["id"] for r in free], starts_at)
 
         pinned_rows = [r for r in free if str(r["id"]) in pinned]
         other_rows = sorted(
@@ -898,26 +902,39 @@ async def build_proposal(
 
         avail_map = await fetch_availability(conn, company_id, [r["id"] for r in survivors])
 
+        # Pinned employees skip the availability filter too (same rule as the
+        # busy pre-filter above) — if they're proposed anyway, execute-time
+        # re-check drops them with an "outside their logged availability"
+        # reason instead of them silently vanishing from the proposal.
+        # Not schedulable — same treatment as inactive employees.
+        candidates = [
+            r for r in survivors
+            if str(r["id"]) in pinned
+            or not availability_violations(avail_map.get(r["id"], {}), starts_at, ends_at)
+        ]
+        # Every candidate plus the shift's own intrinsic check in one batched
+        # evaluation, instead of a full compliance round per candidate.
+        checks = await check_schedule_compliance_batch(conn, company_id, shifts=[
+            *(
+                {
+                    "location_id": location_id, "starts_at": starts_at, "ends_at": ends_at,
+                    "break_minutes": shift["break_minutes"], "employee_id": r["id"],
+                    "lapse_items": lapse_map.get(str(r["id"]), []),
+                    "fw_event": "assign", "fw_shift_published": True,
+                }
+                for r in candidates
+            ),
+            {
+                "location_id": location_id, "starts_at": starts_at, "ends_at": ends_at,
+                "break_minutes": shift["break_minutes"],
+            },
+        ])
+
         contexts: list[CandidateContext] = []
-        for r in survivors:
+        for r, violations in zip(candidates, checks):
             eid = r["id"]
-            # Pinned employees skip this filter too (same rule as the busy
-            # pre-filter above) — if they're proposed anyway, execute-time
-            # re-check drops them with an "outside their logged availability"
-            # reason instead of them silently vanishing from the proposal.
-            if str(eid) not in pinned and availability_violations(
-                avail_map.get(eid, {}), starts_at, ends_at
-            ):
-                continue  # not schedulable — same treatment as inactive employees
             name = f"{r['first_name']} {r['last_name']}".strip()
             conflicts = await find_conflicts(conn, company_id, eid, starts_at, ends_at)
-            violations = await check_shift_compliance(
-                conn, company_id, location_id=location_id,
-                starts_at=starts_at, ends_at=ends_at,
-                break_minutes=shift["break_minutes"], employee_id=eid,
-                lapse_items=lapse_map.get(str(eid), []),
-                fw_event="assign", fw_shift_published=True,
-            )
             contexts.append(CandidateContext(
                 employee_id=str(eid), name=name, job_title=r["job_title"],
                 conflicts=conflicts, violations=violations, week_hours=hours_by_id[str(eid)],
@@ -934,10 +951,7 @@ async def build_proposal(
         provisional_by_day.setdefault(shift_date, set()).update(c.employee_id for c in rank.chosen)
         shift["open_slots"] = shift["required_staff"] - len(rank.chosen)
         shift["excluded"] = [{"name": c.name, "reason": reason} for c, reason in rank.excluded]
-        shift["intrinsic_violations"] = await check_shift_compliance(
-            conn, company_id, location_id=location_id,
-            starts_at=starts_at, ends_at=ends_at, break_minutes=shift["break_minutes"],
-        )
+        shift["intrinsic_violations"] = checks[-1]
 
     # Honesty-line flag: true only when the state is neither curated NOR
     # covered by an approved catalog-extraction — a state with approved
@@ -1913,17 +1927,22 @@ async def execute_proposal(
 
             surviving_ids: list[UUID] = []
             assignee_names: list[str] = []
-            for a in shift["assignees"]:
+            # Batched per shift, not across the whole proposal: each shift
+            # created below must count toward the NEXT shift's week hours /
+            # rest gap, exactly as the per-assignee re-check did.
+            checks = await check_schedule_compliance_batch(conn, company_id, shifts=[
+                {
+                    "location_id": location_id, "starts_at": starts_at, "ends_at": ends_at,
+                    "break_minutes": shift["break_minutes"], "employee_id": UUID(a["employee_id"]),
+                    "lapse_items": lapse_map.get(str(UUID(a["employee_id"])), []),
+                    "fw_event": "assign", "fw_shift_published": True,
+                }
+                for a in shift["assignees"]
+            ])
+            for a, violations in zip(shift["assignees"], checks):
                 eid = UUID(a["employee_id"])
                 conflicts = await find_conflicts(conn, company_id, eid, starts_at, ends_at)
                 avail = availability_violations(avail_map.get(eid, {}), starts_at, ends_at)
-                violations = await check_shift_compliance(
-                    conn, company_id, location_id=location_id,
-                    starts_at=starts_at, ends_at=ends_at,
-                    break_minutes=shift["break_minutes"], employee_id=eid,
-                    lapse_items=lapse_map.get(str(eid), []),
-                    fw_event="assign", fw_shift_published=True,
-                )
                 block = next((v for v in violations if v.get("severity") == "block"), None)
                 if conflicts or block or avail:
                     if block:
@@ -2199,18 +2218,22 @@ async def execute_edit_proposal(
                     "SELECT employee_id FROM schedule_shift_assignments WHERE shift_id = $1", shift_id,
                 )
                 blocked_reason: Optional[str] = None
-                for a in assignee_rows:
+                checks = await check_schedule_compliance_batch(conn, company_id, shifts=[
+                    {
+                        "location_id": shift_row["location_id"],
+                        "starts_at": new_starts_at, "ends_at": new_ends_at,
+                        "break_minutes": shift_row["break_minutes"] or 0, "employee_id": a["employee_id"],
+                        "exclude_shift_id": shift_id, "fw_event": "retime",
+                        "fw_shift_published": shift_row["published_at"] is not None,
+                        "shift_kind": shift_row["kind"],
+                        "training_requirement_id": shift_row["training_requirement_id"],
+                    }
+                    for a in assignee_rows
+                ])
+                for a, violations in zip(assignee_rows, checks):
                     eid = a["employee_id"]
                     conflicts = await find_conflicts(
                         conn, company_id, eid, new_starts_at, new_ends_at, exclude_shift_id=shift_id)
-                    violations = await check_shift_compliance(
-                        conn, company_id, location_id=shift_row["location_id"],
-                        starts_at=new_starts_at, ends_at=new_ends_at,
-                        break_minutes=shift_row["break_minutes"] or 0, employee_id=eid,
-                        exclude_shift_id=shift_id, fw_event="retime",
-                        fw_shift_published=shift_row["published_at"] is not None,
-                        shift_kind=shift_row["kind"], training_requirement_id=shift_row["training_requirement_id"],
-                    )
                     block = next((v for v in violations if v.get("severity") == "block"), None)
                     if conflicts or block:
                         blocked_reason = block["message"] if block else "it would double-book someone already on it"
@@ -37,12 +37,60 @@ async def schedule_eligibility_violations(conn, company_id: UUID, *, employee_id
              AND status = 'active' AND confirmed_on_file = true AND expires_at < $3""",
         company_id, employee_id, shift_date,
     )
+    return eligibility_violations_from((rows, permits), shift_date=shift_date)
+
+
+async def fetch_eligibility_blockers(
+    conn, company_id: UUID, employee_ids: list[UUID], *, before: date,
+) -> dict[UUID, tuple[list, list]]:
+    """employee_id -> (expired credential rows, expired permit rows), for every
+    lapse strictly before `before` — two set-based queries for any number of
+    employees. Callers evaluating several shift dates pass the LATEST date and
+    narrow per shift with `eligibility_violations_from`."""
+    out: dict[UUID, tuple[list, list]] = {}
+    if not employee_ids:
+        return out
+    rows = await conn.fetch(
+        """
+        SELECT ecr.employee_id, ecr.id, ecr.due_date, ct.label, crt.legal_basis
+        FROM employee_credential_requirements ecr
+        JOIN employees e ON e.id = ecr.employee_id
+        JOIN credential_requirement_templates crt ON crt.id = ecr.template_id
+        LEFT JOIN credential_types ct ON ct.id = ecr.credential_type_id
+        WHERE e.org_id = $1 AND ecr.employee_id = ANY($2::uuid[])
+          AND ecr.status NOT IN ('verified', 'waived')
+          AND crt.schedule_blocking = true
+          AND crt.review_status IN ('approved', 'auto_approved')
+          AND ecr.due_date IS NOT NULL AND ecr.due_date < $3
+        """, company_id, list(employee_ids), before,
+    )
+    permits = await conn.fetch(
+        """SELECT employee_id, id, expires_at, legal_basis FROM employee_work_permits
+           WHERE company_id = $1 AND employee_id = ANY($2::uuid[]) AND schedule_blocking = true
+             AND status = 'active' AND confirmed_on_file = true AND expires_at < $3""",
+        company_id, list(employee_ids), before,
+    )
+    for row in rows:
+        out.setdefault(row["employee_id"], ([], []))[0].append(row)
+    for row in permits:
+        out.setdefault(row["employee_id"], ([], []))[1].append(row)
+    return out
+
+
+def eligibility_violations_from(blockers: tuple[list, list], *, shift_date: date) -> list[dict]:
+    """Pure: one employee's `fetch_eligibility_blockers` rows -> block violations
+    for a shift on `shift_date` (only lapses strictly before it count)."""
+    rows, permits = blockers
     out = []
     for row in rows:
+        if row["due_date"] >= shift_date:
+            continue
         out.append({"check": "schedule_eligibility", "severity": "block", "code": "credential_expired",
                     "message": f"{row['label'] or 'Required credential'} expired {row['due_date'].isoformat()} and blocks new scheduling.",
                     "statute": _basis(row['legal_basis']).get('citation'), "state": ""})
     for row in permits:
+        if row["expires_at"] >= shift_date:
+            continue
         out.append({"check": "schedule_eligibility", "severity": "block", "code": "minor_work_permit_expired",
                     "message": f"Work permit expired {row['expires_at'].isoformat()} and blocks new scheduling.",
                     "statute": _basis(row['legal_basis']).get('citation'), "state": ""})
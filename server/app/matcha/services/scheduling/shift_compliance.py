@@ -196,6 +196,31 @@ async def _week_hours(conn, company_id: UUID, employee_id: UUID,
     return total + this_shift_hours
 
 
+async def _week_hours_by_employee(conn, company_id: UUID, employee_ids: list[UUID],
+                                  shift_start: datetime) -> dict[str, float]:
+    """`_week_hours(..., this_shift_hours=0.0, exclude_shift_id=None)` for many
+    employees in one query: str(employee_id) -> scheduled hours in the week
+    containing `shift_start` (0.0 for employees with nothing scheduled)."""
+    out = {str(e): 0.0 for e in employee_ids}
+    if not employee_ids:
+        return out
+    lo, hi = _week_window(shift_start)
+    rows = await conn.fetch(
+        """
+        SELECT a.employee_id, s.starts_at, s.ends_at, s.break_minutes
+        FROM schedule_shifts s
+        JOIN schedule_shift_assignments a ON a.shift_id = s.id
+        WHERE s.company_id = $1 AND a.employee_id = ANY($2::uuid[])
+          AND s.status <> 'cancelled'
+          AND s.starts_at >= $3 AND s.starts_at < $4
+        """,
+        company_id, list(employee_ids), lo, hi,
+    )
+    for r in rows:
+        out[str(r["employee_id"])] += _hours(r["starts_at"], r["ends_at"], r["break_minutes"] or 0)
+    return out
+
+
 async def _min_rest_gap(conn, company_id: UUID, employee_id: UUID,
                         starts_at: datetime, ends_at: datetime,
                         exclude_shift_id: Optional[UUID]) -> Optional[float]:
@@ -256,10 +281,29 @@ async def _fair_workweek_advisories(
     if not state or not city:
         return []
 
-    from . import fair_workweek
-
     company = await conn.fetchrow("SELECT industry FROM companies WHERE id = $1", company_id)
     industry = company["industry"] if company else None
+    return _fair_workweek_for(
+        state, city, industry, starts_at=starts_at, event=event,
+        shift_published=shift_published, min_rest_gap_hours=min_rest_gap_hours,
+    )
+
+
+def _fair_workweek_for(
+    state: str,
+    city: str,
+    industry: Optional[str],
+    *,
+    starts_at: datetime,
+    event: str,
+    shift_published: bool,
+    min_rest_gap_hours: Optional[float],
+) -> list[dict]:
+    """Pure tail of `_fair_workweek_advisories` once location + industry are
+    known — shared with `check_schedule_compliance_batch`, which loads the
+    company's industry once for the whole batch."""
+    from . import fair_workweek
+
     ordinance, applicability = fair_workweek.ordinance_for_location(state, city, industry)
     if ordinance is None:
         return []
@@ -417,22 +461,9 @@ async def check_shift_compliance(
         age=age,
         db_rules=db_rules,
     ))
-    if age_lookup_failed:
-        # Fail visible, not open: the minor check couldn't run at all.
-        violations.append({
-            "check": "minor_hours", "severity": "advisory",
-            "message": "Could not verify this employee's age — minor work-hour "
-                       "limits were not checked. Verify manually.",
-            "statute": None, "state": (state or "").strip().upper(),
-        })
-    if db_rules_fetch_failed:
-        violations.append({
-            "check": "state_rules_unavailable", "severity": "advisory",
-            "message": f"Could not load {(state or '').strip().upper()}'s scheduling-law "
-                       "thresholds just now — this is a temporary issue, not an all-clear. "
-                       "Verify manually before proceeding.",
-            "statute": None, "state": (state or "").strip().upper(),
-        })
+    # Fail visible, not open: the minor check couldn't run at all, or the
+    # state's thresholds couldn't be loaded.
+    violations += _advisory_tail(state, age_lookup_failed, db_rules_fetch_failed)
     violations += await _fair_workweek_advisories(
         conn, company_id, location_id=location_id, state=state, city=city,
         starts_at=starts_at, ends_at=ends_at, event=fw_event,
@@ -456,3 +487,227 @@ async def check_shift_compliance(
                 ),
             )
     return violations
+
+
+# Rest gaps are only ever compared against thresholds well under a day
+# (`min_rest_between_shifts_hours`, Fair Workweek clopening windows), so the
+# batch loads neighbouring shifts this far either side of the affected weeks and
+# reports a gap beyond it as None — which every consumer treats the same as
+# "rested long enough".
+_BATCH_REST_MARGIN = timedelta(days=2)
+
+
+def _advisory_tail(
+    state: Optional[str], age_lookup_failed: bool, db_rules_fetch_failed: bool,
+) -> list[dict]:
+    st = (state or "").strip().upper()
+    out: list[dict] = []
+    if age_lookup_failed:
+        out.append({
+            "check": "minor_hours", "severity": "advisory",
+            "message": "Could not verify this employee's age — minor work-hour "
+                       "limits were not checked. Verify manually.",
+            "statute": None, "state": st,
+        })
+    if db_rules_fetch_failed:
+        out.append({
+            "check": "state_rules_unavailable", "severity": "advisory",
+            "message": f"Could not load {st}'s scheduling-law "
+                       "thresholds just now — this is a temporary issue, not an all-clear. "
+                       "Verify manually before proceeding.",
+            "statute": None, "state": st,
+        })
+    return out
+
+
+async def check_schedule_compliance_batch(
+    conn,
+    company_id: UUID,
+    *,
+    shifts: list[dict[str, Any]],
+) -> list[list[dict]]:
+    """`check_shift_compliance` for many (shift, employee) pairs at once.
+
+    Each entry in `shifts` takes the same keys as `check_shift_compliance`'s
+    keyword arguments (`location_id`, `starts_at`, `ends_at`, `break_minutes`,
+    and optionally `employee_id`, `exclude_shift_id`, `fw_event`,
+    `fw_shift_published`, `shift_kind`, `training_requirement_id`,
+    `lapse_items`). Returns one violation list per entry, in order — identical
+    to calling `check_shift_compliance` once per entry: each proposed shift is
+    judged against what is already in the DB, not against its siblings in the
+    batch (callers that commit as they go re-check at write time, as before).
+
+    The per-shift path runs ~7 queries per entry; this loads locations,
+    eligibility blockers, neighbouring shifts, DOBs, lapse items and state rules
+    for every affected employee/week in a fixed handful of set-based queries and
+    evaluates every entry in memory with the pure `schedule_compliance` checks.
+    """
+    if not shifts:
+        return []
+    from . import schedule_intelligence
+    from .schedule_eligibility import eligibility_violations_from, fetch_eligibility_blockers
+
+    location_ids = list({s["location_id"] for s in shifts if s.get("location_id") is not None})
+    employee_ids = list({s["employee_id"] for s in shifts if s.get("employee_id") is not None})
+
+    locations: dict[UUID, tuple[Optional[str], Optional[str]]] = {}
+    if location_ids:
+        for r in await conn.fetch(
+            "SELECT id, state, city FROM business_locations WHERE company_id = $1 AND id = ANY($2::uuid[])",
+            company_id, location_ids,
+        ):
+            locations[r["id"]] = (r["state"], r["city"])
+
+    industry: Optional[str] = None
+    if any(s.get("fw_event") and s.get("location_id") is not None for s in shifts):
+        company = await conn.fetchrow("SELECT industry FROM companies WHERE id = $1", company_id)
+        industry = company["industry"] if company else None
+
+    # Per-employee context: eligibility, neighbouring shifts, DOB, lapse items.
+    blockers: dict[UUID, tuple[list, list]] = {}
+    existing: dict[UUID, list] = {}
+    dobs: dict[UUID, Optional[date]] = {}
+    age_lookup_failed = False
+    lapse_map: Optional[dict[str, list[dict]]] = None
+    lapse_lookup_failed = False
+    if employee_ids:
+        assigned = [s for s in shifts if s.get("employee_id") is not None]
+        latest_date = max(s["starts_at"].date() for s in assigned)
+        blockers = await fetch_eligibility_blockers(
+            conn, company_id, employee_ids, before=latest_date,
+        )
+
+        windows = [_week_window(s["starts_at"]) for s in assigned]
+        lo = min(min(w[0] for w in windows), min(s["starts_at"] for s in assigned)) - _BATCH_REST_MARGIN
+        hi = max(max(w[1] for w in windows), max(s["ends_at"] for s in assigned)) + _BATCH_REST_MARGIN
+        for r in await conn.fetch(
+            """
+            SELECT a.employee_id, s.id, s.starts_at, s.ends_at, s.break_minutes
+            FROM schedule_shifts s
+            JOIN schedule_shift_assignments a ON a.shift_id = s.id
+            WHERE s.company_id = $1 AND a.employee_id = ANY($2::uuid[])
+              AND s.status <> 'cancelled'
+              AND s.ends_at >= $3 AND s.starts_at < $4
+            """,
+            company_id, employee_ids, lo, hi,
+        ):
+            existing.setdefault(r["employee_id"], []).append(r)
+
+        try:
+            for r in await conn.fetch(
+                """
+                SELECT ed.employee_id, ed.date_of_birth
+                FROM employee_demographics ed
+                JOIN employees e ON e.id = ed.employee_id
+                WHERE ed.employee_id = ANY($1::uuid[]) AND e.org_id = $2
+                """,
+                employee_ids, company_id,
+            ):
+                dobs[r["employee_id"]] = r["date_of_birth"]
+        except Exception:
+            logger.exception("schedule compliance: batched DOB lookup failed")
+            age_lookup_failed = True
+
+        needs_lapse = [s["employee_id"] for s in assigned if s.get("lapse_items") is None]
+        if needs_lapse:
+            from app.core.feature_flags import get_company_features
+
+            try:
+                features = await get_company_features(company_id, conn=conn)
+            except Exception:
+                logger.exception("Could not resolve company features for training-lapse check")
+                lapse_lookup_failed = True
+            else:
+                training_enabled = bool(features.get("training"))
+                credential_templates_enabled = bool(features.get("credential_templates"))
+                lapse_map = {}
+                if training_enabled or credential_templates_enabled:
+                    lapse_map = await schedule_intelligence.fetch_lapse_items(
+                        conn, company_id, list(dict.fromkeys(needs_lapse)),
+                        credential_templates_enabled=credential_templates_enabled,
+                        training_enabled=training_enabled,
+                    )
+
+    # State rules: one (cached) lookup per distinct uncurated state.
+    rules_by_state: dict[str, tuple[Optional[dict], bool]] = {}
+    for state, _city in locations.values():
+        if state and not schedule_compliance.is_curated_state(state):
+            key = state.strip().upper()
+            if key not in rules_by_state:
+                rules_by_state[key] = await _approved_db_rules(conn, key)
+
+    results: list[list[dict]] = []
+    for s in shifts:
+        starts_at: datetime = s["starts_at"]
+        ends_at: datetime = s["ends_at"]
+        break_minutes = s.get("break_minutes") or 0
+        employee_id = s.get("employee_id")
+        exclude_shift_id = s.get("exclude_shift_id")
+        location_id = s.get("location_id")
+        state, city = locations.get(location_id, (None, None)) if location_id is not None else (None, None)
+        worked = _hours(starts_at, ends_at, break_minutes)
+        shift_date = starts_at.astimezone(timezone.utc).date()
+
+        violations: list[dict] = []
+        week_hours: Optional[float] = None
+        min_rest: Optional[float] = None
+        age: Optional[int] = None
+        if employee_id is not None:
+            violations.extend(eligibility_violations_from(
+                blockers.get(employee_id, ([], [])), shift_date=starts_at.date(),
+            ))
+            others = [r for r in existing.get(employee_id, []) if r["id"] != exclude_shift_id]
+            w_lo, w_hi = _week_window(starts_at)
+            week_hours = worked + sum(
+                _hours(r["starts_at"], r["ends_at"], r["break_minutes"] or 0)
+                for r in others if w_lo <= r["starts_at"] < w_hi
+            )
+            gaps = [starts_at - r["ends_at"] for r in others if r["ends_at"] <= starts_at]
+            gaps += [r["starts_at"] - ends_at for r in others if r["starts_at"] >= ends_at]
+            if gaps:
+                min_rest = min(g.total_seconds() / 3600.0 for g in gaps)
+            if not age_lookup_failed:
+                age = _age_on(dobs.get(employee_id), shift_date)
+
+        db_rules: Optional[dict] = None
+        db_rules_fetch_failed = False
+        if state and not schedule_compliance.is_curated_state(state):
+            db_rules, db_rules_fetch_failed = rules_by_state[state.strip().upper()]
+
+        violations.extend(schedule_compliance.evaluate_shift_for_employee(
+            state=state,
+            shift_hours=worked,
+            break_minutes=break_minutes,
+            week_hours=week_hours,
+            min_rest_gap_hours=min_rest,
+            age=age,
+            db_rules=db_rules,
+        ))
+        violations += _advisory_tail(
+            state, employee_id is not None and age_lookup_failed, db_rules_fetch_failed,
+        )
+        if s.get("fw_event") and location_id is not None and state and city:
+            violations += _fair_workweek_for(
+                state, city, industry, starts_at=starts_at, event=s["fw_event"],
+                shift_published=s.get("fw_shift_published", False), min_rest_gap_hours=min_rest,
+            )
+        if employee_id is not None:
+            exclude_requirement_id = (
+                s.get("training_requirement_id") if s.get("shift_kind", "work") == "training" else None
+            )
+            items = s.get("lapse_items")
+            if items is None and lapse_lookup_failed:
+                violations.append({
+                    "check": "training_lapse_unavailable", "severity": "advisory",
+                    "message": "Could not verify training/credential status just now — "
+                               "this is a temporary issue, not an all-clear. Verify manually.",
+                    "statute": None, "state": "",
+                })
+            else:
+                if items is None:
+                    items = (lapse_map or {}).get(str(employee_id), [])
+                violations += shape_lapse_advisories(
+                    items, shift_date=shift_date, exclude_requirement_id=exclude_requirement_id,
+                )
+        results.append(violations)
+    return results
@@ -230,13 +230,25 @@ async def evaluate_new_hire_rules(conn, company_id: UUID, employee_id: UUID) ->
     path (single create, bulk CSV, HRIS sync) so a new hire is enrolled at
     hire time instead of waiting on the cadence worker's periodic sweep.
     """
-    employee = await conn.fetchrow(
+    return await evaluate_new_hire_rules_bulk(conn, company_id, [employee_id])
+
+
+async def evaluate_new_hire_rules_bulk(
+    conn, company_id: UUID, employee_ids: Sequence[UUID],
+) -> AssignResult:
+    """`evaluate_new_hire_rules` for a batch of hires (bulk CSV import): the
+    rules and the employees are read once, and each rule assigns every
+    matching hire that shares a due date in one `assign_training` call.
+    """
+    if not employee_ids:
+        return AssignResult()
+    employees = await conn.fetch(
         "SELECT id, work_state, department, is_supervisor, start_date "
-        "FROM employees WHERE id = $1 AND org_id = $2",
-        employee_id,
+        "FROM employees WHERE id = ANY($1::uuid[]) AND org_id = $2",
+        list(employee_ids),
         company_id,
     )
-    if not employee:
+    if not employees:
         return AssignResult()
 
     rules = await conn.fetch(
@@ -256,18 +268,20 @@ async def evaluate_new_hire_rules(conn, company_id: UUID, employee_id: UUID) ->
     for rule in rules:
         if not rule["req_is_active"]:
             continue
-        if rule["work_states"] and employee["work_state"] not in rule["work_states"]:
-            continue
-        if rule["departments"] and employee["department"] not in rule["departments"]:
-            continue
         applies_to = (rule["applies_to"] or "all").lower()
-        if applies_to == "supervisor" and not employee["is_supervisor"]:
-            continue
-        if applies_to == "nonsupervisor" and employee["is_supervisor"]:
-            continue
-
-        base_date = employee["start_date"] or date.today()
-        due_date = base_date + timedelta(days=rule["due_days"]) if rule["due_days"] else None
+        by_due_date: dict[Optional[date], list[UUID]] = {}
+        for employee in employees:
+            if rule["work_states"] and employee["work_state"] not in rule["work_states"]:
+                continue
+            if rule["departments"] and employee["department"] not in rule["departments"]:
+                continue
+            if applies_to == "supervisor" and not employee["is_supervisor"]:
+                continue
+            if applies_to == "nonsupervisor" and employee["is_supervisor"]:
+                continue
+            base_date = employee["start_date"] or date.today()
+            due_date = base_date + timedelta(days=rule["due_days"]) if rule["due_days"] else None
+            by_due_date.setdefault(due_date, []).append(employee["id"])
 
         requirement = {
             "id": rule["req_id"],
@@ -275,18 +289,19 @@ async def evaluate_new_hire_rules(conn, company_id: UUID, employee_id: UUID) ->
             "training_type": rule["req_training_type"],
             "frequency_months": rule["req_frequency_months"],
         }
-        outcome = await assign_training(
-            conn,
-            company_id,
-            requirement,
-            [employee_id],
-            source_type="new_hire",
-            source_ref=rule["id"],
-            due_date=due_date,
-        )
-        total.assigned += outcome.assigned
-        total.accelerated += outcome.accelerated
-        total.already_open += outcome.already_open
+        for due_date, matched in by_due_date.items():
+            outcome = await assign_training(
+                conn,
+                company_id,
+                requirement,
+                matched,
+                source_type="new_hire",
+                source_ref=rule["id"],
+                due_date=due_date,
+            )
+            total.assigned += outcome.assigned
+            total.accelerated += outcome.accelerated
+            total.already_open += outcome.already_open
 
     return total
 
@@ -15,7 +15,7 @@ from typing import Optional
 from uuid import UUID, uuid4
 
 
-from ....core.services.pdf import render_pdf
+from ....core.services.pdf import render_pdf_async
 from ....core.services.storage import get_storage
 
 logger = logging.getLogger(__name__)
@@ -148,7 +148,7 @@ async def render_certificate_pdf(
         certificate_id=certificate_id,
     )
     return await asyncio.wait_for(
-        asyncio.to_thread(lambda: render_pdf(full_html)),
+        render_pdf_async(full_html),
         timeout=60.0,
     )
 
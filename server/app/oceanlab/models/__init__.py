@@ -3,7 +3,7 @@ from app.oceanlab.models.base import Base
 from app.oceanlab.models.codes import IsrcConfig, UpcCode
 from app.oceanlab.models.contributor import Contributor
 from app.oceanlab.models.delivery import Delivery, DeliveryItem
-from app.oceanlab.models.file import File
+from app.oceanlab.models.file import File, PackageEntry
 from app.oceanlab.models.job import Job
 from app.oceanlab.models.recording import Credit, MasterSplit, Recording
 from app.oceanlab.models.registration import RegistrationTask
@@ -25,6 +25,7 @@ __all__ = [
     "Job",
     "LabelSettings",
     "MasterSplit",
+    "PackageEntry",
     "Recording",
     "RecordingWork",
     "RegistrationTask",
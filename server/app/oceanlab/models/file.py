@@ -21,3 +21,18 @@ class File(Base, TimestampMixin):
     sha256: Mapped[str] = mapped_column(sa.String(64), nullable=False)
     width: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
     height: Mapped[int | None] = mapped_column(sa.Integer, nullable=True)
+
+
+class PackageEntry(Base, TimestampMixin):
+    """CRC-32 of an uploaded file's bytes, keyed by their sha256.
+
+    Recorded at ingest so the packager can write a complete zip local header
+    before streaming the file. Content-addressed, so it stays valid across re-uploads and
+    re-packages and is shared by every release that uses the same master.
+    """
+
+    __tablename__ = "oceanlab_package_entries"
+
+    sha256: Mapped[str] = mapped_column(sa.String(64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
+    crc32: Mapped[int] = mapped_column(sa.BigInteger, nullable=False)
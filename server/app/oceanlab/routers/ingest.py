@@ -1,6 +1,6 @@
 import uuid
-import shutil
 import tempfile
+import zlib
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, File as FastAPIFile, HTTPException, UploadFile
@@ -21,7 +21,7 @@ from app.oceanlab.services import audio_meta
 from app.oceanlab.services import packaging
 from app.oceanlab.services import validation
 from app.oceanlab.services.jobs import create_job, register, run_job
-from app.oceanlab.services.storage import artwork_key, get_store, master_key
+from app.oceanlab.services.storage import CHUNK_SIZE, artwork_key, get_store, master_key
 
 
 router = APIRouter(route_class=OceanlabRoute, tags=["ingestion"], dependencies=[AuthDep])
@@ -69,7 +69,12 @@ def upload_audio(recording_id: uuid.UUID, file: UploadFile = FastAPIFile(...), d
         # Probe before touching the deterministic storage key. A failed retry
         # must not remove the last known-good master at that key.
         with tempfile.NamedTemporaryFile(suffix=ext) as probe:
-            shutil.copyfileobj(file.file, probe)
+            # CRC the bytes on their way to the probe; the packager needs it
+            # to write a full zip local header for this master.
+            crc32 = 0
+            while chunk := file.file.read(CHUNK_SIZE):
+                crc32 = zlib.crc32(chunk, crc32)
+                probe.write(chunk)
             probe.flush()
             probe.seek(0)
             audio_meta.extract(Path(probe.name))
@@ -90,6 +95,7 @@ def upload_audio(recording_id: uuid.UUID, file: UploadFile = FastAPIFile(...), d
     db.add(file_row)
     db.flush()
     recording.audio_file_id = file_row.id
+    packaging.record_package_entry(db, sha, size, crc32)
     job = create_job(db, "extract_audio_meta", {"recording_id": str(recording_id), "storage_key": key})
     db.commit()
     run_job(db, db.get(Job, job.id))
@@ -125,6 +131,7 @@ def upload_artwork(release_id: uuid.UUID, file: UploadFile = FastAPIFile(...), d
     db.add(file_row)
     db.flush()
     release.artwork_file_id = file_row.id
+    packaging.record_package_entry(db, sha, size, zlib.crc32(data))
     db.commit()
     db.refresh(file_row)
     return file_row
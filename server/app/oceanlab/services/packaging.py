@@ -1,19 +1,20 @@
 """Build the manual TuneCore/DSP delivery package."""
 
 import csv
+import hashlib
 import io
 import json
 import re
-import shutil
-import tempfile
 import unicodedata
-import zipfile
+import zlib
+from collections import defaultdict
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.oceanlab.models.artist import Artist
@@ -22,13 +23,14 @@ from app.oceanlab.models.delivery import Delivery
 from app.oceanlab.models.contributor import Contributor
 from app.oceanlab.models.release import ReleaseArtist
 from app.oceanlab.models.recording import MasterSplit
-from app.oceanlab.models.file import File
-from app.oceanlab.models.recording import Credit, Recording
+from app.oceanlab.models.file import File, PackageEntry
+from app.oceanlab.models.recording import Credit
 from app.oceanlab.models.release import Release
 from app.oceanlab.models.track import Track
 from app.oceanlab.models.work import RecordingWork, Work, WorkWriter
-from app.oceanlab.services.storage import get_store, package_key
+from app.oceanlab.services.storage import CHUNK_SIZE, ObjectStore, get_store, package_key
 from app.oceanlab.services.validation import Issue, validate_release
+from app.oceanlab.services.zipstream import ZipStreamWriter
 
 
 MANIFEST_COLUMNS = [
@@ -45,47 +47,99 @@ def sanitize_filename(value: str) -> str:
     return value[:120] or "untitled"
 
 
-def _artist_name(db: Session, artist_id) -> str:
-    artist = db.get(Artist, artist_id)
-    return artist.name if artist else ""
+def _grouped(rows, key) -> dict:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[key(row)].append(row)
+    return grouped
 
 
-def manifest_rows(db: Session, release_id: UUID) -> list[dict]:
+@dataclass
+class _ReleaseData:
+    """Everything the manifest and package read about one release, loaded in
+    a fixed number of queries however many tracks it has."""
+
+    release: Release
+    tracks: list[Track]
+    release_artists: list[ReleaseArtist]
+    artist_names: dict[UUID, str]
+    contributor_names: dict[UUID, str]
+    files: dict[UUID, File]
+    splits: dict[UUID, list[MasterSplit]]
+    credits: dict[UUID, list[Credit]]
+    works: dict[UUID, list[Work]]
+    writers: dict[UUID, list[WorkWriter]]
+
+    def artist_name(self, artist_id) -> str:
+        return self.artist_names.get(artist_id, "")
+
+
+def _load_release(db: Session, release_id: UUID) -> _ReleaseData:
     release = db.get(Release, release_id)
     if not release:
         raise ValueError("Release not found")
-    artist = _artist_name(db, release.primary_artist_id)
+    # Track.recording is joined-loaded, so this one query brings every recording.
+    tracks = db.scalars(sa.select(Track).where(Track.release_id == release_id).order_by(Track.disc_number, Track.position)).all()
+    recordings = [track.recording for track in tracks]
+    recording_ids = [recording.id for recording in recordings]
+    release_artists = db.scalars(
+        sa.select(ReleaseArtist).where(ReleaseArtist.release_id == release_id).order_by(ReleaseArtist.position)
+    ).all()
+    artist_ids = {release.primary_artist_id, *(credit.artist_id for credit in release_artists), *(r.primary_artist_id for r in recordings)}
+    file_ids = {file_id for file_id in (release.artwork_file_id, *(r.audio_file_id for r in recordings)) if file_id}
+    credits = db.scalars(sa.select(Credit).where(Credit.recording_id.in_(recording_ids)).order_by(Credit.position)).all()
+    work_links = db.execute(
+        sa.select(RecordingWork.recording_id, Work).join(Work, Work.id == RecordingWork.work_id)
+        .where(RecordingWork.recording_id.in_(recording_ids))
+    ).all()
+    writers = db.scalars(sa.select(WorkWriter).where(WorkWriter.work_id.in_({work.id for _, work in work_links}))).all()
+    contributor_ids = {credit.contributor_id for credit in credits} | {writer.contributor_id for writer in writers}
+    works = defaultdict(list)
+    for recording_id, work in work_links:
+        works[recording_id].append(work)
+    return _ReleaseData(
+        release=release,
+        tracks=list(tracks),
+        release_artists=list(release_artists),
+        artist_names=dict(db.execute(sa.select(Artist.id, Artist.name).where(Artist.id.in_(artist_ids))).tuples().all()),
+        contributor_names=dict(
+            db.execute(sa.select(Contributor.id, Contributor.name).where(Contributor.id.in_(contributor_ids))).tuples().all()
+        ),
+        files={f.id: f for f in db.scalars(sa.select(File).where(File.id.in_(file_ids))).all()},
+        splits=_grouped(
+            db.scalars(sa.select(MasterSplit).where(MasterSplit.recording_id.in_(recording_ids))).all(),
+            lambda split: split.recording_id,
+        ),
+        credits=_grouped(credits, lambda credit: credit.recording_id),
+        works=works,
+        writers=_grouped(writers, lambda writer: writer.work_id),
+    )
+
+
+def _manifest_rows(data: _ReleaseData) -> list[dict]:
+    release = data.release
     featured_artists = ", ".join(
-        _artist_name(db, credit.artist_id)
-        for credit in db.scalars(
-            sa.select(ReleaseArtist)
-            .where(ReleaseArtist.release_id == release_id, ReleaseArtist.role == "featured")
-            .order_by(ReleaseArtist.position)
-        ).all()
+        data.artist_name(credit.artist_id) for credit in data.release_artists if credit.role == "featured"
     )
     rows = []
-    tracks = db.scalars(sa.select(Track).where(Track.release_id == release_id).order_by(Track.disc_number, Track.position)).all()
-    for track in tracks:
-        recording = db.get(Recording, track.recording_id)
-        works = db.scalars(sa.select(Work).join(RecordingWork).where(RecordingWork.recording_id == recording.id)).all()
+    for track in data.tracks:
+        recording = track.recording
         writers = []
-        for work in works:
-            for writer in db.scalars(sa.select(WorkWriter).where(WorkWriter.work_id == work.id)).all():
-                contributor = db.get(Contributor, writer.contributor_id)
-                if contributor:
-                    writers.append(f"{contributor.name} [{writer.role}] {writer.share_pct}%")
-        producers = []
-        for credit in db.scalars(sa.select(Credit).where(Credit.recording_id == recording.id)).all():
-            if str(credit.role) == "producer":
-                contributor = db.get(Contributor, credit.contributor_id)
-                if contributor:
-                    producers.append(contributor.name)
+        for work in data.works.get(recording.id, []):
+            for writer in data.writers.get(work.id, []):
+                if writer.contributor_id in data.contributor_names:
+                    writers.append(f"{data.contributor_names[writer.contributor_id]} [{writer.role}] {writer.share_pct}%")
+        producers = [
+            data.contributor_names[credit.contributor_id]
+            for credit in data.credits.get(recording.id, [])
+            if str(credit.role) == "producer" and credit.contributor_id in data.contributor_names
+        ]
         rows.append({
             "disc": track.disc_number,
             "position": track.position,
             "track_title": track.title_override or recording.title,
             "version": recording.version or "",
-            "primary_artist": _artist_name(db, recording.primary_artist_id),
+            "primary_artist": data.artist_name(recording.primary_artist_id),
             "featured_artists": featured_artists,
             "isrc": recording.isrc or "",
             "duration": str(recording.duration_seconds or ""),
@@ -108,6 +162,10 @@ def manifest_rows(db: Session, release_id: UUID) -> list[dict]:
     return rows
 
 
+def manifest_rows(db: Session, release_id: UUID) -> list[dict]:
+    return _manifest_rows(_load_release(db, release_id))
+
+
 @dataclass(frozen=True)
 class PackageResult:
     file_id: UUID
@@ -115,68 +173,115 @@ class PackageResult:
     total_bytes: int
 
 
+def _track_detail(data: _ReleaseData, track: Track, row: dict) -> dict:
+    recording = track.recording
+    splits = [
+        {"contributor_id": str(split.contributor_id), "share_pct": str(split.share_pct), "role": str(split.role) if split.role else None}
+        for split in data.splits.get(recording.id, [])
+    ]
+    credits = [
+        {"contributor_id": str(credit.contributor_id), "role": str(credit.role), "credited_as": credit.credited_as, "position": credit.position}
+        for credit in data.credits.get(recording.id, [])
+    ]
+    work_details = []
+    for work in data.works.get(recording.id, []):
+        writers = [
+            {"contributor_id": str(writer.contributor_id), "role": str(writer.role), "share_pct": str(writer.share_pct), "publisher_name": writer.publisher_name, "publisher_share_pct": str(writer.publisher_share_pct) if writer.publisher_share_pct is not None else None}
+            for writer in data.writers.get(work.id, [])
+        ]
+        work_details.append({"id": str(work.id), "title": work.title, "iswc": work.iswc, "writers": writers})
+    return {"track": row, "recording_id": str(recording.id), "splits": splits, "credits": credits, "works": work_details}
+
+
+def _known_crcs(db: Session, files: list[File]) -> dict[str, int]:
+    shas = {f.sha256 for f in files}
+    return dict(db.execute(sa.select(PackageEntry.sha256, PackageEntry.crc32).where(PackageEntry.sha256.in_(shas))).tuples().all())
+
+
+def record_package_entry(db: Session, sha256: str, size_bytes: int, crc32: int) -> None:
+    """Cache a file's CRC-32 under its sha256. Ingest calls this on upload."""
+    db.execute(
+        pg_insert(PackageEntry)
+        .values(sha256=sha256, size_bytes=size_bytes, crc32=crc32)
+        .on_conflict_do_nothing(index_elements=[PackageEntry.sha256])
+    )
+
+
+def _backfill_crc(db: Session, store: ObjectStore, file: File) -> int:
+    """CRC a file uploaded before ingest recorded one, and cache it.
+
+    The entry is keyed by the sha256 of the bytes actually read, never just
+    the File row's claim about them.
+    """
+    digest, crc32, size = hashlib.sha256(), 0, 0
+    with store.open(file.storage_key) as source:
+        while chunk := source.read(CHUNK_SIZE):
+            digest.update(chunk)
+            crc32 = zlib.crc32(chunk, crc32)
+            size += len(chunk)
+    record_package_entry(db, digest.hexdigest(), size, crc32)
+    return crc32
+
+
 def build_package(db: Session, release_id: UUID, delivery_id: UUID) -> PackageResult:
-    release = db.get(Release, release_id)
-    if not release:
-        raise ValueError("Release not found")
+    """Write the package zip straight into storage in one pass.
+
+    Nothing is staged on local disk: each master is copied chunk by chunk
+    from its object into the upload, and the package's
+    size and sha256 are counted as the bytes go out (`store.stream_put`).
+    Peak memory is one upload part. Every entry gets a full local header,
+    with no data descriptor: ingest records each file's CRC-32 in
+    `oceanlab_package_entries`, and a file uploaded before that is read once
+    up front to fill its entry in.
+    """
+    data = _load_release(db, release_id)
+    release = data.release
     report = validate_release(db, release_id)
     if not report.packageable:
         raise ValueError("Release is not ready: " + "; ".join(i.code for i in report.issues if i.severity == "error"))
-    tracks = db.scalars(sa.select(Track).where(Track.release_id == release_id).order_by(Track.disc_number, Track.position)).all()
-    root = sanitize_filename(f"{release.catalog_number or release.id} - {_artist_name(db, release.primary_artist_id)} - {release.title}")
-    rows = manifest_rows(db, release_id)
+    root = sanitize_filename(f"{release.catalog_number or release.id} - {data.artist_name(release.primary_artist_id)} - {release.title}")
+    rows = _manifest_rows(data)
     csv_buffer = io.StringIO(newline="")
     writer = csv.DictWriter(csv_buffer, fieldnames=MANIFEST_COLUMNS, lineterminator="\n")
     writer.writeheader()
     writer.writerows(rows)
     readiness = {"packageable": report.packageable, "issues": [asdict(i) for i in report.issues]}
-    detailed_tracks = []
-    for track in tracks:
-        recording = db.get(Recording, track.recording_id)
-        splits = [
-            {"contributor_id": str(split.contributor_id), "share_pct": str(split.share_pct), "role": str(split.role) if split.role else None}
-            for split in db.scalars(sa.select(MasterSplit).where(MasterSplit.recording_id == recording.id)).all()
-        ]
-        credits = [
-            {"contributor_id": str(credit.contributor_id), "role": str(credit.role), "credited_as": credit.credited_as, "position": credit.position}
-            for credit in db.scalars(sa.select(Credit).where(Credit.recording_id == recording.id).order_by(Credit.position)).all()
-        ]
-        work_details = []
-        for work in db.scalars(sa.select(Work).join(RecordingWork).where(RecordingWork.recording_id == recording.id)).all():
-            writers = [
-                {"contributor_id": str(writer.contributor_id), "role": str(writer.role), "share_pct": str(writer.share_pct), "publisher_name": writer.publisher_name, "publisher_share_pct": str(writer.publisher_share_pct) if writer.publisher_share_pct is not None else None}
-                for writer in db.scalars(sa.select(WorkWriter).where(WorkWriter.work_id == work.id)).all()
-            ]
-            work_details.append({"id": str(work.id), "title": work.title, "iswc": work.iswc, "writers": writers})
-        detailed_tracks.append({"track": next(row for row in rows if row["position"] == track.position and row["disc"] == track.disc_number), "recording_id": str(recording.id), "splits": splits, "credits": credits, "works": work_details})
     metadata = {
         "release": {k: getattr(release, k) for k in ("title", "release_type", "upc", "catalog_number", "release_date", "label_name", "genre", "subgenre", "c_line", "p_line", "territories")},
-        "release_artists": [{"artist_id": str(credit.artist_id), "role": str(credit.role), "position": credit.position} for credit in db.scalars(sa.select(ReleaseArtist).where(ReleaseArtist.release_id == release_id).order_by(ReleaseArtist.position)).all()],
-        "tracks": detailed_tracks,
+        "release_artists": [{"artist_id": str(credit.artist_id), "role": str(credit.role), "position": credit.position} for credit in data.release_artists],
+        "tracks": [_track_detail(data, track, row) for track, row in zip(data.tracks, rows)],
     }
-    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-    key = package_key(release_id, stamp)
+    # Every master is resolved before the upload starts, so a missing one
+    # fails the job without leaving a half-written package behind.
+    masters = []
+    for track, row in zip(data.tracks, rows):
+        audio = data.files.get(track.recording.audio_file_id)
+        if not audio:
+            raise ValueError(f"Missing master for track {row['track_title']}")
+        filename = sanitize_filename(f"{track.disc_number}-{track.position:02d} {row['track_title']}{Path(audio.original_filename).suffix.lower() or '.wav'}")
+        masters.append((f"{root}/audio/{filename}", audio))
+    artwork = data.files.get(release.artwork_file_id)
+    entries = [audio for _, audio in masters] + ([artwork] if artwork else [])
+    known_crcs = _known_crcs(db, entries)
     store = get_store()
-    with tempfile.NamedTemporaryFile(suffix=".zip") as temp:
-        with zipfile.ZipFile(temp, "w", compression=zipfile.ZIP_STORED) as archive:
-            archive.writestr(f"{root}/manifest.csv", csv_buffer.getvalue())
-            archive.writestr(f"{root}/manifest.json", json.dumps(metadata, indent=2, default=str) + "\n")
-            archive.writestr(f"{root}/readiness-report.json", json.dumps(readiness, indent=2, default=str) + "\n")
-            artwork = db.get(File, release.artwork_file_id)
-            if artwork:
-                with store.open(artwork.storage_key) as source:
-                    archive.writestr(f"{root}/artwork/cover{Path(artwork.original_filename).suffix.lower() or '.jpg'}", source.read())
-            for track, row in zip(tracks, rows):
-                recording = db.get(Recording, track.recording_id)
-                audio = db.get(File, recording.audio_file_id)
-                if not audio:
-                    raise ValueError(f"Missing master for track {row['track_title']}")
-                filename = sanitize_filename(f"{track.disc_number}-{track.position:02d} {row['track_title']}{Path(audio.original_filename).suffix.lower() or '.wav'}")
-                with store.open(audio.storage_key) as source, archive.open(f"{root}/audio/{filename}", "w") as target:
-                    shutil.copyfileobj(source, target, 1024 * 1024)
-        temp.flush()
-        temp.seek(0)
-        size, sha = store.put(key, temp, content_type="application/zip")
+    for entry in entries:
+        if entry.sha256 not in known_crcs:
+            known_crcs[entry.sha256] = _backfill_crc(db, store, entry)
+    now = datetime.now(timezone.utc)
+    key = package_key(release_id, now.strftime("%Y%m%d-%H%M%S"))
+    with store.stream_put(key, content_type="application/zip") as upload:
+        archive = ZipStreamWriter(upload, date_time=now)
+        archive.add_bytes(f"{root}/manifest.csv", csv_buffer.getvalue().encode("utf-8"))
+        archive.add_bytes(f"{root}/manifest.json", (json.dumps(metadata, indent=2, default=str) + "\n").encode("utf-8"))
+        archive.add_bytes(f"{root}/readiness-report.json", (json.dumps(readiness, indent=2, default=str) + "\n").encode("utf-8"))
+        if artwork:
+            with store.open(artwork.storage_key) as source:
+                archive.add_stream(f"{root}/artwork/cover{Path(artwork.original_filename).suffix.lower() or '.jpg'}", source, size=artwork.size_bytes, crc32=known_crcs[artwork.sha256])
+        for name, audio in masters:
+            with store.open(audio.storage_key) as source:
+                archive.add_stream(name, source, size=audio.size_bytes, crc32=known_crcs[audio.sha256])
+        archive.close()
+    size, sha = upload.size, upload.sha256
     file_row = File(kind=FileKind.package, storage_key=key, original_filename=f"{root}.zip", mime_type="application/zip", size_bytes=size, sha256=sha)
     db.add(file_row)
     db.flush()
@@ -18,7 +18,7 @@ import logging
 import os
 import shutil
 import tempfile
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from contextlib import AbstractContextManager, contextmanager
 from functools import lru_cache
 from pathlib import Path
@@ -27,6 +27,9 @@ from typing import BinaryIO, Protocol
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 1024 * 1024  # 1MB — used for every hash/copy loop in this module
+# S3 requires every multipart part but the last to be at least 5MB; 8MB keeps
+# a part buffer small next to the worker's 768M cgroup.
+MULTIPART_PART_SIZE = 8 * CHUNK_SIZE
 
 
 class StorageError(Exception):
@@ -58,11 +61,36 @@ def hash_and_size(src: BinaryIO) -> tuple[int, str]:
     return size, digest.hexdigest()
 
 
+class StreamUpload:
+    """Write side of `ObjectStore.stream_put`: counts and SHA-256-hashes bytes
+    as they are written, so the object is never re-read to describe it."""
+
+    def __init__(self, sink: Callable[[bytes], None]):
+        self._sink = sink
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        self.size += len(data)
+        self._sink(data)
+        return len(data)
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
 class ObjectStore(Protocol):
     def put(self, key: str, src: BinaryIO, *, content_type: str) -> tuple[int, str]:
         """Store `src` at `key`. Returns (size_bytes, sha256_hex). Overwrites."""
         ...
 
+    def stream_put(self, key: str, *, content_type: str) -> AbstractContextManager[StreamUpload]:
+        """Store whatever is written to the yielded StreamUpload at `key`, in
+        one pass. The object appears only if the block exits cleanly."""
+        ...
+
     def open(self, key: str) -> BinaryIO: ...
 
     def exists(self, key: str) -> bool: ...
@@ -112,6 +140,54 @@ class S3Store:
         )
         return size, sha256
 
+    @contextmanager
+    def stream_put(self, key: str, *, content_type: str) -> Iterator[StreamUpload]:
+        # Multipart upload fed from a single part-sized buffer. An exception
+        # in the caller's block aborts it, so S3 never keeps a partial object
+        # (or billable orphaned parts).
+        full_key = self._full_key(key)
+        try:
+            upload_id = self._client.create_multipart_upload(
+                Bucket=self._bucket, Key=full_key, ContentType=content_type, ServerSideEncryption="AES256",
+            )["UploadId"]
+        except Exception as e:
+            raise StorageError(f"Could not start upload of {key}: {e}") from e
+        parts: list[dict] = []
+        buffer = bytearray()
+
+        def upload_part() -> None:
+            number = len(parts) + 1
+            try:
+                resp = self._client.upload_part(
+                    Bucket=self._bucket, Key=full_key, UploadId=upload_id, PartNumber=number, Body=bytes(buffer),
+                )
+            except Exception as e:
+                raise StorageError(f"Could not upload {key}: {e}") from e
+            parts.append({"ETag": resp["ETag"], "PartNumber": number})
+            buffer.clear()
+
+        def sink(data: bytes) -> None:
+            buffer.extend(data)
+            if len(buffer) >= MULTIPART_PART_SIZE:
+                upload_part()
+
+        try:
+            yield StreamUpload(sink)
+            if buffer or not parts:
+                upload_part()
+            try:
+                self._client.complete_multipart_upload(
+                    Bucket=self._bucket, Key=full_key, UploadId=upload_id, MultipartUpload={"Parts": parts},
+                )
+            except Exception as e:
+                raise StorageError(f"Could not upload {key}: {e}") from e
+        except BaseException:
+            try:
+                self._client.abort_multipart_upload(Bucket=self._bucket, Key=full_key, UploadId=upload_id)
+            except Exception as e:
+                logger.warning("oceanlab: abort of multipart upload %s failed: %s", key, e)
+            raise
+
     def open(self, key: str) -> BinaryIO:
         try:
             resp = self._client.get_object(Bucket=self._bucket, Key=self._full_key(key))
@@ -201,6 +277,18 @@ class LocalDiskStore:
         os.replace(tmp, path)
         return size, sha256
 
+    @contextmanager
+    def stream_put(self, key: str, *, content_type: str) -> Iterator[StreamUpload]:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            with open(tmp, "wb") as out:
+                yield StreamUpload(out.write)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
     def open(self, key: str) -> BinaryIO:
         try:
             return open(self._path(key), "rb")
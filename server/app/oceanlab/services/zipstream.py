@@ -0,0 +1,181 @@
+"""Write a STORED (uncompressed) zip to a forward-only stream.
+
+`zipfile` needs to seek back over each local header to fill in the CRC and
+sizes; handed a non-seekable stream it falls back to a data descriptor after
+every entry. The packager writes straight into a multipart upload, which
+cannot seek. It also knows every entry's CRC before writing it (ingest
+records it in `oceanlab_package_entries`), so a full local header can go out
+up front.
+That makes the package readable by strict streaming unzippers, some of which
+reject STORED entries with a descriptor.
+
+This writer therefore does both:
+
+* a known `crc32` puts the CRC and sizes in the local header, then streams
+  the bytes and checks them against it;
+* an unknown `crc32` writes a data descriptor after the bytes, as `zipfile`
+  does.
+
+Sizes are always known up front (File.size_bytes or an in-memory body), so
+each entry decides on zip64 before it is written. The archive switches to a
+zip64 end record once offsets pass 4GiB, which a long album of 24-bit WAVs
+can.
+"""
+
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import BinaryIO
+
+ZIP64_LIMIT = 0xFFFFFFFF
+_MAX_ENTRIES = 0xFFFF
+# Field values that mean "see the zip64 record" to a reader.
+_FULL32 = 0xFFFFFFFF
+_FULL16 = 0xFFFF
+_CHUNK_SIZE = 1024 * 1024
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+_CENTRAL_HEADER = struct.Struct("<4sHHHHHHLLLHHHHHLL")
+_END_RECORD = struct.Struct("<4sHHHHLLH")
+_END_RECORD64 = struct.Struct("<4sQHHLLQQQQ")
+_END_LOCATOR64 = struct.Struct("<4sLQL")
+
+_FLAG_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_VERSION = 20
+_VERSION_ZIP64 = 45
+_UNIX = 3
+_FILE_MODE = 0o100644
+
+
+class ZipStreamError(ValueError):
+    """An entry's bytes did not match what its header promised."""
+
+
+@dataclass(frozen=True)
+class _Entry:
+    name: bytes
+    flags: int
+    dos_time: int
+    dos_date: int
+    crc32: int
+    size: int
+    offset: int
+
+
+def _dos_stamp(moment: datetime) -> tuple[int, int]:
+    year = max(moment.year, 1980)
+    return (
+        (moment.hour << 11) | (moment.minute << 5) | (moment.second // 2),
+        ((year - 1980) << 9) | (moment.month << 5) | moment.day,
+    )
+
+
+class ZipStreamWriter:
+    """Single pass over `out`; only `out.write` is used."""
+
+    def __init__(self, out: BinaryIO, *, date_time: datetime):
+        self._out = out
+        self._time, self._date = _dos_stamp(date_time)
+        self._offset = 0
+        self._entries: list[_Entry] = []
+        self._closed = False
+
+    def _write(self, data: bytes) -> None:
+        self._out.write(data)
+        self._offset += len(data)
+
+    def _local_header(self, name: bytes, flags: int, crc32: int, size: int, zip64: bool) -> bytes:
+        """CRC and size are zeros for a descriptor entry, as the spec asks."""
+        extra = b""
+        header_size = size
+        if zip64:
+            extra = struct.pack("<HHQQ", 1, 16, size, size)
+            header_size = _FULL32
+        return _LOCAL_HEADER.pack(
+            b"PK\x03\x04", _VERSION_ZIP64 if zip64 else _VERSION, flags, 0,
+            self._time, self._date, crc32, header_size, header_size, len(name), len(extra),
+        ) + name + extra
+
+    def add_bytes(self, name: str, data: bytes) -> int:
+        """Add an in-memory entry; returns its CRC-32."""
+        crc32 = zlib.crc32(data)
+        encoded, flags = self._name(name)
+        zip64 = len(data) >= ZIP64_LIMIT
+        offset = self._offset
+        self._write(self._local_header(encoded, flags, crc32, len(data), zip64))
+        self._write(data)
+        self._entries.append(_Entry(encoded, flags, self._time, self._date, crc32, len(data), offset))
+        return crc32
+
+    def add_stream(self, name: str, src: BinaryIO, *, size: int, crc32: int | None = None, digest=None) -> int:
+        """Copy `src` into a new entry of exactly `size` bytes; returns its CRC-32.
+
+        A known `crc32` is written into the local header and verified against
+        the streamed bytes. `digest` (a hashlib object) is fed every chunk, so
+        a caller can hash the source without a second read.
+        """
+        encoded, flags = self._name(name)
+        known = crc32 is not None
+        if not known:
+            flags |= _FLAG_DESCRIPTOR
+        zip64 = size >= ZIP64_LIMIT
+        offset = self._offset
+        self._write(self._local_header(encoded, flags, crc32 if known else 0, size if known else 0, zip64))
+        running, copied = 0, 0
+        while chunk := src.read(_CHUNK_SIZE):
+            running = zlib.crc32(chunk, running)
+            copied += len(chunk)
+            if digest is not None:
+                digest.update(chunk)
+            self._write(chunk)
+        if copied != size:
+            raise ZipStreamError(f"{name}: expected {size} bytes, read {copied}")
+        if not known:
+            sizes = "<QQ" if zip64 else "<LL"
+            self._write(struct.pack("<4sL", b"PK\x07\x08", running) + struct.pack(sizes, size, size))
+        elif running != crc32:
+            raise ZipStreamError(f"{name}: content does not match its cached CRC-32")
+        self._entries.append(_Entry(encoded, flags, self._time, self._date, running, size, offset))
+        return running
+
+    @staticmethod
+    def _name(name: str) -> tuple[bytes, int]:
+        try:
+            return name.encode("ascii"), 0
+        except UnicodeEncodeError:
+            return name.encode("utf-8"), _FLAG_UTF8
+
+    def close(self) -> None:
+        """Write the central directory and end record. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        directory_offset = self._offset
+        for entry in self._entries:
+            extra_values = [v for v in (entry.size, entry.size, entry.offset) if v >= ZIP64_LIMIT]
+            extra = b""
+            if extra_values:
+                extra = struct.pack(f"<HH{len(extra_values)}Q", 1, 8 * len(extra_values), *extra_values)
+            version = _VERSION_ZIP64 if extra_values else _VERSION
+            size = _FULL32 if entry.size >= ZIP64_LIMIT else entry.size
+            offset = _FULL32 if entry.offset >= ZIP64_LIMIT else entry.offset
+            self._write(_CENTRAL_HEADER.pack(
+                b"PK\x01\x02", (_UNIX << 8) | version, version, entry.flags, 0,
+                entry.dos_time, entry.dos_date, entry.crc32, size, size,
+                len(entry.name), len(extra), 0, 0, 0, _FILE_MODE << 16, offset,
+            ) + entry.name + extra)
+        directory_size = self._offset - directory_offset
+        count = len(self._entries)
+        if count >= _MAX_ENTRIES or directory_offset >= ZIP64_LIMIT or directory_size >= ZIP64_LIMIT:
+            end64_offset = self._offset
+            self._write(_END_RECORD64.pack(
+                b"PK\x06\x06", _END_RECORD64.size - 12, (_UNIX << 8) | _VERSION_ZIP64, _VERSION_ZIP64,
+                0, 0, count, count, directory_size, directory_offset,
+            ))
+            self._write(_END_LOCATOR64.pack(b"PK\x06\x07", 0, end64_offset, 1))
+            count, directory_size, directory_offset = _FULL16, _FULL32, _FULL32
+        self._write(_END_RECORD.pack(
+            b"PK\x05\x06", 0, 0, count, count, directory_size, directory_offset, 0,
+        ))
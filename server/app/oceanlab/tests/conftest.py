@@ -70,6 +70,7 @@ _MIGRATION_MODULES = (
     "oceanlab_app_01_standalone",
     "oceanlab_app_02_label_defaults",
     "oceanlab_app_03_prefill_provenance",
+    "oceanlab_app_04_package_entries",
 )
 
 
@@ -146,7 +147,7 @@ _TRUNCATE_TABLES = (
     "oceanlab_royalty_statements, oceanlab_tracks, oceanlab_upc_codes, oceanlab_recording_works, "
     "oceanlab_master_splits, oceanlab_credits, oceanlab_work_writers, oceanlab_release_artists, "
     "oceanlab_releases, oceanlab_recordings, oceanlab_works, oceanlab_isrc_config, oceanlab_files, "
-    "oceanlab_label_settings, oceanlab_artists, oceanlab_contributors, oceanlab_jobs"
+    "oceanlab_label_settings, oceanlab_artists, oceanlab_contributors, oceanlab_jobs, oceanlab_package_entries"
 )
 
 
@@ -1,9 +1,10 @@
 import io
+import zlib
 from decimal import Decimal
 
 from PIL import Image
 
-from app.oceanlab.models.file import File
+from app.oceanlab.models.file import File, PackageEntry
 from app.oceanlab.models.delivery import Delivery
 from app.oceanlab.models.enums import DeliveryStatus, DeliveryTarget, FileKind
 from app.oceanlab.models.recording import Recording
@@ -39,6 +40,8 @@ def test_audio_upload_persists_file_metadata_and_job(client, db, monkeypatch, tm
     assert refreshed.audio_file_id is not None
     assert refreshed.duration_seconds == Decimal("3.250")
     assert refreshed.sample_rate == 44100
+    entry = db.get(PackageEntry, body["file"]["sha256"])
+    assert entry is not None and entry.crc32 == zlib.crc32(b"fake wav")
 
 
 def test_bad_audio_retry_keeps_existing_master(client, db, monkeypatch, tmp_path):
@@ -150,3 +153,41 @@ def test_package_contains_metadata_artwork_master_and_readiness_report(db_real,
             assert any(name.endswith("readiness-report.json") for name in names)
             assert any("artwork/cover.jpg" in name for name in names)
             assert any("audio/" in name for name in names)
+
+
+def test_master_without_an_ingest_crc_is_backfilled_and_reused(db_real, monkeypatch, tmp_path):
+    import hashlib
+    import zipfile
+
+    from app.oceanlab.models.track import Track
+
+    artist = make_artist(db_real)
+    release = make_release(db_real, artist=artist, tracks=1, complete=True)
+    recording = db_real.get(Recording, db_real.query(Track).filter_by(release_id=release.id).one().recording_id)
+    store = LocalDiskStore(tmp_path / "storage")
+    master = b"master bytes" * 1000
+    store.put(f"masters/{recording.id}/original.wav", io.BytesIO(master), content_type="audio/wav")
+    audio = File(kind=FileKind.audio_master, storage_key=f"masters/{recording.id}/original.wav", original_filename="master.wav", mime_type="audio/wav", size_bytes=len(master), sha256=hashlib.sha256(master).hexdigest())
+    db_real.add(audio)
+    db_real.flush()
+    recording.audio_file_id = audio.id
+    deliveries = [Delivery(release_id=release.id, target=DeliveryTarget.export_package, status=DeliveryStatus.pending) for _ in range(2)]
+    db_real.add_all(deliveries)
+    db_real.commit()
+    monkeypatch.setattr(packaging, "get_store", lambda: store)
+
+    def master_flags(result):
+        with store.open(db_real.get(File, result.file_id).storage_key) as source:
+            with zipfile.ZipFile(source) as archive:
+                info = next(info for info in archive.infolist() if "/audio/" in info.filename)
+                assert archive.read(info) == master
+                return info.flag_bits & 0x08
+
+    first = packaging.build_package(db_real, release.id, deliveries[0].id)
+    entry = db_real.get(PackageEntry, audio.sha256)
+    assert entry is not None and entry.crc32 == zlib.crc32(master)
+    assert not master_flags(first)
+
+    monkeypatch.setattr(packaging, "package_key", lambda release_id, stamp: f"packages/{release_id}/second/package.zip")
+    second = packaging.build_package(db_real, release.id, deliveries[1].id)
+    assert not master_flags(second)
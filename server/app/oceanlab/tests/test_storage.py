@@ -11,6 +11,7 @@ import pytest
 from app.oceanlab.config import settings
 from app.oceanlab.services.storage import (
     CHUNK_SIZE,
+    MULTIPART_PART_SIZE,
     LocalDiskStore,
     S3Store,
     StorageError,
@@ -85,6 +86,70 @@ def test_put_leaves_no_tmp_file_behind(store, tmp_path):
     assert list((tmp_path / "store").rglob("*.tmp")) == []
 
 
+def test_stream_put_returns_size_and_sha256(store):
+    data = b"q" * (CHUNK_SIZE + 5)
+    with store.stream_put("packages/r/p.zip", content_type="application/zip") as out:
+        out.write(data[:CHUNK_SIZE])
+        out.write(data[CHUNK_SIZE:])
+
+    assert (out.size, out.sha256) == (len(data), hashlib.sha256(data).hexdigest())
+    with store.open("packages/r/p.zip") as fh:
+        assert fh.read() == data
+    assert list((store._root / "packages/r").iterdir()) == [store._root / "packages/r/p.zip"]
+
+
+def test_stream_put_failure_stores_nothing(store):
+    with pytest.raises(RuntimeError):
+        with store.stream_put("packages/r/p.zip", content_type="application/zip") as out:
+            out.write(b"half a package")
+            raise RuntimeError("master missing")
+
+    assert not store.exists("packages/r/p.zip")
+    assert list((store._root / "packages/r").iterdir()) == []
+
+
+class _MultipartClient:
+    def __init__(self):
+        self.parts, self.completed, self.aborted = [], None, False
+
+    def create_multipart_upload(self, **kwargs):
+        assert kwargs["ServerSideEncryption"] == "AES256"
+        return {"UploadId": "u1"}
+
+    def upload_part(self, **kwargs):
+        self.parts.append(kwargs["Body"])
+        return {"ETag": f"e{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs["MultipartUpload"]["Parts"]
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+def test_s3_stream_put_uploads_part_sized_chunks():
+    client = _MultipartClient()
+    data = b"m" * (MULTIPART_PART_SIZE * 2 + 3)
+    with S3Store(client, "bucket", "oceanlab").stream_put("packages/r/p.zip", content_type="application/zip") as out:
+        for start in range(0, len(data), CHUNK_SIZE):
+            out.write(data[start:start + CHUNK_SIZE])
+
+    assert [len(part) for part in client.parts] == [MULTIPART_PART_SIZE, MULTIPART_PART_SIZE, 3]
+    assert client.completed == [{"ETag": "e1", "PartNumber": 1}, {"ETag": "e2", "PartNumber": 2}, {"ETag": "e3", "PartNumber": 3}]
+    assert out.sha256 == hashlib.sha256(data).hexdigest()
+    assert not client.aborted
+
+
+def test_s3_stream_put_aborts_on_error():
+    client = _MultipartClient()
+    with pytest.raises(RuntimeError):
+        with S3Store(client, "bucket", "oceanlab").stream_put("packages/r/p.zip", content_type="application/zip") as out:
+            out.write(b"x")
+            raise RuntimeError("boom")
+
+    assert client.aborted and client.completed is None
+
+
 def test_exists(store):
     assert store.exists("artwork/r/cover.jpg") is False
     store.put("artwork/r/cover.jpg", _bio(b"x"), content_type="image/jpeg")
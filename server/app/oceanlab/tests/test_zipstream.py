@@ -0,0 +1,99 @@
+"""ZipStreamWriter output must open with `zipfile` and stay byte-checked.
+
+Pure — no DB, no storage.
+"""
+
+import hashlib
+import io
+import struct
+import zipfile
+import zlib
+from datetime import datetime, timezone
+
+import pytest
+
+from app.oceanlab.services import zipstream
+from app.oceanlab.services.zipstream import ZipStreamError, ZipStreamWriter
+
+STAMP = datetime(2026, 10, 16, 12, 30, 4, tzinfo=timezone.utc)
+
+
+class _ForwardOnly:
+    """Only `write` — what a multipart upload offers."""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def _build(entries):
+    out = _ForwardOnly()
+    writer = ZipStreamWriter(out, date_time=STAMP)
+    for add in entries:
+        add(writer)
+    writer.close()
+    return out.buffer.getvalue()
+
+
+def test_roundtrip_with_and_without_known_crc():
+    master = b"\x00\x7f" * 300_000
+    body = _build([
+        lambda w: w.add_bytes("Rel/manifest.csv", b"disc,position\n1,1\n"),
+        lambda w: w.add_stream("Rel/audio/1-01 Intro.wav", io.BytesIO(master), size=len(master)),
+        lambda w: w.add_stream("Rel/audio/1-02 Outro.wav", io.BytesIO(master), size=len(master), crc32=zlib.crc32(master)),
+        lambda w: w.add_bytes("Rel/audio/1-03 Café.wav", b"accent"),
+    ])
+
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist()[-1] == "Rel/audio/1-03 Café.wav"
+        assert archive.read("Rel/audio/1-01 Intro.wav") == master
+        assert archive.getinfo("Rel/manifest.csv").date_time == (2026, 10, 16, 12, 30, 4)
+        flags = {info.filename: info.flag_bits for info in archive.infolist()}
+    assert flags["Rel/audio/1-01 Intro.wav"] & 0x08
+    assert not flags["Rel/audio/1-02 Outro.wav"] & 0x08
+
+
+def test_known_crc_goes_in_the_local_header():
+    data = b"master"
+    body = _build([lambda w: w.add_stream("a.wav", io.BytesIO(data), size=len(data), crc32=zlib.crc32(data))])
+
+    _, _, flags, _, _, _, crc32, compressed, size = struct.unpack_from("<4sHHHHHLLL", body)
+    assert (flags, crc32, compressed, size) == (0, zlib.crc32(data), len(data), len(data))
+
+
+def test_stream_feeds_the_digest_and_returns_the_crc():
+    data = b"w" * 5000
+    digest = hashlib.sha256()
+    out = _ForwardOnly()
+    crc32 = ZipStreamWriter(out, date_time=STAMP).add_stream("a.wav", io.BytesIO(data), size=len(data), digest=digest)
+
+    assert crc32 == zlib.crc32(data)
+    assert digest.hexdigest() == hashlib.sha256(data).hexdigest()
+
+
+def test_mismatches_raise():
+    writer = ZipStreamWriter(_ForwardOnly(), date_time=STAMP)
+    with pytest.raises(ZipStreamError, match="expected 10 bytes"):
+        writer.add_stream("short.wav", io.BytesIO(b"abc"), size=10)
+    with pytest.raises(ZipStreamError, match="cached CRC-32"):
+        writer.add_stream("stale.wav", io.BytesIO(b"abc"), size=3, crc32=zlib.crc32(b"abd"))
+
+
+def test_zip64_records_past_the_limit(monkeypatch):
+    # Real 4GiB entries are too slow for CI; lowering the limit takes every
+    # zip64 branch with small data.
+    monkeypatch.setattr(zipstream, "ZIP64_LIMIT", 64)
+    data = b"z" * 200
+    body = _build([
+        lambda w: w.add_bytes("small.txt", b"hi"),
+        lambda w: w.add_stream("big.wav", io.BytesIO(data), size=len(data)),
+        lambda w: w.add_stream("late.wav", io.BytesIO(data), size=len(data), crc32=zlib.crc32(data)),
+    ])
+
+    assert b"PK\x06\x06" in body and b"PK\x06\x07" in body
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.testzip() is None
+        assert archive.read("late.wav") == data
@@ -42,6 +42,7 @@ from ..services.auth import (
     verify_password_async,
 )
 from ..services.access_service import list_business_memberships
+from ..services.activity_inbox_service import rewrite_for_visibility
 from ..services.email import send_tellus_verification_email
 from ..services.geo import geocode_location
 
@@ -435,17 +436,28 @@ async def update_profile(
     for the 409-on-taken + change-cooldown semantics a COALESCE PATCH can't
     express)."""
     async with get_connection() as conn:
-        await conn.execute(
-            """UPDATE tellus_accounts
-               SET display_name = COALESCE($2, display_name),
-                   leaderboard_opt_in = COALESCE($3, leaderboard_opt_in),
-                   profile_visibility = COALESCE($4, profile_visibility),
-                   discoverable = COALESCE($5, discoverable),
-                   updated_at = NOW()
-               WHERE id = $1""",
-            account.id, body.display_name, body.leaderboard_opt_in,
-            body.profile_visibility, body.discoverable,
-        )
+        async with conn.transaction():
+            was_visibility = await conn.fetchval(
+                "SELECT profile_visibility FROM tellus_accounts WHERE id = $1 FOR UPDATE", account.id,
+            )
+            await conn.execute(
+                """UPDATE tellus_accounts
+                   SET display_name = COALESCE($2, display_name),
+                       leaderboard_opt_in = COALESCE($3, leaderboard_opt_in),
+                       profile_visibility = COALESCE($4, profile_visibility),
+                       discoverable = COALESCE($5, discoverable),
+                       updated_at = NOW()
+                   WHERE id = $1""",
+                account.id, body.display_name, body.leaderboard_opt_in,
+                body.profile_visibility, body.discoverable,
+            )
+            if body.profile_visibility is not None:
+                # Friends' feeds only carry follows from non-private profiles.
+                await rewrite_for_visibility(
+                    conn, account.id,
+                    was_private=was_visibility == "private",
+                    is_private=body.profile_visibility == "private",
+                )
         return await _load_account(conn, account.id)
 
 
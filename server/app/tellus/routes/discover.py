@@ -15,6 +15,7 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
 
+from ...core.services.geocell import cover_ranges, covering_scan
 from ...core.services.redis_cache import cache_get, cache_set, check_rate_limit, client_ip, get_redis_cache
 from ...database import get_connection
 from ..dependencies import optional_consumer_account_id, require_consumer
@@ -29,11 +30,12 @@ from ..services import google_places
 from ..services.discover_service import (
     MAX_RADIUS_KM,
     DISTANCE_SQL,
-    bbox_predicate,
     dedupe_google,
     discover_cache_key,
+    nearby_rank_cache,
     normalize_brand_category,
     normalize_google_type,
+    rank_point,
 )
 from ._shared import INVITE_COUNT_CAP, INVITE_COUNT_SQL, escape_like
 
@@ -49,6 +51,64 @@ _MAX_DEPTH = 200
 _MAX_LIMIT = 24
 _GOOGLE_CACHE_TTL_S = 300
 
+# Nearby ranking: every brand within the radius, by its nearest store, as
+# (brand_id, city, state, distance_km) — cached per bucket in
+# nearby_rank_cache. Stores are reached through the geocell cover ranges
+# ($4/$5) rather than a lat/lng box; see core/services/geocell.py.
+# $1/$2 = bucketed point, $3 = radius, $6 = escaped name filter or NULL.
+_NEARBY_RANK_SQL = f"""
+    WITH nearest AS (
+        SELECT DISTINCT ON (st.brand_id)
+               st.brand_id, st.city, st.state,
+               ({DISTANCE_SQL.replace("$LAT", "$1").replace("$LNG", "$2")}) AS distance_km
+          FROM {covering_scan("tellus_stores", "st", "$4", "$5")}
+         ORDER BY st.brand_id, distance_km ASC
+    )
+    SELECT n.brand_id, n.city, n.state, n.distance_km
+      FROM nearest n
+      JOIN tellus_brands b ON b.id = n.brand_id
+      LEFT JOIN LATERAL (
+          SELECT COUNT(*) AS review_count
+            FROM tellus_reports r
+           WHERE r.brand_id = b.id AND r.review_state = 'held'
+             AND r.publish_at <= NOW() AND r.publish_at >= NOW() - interval '12 months'
+             AND r.moderation_status = 'visible'
+      ) rev ON TRUE
+     WHERE n.distance_km <= $3
+       AND ($6::text IS NULL OR b.name ILIKE '%' || $6 || '%')
+     ORDER BY n.distance_km ASC, rev.review_count DESC, b.name
+     LIMIT {_MAX_DEPTH}
+"""
+
+# One page of ranked brands, hydrated. $1 = brand ids, $2 = viewer (or NULL).
+_NEARBY_PAGE_SQL = f"""
+    SELECT b.id, b.slug, b.name, b.logo_url, b.google_place_id, b.messaging_enabled,
+           b.owner_account_id, b.tagline, b.cover_url, b.category,
+           rev.rating, rev.review_count, rev.rating_count,
+           EXISTS (SELECT 1 FROM tellus_boards bd
+                    WHERE bd.brand_id = b.id AND bd.is_active) AS has_board,
+           EXISTS (SELECT 1 FROM tellus_brand_follows f
+                    WHERE f.brand_id = b.id AND f.consumer_account_id = $2) AS followed,
+           CASE WHEN b.owner_account_id IS NULL THEN lk.token END AS intake_token,
+           (SELECT COUNT(*) FROM (
+                SELECT 1 FROM tellus_brand_fan_invites bi WHERE bi.brand_id = b.id LIMIT {INVITE_COUNT_CAP}
+           ) ic) AS invite_count
+      FROM tellus_brands b
+      LEFT JOIN LATERAL (
+          SELECT ROUND(AVG(r.rating)::numeric, 1) AS rating,
+                 COUNT(*) AS review_count,
+                 COUNT(r.rating) AS rating_count
+            FROM tellus_reports r
+           WHERE r.brand_id = b.id AND r.review_state = 'held'
+             AND r.publish_at <= NOW() AND r.publish_at >= NOW() - interval '12 months'
+             AND r.moderation_status = 'visible'
+      ) rev ON TRUE
+      LEFT JOIN LATERAL (SELECT token FROM tellus_links
+                          WHERE brand_id = b.id AND is_active
+                          ORDER BY created_at LIMIT 1) lk ON TRUE
+     WHERE b.id = ANY($1::uuid[])
+"""
+
 
 def _entry_from_tellus_row(row) -> TellusDiscoverEntry:
     return TellusDiscoverEntry(
@@ -137,75 +197,40 @@ async def discover(
                 city_filter = acct["city"]
                 state_filter = acct["state"]
 
-        args: list = []
-        where_extra = ""
-        if query:
-            args.append(escape_like(query))
-            where_extra = f"AND b.name ILIKE '%' || ${len(args)} || '%'"
-
         if has_geo:
-            args.append(lat)
-            lat_p = f"${len(args)}"
-            args.append(lng)
-            lng_p = f"${len(args)}"
-            args.append(radius_km)
-            radius_p = f"${len(args)}"
-            args.append(viewer_id)
-            viewer_p = f"${len(args)}"
-
-            distance_expr = DISTANCE_SQL.replace("$LAT", lat_p).replace("$LNG", lng_p)
-            bbox = bbox_predicate(lat_p, lng_p, radius_p)
-
-            args.append(limit)
-            limit_p = f"${len(args)}"
-            args.append(offset)
-            offset_p = f"${len(args)}"
-
-            sql = f"""
-                WITH nearest AS (
-                    SELECT DISTINCT ON (st.brand_id)
-                           st.brand_id, st.city, st.state, ({distance_expr}) AS distance_km
-                      FROM tellus_stores st
-                     WHERE {bbox}
-                     ORDER BY st.brand_id, distance_km ASC
+            # Ranked from the ~110m bucket point, not the exact one, so the
+            # ranking is shareable and distances are within ~0.1km of the
+            # caller's — the same precision the card displays.
+            cache_key = discover_cache_key(lat, lng, radius_km, query)
+            ranked = nearby_rank_cache.get(cache_key)
+            if ranked is None:
+                rank_lat, rank_lng = rank_point(lat, lng)
+                lows, highs = cover_ranges(rank_lat, rank_lng, radius_km)
+                rank_rows = await conn.fetch(
+                    _NEARBY_RANK_SQL, rank_lat, rank_lng, radius_km, lows, highs,
+                    escape_like(query) if query else None,
                 )
-                SELECT b.slug, b.name, b.logo_url, b.google_place_id, b.messaging_enabled,
-                       b.owner_account_id, b.tagline, b.cover_url, b.category,
-                       n.city, n.state, n.distance_km,
-                       rev.rating, rev.review_count, rev.rating_count,
-                       EXISTS (SELECT 1 FROM tellus_boards bd
-                                WHERE bd.brand_id = b.id AND bd.is_active) AS has_board,
-                       EXISTS (SELECT 1 FROM tellus_brand_follows f
-                                WHERE f.brand_id = b.id AND f.consumer_account_id = {viewer_p}) AS followed,
-                       CASE WHEN b.owner_account_id IS NULL THEN lk.token END AS intake_token,
-                       (SELECT COUNT(*) FROM (
-                            SELECT 1 FROM tellus_brand_fan_invites bi WHERE bi.brand_id = b.id LIMIT {INVITE_COUNT_CAP}
-                       ) ic) AS invite_count,
-                       (SELECT COUNT(*) FROM (
-                            SELECT 1 FROM tellus_brands b2
-                              JOIN nearest n2 ON n2.brand_id = b2.id
-                             WHERE n2.distance_km <= {radius_p} {where_extra.replace('b.name', 'b2.name')}
-                             LIMIT {_MAX_DEPTH}
-                       ) capped) AS total_count
-                  FROM tellus_brands b
-                  JOIN nearest n ON n.brand_id = b.id
-                  LEFT JOIN LATERAL (
-                      SELECT ROUND(AVG(r.rating)::numeric, 1) AS rating,
-                             COUNT(*) AS review_count,
-                             COUNT(r.rating) AS rating_count
-                        FROM tellus_reports r
-                       WHERE r.brand_id = b.id AND r.review_state = 'held'
-                         AND r.publish_at <= NOW() AND r.publish_at >= NOW() - interval '12 months'
-                         AND r.moderation_status = 'visible'
-                  ) rev ON TRUE
-                  LEFT JOIN LATERAL (SELECT token FROM tellus_links
-                                      WHERE brand_id = b.id AND is_active
-                                      ORDER BY created_at LIMIT 1) lk ON TRUE
-                 WHERE n.distance_km <= {radius_p} {where_extra}
-                 ORDER BY n.distance_km ASC, rev.review_count DESC, b.name
-                 LIMIT {limit_p} OFFSET {offset_p}
-            """
+                ranked = tuple((r["brand_id"], r["city"], r["state"], r["distance_km"]) for r in rank_rows)
+                nearby_rank_cache.put(cache_key, ranked)
+            page = ranked[offset:offset + limit]
+            found = {}
+            if page:
+                page_rows = await conn.fetch(_NEARBY_PAGE_SQL, [brand_id for brand_id, *_ in page], viewer_id)
+                found = {r["id"]: r for r in page_rows}
+            # A brand deleted since the ranking was cached just drops out.
+            rows = [
+                {**found[brand_id], "city": city, "state": state, "distance_km": distance_km}
+                for brand_id, city, state, distance_km in page
+                if brand_id in found
+            ]
+            total = len(ranked)
         else:
+            args: list = []
+            where_extra = ""
+            if query:
+                args.append(escape_like(query))
+                where_extra = f"AND b.name ILIKE '%' || ${len(args)} || '%'"
+
             args.append(escape_like(city_filter) if city_filter else None)
             city_p = f"${len(args)}"
             args.append(state_filter)
@@ -272,10 +297,10 @@ async def discover(
                  LIMIT {limit_p} OFFSET {offset_p}
             """
 
-        rows = await conn.fetch(sql, *args)
+            rows = await conn.fetch(sql, *args)
+            total = min(rows[0]["total_count"], _MAX_DEPTH) if rows else 0
 
     tellus_entries = [_entry_from_tellus_row(r) for r in rows]
-    total = min(rows[0]["total_count"], _MAX_DEPTH) if rows else 0
 
     google_entries: list[TellusDiscoverEntry] = []
     # Google fill: page-1-only (Google paginates independently — interleaving
@@ -283,7 +308,6 @@ async def discover(
     # Tell-Us didn't already fill the page.
     if has_geo and offset == 0 and len(tellus_entries) < limit:
         redis = get_redis_cache()
-        cache_key = discover_cache_key(lat, lng, radius_km, query)
         cached = await cache_get(redis, cache_key) if redis else None
         if cached is not None:
             google_rows = cached
@@ -300,7 +324,7 @@ async def discover(
         google_rows = google_rows or []
         # Dedupe against ALL Tell-Us brands with this place_id, not just this
         # page's rows — a brand whose stores lack lat/lng (never geocoded, or
-        # a failed re-geocode) is invisible to the bbox filter above but still
+        # a failed re-geocode) has no geocell, so it is invisible to the ranking above but still
         # has a google_place_id, so without this it renders twice: once as
         # its own (storeless) Tell-Us card if it ever surfaces, and once as a
         # bare "Add to Tell-Us" Google card.
@@ -22,6 +22,7 @@ from ..models.tellus import (
     TellusRewardDecision,
 )
 from ..services.email import send_tellus_points_email
+from ..services.activity_inbox_service import reschedule_review
 from ..services.feedback_service import award_for_report
 from ..services.points_service import notify_account
 from ._shared import get_owned_report, serialize_report, serialize_reports
@@ -322,6 +323,7 @@ async def publish_review_now(report_id: UUID, account: TellusAccount = Depends(r
                 "WHERE id = $1 AND brand_id = $2 RETURNING *",
                 report_id, account.brand_id, account.id,
             )
+            await reschedule_review(conn, report_id, updated["publish_at"])
             if row["reporter_account_id"] is not None:
                 await notify_account(
                     conn, row["reporter_account_id"], "review_published", "Your review is live",
@@ -58,6 +58,7 @@ from ..services.friends_service import (
 )
 from ..services.points_service import notify_account
 from ..services.likes_service import hydrate_likes
+from ..services.activity_inbox_service import read_feed
 
 router = APIRouter()
 HANDLE_COOLDOWN = FRIEND_DECLINE_COOLDOWN
@@ -748,50 +749,7 @@ async def friend_activity_feed(
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor")
     cursor_time, cursor_id = decoded if decoded else (None, None)
     async with get_connection() as conn:
-        rows = await conn.fetch(
-            """WITH friends AS (
-                    SELECT f.friend_account_id AS account_id
-                      FROM tellus_friendships f
-                      JOIN tellus_accounts a ON a.id = f.friend_account_id
-                     WHERE f.account_id = $1 AND a.status = 'active'
-                       AND a.account_type = 'consumer'
-                       AND NOT EXISTS (
-                           SELECT 1 FROM tellus_account_blocks b
-                            WHERE (b.blocker_account_id = $1 AND b.blocked_account_id = a.id)
-                               OR (b.blocker_account_id = a.id AND b.blocked_account_id = $1))
-                ), reviews AS (
-                    SELECT 'review_published'::text AS kind, r.id AS item_id,
-                           r.reporter_account_id AS actor_id, r.publish_at AS happened_at,
-                           r.brand_id, b.name AS brand_name, b.slug AS brand_slug,
-                           r.rating, r.title, r.description AS body
-                      FROM tellus_reports r
-                      JOIN friends fr ON fr.account_id = r.reporter_account_id
-                      JOIN tellus_brands b ON b.id = r.brand_id
-                     WHERE r.review_state = 'held' AND r.publish_at <= NOW()
-                       AND r.publish_at >= NOW() - INTERVAL '90 days'
-                       AND r.moderation_status = 'visible'
-                       AND ($2::timestamptz IS NULL OR (r.publish_at, r.id) < ($2, $3))
-                     ORDER BY r.publish_at DESC, r.id DESC LIMIT $4
-                ), follows AS (
-                    SELECT 'place_followed'::text AS kind, bf.brand_id AS item_id,
-                           bf.consumer_account_id AS actor_id, bf.created_at AS happened_at,
-                           bf.brand_id, b.name AS brand_name, b.slug AS brand_slug,
-                           NULL::smallint AS rating, NULL::text AS title, NULL::text AS body
-                      FROM tellus_brand_follows bf
-                      JOIN friends fr ON fr.account_id = bf.consumer_account_id
-                      JOIN tellus_accounts fa ON fa.id = bf.consumer_account_id
-                      JOIN tellus_brands b ON b.id = bf.brand_id
-                     WHERE fa.profile_visibility <> 'private'
-                       AND bf.created_at >= NOW() - INTERVAL '90 days'
-                       AND ($2::timestamptz IS NULL OR (bf.created_at, bf.brand_id) < ($2, $3))
-                     ORDER BY bf.created_at DESC, bf.brand_id DESC LIMIT $4
-                )
-                SELECT * FROM (
-                    SELECT * FROM reviews UNION ALL SELECT * FROM follows
-                ) merged
-                ORDER BY happened_at DESC, item_id DESC LIMIT $4""",
-            account.id, cursor_time, cursor_id, limit + 1,
-        )
+        rows = await read_feed(conn, account.id, cursor_time, cursor_id, limit + 1)
         has_more = len(rows) > limit
         rows = rows[:limit]
         actor_ids = list({row["actor_id"] for row in rows})
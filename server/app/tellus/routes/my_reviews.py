@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from ...database import get_connection
 from ..dependencies import require_consumer
 from ..models.tellus import TellusAccount, TellusMyReview, TellusMyReviewUpdate, TellusReportMedia
+from ..services.activity_inbox_service import retract_review
 from ._shared import _answer_rows_to_models, _media_url, effective_review_state
 
 router = APIRouter()
@@ -203,10 +204,12 @@ async def withdraw_my_review(report_id: UUID, account: TellusAccount = Depends(r
     v1; gifting/grants are untouched (a gift already given stays given)."""
     async with get_connection() as conn:
         await _get_owned_review(conn, report_id, account.id)
-        await conn.execute(
-            "UPDATE tellus_reports SET review_state = 'withdrawn', updated_at = NOW() WHERE id = $1",
-            report_id,
-        )
+        async with conn.transaction():
+            await conn.execute(
+                "UPDATE tellus_reports SET review_state = 'withdrawn', updated_at = NOW() WHERE id = $1",
+                report_id,
+            )
+            await retract_review(conn, report_id)
         full = await conn.fetchrow(
             """SELECT r.*, b.name AS brand_name, b.slug AS brand_slug, s.name AS store_name
                FROM tellus_reports r
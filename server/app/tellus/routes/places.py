@@ -28,7 +28,7 @@ from ..models.tellus import (
 )
 from ..models.tellus import TellusAccount
 from ..services import google_places
-from ..services import loyalty_service
+from ..services import activity_inbox_service, loyalty_service
 from ._shared import escape_like, slugify
 
 router = APIRouter()
@@ -180,13 +180,18 @@ async def follow_place(slug: str, account: TellusAccount = Depends(require_verif
         )
         if brand is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business not found")
-        inserted = await conn.fetchrow(
-            """INSERT INTO tellus_brand_follows (consumer_account_id, brand_id)
-               SELECT $1, id FROM tellus_brands WHERE slug = $2
-               ON CONFLICT DO NOTHING
-               RETURNING brand_id""",
-            account.id, slug,
-        )
+        async with conn.transaction():
+            inserted = await conn.fetchrow(
+                """INSERT INTO tellus_brand_follows (consumer_account_id, brand_id)
+                   SELECT $1, id FROM tellus_brands WHERE slug = $2
+                   ON CONFLICT DO NOTHING
+                   RETURNING brand_id, created_at""",
+                account.id, slug,
+            )
+            if inserted is not None:
+                await activity_inbox_service.fan_out_follow(
+                    conn, account.id, inserted["brand_id"], inserted["created_at"],
+                )
         if inserted is not None:
             await loyalty_service.award_event(
                 conn,
@@ -203,12 +208,15 @@ async def follow_place(slug: str, account: TellusAccount = Depends(require_verif
 @router.delete("/places/{slug}/follow", status_code=status.HTTP_204_NO_CONTENT)
 async def unfollow_place(slug: str, account: TellusAccount = Depends(require_verified_consumer)):
     async with get_connection() as conn:
-        await conn.execute(
-            """DELETE FROM tellus_brand_follows f
-               USING tellus_brands b
-               WHERE f.brand_id = b.id AND f.consumer_account_id = $1 AND b.slug = $2""",
-            account.id, slug,
-        )
+        async with conn.transaction():
+            rows = await conn.fetch(
+                """DELETE FROM tellus_brand_follows f
+                   USING tellus_brands b
+                   WHERE f.brand_id = b.id AND f.consumer_account_id = $1 AND b.slug = $2
+                   RETURNING f.brand_id""",
+                account.id, slug,
+            )
+            await activity_inbox_service.retract_follow(conn, account.id, [row["brand_id"] for row in rows])
 
 
 @router.get("/places/autocomplete", response_model=list[TellusPlaceAutocompleteResult])
@@ -0,0 +1,259 @@
+"""Materialized friend-activity inbox behind GET /me/feed.
+
+The feed used to be rebuilt per request by joining all of the viewer's
+friendships against `tellus_reports` and `tellus_brand_follows` over the
+window. Cost grew with friend count × activity. Activity is now fanned out
+when it is written, into `tellus_activity_inbox`: one row per
+(viewer, item, actor). A feed page is a single indexed range read of
+(owner_account_id, happened_at DESC, item_id DESC).
+
+Rows are written when:
+
+* a public review is submitted — `happened_at` is its `publish_at`, so a held
+  review sits in the inbox unseen until the hold ends; publish-now moves it;
+* a place is followed, unless the follower's profile is private.
+
+Rows are rewritten so a page never has to skip past stale entries:
+
+* unfriending and blocking (block_account goes through remove_friendship)
+  delete both directions; a new friendship backfills both sides;
+* going private drops the account's follow rows, and leaving private
+  backfills them;
+* withdrawing a review and unfollowing drop the item.
+
+Moderation and account suspension are reversible, so they are filtered at read
+time on the rows the page already joins, not rewritten.
+
+Accounts with more than `FANOUT_MAX_FRIENDS` friends are recorded in
+`tellus_activity_pull_actors` and are not fanned out. Each viewer's page reads
+their recent activity directly and merges it in (the hybrid fan-out-on-read
+fallback), so one very popular account can't turn a single review into a
+huge write.
+"""
+import os
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+FEED_WINDOW = "90 days"
+FANOUT_MAX_FRIENDS = int(os.getenv("TELLUS_FEED_FANOUT_MAX_FRIENDS", "1000"))
+
+_INSERT = """INSERT INTO tellus_activity_inbox
+                 (owner_account_id, kind, item_id, actor_account_id, brand_id, happened_at)"""
+
+# The actor's own recent activity, fanned into each owner in `owners`
+# (a subquery yielding account_id). $1 = actor.
+_BACKFILL_REVIEWS = _INSERT + """
+    SELECT o.account_id, 'review_published', r.id, r.reporter_account_id, r.brand_id, r.publish_at
+      FROM ({owners}) o
+      JOIN tellus_reports r ON r.reporter_account_id = $1
+     WHERE r.review_state = 'held'
+       AND r.publish_at >= NOW() - INTERVAL '""" + FEED_WINDOW + """'
+    ON CONFLICT DO NOTHING"""
+
+_BACKFILL_FOLLOWS = _INSERT + """
+    SELECT o.account_id, 'place_followed', bf.brand_id, bf.consumer_account_id, bf.brand_id, bf.created_at
+      FROM ({owners}) o
+      JOIN tellus_brand_follows bf ON bf.consumer_account_id = $1
+      JOIN tellus_accounts a ON a.id = bf.consumer_account_id
+     WHERE a.profile_visibility <> 'private'
+       AND bf.created_at >= NOW() - INTERVAL '""" + FEED_WINDOW + """'
+    ON CONFLICT DO NOTHING"""
+
+_ALL_FRIENDS = "SELECT f.account_id FROM tellus_friendships f WHERE f.friend_account_id = $1"
+_ONE_OWNER = "SELECT $2::uuid AS account_id"
+
+_INBOX_PAGE = """
+    SELECT i.kind, i.item_id, i.actor_account_id AS actor_id, i.happened_at,
+           i.brand_id, b.name AS brand_name, b.slug AS brand_slug,
+           r.rating, r.title, r.description AS body
+      FROM tellus_activity_inbox i
+      JOIN tellus_accounts a ON a.id = i.actor_account_id
+      JOIN tellus_brands b ON b.id = i.brand_id
+      LEFT JOIN tellus_reports r ON i.kind = 'review_published' AND r.id = i.item_id
+     WHERE i.owner_account_id = $1
+       AND i.happened_at <= NOW() AND i.happened_at >= NOW() - INTERVAL '""" + FEED_WINDOW + """'
+       AND ($2::timestamptz IS NULL OR (i.happened_at, i.item_id) < ($2, $3))
+       AND a.status = 'active' AND a.account_type = 'consumer'
+       AND CASE WHEN i.kind = 'review_published'
+                THEN r.review_state = 'held' AND r.publish_at <= NOW() AND r.moderation_status = 'visible'
+                ELSE a.profile_visibility <> 'private' END
+     ORDER BY i.happened_at DESC, i.item_id DESC LIMIT $4"""
+
+# Fan-out-on-read for the viewer's high-degree friends ($5): the per-request
+# query the feed used to run for every friend, now only for these.
+_PULL_PAGE = """
+    WITH actors AS (
+        SELECT a.id AS account_id, a.profile_visibility
+          FROM tellus_accounts a
+         WHERE a.id = ANY($5::uuid[]) AND a.status = 'active' AND a.account_type = 'consumer'
+           AND NOT EXISTS (
+               SELECT 1 FROM tellus_account_blocks b
+                WHERE (b.blocker_account_id = $1 AND b.blocked_account_id = a.id)
+                   OR (b.blocker_account_id = a.id AND b.blocked_account_id = $1))
+    ), reviews AS (
+        SELECT 'review_published'::text AS kind, r.id AS item_id,
+               r.reporter_account_id AS actor_id, r.publish_at AS happened_at,
+               r.brand_id, b.name AS brand_name, b.slug AS brand_slug,
+               r.rating, r.title, r.description AS body
+          FROM tellus_reports r
+          JOIN actors ac ON ac.account_id = r.reporter_account_id
+          JOIN tellus_brands b ON b.id = r.brand_id
+         WHERE r.review_state = 'held' AND r.publish_at <= NOW()
+           AND r.publish_at >= NOW() - INTERVAL '""" + FEED_WINDOW + """'
+           AND r.moderation_status = 'visible'
+           AND ($2::timestamptz IS NULL OR (r.publish_at, r.id) < ($2, $3))
+         ORDER BY r.publish_at DESC, r.id DESC LIMIT $4
+    ), follows AS (
+        SELECT 'place_followed'::text AS kind, bf.brand_id AS item_id,
+               bf.consumer_account_id AS actor_id, bf.created_at AS happened_at,
+               bf.brand_id, b.name AS brand_name, b.slug AS brand_slug,
+               NULL::smallint AS rating, NULL::text AS title, NULL::text AS body
+          FROM tellus_brand_follows bf
+          JOIN actors ac ON ac.account_id = bf.consumer_account_id
+          JOIN tellus_brands b ON b.id = bf.brand_id
+         WHERE ac.profile_visibility <> 'private'
+           AND bf.created_at >= NOW() - INTERVAL '""" + FEED_WINDOW + """'
+           AND ($2::timestamptz IS NULL OR (bf.created_at, bf.brand_id) < ($2, $3))
+         ORDER BY bf.created_at DESC, bf.brand_id DESC LIMIT $4
+    )
+    SELECT * FROM reviews UNION ALL SELECT * FROM follows"""
+
+
+async def fans_out_on_read(conn, actor_id: UUID) -> bool:
+    """True for accounts too well-connected to fan out on write. Sticky: an
+    account that crosses the threshold stays on the read path."""
+    if await conn.fetchval("SELECT 1 FROM tellus_activity_pull_actors WHERE account_id = $1", actor_id):
+        return True
+    degree = await conn.fetchval(
+        "SELECT COUNT(*) FROM (SELECT 1 FROM tellus_friendships WHERE account_id = $1 LIMIT $2) d",
+        actor_id, FANOUT_MAX_FRIENDS + 1,
+    )
+    if degree <= FANOUT_MAX_FRIENDS:
+        return False
+    await conn.execute(
+        "INSERT INTO tellus_activity_pull_actors (account_id) VALUES ($1) ON CONFLICT DO NOTHING",
+        actor_id,
+    )
+    return True
+
+
+async def fan_out_review(conn, report: dict) -> None:
+    """Deliver a just-submitted public review to the reporter's friends."""
+    actor_id = report.get("reporter_account_id")
+    if actor_id is None or report.get("review_state") != "held" or await fans_out_on_read(conn, actor_id):
+        return
+    await conn.execute(
+        _INSERT + """
+        SELECT f.account_id, 'review_published', $2, $1, $3, $4
+          FROM tellus_friendships f WHERE f.friend_account_id = $1
+        ON CONFLICT DO NOTHING""",
+        actor_id, report["id"], report["brand_id"], report["publish_at"],
+    )
+
+
+async def fan_out_follow(conn, actor_id: UUID, brand_id: UUID, followed_at: datetime) -> None:
+    """Deliver a new follow to the follower's friends (not for private profiles)."""
+    if await fans_out_on_read(conn, actor_id):
+        return
+    await conn.execute(
+        _INSERT + """
+        SELECT f.account_id, 'place_followed', $2, $1, $2, $3
+          FROM tellus_friendships f
+          JOIN tellus_accounts a ON a.id = $1
+         WHERE f.friend_account_id = $1 AND a.profile_visibility <> 'private'
+        ON CONFLICT DO NOTHING""",
+        actor_id, brand_id, followed_at,
+    )
+
+
+async def retract_follow(conn, actor_id: UUID, brand_ids: list[UUID]) -> None:
+    if brand_ids:
+        await conn.execute(
+            "DELETE FROM tellus_activity_inbox WHERE actor_account_id = $1 "
+            "AND kind = 'place_followed' AND item_id = ANY($2::uuid[])",
+            actor_id, brand_ids,
+        )
+
+
+async def retract_review(conn, report_id: UUID) -> None:
+    await conn.execute(
+        "DELETE FROM tellus_activity_inbox WHERE kind = 'review_published' AND item_id = $1",
+        report_id,
+    )
+
+
+async def reschedule_review(conn, report_id: UUID, publish_at: datetime) -> None:
+    """Keep inbox order in step with publish-now moving `publish_at` earlier."""
+    await conn.execute(
+        "UPDATE tellus_activity_inbox SET happened_at = $2 "
+        "WHERE kind = 'review_published' AND item_id = $1",
+        report_id, publish_at,
+    )
+
+
+async def link_friends(conn, first: UUID, second: UUID) -> None:
+    """Backfill each new friend's recent activity into the other's inbox."""
+    for owner, actor in ((first, second), (second, first)):
+        if await fans_out_on_read(conn, actor):
+            continue
+        for sql in (_BACKFILL_REVIEWS, _BACKFILL_FOLLOWS):
+            await conn.execute(sql.format(owners=_ONE_OWNER), actor, owner)
+
+
+async def unlink_friends(conn, first: UUID, second: UUID) -> None:
+    await conn.execute(
+        """DELETE FROM tellus_activity_inbox
+            WHERE (owner_account_id = $1 AND actor_account_id = $2)
+               OR (owner_account_id = $2 AND actor_account_id = $1)""",
+        first, second,
+    )
+
+
+async def rewrite_for_visibility(conn, account_id: UUID, was_private: bool, is_private: bool) -> None:
+    """Follow activity is hidden from friends while a profile is private."""
+    if is_private and not was_private:
+        await conn.execute(
+            "DELETE FROM tellus_activity_inbox WHERE actor_account_id = $1 AND kind = 'place_followed'",
+            account_id,
+        )
+    elif was_private and not is_private and not await fans_out_on_read(conn, account_id):
+        await conn.execute(_BACKFILL_FOLLOWS.format(owners=_ALL_FRIENDS), account_id)
+
+
+def _merge(pages: list[list], limit: int) -> list:
+    seen, merged = set(), []
+    for row in sorted(
+        (row for page in pages for row in page),
+        key=lambda row: (row["happened_at"], row["item_id"]),
+        reverse=True,
+    ):
+        key = (row["kind"], row["item_id"], row["actor_id"])
+        if key not in seen:
+            seen.add(key)
+            merged.append(row)
+    return merged[:limit]
+
+
+async def read_feed(
+    conn, viewer_id: UUID, cursor_time: Optional[datetime], cursor_id: Optional[UUID], limit: int,
+) -> list:
+    """Up to `limit` feed rows after the keyset cursor, newest first."""
+    rows = await conn.fetch(_INBOX_PAGE, viewer_id, cursor_time, cursor_id, limit)
+    pull_ids = [row["account_id"] for row in await conn.fetch(
+        """SELECT p.account_id FROM tellus_activity_pull_actors p
+             JOIN tellus_friendships f ON f.friend_account_id = p.account_id AND f.account_id = $1""",
+        viewer_id,
+    )]
+    if not pull_ids:
+        return list(rows)
+    pulled = await conn.fetch(_PULL_PAGE, viewer_id, cursor_time, cursor_id, limit, pull_ids)
+    return _merge([rows, pulled], limit)
+
+
+async def prune_expired(conn) -> int:
+    """Drop rows that have aged out of the feed window."""
+    status = await conn.execute(
+        "DELETE FROM tellus_activity_inbox WHERE happened_at < NOW() - INTERVAL '" + FEED_WINDOW + "'"
+    )
+    return int(status.split()[-1]) if status else 0
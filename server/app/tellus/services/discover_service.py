@@ -4,6 +4,8 @@ Everything unit-testable lives here since the app has no mock/protocol seam
 for services (all hard singletons) — see TELLUS_DISCOVER_PLAN.md at the repo
 root for the full feature design and the route that calls these.
 """
+import time
+from collections import OrderedDict
 from typing import Any, Collection, Optional
 
 # Matches Google searchNearby's own hard cap, so a wider ask can't silently
@@ -51,11 +53,18 @@ DISTANCE_SQL = """
 """
 
 
+def rank_point(lat: float, lng: float) -> tuple[float, float]:
+    """The bucketed point discover_cache_key rounds to. Nearby ranking is
+    computed from it too, so one cached ranking serves the whole bucket and
+    page 2 always continues page 1's order."""
+    return round(lat, _COORD_PRECISION), round(lng, _COORD_PRECISION)
+
+
 def discover_cache_key(lat: float, lng: float, radius_km: float, q: Optional[str]) -> str:
-    """Redis key for a Google fill. Coords rounded to _COORD_PRECISION so
-    nearby opens share one cache entry — see module docstring."""
-    lat_b = round(lat, _COORD_PRECISION)
-    lng_b = round(lng, _COORD_PRECISION)
+    """Redis key for a Google fill, and the in-process nearby-ranking key.
+    Coords rounded to _COORD_PRECISION so nearby opens share one cache entry —
+    see module docstring."""
+    lat_b, lng_b = rank_point(lat, lng)
     q_part = (q or "").strip().lower()
     return f"tellus:discover:{lat_b}:{lng_b}:{radius_km}:{q_part}"
 
@@ -98,16 +107,43 @@ def dedupe_google(google_rows: list[dict], known_place_ids: Collection[str]) ->
     return [row for row in google_rows if row.get("place_id") and row["place_id"] not in known]
 
 
-def bbox_predicate(lat_param: str, lng_param: str, radius_param: str) -> str:
-    """SQL fragment bounding st.lat/st.lng to a square around the point, as a
-    cheap index-usable prefilter before the exact haversine circle is applied
-    in the outer WHERE. greatest(cos(radians(...)), 0.01) guards the pole
-    singularity (cos(90) == 0 would blow up the longitude delta). Same shape
-    as cappe/routes/public/directory.py's bbox_predicate."""
-    return f"""
-        st.lat IS NOT NULL AND st.lng IS NOT NULL
-        AND st.lat BETWEEN {lat_param} - ({radius_param} / 111.045)
-                        AND {lat_param} + ({radius_param} / 111.045)
-        AND st.lng BETWEEN {lng_param} - ({radius_param} / (111.045 * greatest(cos(radians({lat_param})), 0.01)))
-                        AND {lng_param} + ({radius_param} / (111.045 * greatest(cos(radians({lat_param})), 0.01)))
-    """
+# Per-worker cache of distance-ordered Tell-Us results. A popular bucket
+# (a downtown, a campus) is opened far more often than its stores change, so
+# the geocell scan + haversine + sort runs once per TTL per worker. Only brand
+# ids and distances are cached; everything viewer-scoped or fast-moving
+# (followed, rating, invite count) is read fresh for the page shown. A new or
+# moved store shows up within the TTL.
+NEARBY_RANK_TTL_S = 60.0
+NEARBY_RANK_MAX_ENTRIES = 1024
+
+
+class NearbyRankCache:
+    """Bounded TTL + LRU map of discover_cache_key -> ranked rows."""
+
+    def __init__(self, ttl_s: float = NEARBY_RANK_TTL_S, max_entries: int = NEARBY_RANK_MAX_ENTRIES):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, tuple]]" = OrderedDict()
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - entry[0] > self.ttl_s:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, ranked: tuple, now: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() if now is None else now, ranked)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+nearby_rank_cache = NearbyRankCache()
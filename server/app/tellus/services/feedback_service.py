@@ -15,6 +15,7 @@ import secrets
 from typing import Optional
 from uuid import UUID
 
+from .activity_inbox_service import fan_out_review
 from .points_service import award_points, notify_account
 from .loyalty_service import award_event as award_loyalty_event
 
@@ -184,6 +185,10 @@ async def create_report(
                 report_id, prompt_id, prompt_text, answer, position,
             )
 
+        # Friends see it in their feed once publish_at passes.
+        if identified and public_review:
+            await fan_out_review(conn, dict(report))
+
         points_awarded = 0
         if identified and not manual:
             points_awarded = await award_for_report(conn, dict(report))
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
+from .activity_inbox_service import link_friends, unlink_friends
 from .points_service import award_points
 
 
@@ -303,6 +304,7 @@ async def create_friendship(conn, first: UUID, second: UUID, source: str) -> Non
                VALUES ($1, $2, $3), ($2, $1, $3) ON CONFLICT DO NOTHING""",
             first, second, source,
         )
+        await link_friends(conn, first, second)
         reference_id = pair_key(first, second)
         for account_id in (first, second):
             await award_points(
@@ -321,6 +323,7 @@ async def remove_friendship(conn, first: UUID, second: UUID) -> None:
                    OR (account_id = $2 AND friend_account_id = $1)""",
             first, second,
         )
+        await unlink_friends(conn, first, second)
 
 
 async def block_account(conn, blocker: UUID, blocked: UUID) -> None:
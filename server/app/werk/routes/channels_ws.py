@@ -23,11 +23,13 @@ from ..services.channel_access import (
     channel_ops_automation_enabled,
     load_channel_access,
 )
+from ..services.channel_presence import PresenceWriter, TimingWheel
 
 logger = logging.getLogger(__name__)
 
-# Cap on a single WS send so one slow/half-dead socket can't stall an entire
-# room's fan-out (the Redis subscriber loop processes envelopes serially).
+# Cap on a single WS send. Sends run on each socket's own writer task (see
+# _SocketWriter), so this bounds how long a half-dead socket holds its own
+# queue, not anyone else's delivery.
 _WS_SEND_TIMEOUT_SECONDS = 5.0
 
 
@@ -89,6 +91,84 @@ async def _safe_send_text(ws: WebSocket, data: str) -> bool:
         return False
 
 
+
+# Per-socket outbound queue depth. A healthy client drains in milliseconds;
+# a socket this far behind is either on a dead link or can't keep up, and
+# holding more only grows worker memory.
+_WS_QUEUE_MAX = 256
+# Event types that are safe to shed under backpressure — the next one
+# supersedes them. Anything else (messages, notifications, membership) is
+# state the client can't reconstruct without a refetch, so a full queue for
+# those closes the socket instead and the client's reconnect path resyncs.
+_DROPPABLE_TYPES = frozenset({"typing", "server_ping"})
+
+
+class _SocketWriter:
+    """Bounded outbound queue + writer task for one WebSocket.
+
+    Fan-out paths only `offer()` pre-serialized frames — they never await
+    network I/O — so one slow socket delays nothing but itself. The writer
+    sends frames in order through `_safe_send_text`; the first failed send
+    ends it and calls `on_dead` so the manager forgets the socket.
+    """
+    __slots__ = ("ws", "user_id", "queue", "task", "dropped", "closed", "_on_dead")
+
+    def __init__(self, ws: WebSocket, user_id: UUID, on_dead):
+        self.ws = ws
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=_WS_QUEUE_MAX)
+        self.dropped = 0
+        self.closed = False
+        self._on_dead = on_dead
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, data: str, droppable: bool = False) -> bool:
+        """Enqueue without blocking. Returns False when the frame was shed."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            pass
+        self.dropped += 1
+        if not droppable:
+            logger.warning(
+                "[Channels WS] Slow consumer: closing socket for user %s (%d frames queued)",
+                self.user_id, self.queue.qsize(),
+            )
+            self.closed = True
+            self.task.cancel()
+            _spawn_bg(self._close_slow())
+        return False
+
+    async def _close_slow(self) -> None:
+        try:
+            await asyncio.wait_for(self.ws.close(code=1013, reason="Slow consumer"), timeout=2)
+        except Exception:
+            pass
+        await self._on_dead(self)
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                data = await self.queue.get()
+                try:
+                    ok = await _safe_send_text(self.ws, data)
+                finally:
+                    self.queue.task_done()
+                if not ok:
+                    self.closed = True
+                    await self._on_dead(self)
+                    return
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self) -> None:
+        self.closed = True
+        if not self.task.done():
+            self.task.cancel()
+
 # Background tasks spawned fire-and-forget from the WS handler. Held in a set so
 # they aren't GC'd mid-flight (asyncio keeps only a weak ref to running tasks).
 _bg_tasks: set = set()
@@ -2518,29 +2598,35 @@ async def _get_channel_name(conn, ch_uuid: UUID) -> Optional[str]:
         _channel_name_cache[key] = name
     return name
 
-# Online presence — written on every WS receive (heartbeat), read by the
+# Online presence — refreshed from WS receives (heartbeat), read by the
 # mention_email Celery worker to skip emails for users who are still active.
 # TTL is intentionally generous (60s) so a single dropped ping doesn't trigger
-# a false-offline email; manager.disconnect explicitly clears the key when the
-# last WS for a user closes.
-_ONLINE_KEY_PREFIX = "channels_ws:online:"
-_ONLINE_TTL_SECONDS = 60
-
-# Redis pub/sub channel used to fan-out broadcasts across uvicorn workers.
-# Production runs --workers 2, so an in-process broadcast on worker A would
-# never reach a WS client connected to worker B. Each worker subscribes to
-# this channel on startup and re-dispatches incoming envelopes to its own
-# local sockets via _local_broadcast_to_room / _local_send_to_user.
+# a false-offline email; the key is cleared when the last WS for a user
+# closes. Writes are coalesced per user and pipelined — see PresenceWriter.
+_presence = PresenceWriter()
+
+# Redis pub/sub channel used to fan-out user-targeted sends (send_to_user /
+# send_to_users) across uvicorn workers. Production runs --workers 2, so an
+# in-process send on worker A would never reach a WS client connected to
+# worker B. Each worker subscribes to this channel on startup and
+# re-dispatches incoming envelopes to its own local sockets.
 _FANOUT_CHANNEL = "channels:fanout"
-# Typing is the highest-frequency event class; it rides its own pub/sub
-# channel so a typing storm can't head-of-line-block message delivery in the
-# (serial, per-worker) fanout subscriber loop.
-_TYPING_CHANNEL = "channels:typing:fanout"
+# Room traffic rides one pub/sub channel PER ROOM, and a worker subscribes
+# only while it has a local member of that room (see _RoomSubscriptions).
+# Before, every room envelope in the deployment went through the single
+# fanout channel and every worker decoded all of it, local members or not.
+# Typing gets its own per-room channel AND its own subscriber connection and
+# listen loop (_typing_subscriptions), so a typing storm can't queue ahead of
+# message delivery in a shared serial loop.
+_ROOM_CHANNEL_PREFIX = "channels:room:"
+_TYPING_CHANNEL_PREFIX = "channels:typing:"
 _SERVER_PING_INTERVAL_SECONDS = 25
 # A healthy client touches at least every 25-30s (its own ping, or its pong
 # reply to server_ping). 90s = 3 missed cycles ⇒ the socket is a zombie the
 # 5s send timeout can't see (TCP buffer still accepting writes).
 _LIVENESS_DEADLINE_SECONDS = 90
+# Timing-wheel slot width; expiry is accurate to one slot.
+_LIVENESS_RESOLUTION_SECONDS = 5.0
 
 # Identifies THIS worker's envelopes on the fanout channel. Local delivery
 # now happens synchronously at publish time (local-first), so the subscriber
@@ -2549,6 +2635,97 @@ _LIVENESS_DEADLINE_SECONDS = 90
 _WORKER_ID = uuid4().hex
 
 
+def _room_channels(room_key: str) -> tuple[str, str]:
+    """(message channel, typing channel) for a room."""
+    return f"{_ROOM_CHANNEL_PREFIX}{room_key}", f"{_TYPING_CHANNEL_PREFIX}{room_key}"
+
+
+class _RoomSubscriptions:
+    """The per-room channels (one `prefix`) this worker listens on, kept in
+    step with ChannelConnectionManager.room_members: subscribe when the first
+    local member joins a room, unsubscribe when the last one leaves.
+
+    Messages and typing each have an instance on their own connection; the
+    typing one shares the message one's `rooms` set, so the manager marks a
+    room once and applies it to both (`_apply_room_subscriptions`).
+
+    `add`/`discard` only update `rooms` and are called under the manager's
+    lock, in the same critical section that changes room_members, so the two
+    can never disagree. A join that lands while the last leave is still
+    broadcasting would otherwise find the room already in `rooms`, skip it,
+    and the leave's late discard would unsubscribe a room with a member.
+    `apply` then sends the change; it re-reads `rooms`, so whichever apply
+    runs last leaves the subscription right.
+
+    `pubsub` is attached by the room subscriber loop while it is connected;
+    until then (Redis down, dev without Redis) `apply` is a no-op and the
+    loop subscribes the whole set when it (re)connects. Changes are sent on
+    the loop's connection from the caller's task — a send, never a read, so
+    it doesn't race the loop's listen().
+    """
+
+    def __init__(self, prefix: str, rooms: Optional[Set[str]] = None):
+        self.prefix = prefix
+        self.rooms: Set[str] = rooms if rooms is not None else set()
+        self.pubsub = None
+        self._lock = asyncio.Lock()
+
+    def channel(self, room_key: str) -> str:
+        return f"{self.prefix}{room_key}"
+
+    def add(self, room_key: str) -> bool:
+        """Mark `room_key` wanted; True if that changed anything."""
+        if room_key in self.rooms:
+            return False
+        self.rooms.add(room_key)
+        return True
+
+    def discard(self, room_key: str) -> bool:
+        """Mark `room_key` unwanted; True if that changed anything."""
+        if room_key not in self.rooms:
+            return False
+        self.rooms.discard(room_key)
+        return True
+
+    async def apply(self, room_key: str) -> None:
+        if self.pubsub is None:
+            return
+        async with self._lock:
+            pubsub = self.pubsub
+            if pubsub is None:
+                return
+            # Re-read desired state under the lock: a join/leave pair racing
+            # here must leave the subscription matching `rooms`, not
+            # whichever command happened to be sent last.
+            try:
+                if room_key in self.rooms:
+                    await pubsub.subscribe(self.channel(room_key))
+                else:
+                    await pubsub.unsubscribe(self.channel(room_key))
+            except Exception:
+                logger.warning("[Channels WS] Room subscription update failed for %s", room_key)
+
+    async def attach(self, pubsub) -> None:
+        async with self._lock:
+            self.pubsub = pubsub
+            channels = [self.channel(room) for room in self.rooms]
+            if channels:
+                await pubsub.subscribe(*channels)
+
+    def detach(self) -> None:
+        self.pubsub = None
+
+
+_room_subscriptions = _RoomSubscriptions(_ROOM_CHANNEL_PREFIX)
+_typing_subscriptions = _RoomSubscriptions(_TYPING_CHANNEL_PREFIX, rooms=_room_subscriptions.rooms)
+
+
+async def _apply_room_subscriptions(room_key: str) -> None:
+    """Send a room's subscription change on both the message and typing connections."""
+    await _room_subscriptions.apply(room_key)
+    await _typing_subscriptions.apply(room_key)
+
+
 def _should_process_envelope(envelope: dict, worker_id: str) -> bool:
     """Pure: process an envelope unless this worker published it. Envelopes
     from pre-deploy workers carry no 'origin' — process those (worst case a
@@ -2557,23 +2734,11 @@ def _should_process_envelope(envelope: dict, worker_id: str) -> bool:
 
 
 async def _mark_online(user_id: UUID) -> None:
-    redis = get_redis_cache()
-    if redis is None:
-        return
-    try:
-        await redis.setex(f"{_ONLINE_KEY_PREFIX}{user_id}", _ONLINE_TTL_SECONDS, "1")
-    except Exception:
-        pass
+    _presence.mark_online(user_id)
 
 
 async def _mark_offline(user_id: UUID) -> None:
-    redis = get_redis_cache()
-    if redis is None:
-        return
-    try:
-        await redis.delete(f"{_ONLINE_KEY_PREFIX}{user_id}")
-    except Exception:
-        pass
+    _presence.mark_offline(user_id)
 
 router = APIRouter()
 
@@ -2611,9 +2776,13 @@ class ChannelConnectionManager:
         self.user_rooms: Dict[UUID, Set[str]] = {}
         self.lock = asyncio.Lock()
         # Liveness tracking (touch() called on every inbound frame + on
-        # connect). Plain dict — single event loop, no await between reads
-        # and writes, so no lock needed. See _server_ping_loop's reaper.
-        self.last_seen: Dict[WebSocket, float] = {}
+        # connect), filed on a timing wheel so _server_ping_loop visits only
+        # idle and expired slots. Single event loop, no
+        # await between reads and writes, so no lock needed.
+        self.last_seen = TimingWheel(resolution=_LIVENESS_RESOLUTION_SECONDS)
+        # One bounded outbound queue + writer task per socket. Every fan-out
+        # path enqueues here and returns; see _SocketWriter.
+        self.writers: Dict[WebSocket, _SocketWriter] = {}
 
     async def connect(
         self, websocket: WebSocket, user: ChannelUser, subprotocol: Optional[str] = None
@@ -2625,11 +2794,12 @@ class ChannelConnectionManager:
                 self.user_rooms[user.id] = set()
             self.active_connections[user.id].add(websocket)
             self.users[user.id] = user
-            self.last_seen[websocket] = time.monotonic()
+            self.last_seen.touch(websocket)
+            self.writers[websocket] = _SocketWriter(websocket, user.id, self._writer_dead)
 
     def touch(self, websocket: WebSocket) -> None:
         """Stamp last-activity for the liveness reaper."""
-        self.last_seen[websocket] = time.monotonic()
+        self.last_seen.touch(websocket)
 
     async def disconnect(self, websocket: WebSocket, user_id: UUID):
         # Collect broadcasts under the lock, send after release — the lock is
@@ -2637,8 +2807,12 @@ class ChannelConnectionManager:
         # socket cleanup, so awaiting a broadcast while holding it deadlocks
         # the whole manager the moment Redis is down AND a socket is dead.
         to_broadcast: list[tuple[str, dict]] = []
+        emptied: list[str] = []
         async with self.lock:
             self.last_seen.pop(websocket, None)
+            writer = self.writers.pop(websocket, None)
+            if writer is not None:
+                writer.stop()
             if user_id in self.active_connections:
                 self.active_connections[user_id].discard(websocket)
                 if not self.active_connections[user_id]:
@@ -2654,6 +2828,8 @@ class ChannelConnectionManager:
                                     # Never deleted before — slow leak, one
                                     # entry per channel ever joined.
                                     del self.room_members[room]
+                                    if _room_subscriptions.discard(room):
+                                        emptied.append(room)
                                 if user:
                                     to_broadcast.append((room, {
                                         "type": "user_left",
@@ -2662,12 +2838,16 @@ class ChannelConnectionManager:
                                     }))
         for room, payload in to_broadcast:
             await self._broadcast_to_room(room, payload, exclude_user=user_id)
+        for room in emptied:
+            await _apply_room_subscriptions(room)
 
     async def join_room(self, user_id: UUID, room_key: str):
         payload = None
         async with self.lock:
-            if room_key not in self.room_members:
+            first_local_member = room_key not in self.room_members
+            if first_local_member:
                 self.room_members[room_key] = set()
+                first_local_member = _room_subscriptions.add(room_key)
 
             was_in_room = user_id in self.room_members[room_key]
             self.room_members[room_key].add(user_id)
@@ -2681,16 +2861,20 @@ class ChannelConnectionManager:
                     "room": room_key,
                     "user": self.users[user_id].model_dump(mode='json'),
                 }
+        if first_local_member:
+            await _apply_room_subscriptions(room_key)
         if payload:
             await self._broadcast_to_room(room_key, payload, exclude_user=user_id)
 
     async def leave_room(self, user_id: UUID, room_key: str):
         payload = None
+        emptied = False
         async with self.lock:
             if room_key in self.room_members:
                 self.room_members[room_key].discard(user_id)
                 if not self.room_members[room_key]:
                     del self.room_members[room_key]
+                    emptied = _room_subscriptions.discard(room_key)
             if user_id in self.user_rooms:
                 self.user_rooms[user_id].discard(room_key)
             if user_id in self.users:
@@ -2701,6 +2885,8 @@ class ChannelConnectionManager:
                 }
         if payload:
             await self._broadcast_to_room(room_key, payload)
+        if emptied:
+            await _apply_room_subscriptions(room_key)
 
     async def broadcast_message(self, room_key: str, message: dict):
         await self._broadcast_to_room(room_key, {
@@ -2710,12 +2896,12 @@ class ChannelConnectionManager:
         })
 
     async def broadcast_typing(self, room_key: str, user: ChannelUser):
-        # Rides its own pub/sub channel — see _TYPING_CHANNEL's comment.
+        # Rides the room's typing channel — see _TYPING_CHANNEL_PREFIX.
         await self._broadcast_to_room(room_key, {
             "type": "typing",
             "room": room_key,
             "user": user.model_dump(mode='json'),
-        }, exclude_user=user.id, channel=_TYPING_CHANNEL)
+        }, exclude_user=user.id, typing=True)
 
     async def get_online_users(self, room_key: str) -> list:
         async with self.lock:
@@ -2753,17 +2939,12 @@ class ChannelConnectionManager:
         (create_notifications_bulk) instead of N separate send_to_user calls."""
         if not payloads:
             return
-        # Concurrent, not serial: a 200-recipient batch awaited one at a time
-        # would block the caller (and, via the fanout envelope below, the
-        # message-delivery subscriber on the OTHER worker — see the
-        # _process_envelope 'users' branch) for as long as the single
-        # slowest socket in the batch takes, reintroducing exactly the
-        # head-of-line blocking the typing/message channel split exists to
-        # avoid.
-        await asyncio.gather(
-            *(self._local_send_to_user(uid, message) for uid, message in payloads.items()),
-            return_exceptions=True,
-        )
+        # Enqueue-only (see _SocketWriter): a 200-recipient batch costs 200
+        # queue puts, never 200 socket writes, so neither the caller nor the
+        # OTHER worker's subscriber (the _process_envelope 'users' branch)
+        # waits on the slowest socket in the batch.
+        for uid, message in payloads.items():
+            await self._local_send_to_user(uid, message)
         redis = get_redis_cache()
         if redis is None:
             return
@@ -2778,33 +2959,27 @@ class ChannelConnectionManager:
             logger.exception("Redis publish failed in send_to_users (local delivery already done)")
 
     async def _local_send_to_user(self, user_id: UUID, message: dict):
-        """Direct write to this worker's local sockets for a user. Called by
+        """Queue a frame for this worker's local sockets of a user. Called by
         the subscriber loop when a fanout envelope targets this user, and as
-        a fallback when Redis is unavailable."""
-        async with self.lock:
-            conns = set(self.active_connections.get(user_id, set()))
+        a fallback when Redis is unavailable. Never awaits a socket write."""
+        conns = self.active_connections.get(user_id)
         if not conns:
             return
         data = json.dumps(message, default=str)
-        # Fan out to this user's connections (usually one, but multi-tab/
-        # multi-device is possible) concurrently instead of one at a time.
-        results = await asyncio.gather(*(_safe_send_text(ws, data) for ws in conns))
-        dead = [ws for ws, ok in zip(conns, results) if not ok]
-        if dead:
-            async with self.lock:
-                for ws in dead:
-                    self.active_connections.get(user_id, set()).discard(ws)
+        droppable = message.get("type") in _DROPPABLE_TYPES
+        # Multi-tab/multi-device: one queue per connection.
+        for ws in list(conns):
+            self._offer(user_id, ws, data, droppable)
 
     async def _broadcast_to_room(
         self, room_key: str, message: dict, exclude_user: UUID = None,
-        channel: str = _FANOUT_CHANNEL,
+        typing: bool = False,
     ):
         """Fan-out to every WS member of a room across all uvicorn workers.
 
         Local-first: this worker's sockets are written directly, then one
-        Redis publish reaches the other worker. `channel` lets high-frequency
-        event classes (typing) ride their own pub/sub channel so they can't
-        head-of-line-block message delivery in the serial subscriber.
+        Redis publish on the room's own channel reaches only the workers
+        that have a member of it. `typing` selects the room's typing channel.
         """
         await self._local_broadcast_to_room(room_key, message, exclude_user=exclude_user)
         redis = get_redis_cache()
@@ -2817,34 +2992,68 @@ class ChannelConnectionManager:
             "exclude_user": str(exclude_user) if exclude_user else None,
             "origin": _WORKER_ID,
         }
+        message_channel, typing_channel = _room_channels(room_key)
         try:
-            await redis.publish(channel, json.dumps(envelope, default=str))
+            await redis.publish(
+                typing_channel if typing else message_channel,
+                json.dumps(envelope, default=str),
+            )
         except Exception:
             logger.exception("Redis publish failed in _broadcast_to_room (local delivery already done)")
 
     async def _local_broadcast_to_room(self, room_key: str, message: dict, exclude_user: UUID = None):
-        """Direct write to this worker's local sockets for a room. Called by
-        the subscriber loop and as a Redis-down fallback."""
-        if room_key not in self.room_members:
+        """Queue a frame for this worker's local sockets in a room. Called by
+        the subscriber loop and as a Redis-down fallback.
+
+        Serialized once, then one non-blocking put per socket — previously
+        this awaited a gather of sends, so a busy room held the (serial)
+        subscriber loop and delayed every other room on the worker."""
+        members = self.room_members.get(room_key)
+        if not members:
             return
         data = json.dumps(message, default=str)
-        targets: list[tuple[UUID, WebSocket]] = []
-        for user_id in self.room_members[room_key]:
+        droppable = message.get("type") in _DROPPABLE_TYPES
+        for user_id in list(members):
             if exclude_user and user_id == exclude_user:
                 continue
-            for ws in self.active_connections.get(user_id, set()):
-                targets.append((user_id, ws))
-        if not targets:
+            for ws in list(self.active_connections.get(user_id, ())):
+                self._offer(user_id, ws, data, droppable)
+
+    def _offer(self, user_id: UUID, ws: WebSocket, data: str, droppable: bool) -> bool:
+        writer = self.writers.get(ws)
+        if writer is None:
+            # Not registered, or already torn down by disconnect() or
+            # _writer_dead — a fan-out that raced either must not bring the
+            # socket back with a fresh writer nobody will ever stop.
+            return False
+        return writer.offer(data, droppable)
+
+    async def _writer_dead(self, writer: "_SocketWriter") -> None:
+        """A writer's send failed or it was closed as a slow consumer: stop
+        routing to the socket. Runs on the writer's own task, never under a
+        fan-out caller, so taking the lock here can't deadlock a broadcast.
+
+        Clears every per-socket entry — writer, connection set membership and
+        liveness slot. The user's room bookkeeping is left for disconnect(),
+        which the socket's own handler still runs once its receive fails."""
+        async with self.lock:
+            if self.writers.get(writer.ws) is not writer:
+                return  # already torn down, or the socket reconnected
+            del self.writers[writer.ws]
+            self.last_seen.pop(writer.ws, None)
+            self.active_connections.get(writer.user_id, set()).discard(writer.ws)
+
+    async def drain(self, timeout: float = 5.0) -> None:
+        """Wait until every live socket's queue has been written out, or
+        `timeout`. Used at shutdown so a deploy doesn't drop the last
+        broadcasts still sitting in queues."""
+        pending = [w.queue.join() for w in self.writers.values() if not w.closed]
+        if not pending:
             return
-        # Every socket in the room sent to concurrently — previously this
-        # awaited sends one at a time, so a single slow/half-dead socket
-        # delayed delivery to the rest of the room.
-        results = await asyncio.gather(*(_safe_send_text(ws, data) for _, ws in targets))
-        dead = [(uid, ws) for (uid, ws), ok in zip(targets, results) if not ok]
-        if dead:
-            async with self.lock:
-                for uid, ws in dead:
-                    self.active_connections.get(uid, set()).discard(ws)
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
 
 manager = ChannelConnectionManager()
@@ -2855,13 +3064,14 @@ manager = ChannelConnectionManager()
 # ---------------------------------------------------------------------------
 
 _subscriber_task: Optional[asyncio.Task] = None
+_room_subscriber_task: Optional[asyncio.Task] = None
 _typing_subscriber_task: Optional[asyncio.Task] = None
 _server_ping_task: Optional[asyncio.Task] = None
 
 
 async def _process_envelope(envelope: dict) -> None:
     """Dispatch one decoded fanout envelope to this worker's local sockets.
-    Shared by the message-fanout and typing-fanout subscriber loops."""
+    Shared by the user-fanout, per-room and typing subscriber loops."""
     if not _should_process_envelope(envelope, _WORKER_ID):
         return
     kind = envelope.get("kind")
@@ -2892,34 +3102,33 @@ async def _process_envelope(envelope: dict) -> None:
             return
         await manager._local_send_to_user(uid, msg)
     elif kind == "users":
-        # Multicast: one envelope, many recipients (bulk notify). Concurrent
-        # for the same reason as send_to_users above — this runs on the
-        # single serial fanout subscriber, so one slow socket serially
-        # awaited here stalls every other message this worker is about to
-        # dispatch, not just the rest of this batch.
+        # Multicast: one envelope, many recipients (bulk notify). Each
+        # recipient is a queue put, so the serial subscriber is never held
+        # by a slow socket here.
         msgs = envelope.get("messages") or {}
-        targets = []
         for uid_raw, m in msgs.items():
             try:
-                targets.append((UUID(uid_raw), m))
+                uid = UUID(uid_raw)
             except (ValueError, TypeError):
                 continue
-        if targets:
-            await asyncio.gather(
-                *(manager._local_send_to_user(uid, m) for uid, m in targets),
-                return_exceptions=True,
-            )
+            await manager._local_send_to_user(uid, m)
 
 
-async def _subscriber_loop(channel: str, label: str) -> None:
-    """Long-running per-worker task. Subscribes to a Redis fanout channel and
+async def _subscriber_loop(
+    channel: str, label: str, rooms: Optional[_RoomSubscriptions] = None,
+) -> None:
+    """Long-running per-worker task. Subscribes to a Redis channel and
     dispatches incoming envelopes to this worker's local sockets via
-    _process_envelope. Parametrized by channel so message and typing traffic
-    ride independent pub/sub channels (see _TYPING_CHANNEL) and can't head-
-    of-line-block each other.
+    _process_envelope.
+
+    With `rooms`, the connection also carries every per-room channel this
+    worker has local members for, and `rooms` is pointed at it so join/leave
+    can add and drop channels live. `channel` then only anchors the
+    connection (redis-py's listen() returns as soon as nothing is
+    subscribed, which would otherwise happen on a worker with no rooms).
 
-    Self-healing: on any exception, sleeps 2s and re-subscribes. Cancellation
-    exits cleanly.
+    Self-healing: on any exception, sleeps 2s and re-subscribes (including
+    the current room set). Cancellation exits cleanly.
     """
     while True:
         pubsub = None
@@ -2931,6 +3140,8 @@ async def _subscriber_loop(channel: str, label: str) -> None:
                 continue
             pubsub = redis.pubsub()
             await pubsub.subscribe(channel)
+            if rooms is not None:
+                await rooms.attach(pubsub)
             logger.info("[Channels WS] Subscribed to %s (%s)", channel, label)
             async for raw in pubsub.listen():
                 if raw is None or raw.get("type") != "message":
@@ -2953,24 +3164,30 @@ async def _subscriber_loop(channel: str, label: str) -> None:
             logger.exception("[Channels WS] Subscriber loop error (%s); restarting in 2s", label)
             await asyncio.sleep(2)
         finally:
+            if rooms is not None:
+                rooms.detach()
             if pubsub is not None:
                 try:
-                    await pubsub.unsubscribe(channel)
+                    await pubsub.unsubscribe()
                     await pubsub.aclose()
                 except Exception:
                     pass
 
 
 async def _fanout_subscriber_loop() -> None:
-    await _subscriber_loop(_FANOUT_CHANNEL, "messages")
+    await _subscriber_loop(_FANOUT_CHANNEL, "users")
+
+
+async def _room_subscriber_loop() -> None:
+    await _subscriber_loop(f"channels:worker:{_WORKER_ID}", "rooms", rooms=_room_subscriptions)
 
 
 async def _typing_subscriber_loop() -> None:
-    await _subscriber_loop(_TYPING_CHANNEL, "typing")
+    await _subscriber_loop(f"channels:worker:{_WORKER_ID}:typing", "typing", rooms=_typing_subscriptions)
 
 
 async def _server_ping_loop() -> None:
-    """Periodic keepalive push from server to every connected WS. Prevents
+    """Periodic keepalive push from server to every idle WS. Prevents
     Nginx / intermediaries from silently killing idle connections and gives
     the server early detection of dead sockets (a failed send drops the WS
     from active_connections). Also reaps zombie sockets — a half-open
@@ -2981,53 +3198,37 @@ async def _server_ping_loop() -> None:
     while True:
         try:
             await asyncio.sleep(_SERVER_PING_INTERVAL_SECONDS)
-            # Snapshot the per-user connection map under the lock so we don't
-            # iterate while disconnect() mutates it.
-            async with manager.lock:
-                snapshot: list[tuple[UUID, list[WebSocket]]] = [
-                    (uid, list(conns)) for uid, conns in manager.active_connections.items()
-                ]
-            targets: list[tuple[UUID, WebSocket]] = [
-                (uid, ws) for uid, conns in snapshot for ws in conns
-            ]
-
-            now = time.monotonic()
-            stale = [
-                (uid, ws) for uid, ws in targets
-                if now - manager.last_seen.get(ws, now) > _LIVENESS_DEADLINE_SECONDS
-            ]
+            # Only the wheel's slots older than each cutoff are visited — no
+            # snapshot or scan of every connection. Expired sockets stay in
+            # the wheel (re-armed) until disconnect() unregisters them, so a
+            # close that never completes is retried a deadline later.
+            stale = manager.last_seen.expire(_LIVENESS_DEADLINE_SECONDS)
             if stale:
-                # Concurrent, not serial: this runs BEFORE the keepalive
-                # gather below, so a batch of zombies (a NAT rebind, an LB
-                # event) closed one at a time could burn up to
-                # len(stale) * 2s here before a single server_ping goes out —
-                # cascading a partial outage into healthy clients getting
-                # dropped by intermediaries for missing the very keepalive
-                # this loop exists to send.
+                # Concurrent, not serial: this runs BEFORE the keepalives
+                # below, so a batch of zombies (a NAT rebind, an LB event)
+                # closed one at a time could burn up to len(stale) * 2s here
+                # before a single server_ping goes out — cascading a partial
+                # outage into healthy clients getting dropped by
+                # intermediaries for missing the very keepalive this loop
+                # exists to send.
                 async def _close(ws: WebSocket) -> None:
                     try:
                         await asyncio.wait_for(ws.close(), timeout=2)
                     except Exception:
                         pass
-                await asyncio.gather(*(_close(ws) for _, ws in stale), return_exceptions=True)
-                stale_set = {id(ws) for _, ws in stale}
-                targets = [(uid, ws) for uid, ws in targets if id(ws) not in stale_set]
+                await asyncio.gather(*(_close(ws) for ws in stale), return_exceptions=True)
 
             ping_payload = json.dumps({"type": "server_ping"})
-            # Ping every socket on this worker concurrently rather than one at
-            # a time — sequential sends here would delay the next room's
-            # pings behind a single slow/half-dead connection.
-            if targets:
-                results = await asyncio.gather(
-                    *(_safe_send_text(ws, ping_payload) for _, ws in targets)
-                )
-                dead = [(uid, ws) for (uid, ws), ok in zip(targets, results) if not ok]
-                if dead:
-                    async with manager.lock:
-                        for uid, ws in dead:
-                            bucket = manager.active_connections.get(uid)
-                            if bucket is not None:
-                                bucket.discard(ws)
+            # Only sockets the client hasn't touched for a ping interval need
+            # a keepalive; re-armed stale ones sit in the current slot and are
+            # skipped. Through each socket's writer like any other frame:
+            # pings stay ordered with queued broadcasts, and a failed send is
+            # reaped by the writer (_writer_dead). Droppable — a socket whose
+            # queue is full already has traffic in flight.
+            for ws in manager.last_seen.due(_SERVER_PING_INTERVAL_SECONDS):
+                writer = manager.writers.get(ws)
+                if writer is not None:
+                    writer.offer(ping_payload, droppable=True)
         except asyncio.CancelledError:
             break
         except Exception:
@@ -3035,11 +3236,13 @@ async def _server_ping_loop() -> None:
 
 
 def start_fanout_subscriber() -> None:
-    """Start the per-worker Redis pub/sub subscribers (message + typing).
-    Idempotent."""
-    global _subscriber_task, _typing_subscriber_task
+    """Start the per-worker Redis pub/sub subscribers (user fanout, rooms
+    and typing). Idempotent."""
+    global _subscriber_task, _room_subscriber_task, _typing_subscriber_task
     if not _subscriber_task or _subscriber_task.done():
         _subscriber_task = asyncio.create_task(_fanout_subscriber_loop())
+    if not _room_subscriber_task or _room_subscriber_task.done():
+        _room_subscriber_task = asyncio.create_task(_room_subscriber_loop())
     if not _typing_subscriber_task or _typing_subscriber_task.done():
         _typing_subscriber_task = asyncio.create_task(_typing_subscriber_loop())
 
@@ -3053,8 +3256,9 @@ def start_server_ping_loop() -> None:
 
 
 async def stop_fanout_subscriber() -> None:
-    """Cancel both subscriber tasks on shutdown."""
-    global _subscriber_task, _typing_subscriber_task
+    """Cancel the subscriber tasks on shutdown, then give queued frames a
+    moment to reach their sockets."""
+    global _subscriber_task, _room_subscriber_task, _typing_subscriber_task
     if _subscriber_task is not None:
         _subscriber_task.cancel()
         try:
@@ -3062,6 +3266,13 @@ async def stop_fanout_subscriber() -> None:
         except (asyncio.CancelledError, Exception):
             pass
         _subscriber_task = None
+    if _room_subscriber_task is not None:
+        _room_subscriber_task.cancel()
+        try:
+            await _room_subscriber_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _room_subscriber_task = None
     if _typing_subscriber_task is not None:
         _typing_subscriber_task.cancel()
         try:
@@ -3069,6 +3280,7 @@ async def stop_fanout_subscriber() -> None:
         except (asyncio.CancelledError, Exception):
             pass
         _typing_subscriber_task = None
+    await manager.drain(timeout=2)
 
 
 async def stop_server_ping_loop() -> None:
@@ -3080,6 +3292,7 @@ async def stop_server_ping_loop() -> None:
         except (asyncio.CancelledError, Exception):
             pass
         _server_ping_task = None
+    await _presence.close()
 
 
 async def broadcast_message_deleted(
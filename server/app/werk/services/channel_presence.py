@@ -0,0 +1,203 @@
+"""Presence and liveness bookkeeping for the channel WebSocket server.
+
+Two pieces, both per uvicorn worker:
+
+* `TimingWheel` — socket liveness. `touch()` files a socket under the
+  current time slot; `expire()` and `due()` visit only the slots older than
+  their cutoff, so the ping loop's cost follows the number of idle sockets
+  instead of a full scan of every connection every ping interval.
+* `PresenceWriter` — the `channels_ws:online:<user>` keys the mention_email
+  worker reads. Every inbound frame used to SETEX the key; now a user's key
+  is refreshed at most once per `refresh_interval`, and pending online/offline
+  changes go out in one Redis pipeline per flush. The key contract for
+  readers is unchanged: present (TTL 60s) while the user has a live socket
+  somewhere, deleted when their last socket on this worker closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Hashable, Optional
+from uuid import UUID
+
+from ...core.services.redis_cache import get_redis_cache
+
+logger = logging.getLogger(__name__)
+
+ONLINE_KEY_PREFIX = "channels_ws:online:"
+ONLINE_TTL_SECONDS = 60
+# A user's key is re-SETEXed at most this often. Well inside the TTL so one
+# late flush can't let a live user's key lapse.
+ONLINE_REFRESH_SECONDS = 20.0
+# How long online/offline changes may sit before going out in a batch.
+PRESENCE_FLUSH_SECONDS = 1.0
+
+
+class TimingWheel:
+    """Hashed timing wheel keyed by object; slot width `resolution` seconds.
+
+    Expiry is approximate to one slot, which is fine for a 90s liveness
+    deadline. Single event loop, no awaits inside — no lock.
+    """
+
+    def __init__(self, resolution: float = 5.0):
+        self.resolution = resolution
+        self._slots: dict[int, set] = {}
+        self._slot_of: dict[Hashable, int] = {}
+        self._oldest: Optional[int] = None
+
+    def _tick(self, now: float) -> int:
+        return int(now // self.resolution)
+
+    def touch(self, key: Hashable, now: Optional[float] = None) -> None:
+        tick = self._tick(time.monotonic() if now is None else now)
+        current = self._slot_of.get(key)
+        if current == tick:
+            return  # the common case: already filed in this slot
+        if current is not None:
+            self._remove_from_slot(key, current)
+        self._slots.setdefault(tick, set()).add(key)
+        self._slot_of[key] = tick
+        if self._oldest is None or tick < self._oldest:
+            self._oldest = tick
+
+    def pop(self, key: Hashable, default=None):
+        tick = self._slot_of.pop(key, None)
+        if tick is None:
+            return default
+        bucket = self._slots.get(tick)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._slots[tick]
+        return tick * self.resolution
+
+    def _remove_from_slot(self, key: Hashable, tick: int) -> None:
+        bucket = self._slots.get(tick)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._slots[tick]
+
+    def expire(self, deadline: float, now: Optional[float] = None) -> list:
+        """Return every key not touched within `deadline` seconds.
+
+        Returned keys are re-filed under the current slot rather than
+        dropped: a socket stays in the wheel until `pop()` unregisters it, so
+        one whose close never completes expires again a deadline later.
+        """
+        now = time.monotonic() if now is None else now
+        cutoff = self._tick(now - deadline)
+        expired: list = []
+        if self._oldest is None:
+            return expired
+        tick = self._oldest
+        while tick < cutoff and self._slots:
+            bucket = self._slots.pop(tick, None)
+            if bucket:
+                expired.extend(bucket)
+            tick += 1
+        if expired:
+            current = self._tick(now)
+            self._slots.setdefault(current, set()).update(expired)
+            for key in expired:
+                self._slot_of[key] = current
+        self._oldest = min(self._slots) if self._slots else None
+        return expired
+
+    def due(self, age: float, now: Optional[float] = None) -> list:
+        """Every key not touched within `age` seconds, left in place."""
+        cutoff = self._tick((time.monotonic() if now is None else now) - age)
+        due: list = []
+        for tick, bucket in self._slots.items():
+            if tick < cutoff:
+                due.extend(bucket)
+        return due
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slot_of
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+
+class PresenceWriter:
+    """Coalesced, batched writer for the per-user online keys."""
+
+    def __init__(
+        self,
+        *,
+        refresh_interval: float = ONLINE_REFRESH_SECONDS,
+        flush_interval: float = PRESENCE_FLUSH_SECONDS,
+    ):
+        self.refresh_interval = refresh_interval
+        self.flush_interval = flush_interval
+        self._written_at: dict[UUID, float] = {}
+        self._pending_online: set[UUID] = set()
+        self._pending_offline: set[UUID] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_online(self, user_id: UUID, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._pending_offline.discard(user_id)
+        last = self._written_at.get(user_id)
+        if last is not None and now - last < self.refresh_interval:
+            return
+        # Stamp at enqueue time: further frames in this interval are no-ops
+        # even before the flush lands.
+        self._written_at[user_id] = now
+        self._pending_online.add(user_id)
+        self._ensure_flusher()
+
+    def mark_offline(self, user_id: UUID) -> None:
+        self._written_at.pop(user_id, None)
+        self._pending_online.discard(user_id)
+        self._pending_offline.add(user_id)
+        self._ensure_flusher()
+
+    def _ensure_flusher(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        try:
+            while self._pending_online or self._pending_offline:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+        except asyncio.CancelledError:
+            pass
+
+    async def flush(self) -> int:
+        """Write every pending change in one pipeline. Returns keys touched."""
+        online, self._pending_online = self._pending_online, set()
+        offline, self._pending_offline = self._pending_offline, set()
+        if not online and not offline:
+            return 0
+        redis = get_redis_cache()
+        if redis is None:
+            return 0
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for uid in online:
+                pipe.setex(f"{ONLINE_KEY_PREFIX}{uid}", ONLINE_TTL_SECONDS, "1")
+            if offline:
+                pipe.delete(*(f"{ONLINE_KEY_PREFIX}{uid}" for uid in offline))
+            await pipe.execute()
+        except Exception:
+            # Presence is best-effort; let the next frame re-queue the user.
+            for uid in online:
+                self._written_at.pop(uid, None)
+            logger.warning("[Channels WS] Presence flush failed (%d keys)", len(online) + len(offline))
+            return 0
+        return len(online) + len(offline)
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self.flush()
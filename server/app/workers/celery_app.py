@@ -3,7 +3,7 @@
 import logging
 import os
 from celery import Celery
-from celery.signals import worker_ready, task_failure, worker_process_init
+from celery.signals import worker_ready, task_failure, task_postrun, worker_process_init, worker_process_shutdown
 from dotenv import load_dotenv
 
 # Load environment variables for worker process
@@ -56,6 +56,7 @@ celery_app = Celery(
         "app.workers.tasks.cappe_campaign_send",
         "app.workers.tasks.cappe_collab_auto_approve",
         "app.workers.tasks.cappe_domain_finalize",
+        "app.workers.tasks.tellus_activity_inbox_prune",
         "app.workers.tasks.cba_clause_extraction",
         "app.workers.tasks.grievance_deadline_alerts",
         "app.workers.tasks.ir_deadline_alerts",
@@ -197,6 +198,7 @@ _SCHEDULED_TASKS = [
     ("cappe_comp_expiry", "app.workers.tasks.cappe_comp_expiry", "run_cappe_comp_expiry"),
     ("cappe_collab_auto_approve", "app.workers.tasks.cappe_collab_auto_approve", "run_cappe_collab_auto_approve"),
     ("cappe_domain_finalize", "app.workers.tasks.cappe_domain_finalize", "run_cappe_domain_finalize"),
+    ("tellus_activity_inbox_prune", "app.workers.tasks.tellus_activity_inbox_prune", "run_tellus_activity_inbox_prune"),
 ]
 
 
@@ -224,6 +226,16 @@ def on_worker_ready(**kwargs):
         reconcile_stale_runs.delay()
     except Exception:
         logger.exception("[Worker] Failed to enqueue Huume-code reconciliation")
+    # Same reasoning: a campaign whose batch tasks died with their worker would
+    # sit in 'sending' forever. Cheap when nothing is stalled. The delayed
+    # second sweep catches the claims orphaned by the crash that caused THIS
+    # restart, which are not stale yet.
+    try:
+        from app.workers.tasks.cappe_campaign_send import RESUME_AFTER_SECONDS, resume_stalled_cappe_campaigns
+        resume_stalled_cappe_campaigns.delay()
+        resume_stalled_cappe_campaigns.apply_async(countdown=RESUME_AFTER_SECONDS)
+    except Exception:
+        logger.exception("[Worker] Failed to enqueue Cappe campaign resume")
 
     task_keys = [key for key, _, _ in _SCHEDULED_TASKS]
     flags = _scheduler_flags(task_keys)
@@ -270,14 +282,18 @@ def _install_error_reporter(**kwargs):
     except Exception:
         logger.exception("[Worker] Failed to load settings")
 
-    # NOTE: deliberately do NOT call app.database.init_pool() here.
-    # Celery tasks each run via asyncio.run() which creates a NEW event
-    # loop per task; an asyncpg pool bound to one loop can't be reused
-    # from another, and the next task would fail with
-    # "another operation is in progress" or hang. Worker tasks that need
-    # DB access should use workers/utils.get_db_connection (raw asyncpg
-    # connection opened inside the task's own loop). The pool stays
-    # process-level for FastAPI's lifespan; workers stay pool-free.
+    # NOTE: deliberately do NOT call app.database.init_pool() here — that
+    # pool (and get_connection's request-scoped RLS context) is FastAPI's.
+    # Workers get their own: one persistent event loop per worker process,
+    # which task bodies run on via workers/utils.run_async, and a small
+    # asyncpg pool on that loop behind workers/utils.get_db_connection and
+    # connection_or_direct. A bare asyncio.run() still works — it just gets
+    # raw connections, since a pool can't be used from a foreign loop.
+    try:
+        from app.workers.utils import start_worker_runtime
+        start_worker_runtime()
+    except Exception:
+        logger.exception("[Worker] Failed to start worker runtime")
 
     try:
         from app.core.services.error_reporter import install_error_logging
@@ -288,6 +304,41 @@ def _install_error_reporter(**kwargs):
         logger.exception("[Worker] Failed to install error reporter")
 
 
+@task_postrun.connect
+def _drain_ai_usage_spool(**kwargs):
+    # Workers have no background loop of their own, so the AI usage spool
+    # (services/ai_usage_spool) is drained between tasks once its interval
+    # has passed — one COPY for everything the recent tasks spooled. Whatever
+    # is still spooled after that goes out on a trailing timer, so an idle
+    # worker doesn't hold its last burst until the next task.
+    try:
+        from app.core.services.ai_usage_spool import drain_if_due, pending_bytes, schedule_trailing_drain
+        from app.workers.utils import run_async
+        run_async(drain_if_due())
+        if pending_bytes():
+            schedule_trailing_drain()
+    except Exception:
+        logger.warning("[Worker] AI usage spool drain failed", exc_info=True)
+
+
+@worker_process_shutdown.connect
+def _stop_worker_runtime(**kwargs):
+    # Last drain before the child exits (recycle or shutdown). Rows it can't
+    # move stay on disk for the next drainer on this host.
+    try:
+        from app.core.services.ai_usage_spool import cancel_trailing_drain, drain
+        from app.workers.utils import run_async
+        cancel_trailing_drain()
+        run_async(drain())
+    except Exception:
+        logger.warning("[Worker] AI usage spool drain failed", exc_info=True)
+    try:
+        from app.workers.utils import stop_worker_runtime
+        stop_worker_runtime()
+    except Exception:
+        logger.exception("[Worker] Failed to stop worker runtime")
+
+
 @task_failure.connect
 def _on_task_failure(
     sender=None, task_id=None, exception=None, args=None, kwargs=None, traceback=None, einfo=None, **_
@@ -5,11 +5,10 @@ Projects: any row in mw_project_pins for this project → skip. Otherwise archiv
 Only processes status='active' rows. Idempotent.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +60,7 @@ async def _run_auto_archive() -> dict:
 def run_auto_archive(self):
     """Archive threads/projects idle for 7+ days with no star/pin."""
     try:
-        result = asyncio.run(_run_auto_archive())
+        result = run_async(_run_auto_archive())
         return result
     except Exception as e:
         logger.exception("[AutoArchive] Task failed")
@@ -13,11 +13,10 @@ each company with the benefits feature on (or linked to a broker), it:
 The heavy lifting is in ``services/benefits_eligibility.py`` so it can be unit
 tested without a worker.
 """
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 from app.matcha.services.benefits import benefits_eligibility as be
 
 logger = logging.getLogger(__name__)
@@ -56,4 +55,4 @@ async def _run() -> dict:
 @celery_app.task(bind=True, max_retries=3)
 def run_benefit_eligibility_sync(self):
     """Entry point dispatched by ``@worker_ready`` when the scheduler row is enabled."""
-    return asyncio.run(_run())
+    return run_async(_run())
@@ -18,12 +18,11 @@ Per cycle:
 Email builders + policy constants live in `services/benefits_enrollment.py`
 so they're unit-testable without a worker.
 """
-import asyncio
 import logging
 from datetime import date
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from app.config import get_settings
 from app.core.services.email import get_email_service
 from app.matcha.services.benefits.benefits_enrollment import (
@@ -194,4 +193,4 @@ async def _run() -> dict:
 @celery_app.task(bind=True, max_retries=3)
 def run_benefit_enrollment_notifications(self):
     """Entry point dispatched by ``@worker_ready`` when the scheduler row is enabled."""
-    return asyncio.run(_run())
+    return run_async(_run())
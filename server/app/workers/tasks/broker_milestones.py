@@ -18,13 +18,12 @@ the same family fires or the underlying streak breaks — both set
 `superseded_at`. A milestone that fires again after being superseded re-arms.
 """
 
-import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from .broker_risk_alerts import should_suppress
 from app.matcha.services.ir.ir_wc_metrics import compute_wc_metrics
 
@@ -246,7 +245,7 @@ def run_broker_milestones(self) -> dict:
     """Scan broker portfolios and record positive client safety milestones."""
     print("[Broker Milestones] Running...")
     try:
-        result = asyncio.run(_run_broker_milestones())
+        result = run_async(_run_broker_milestones())
         print(f"[Broker Milestones] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
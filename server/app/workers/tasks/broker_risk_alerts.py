@@ -17,7 +17,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from app.matcha.services.ir.ir_wc_metrics import compute_wc_metrics
 
 logger = logging.getLogger(__name__)
@@ -415,7 +415,7 @@ def run_broker_risk_alerts(self) -> dict:
     """Scan broker portfolios and email brokers about clients trending negative."""
     print("[Broker Risk Alerts] Running...")
     try:
-        result = asyncio.run(_run_broker_risk_alerts())
+        result = run_async(_run_broker_risk_alerts())
         print(f"[Broker Risk Alerts] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
@@ -5,7 +5,6 @@ enabled (default off). Emails each customer a single reminder ~24h before a
 confirmed booking. Claim-before-send (stamp reminder_sent_at, only send if the
 claim won) so the 15-min re-dispatch never double-sends.
 """
-import asyncio
 import logging
 from datetime import datetime, timezone
 
@@ -18,7 +17,7 @@ from app.cappe.services.reminders import reminder_due
 from app.core.services.email._shared import _is_reserved_test_domain
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -99,7 +98,7 @@ def run_cappe_booking_reminders(self) -> dict:
     """Scan confirmed Cappe bookings and email pre-start reminders."""
     print("[Cappe Booking Reminders] Running scheduler...")
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
         print(f"[Cappe Booking Reminders] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
@@ -1,42 +1,43 @@
-"""Celery task: send a Cappe newsletter campaign.
+"""Celery tasks: deliver a Cappe newsletter campaign.
 
 On-demand (dispatched via .delay() from the send endpoint, NOT scheduled). The
-route marks the campaign 'sending' synchronously; this task does the throttled
-per-recipient send and finalizes it to 'sent' with the real recipient count.
-Bulk send is kept off the web worker for deliverability + request-lifecycle
-reasons.
+route marks the campaign 'sending' synchronously; `run_cappe_campaign_send`
+freezes the recipient list into batches and fans out one
+`run_cappe_campaign_batch` per batch. The batch that finishes the last
+recipient finalizes the campaign to 'sent' with the real recipient count. Bulk
+send is kept off the web worker for deliverability + request-lifecycle
+reasons; the engine itself lives in app/cappe/services/campaign_delivery.py.
+
+Resuming is the same entry point: re-running `run_cappe_campaign_send` for a
+campaign still in 'sending' dispatches only the batches with unsent rows.
+`resume_stalled_cappe_campaigns` does that for any campaign whose delivery has
+made no progress in the stale window: on worker startup, and again one stale
+window later, when the claims a crash just orphaned have gone stale. A batch
+task that raises re-enqueues itself for the same moment, a bounded number of
+times.
 """
-import asyncio
 import logging
-import os
 
-from app.cappe.services.campaigns import deliverable_recipients, personalize_unsubscribe
+from app.cappe.services import campaign_delivery as delivery
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
-THROTTLE_SECONDS = 0.1
-
-
-def _unsubscribe_url(slug: str, token: str | None) -> str:
-    base = f"https://{os.getenv('CAPPE_BASE_DOMAIN', 'hey-matcha.com')}"
-    return f"{base}/api/cappe/public/sites/{slug}/unsubscribe/{token or ''}"
+# Countdown before a batch with failed sends tries them again.
+RETRY_FAILED_AFTER_SECONDS = 120
+# A batch that raised may have left claimed rows in 'sending'; its retry (and
+# the post-restart sweep) waits until those claims are stale and reclaimable.
+RESUME_AFTER_SECONDS = delivery.CLAIM_STALE_SECONDS + 60
+# Retries for a batch task that raised (DB error, bug) rather than failing sends.
+MAX_BATCH_ERRORS = 3
 
 
 async def _run(campaign_id: str) -> dict:
-    from app.core.services.email import EmailService
-
     conn = await get_db_connection()
     try:
-        camp = await conn.fetchrow(
-            """SELECT c.id, c.subject, c.body_html, c.from_name, c.status, c.site_id,
-                      s.slug, s.name AS site_name
-               FROM cappe_campaigns c JOIN cappe_sites s ON s.id = c.site_id
-               WHERE c.id = $1""",
-            campaign_id,
-        )
+        camp = await delivery.get_campaign(conn, campaign_id)
         if camp is None:
             return {"skipped": True, "reason": "not_found"}
         # Only campaigns the route has staged for sending proceed (avoids a stray
@@ -44,48 +45,88 @@ async def _run(campaign_id: str) -> dict:
         if camp["status"] != "sending":
             return {"skipped": True, "reason": f"status_{camp['status']}"}
 
-        subs = await conn.fetch(
-            "SELECT email, name, unsubscribe_token FROM cappe_subscribers "
-            "WHERE site_id = $1 AND status = 'subscribed'",
-            camp["site_id"],
-        )
-        recipients = deliverable_recipients(subs)
-
-        email_service = EmailService()
-        subject = camp["subject"] or f"News from {camp['site_name']}"
-        sent = 0
-        for r in recipients:
-            unsub = _unsubscribe_url(camp["slug"], r["unsubscribe_token"])
-            html = personalize_unsubscribe(camp["body_html"] or "", unsub)
-            text = f"View this message in an HTML email client.\n\nUnsubscribe: {unsub}"
-            try:
-                await email_service.send_email_with_fallback(
-                    to_email=r["email"], to_name=r["name"], subject=subject,
-                    html_content=html, text_content=text,
-                )
-                sent += 1
-            except Exception:
-                pass  # best-effort per recipient; one bad address shouldn't halt the blast
-            await asyncio.sleep(THROTTLE_SECONDS)
-
-        await conn.execute(
-            "UPDATE cappe_campaigns SET status = 'sent', sent_at = NOW(), "
-            "recipient_count = $1, updated_at = NOW() WHERE id = $2",
-            sent, campaign_id,
+        recipients = await delivery.materialize_recipients(conn, campaign_id, camp["site_id"])
+        batches = await delivery.open_batches(conn, campaign_id)
+        if not batches:
+            sent = await delivery.finalize_if_done(conn, campaign_id)
+            return {"recipients": recipients, "batches": 0, "sent": sent}
+    finally:
+        await conn.close()
+
+    for batch in batches:
+        run_cappe_campaign_batch.delay(str(campaign_id), batch)
+    return {"recipients": recipients, "batches": len(batches)}
+
+
+async def _run_batch(campaign_id: str, batch: int) -> tuple[dict, bool]:
+    from app.core.services.email import EmailService
+
+    email_service = EmailService()
+    conn = await get_db_connection()
+    try:
+        result = await delivery.deliver_batch(
+            conn, campaign_id, batch,
+            sender=email_service.send_email_with_fallback,
+            from_email=email_service.mailersend_from_email or email_service.from_email,
         )
-        return {"recipients": len(recipients), "sent": sent}
+        finalized = None if result.needs_followup else await delivery.finalize_if_done(conn, campaign_id)
+    finally:
+        await conn.close()
+    summary = {
+        "batch": batch, "claimed": result.claimed, "sent": result.sent,
+        "failed": result.failed, "deferred": result.deferred,
+    }
+    if finalized is not None:
+        summary["campaign_sent"] = finalized
+    return summary, result.needs_followup
+
+
+async def _resume_stalled() -> dict:
+    conn = await get_db_connection()
+    try:
+        stalled = await delivery.stalled_campaigns(conn)
     finally:
         await conn.close()
+    for campaign_id in stalled:
+        run_cappe_campaign_send.delay(str(campaign_id))
+    return {"resumed": len(stalled)}
 
 
 @celery_app.task(bind=True, max_retries=0)
 def run_cappe_campaign_send(self, campaign_id: str) -> dict:
-    """Deliver a Cappe newsletter campaign to its subscribers."""
-    print(f"[Cappe Campaign Send] Sending campaign {campaign_id}...")
+    """Start (or resume) delivering a Cappe newsletter campaign."""
+    print(f"[Cappe Campaign Send] Dispatching campaign {campaign_id}...")
     try:
-        result = asyncio.run(_run(campaign_id))
-        print(f"[Cappe Campaign Send] Completed: {result}")
+        result = run_async(_run(campaign_id))
+        print(f"[Cappe Campaign Send] Dispatched: {result}")
         return {"status": "success", **result}
     except Exception:
         logger.exception("[Cappe Campaign Send] Failed for campaign %s", campaign_id)
         raise
+
+
+@celery_app.task(bind=True, max_retries=0)
+def run_cappe_campaign_batch(self, campaign_id: str, batch: int, errors: int = 0) -> dict:
+    """Send one batch of a campaign; re-enqueues itself for deferred or failed rows."""
+    try:
+        summary, followup = run_async(_run_batch(campaign_id, batch))
+    except Exception:
+        logger.exception("[Cappe Campaign Send] Batch %s failed for campaign %s", batch, campaign_id)
+        if errors < MAX_BATCH_ERRORS:
+            run_cappe_campaign_batch.apply_async(
+                (campaign_id, batch), {"errors": errors + 1}, countdown=RESUME_AFTER_SECONDS,
+            )
+        raise
+    if followup:
+        countdown = 0 if summary["deferred"] else RETRY_FAILED_AFTER_SECONDS
+        run_cappe_campaign_batch.apply_async((campaign_id, batch), countdown=countdown)
+    return {"status": "success", **summary}
+
+
+@celery_app.task
+def resume_stalled_cappe_campaigns() -> dict:
+    """Re-dispatch campaigns whose batch tasks died mid-delivery."""
+    result = run_async(_resume_stalled())
+    if result["resumed"]:
+        print(f"[Cappe Campaign Send] Resumed {result['resumed']} stalled campaign(s)")
+    return result
@@ -1,12 +1,11 @@
 """Scheduled reconciliation for overdue Cappe collab deliverables."""
 
-import asyncio
 import logging
 
 from app.cappe.services import collab as collab_svc
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +37,7 @@ async def _run() -> dict:
 @celery_app.task(bind=True, max_retries=1)
 def run_cappe_collab_auto_approve(self) -> dict:
     try:
-        return {"status": "success", **asyncio.run(_run())}
+        return {"status": "success", **run_async(_run())}
     except Exception as exc:
         logger.exception("Cappe collab auto-approve failed")
         raise self.retry(exc=exc, countdown=60)
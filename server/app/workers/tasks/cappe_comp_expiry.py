@@ -12,11 +12,10 @@ again, and an account that has since started paying for real is skipped rather
 than downgraded.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +43,7 @@ async def _dispatch_cappe_comp_expiry() -> dict:
 def run_cappe_comp_expiry(self):
     """Return accounts with a lapsed comp to the free plan."""
     try:
-        return asyncio.run(_dispatch_cappe_comp_expiry())
+        return run_async(_dispatch_cappe_comp_expiry())
     except Exception as e:
         logger.exception("[Cappe Comps] Task failed")
         raise self.retry(exc=e, countdown=300)
@@ -1,12 +1,11 @@
 """Scheduled reconciliation for stranded Cappe domain registrations."""
 
-import asyncio
 import logging
 
 from app.cappe.services.domain_register import finalize_domain_registration
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +32,7 @@ async def _run() -> dict:
 @celery_app.task(bind=True, max_retries=1)
 def run_cappe_domain_finalize(self) -> dict:
     try:
-        return {"status": "success", **asyncio.run(_run())}
+        return {"status": "success", **run_async(_run())}
     except Exception as exc:
         logger.exception("Cappe domain finalization failed")
         raise self.retry(exc=exc, countdown=60)
@@ -11,11 +11,10 @@ Gated on `scheduler_settings.task_key = 'cappe_domain_renewals'`. Idempotent:
   so the hourly worker restart can't double-charge or hammer a declined card.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +103,7 @@ async def _dispatch_cappe_domain_renewals() -> dict:
 def run_cappe_domain_renewals(self):
     """Charge tenants for domains nearing expiry; lapse non-payers."""
     try:
-        return asyncio.run(_dispatch_cappe_domain_renewals())
+        return run_async(_dispatch_cappe_domain_renewals())
     except Exception as e:
         logger.exception("[Cappe Renewals] Task failed")
         raise self.retry(exc=e, countdown=300)
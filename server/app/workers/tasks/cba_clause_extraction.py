@@ -7,13 +7,12 @@ config is only seeded when the CBA has none yet (never clobbers HR edits) and is
 advisory until a human confirms it.
 """
 
-import asyncio
 import json
 import logging
 from uuid import UUID
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +111,7 @@ async def _extract(cba_id: str) -> dict:
 def run_cba_clause_extraction(self, cba_id: str):
     """Parse + AI-extract a stored CBA document into the clause library."""
     try:
-        return asyncio.run(_extract(cba_id))
+        return run_async(_extract(cba_id))
     except Exception as e:
         logger.exception("[CBA Extraction] Task error for %s", cba_id)
         raise self.retry(exc=e, countdown=60)
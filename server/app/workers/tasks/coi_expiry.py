@@ -7,11 +7,10 @@ already expired. `coi_tracking` is a paid flag in no tier overlay, so the stored
 enabled_features value is the merged value — safe to filter in SQL.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -94,7 +93,7 @@ async def _send_expiry_alert(company_id: str, cert) -> None:
 def run_coi_expiry_sweep(self):
     """Sweep certificates for upcoming/lapsed expiry and alert company admins."""
     try:
-        result = asyncio.run(_dispatch_coi_expiry())
+        result = run_async(_dispatch_coi_expiry())
         print(f"[COI Expiry] Completed: {result}")
         return result
     except Exception as e:
@@ -4,12 +4,11 @@ Celery task for compliance action reminders.
 Runs daily; emails assigned owners when their compliance action due date is approaching.
 """
 
-import asyncio
 import logging
 from datetime import date, timedelta
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -140,7 +139,7 @@ def run_compliance_action_reminders(self) -> dict:
     print("[Compliance Action Reminders] Running...")
 
     try:
-        result = asyncio.run(_run_compliance_action_reminders())
+        result = run_async(_run_compliance_action_reminders())
         print(f"[Compliance Action Reminders] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
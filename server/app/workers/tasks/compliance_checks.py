@@ -6,13 +6,12 @@ that restarts the Celery worker every 15 minutes. The worker_ready signal
 triggers the dispatcher, which enqueues individual checks for due locations.
 """
 
-import asyncio
 import logging
 from typing import Optional
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +152,7 @@ def run_compliance_check_task(
     print(f"[Worker] Starting compliance check for location {location_id} (type: {check_type})")
 
     try:
-        result = asyncio.run(_run_check(location_id, company_id, check_type))
+        result = run_async(_run_check(location_id, company_id, check_type))
 
         # Notify frontend via Redis pub/sub
         publish_task_complete(
@@ -190,7 +189,7 @@ def enqueue_scheduled_compliance_checks(self) -> dict:
     print("[Compliance Scheduler] Checking for due compliance checks...")
 
     try:
-        result = asyncio.run(_enqueue_due_checks())
+        result = run_async(_enqueue_due_checks())
         print(f"[Compliance Scheduler] Enqueued {result['enqueued']} checks")
         return {"status": "success", **result}
 
@@ -210,7 +209,7 @@ def run_deadline_escalation(self) -> dict:
     print("[Compliance Escalation] Running deadline escalation...")
 
     try:
-        result = asyncio.run(_run_escalation())
+        result = run_async(_run_escalation())
         print(f"[Compliance Escalation] Escalated {result['total_escalated']} deadlines across {result['companies_checked']} companies")
         return {"status": "success", **result}
 
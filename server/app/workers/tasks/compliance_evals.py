@@ -11,11 +11,11 @@ already completed recently. `MIN_SCHEDULED_INTERVAL_DAYS` is that guard; without
 it, enabling the row would run a full network sweep every hour.
 """
 
-import asyncio
 import logging
 from typing import List, Optional
 
 from ..celery_app import celery_app
+from ..utils import run_async
 from ..notifications import publish_task_complete, publish_task_error
 
 logger = logging.getLogger(__name__)
@@ -74,7 +74,7 @@ def run_compliance_evals(
         return {"status": "completed", "run_id": str(rid)}
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "compliance_evals", run_id or "", str(exc))
         raise
@@ -6,11 +6,10 @@ minutes); the dispatcher gates execution on `scheduler_settings.task_key
 where `expires_at <= NOW() AND status = 'active'`.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -34,7 +33,7 @@ async def _dispatch_discipline_expiry() -> dict:
 def run_discipline_expiry(self):
     """Sweep active discipline records past their expires_at to expired."""
     try:
-        result = asyncio.run(_dispatch_discipline_expiry())
+        result = run_async(_dispatch_discipline_expiry())
         return result
     except Exception as e:
         logger.exception("[Discipline Expiry] Task failed")
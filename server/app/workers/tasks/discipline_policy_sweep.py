@@ -27,12 +27,11 @@ Gated on scheduler_settings.task_key = 'discipline_policy_sweep' (seeded
 DISABLED, migration discipapp01).
 """
 
-import asyncio
 import json
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -343,7 +342,7 @@ def run_discipline_policy_sweep(self) -> dict:
     """Check recently-closed incidents against the company handbook."""
     print("[Discipline Policy Sweep] Running...")
     try:
-        result = asyncio.run(_run_discipline_policy_sweep())
+        result = run_async(_run_discipline_policy_sweep())
         print(f"[Discipline Policy Sweep] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
@@ -17,7 +17,7 @@ from typing import Any, Optional
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error, publish_task_progress
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -200,7 +200,7 @@ async def _run_timeline_analysis(case_id: str, model_override: Optional[str] = N
 def run_timeline_analysis(self, case_id: str, model_override: Optional[str] = None) -> dict[str, Any]:
     """Celery task for timeline analysis."""
     try:
-        result = asyncio.run(_run_timeline_analysis(case_id, model_override=model_override))
+        result = run_async(_run_timeline_analysis(case_id, model_override=model_override))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -294,7 +294,7 @@ async def _run_discrepancy_analysis(case_id: str, model_override: Optional[str]
 def run_discrepancy_analysis(self, case_id: str, model_override: Optional[str] = None) -> dict[str, Any]:
     """Celery task for discrepancy analysis."""
     try:
-        result = asyncio.run(_run_discrepancy_analysis(case_id, model_override=model_override))
+        result = run_async(_run_discrepancy_analysis(case_id, model_override=model_override))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -715,7 +715,7 @@ async def _run_policy_check(case_id: str, model_override: Optional[str] = None)
 def run_policy_check(self, case_id: str, model_override: Optional[str] = None) -> dict[str, Any]:
     """Celery task for policy check."""
     try:
-        result = asyncio.run(_run_policy_check(case_id, model_override=model_override))
+        result = run_async(_run_policy_check(case_id, model_override=model_override))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -826,7 +826,7 @@ async def _generate_summary_report(case_id: str, generated_by: str) -> dict[str,
 def generate_summary_report(self, case_id: str, generated_by: str) -> dict[str, Any]:
     """Celery task for summary report generation."""
     try:
-        result = asyncio.run(_generate_summary_report(case_id, generated_by))
+        result = run_async(_generate_summary_report(case_id, generated_by))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -925,7 +925,7 @@ def generate_determination_letter(
 ) -> dict[str, Any]:
     """Celery task for determination letter generation."""
     try:
-        result = asyncio.run(_generate_determination_letter(case_id, determination, generated_by))
+        result = run_async(_generate_determination_letter(case_id, determination, generated_by))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -4,14 +4,14 @@ Celery tasks for ER document processing.
 Handles document parsing, PII scrubbing, chunking, and embedding generation.
 """
 
-import asyncio
 import json
 import logging
 from typing import Any
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error, publish_task_progress
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
+from app.database.vector import ensure_vector_codec
 
 logger = logging.getLogger(__name__)
 
@@ -156,6 +156,8 @@ async def _process_document(document_id: str, case_id: str) -> dict[str, Any]:
                 message="Generating embeddings...",
             )
             try:
+                # Embeddings go over the binary vector codec as plain lists.
+                await ensure_vector_codec(conn)
                 # Chunks are only useful with their embeddings, so keep the
                 # all-or-nothing guarantee: a mid-way embedding failure rolls
                 # back every chunk written for this document.
@@ -170,30 +172,30 @@ async def _process_document(document_id: str, case_id: str) -> dict[str, Any]:
                                 f"Embedding count {len(embeddings)} != chunk count {len(batch)}"
                             )
 
-                        for chunk, embedding in zip(batch, embeddings):
-                            # Try to find speaker for this chunk
-                            speaker = speaker_map.get(chunk.get("line_start"))
-
-                            # Convert embedding list to string format for pgvector
-                            embedding_str = "[" + ",".join(str(x) for x in embedding) + "]"
-                            await conn.execute(
-                                """
-                                INSERT INTO er_evidence_chunks
-                                (document_id, case_id, chunk_index, content, speaker, page_number, line_start, line_end, embedding, metadata)
-                                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10::jsonb)
-                                """,
-                                document_id,
-                                case_id,
-                                chunk["chunk_index"],
-                                chunk["content"],
-                                speaker,
-                                None,  # page_number - could be extracted from PDF
-                                chunk.get("line_start"),
-                                chunk.get("line_end"),
-                                embedding_str,
-                                json.dumps({"char_start": chunk.get("char_start")}),
-                            )
-                            chunks_created += 1
+                        await conn.executemany(
+                            """
+                            INSERT INTO er_evidence_chunks
+                            (document_id, case_id, chunk_index, content, speaker, page_number, line_start, line_end, embedding, metadata)
+                            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10::jsonb)
+                            """,
+                            [
+                                (
+                                    document_id,
+                                    case_id,
+                                    chunk["chunk_index"],
+                                    chunk["content"],
+                                    # Try to find speaker for this chunk
+                                    speaker_map.get(chunk.get("line_start")),
+                                    None,  # page_number - could be extracted from PDF
+                                    chunk.get("line_start"),
+                                    chunk.get("line_end"),
+                                    embedding,
+                                    json.dumps({"char_start": chunk.get("char_start")}),
+                                )
+                                for chunk, embedding in zip(batch, embeddings)
+                            ],
+                        )
+                        chunks_created += len(batch)
 
                         del embeddings
 
@@ -280,7 +282,7 @@ class _ERDocumentTask(celery_app.Task):
 
         error = f"{type(exc).__name__}: {exc}"
         try:
-            asyncio.run(_mark_document_failed(document_id, error))
+            run_async(_mark_document_failed(document_id, error))
         except Exception:  # pragma: no cover - best effort, never mask the original failure
             pass
 
@@ -311,7 +313,7 @@ def process_er_document(self, document_id: str, case_id: str) -> dict[str, Any]:
         Processing result with chunk count and metadata.
     """
     try:
-        result = asyncio.run(_process_document(document_id, case_id))
+        result = run_async(_process_document(document_id, case_id))
 
         publish_task_complete(
             channel=f"er_case:{case_id}",
@@ -370,7 +372,7 @@ def reset_stale_er_documents() -> dict[str, Any]:
     mid-flight at that moment, and the age threshold guards against racing a
     long-running task anyway.
     """
-    reset = asyncio.run(_reset_stale_documents())
+    reset = run_async(_reset_stale_documents())
     if reset:
         print(f"[Worker] Reset {reset} stale ER document(s) from 'processing' to 'failed'")
     return {"status": "success", "reset": reset}
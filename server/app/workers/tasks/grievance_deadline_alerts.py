@@ -8,12 +8,11 @@ HR owner + steward, flips truly-missed steps to `missed_deadline`, and marks the
 alert as sent so a re-fire won't re-notify.
 """
 
-import asyncio
 import html as html_lib
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -137,7 +136,7 @@ async def _dispatch() -> dict:
 def run_grievance_deadline_alerts(self):
     """Sweep active grievance steps near/past deadline; email + mark missed."""
     try:
-        return asyncio.run(_dispatch())
+        return run_async(_dispatch())
     except Exception as e:
         logger.exception("[Grievance Deadlines] Task failed")
         raise self.retry(exc=e, countdown=120)
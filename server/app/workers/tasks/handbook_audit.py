@@ -10,10 +10,10 @@ Delete this file once the prod Redis queue has drained (typically within
 an hour of the deploy that swaps the route to BackgroundTasks).
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
+from ..utils import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +36,7 @@ def analyze_handbook_audit(self, report_id: str):
     )
     try:
         from app.core.services.handbook_audit_service import run_handbook_audit
-        asyncio.run(run_handbook_audit(report_id))
+        run_async(run_handbook_audit(report_id))
     except Exception as exc:
         logger.exception("shim run_handbook_audit failed report_id=%s: %s", report_id, exc)
         # Don't retry — the BackgroundTasks path is the canonical one now.
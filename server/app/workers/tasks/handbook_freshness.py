@@ -5,13 +5,12 @@ These tasks check published handbooks for stale content on a schedule
 via the systemd timer that restarts the Celery worker every 15 minutes.
 """
 
-import asyncio
 import logging
 from typing import Optional
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -148,7 +147,7 @@ async def _send_freshness_notification(company_id: str, handbook_id: str, impact
 def run_handbook_freshness_checks(self):
     """Dispatch handbook freshness checks for all active handbooks."""
     try:
-        result = asyncio.run(_dispatch_freshness_checks())
+        result = run_async(_dispatch_freshness_checks())
         print(f"[Handbook Freshness] Completed: {result}")
         return result
     except Exception as e:
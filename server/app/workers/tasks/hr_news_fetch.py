@@ -4,11 +4,10 @@ Wraps app.core.services.hr_news_service.refresh_feeds() so the periodic
 worker can pull fresh items in addition to the on-demand admin trigger.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +27,7 @@ def run_hr_news_fetch(self) -> dict:
     """Pull latest items from configured HR news RSS feeds."""
     print("[HR News Fetch] Starting refresh...")
     try:
-        result = asyncio.run(_run_refresh())
+        result = run_async(_run_refresh())
         print(f"[HR News Fetch] Completed: {result}")
         return {"status": "success", **result}
     except Exception as e:
@@ -30,13 +30,12 @@ hrpush01). Idempotency lives in hr_proactive_push_log — see `_already_pushed`
 for why the two dedupe shapes differ.
 """
 
-import asyncio
 import json
 import logging
 from datetime import date, timedelta
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from .leave_deadline_checks import FMLA_LEAVE_TYPES
 
 logger = logging.getLogger(__name__)
@@ -613,7 +612,7 @@ def run_hr_proactive_push(self) -> dict:
     """Open pre-briefed HR Pilot threads ahead of upcoming HR events."""
     print("[HR Proactive Push] Running...")
     try:
-        result = asyncio.run(_run_hr_proactive_push())
+        result = run_async(_run_hr_proactive_push())
         print(f"[HR Proactive Push] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
@@ -5,7 +5,6 @@ These tasks are queued after a WebSocket interview ends, allowing the server
 to return immediately while analysis runs in the background.
 """
 
-import asyncio
 import json
 import logging
 from typing import Any, Optional
@@ -13,7 +12,7 @@ from uuid import UUID as _UUID
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -374,7 +373,7 @@ def analyze_interview_async(
     print(f"[Worker] Starting analysis for interview {interview_id} (type: {interview_type})")
 
     try:
-        result = asyncio.run(
+        result = run_async(
             _analyze_interview(
                 interview_id=interview_id,
                 interview_type=interview_type,
@@ -19,12 +19,11 @@ irdl01). Idempotent: CAPA dedupes on ir_corrective_actions.reminder_sent_at;
 sweeps 2–5 dedupe via ir_deadline_alert_log (incident_id, alert_kind, sent_on).
 """
 
-import asyncio
 import logging
 from datetime import date, timedelta
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from app.core.services.company_contacts import get_company_admin_contacts
 
 logger = logging.getLogger(__name__)
@@ -458,7 +457,7 @@ def run_ir_deadline_alerts(self) -> dict:
     """Scan IR incidents + corrective actions and send deadline/SLA reminders."""
     print("[IR Deadline Alerts] Running...")
     try:
-        result = asyncio.run(_run_ir_deadline_alerts())
+        result = run_async(_run_ir_deadline_alerts())
         print(f"[IR Deadline Alerts] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
@@ -4,11 +4,10 @@ Celery tasks for scheduled LeaveAgent orchestration.
 This scheduler runs periodic return-to-work and accommodation stall checks.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +43,7 @@ def run_leave_agent_orchestration(self) -> dict:
     print("[Leave Agent] Running scheduled orchestration...")
 
     try:
-        result = asyncio.run(_run_leave_agent_orchestration())
+        result = run_async(_run_leave_agent_orchestration())
         print(f"[Leave Agent] Completed: {result}")
         return {"status": "success", **result}
 
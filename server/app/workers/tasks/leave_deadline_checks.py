@@ -5,13 +5,12 @@ check_leave_deadlines — runs on worker startup to escalate overdue deadlines.
 create_leave_deadlines — called when a leave request is approved to seed deadlines.
 """
 
-import asyncio
 import logging
 from datetime import date, timedelta
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -216,7 +215,7 @@ def check_leave_deadlines(self) -> dict:
     print("[Leave Deadlines] Checking for overdue leave deadlines...")
 
     try:
-        result = asyncio.run(_check_deadlines())
+        result = run_async(_check_deadlines())
         print(
             f"[Leave Deadlines] Checked {result['checked']} deadlines: "
             f"{result['warnings']} warnings, {result['overdue']} overdue, "
@@ -235,7 +234,7 @@ def create_leave_deadlines(self, leave_request_id: str) -> dict:
     print(f"[Leave Deadlines] Creating deadlines for leave request {leave_request_id}")
 
     try:
-        result = asyncio.run(_create_deadlines(leave_request_id))
+        result = run_async(_create_deadlines(leave_request_id))
         print(f"[Leave Deadlines] Created {result['created']} deadlines for {leave_request_id}")
         return {"status": "success", **result}
 
@@ -8,13 +8,12 @@ bucket) — no new table. Gated by the `legal_deadline_reminders`
 scheduler_settings row, default disabled (repo convention).
 """
 
-import asyncio
 import json
 import logging
 from datetime import date
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -129,7 +128,7 @@ def run_legal_deadline_reminders(self) -> dict:
     """Scan active legal matters and nudge owners near their response deadline."""
     print("[Legal Deadline Reminders] Running...")
     try:
-        result = asyncio.run(_run_legal_deadline_reminders())
+        result = run_async(_run_legal_deadline_reminders())
         print(f"[Legal Deadline Reminders] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
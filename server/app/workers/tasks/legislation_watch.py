@@ -6,11 +6,10 @@ and processes RSS feeds from state DOL/legislature sites to detect
 upcoming legislation changes.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +39,7 @@ def run_legislation_watch(self) -> dict:
     print("[Legislation Watch] Starting RSS monitoring...")
 
     try:
-        result = asyncio.run(_run_legislation_watch())
+        result = run_async(_run_legislation_watch())
         print(f"[Legislation Watch] Completed: {result}")
         return {"status": "success", **result}
 
@@ -15,12 +15,11 @@ Scheduler-gated on `scheduler_settings.task_key = 'location_fips_backfill'`, see
 DISABLED (makes live Census calls; an admin enables it deliberately). `force=True`
 is the manual Trigger — runs even when disabled, same as the other sweeps.
 """
-import asyncio
 import logging
 from typing import Any, Dict
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -168,7 +167,7 @@ def run_location_fips_backfill(self, force: bool = False) -> Dict[str, Any]:
     """Geocode a batch of business locations to FIPS anchors. Re-fires on worker
     startup; gated by the (disabled-by-default) scheduler row."""
     try:
-        result = asyncio.run(_backfill(force=force))
+        result = run_async(_backfill(force=force))
         print(f"[FIPS Backfill] {result}")
         return result
     except Exception as e:
@@ -9,13 +9,12 @@ Categories are researched sequentially (concurrency=1) to maximise
 accuracy and avoid Gemini rate-limit pressure.
 """
 
-import asyncio
 import logging
 from uuid import UUID
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error, publish_task_progress
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +61,7 @@ def run_medical_compliance_research(self, jurisdiction_id: str) -> dict:
     print(f"[Worker] Starting medical compliance research for jurisdiction {jurisdiction_id}")
 
     try:
-        result = asyncio.run(_run_medical_compliance_research(jurisdiction_id))
+        result = run_async(_run_medical_compliance_research(jurisdiction_id))
 
         publish_task_complete(
             channel="admin:medical_compliance_research",
@@ -7,7 +7,6 @@ without a fresh heartbeat get an email. A throttle key per (user, channel)
 prevents flooding during bursty conversations.
 """
 
-import asyncio
 import html as _html
 import logging
 from typing import Optional
@@ -15,7 +14,7 @@ from typing import Optional
 import redis.asyncio as aioredis
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -36,7 +35,7 @@ def send_mention_email(
 ):
     """Sync entry-point invoked via .delay() from the WS message handler."""
     try:
-        asyncio.run(_send_mention_email_async(
+        run_async(_send_mention_email_async(
             message_id=message_id,
             channel_id=channel_id,
             sender_id=sender_id,
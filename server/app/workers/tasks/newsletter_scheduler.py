@@ -11,12 +11,11 @@ Idempotent — only operates on rows where
 and the claim is a single UPDATE so two beats can't double-send.
 """
 
-import asyncio
 import logging
 from uuid import UUID
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -80,7 +79,7 @@ async def _dispatch_newsletter_scheduler() -> dict:
 def run_newsletter_scheduler(self):
     """Dispatch any newsletters whose scheduled_at has elapsed."""
     try:
-        return asyncio.run(_dispatch_newsletter_scheduler())
+        return run_async(_dispatch_newsletter_scheduler())
     except Exception as e:
         logger.exception("[Newsletter Scheduler] Task failed")
         raise self.retry(exc=e, countdown=120)
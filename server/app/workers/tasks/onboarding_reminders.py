@@ -4,7 +4,6 @@ Celery task for onboarding reminders and escalation emails.
 Runs on worker startup when the onboarding_reminders scheduler is enabled.
 """
 
-import asyncio
 import logging
 from datetime import datetime, timezone
 
@@ -22,7 +21,7 @@ from app.matcha.services.onboarding.onboarding_reminder_logic import (
 )
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -291,7 +290,7 @@ def run_onboarding_reminders(self) -> dict:
     print("[Onboarding Reminders] Running scheduler...")
 
     try:
-        result = asyncio.run(_run_onboarding_reminders())
+        result = run_async(_run_onboarding_reminders())
         print(f"[Onboarding Reminders] Completed: {result}")
         return {"status": "success", **result}
     except Exception as exc:
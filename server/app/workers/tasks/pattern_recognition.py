@@ -6,11 +6,10 @@ and detects coordinated legislative changes across jurisdictions, flagging
 stale jurisdictions that may need review.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +39,7 @@ def run_pattern_recognition(self) -> dict:
     print("[Pattern Recognition] Starting pattern detection...")
 
     try:
-        result = asyncio.run(_run_pattern_recognition())
+        result = run_async(_run_pattern_recognition())
         print(f"[Pattern Recognition] Completed: {result}")
         return {"status": "success", **result}
 
@@ -1,6 +1,5 @@
 """Scheduled sync for connected POS providers."""
 
-import asyncio
 import logging
 from datetime import date, datetime, timedelta, timezone as dt_timezone
 from zoneinfo import ZoneInfo
@@ -9,7 +8,7 @@ from app.core.feature_flags import merge_company_features
 from app.matcha.services.inventory.pos.sync import sync_pos_connection
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 
 logger = logging.getLogger(__name__)
@@ -93,4 +92,4 @@ async def _run() -> dict:
 
 @celery_app.task(bind=True, max_retries=3)
 def run_pos_sales_sync(self):
-    return asyncio.run(_run())
+    return run_async(_run())
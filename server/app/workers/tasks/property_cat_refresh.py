@@ -11,12 +11,11 @@ All hazard fetching is best-effort inside ``property_cat`` (never raises per
 building); this task only owns scheduling + the per-cycle cap.
 """
 
-import asyncio
 import logging
 from uuid import UUID
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +59,7 @@ async def _refresh(building_id=None, cap: int = _DEFAULT_CAP) -> dict:
 def refresh_property_cat(self, building_id=None) -> dict:
     """Geocode + refresh catastrophe hazard for one building or a periodic batch."""
     try:
-        result = asyncio.run(_refresh(building_id))
+        result = run_async(_refresh(building_id))
         print(f"[Property Cat] Refresh complete: {result}")
         return {"status": "success", **result}
     except Exception as e:  # noqa: BLE001
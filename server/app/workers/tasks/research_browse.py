@@ -9,7 +9,7 @@ from uuid import UUID
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error, publish_task_progress
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -301,7 +301,7 @@ def run_research_browse(
         return result
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
 
         publish_task_complete(
             channel=channel,
@@ -319,7 +319,7 @@ def run_research_browse(
             "error": str(exc)[:500],
         }
         try:
-            asyncio.run(_save_research_result(project_id, task_id, input_id, error_result))
+            run_async(_save_research_result(project_id, task_id, input_id, error_result))
         except Exception as save_exc:
             logger.warning("Failed to save error result for %s: %s", input_id, save_exc)
 
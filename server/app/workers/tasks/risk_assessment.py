@@ -7,7 +7,6 @@ individual tasks. Unlike manual runs, scheduled assessments skip the
 expensive Gemini recommendations call.
 """
 
-import asyncio
 import json
 import logging
 from dataclasses import asdict
@@ -15,7 +14,7 @@ from typing import Optional
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -158,7 +157,7 @@ def run_risk_assessment_task(self, company_id: str) -> dict:
     print(f"[Worker] Starting risk assessment for company {company_id}")
 
     try:
-        result = asyncio.run(_run_assessment(company_id))
+        result = run_async(_run_assessment(company_id))
 
         publish_task_complete(
             channel=f"company:{company_id}",
@@ -194,7 +193,7 @@ def enqueue_scheduled_risk_assessments(self) -> dict:
     print("[Risk Assessment Scheduler] Checking for due risk assessments...")
 
     try:
-        result = asyncio.run(_enqueue_due_assessments())
+        result = run_async(_enqueue_due_assessments())
         print(f"[Risk Assessment Scheduler] Enqueued {result['enqueued']} assessments")
         return {"status": "success", **result}
 
@@ -213,7 +212,7 @@ def refresh_company_risk_assessment(self, company_id: str):
     from app.matcha.services.risk_analytics.risk_assessment_service.refresh import refresh_risk_snapshot
 
     try:
-        asyncio.run(refresh_risk_snapshot(UUID(company_id)))
+        run_async(refresh_risk_snapshot(UUID(company_id)))
         return {"company_id": company_id, "status": "success"}
     except Exception as e:
         logger.exception("[Risk Refresh] Failed for company %s", company_id)
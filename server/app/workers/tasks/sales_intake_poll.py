@@ -1,6 +1,5 @@
 """Poll the dedicated POS Gmail inbox for itemized sales exports."""
 
-import asyncio
 import logging
 
 from app.core.feature_flags import merge_company_features
@@ -8,7 +7,7 @@ from app.matcha.services.inventory import sales_commit, sales_mailbox, sales_map
 from app.matcha.services.matcha_work.gmail_service import GmailMailboxService
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -87,4 +86,4 @@ async def _run() -> dict:
 
 @celery_app.task(bind=True, max_retries=3)
 def run_sales_intake_poll(self):
-    return asyncio.run(_run())
+    return run_async(_run())
@@ -1,12 +1,11 @@
 """Idempotent daily break and shift-note delivery for schedule locations."""
 
-import asyncio
 import logging
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_enabled, scheduler_settings_row, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +69,6 @@ def _location_date(timezone_name: str | None):
 @celery_app.task(name="schedule_daily_digest.send", bind=True, max_retries=1)
 def send_schedule_daily_digest(self):
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as exc:
         raise self.retry(exc=exc, countdown=120)
@@ -3,12 +3,11 @@
 This task intentionally never removes assignments. Managers decide removal or
 provide an explicit, audited acknowledgement through the scheduling API.
 """
-import asyncio
 import logging
 from datetime import date
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 from app.matcha.services.scheduling.schedule_eligibility import open_expired_eligibility_cases
 
 logger = logging.getLogger(__name__)
@@ -62,7 +61,7 @@ async def _send_removal_requested_email(conn, case_id) -> None:
 @celery_app.task(name="schedule_eligibility.run", bind=True, max_retries=1)
 def run_schedule_eligibility(self):
     try:
-        return asyncio.run(_dispatch())
+        return run_async(_dispatch())
     except Exception as exc:
         logger.exception("Schedule eligibility reconciliation failed")
         raise self.retry(exc=exc, countdown=60)
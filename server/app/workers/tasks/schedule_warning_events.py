@@ -1,10 +1,9 @@
 """Reconcile schedule competency warnings into EMS."""
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +34,7 @@ async def _run_schedule_warning_sweep() -> dict:
 @celery_app.task(name="schedule_warning_events.reconcile", bind=True, max_retries=1)
 def reconcile_schedule_warning_events_task(self):
     try:
-        return asyncio.run(_run_schedule_warning_sweep())
+        return run_async(_run_schedule_warning_sweep())
     except Exception as exc:
         logger.exception("Schedule warning EMS sweep failed")
         raise self.retry(exc=exc, countdown=120)
@@ -15,11 +15,11 @@ is enabled (seeded disabled by `scoperg02`). A scheduled ingest declines on
 its own if one completed recently, so enabling the row doesn't re-crawl .gov
 every hour; the research cycle is capped per-run by MAX_UNITS_PER_CYCLE.
 """
-import asyncio
 import logging
 from typing import Optional
 
 from ..celery_app import celery_app
+from ..utils import run_async
 from ..notifications import publish_task_complete, publish_task_error
 
 logger = logging.getLogger(__name__)
@@ -132,7 +132,7 @@ def ingest_authority_index(index_slug: Optional[str] = None, trigger_source: str
                 logger.warning("[scope_registry] body-fetch dispatch failed for %s: %s", r.get("slug"), exc)
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "scope_registry", index_slug or "all", str(exc))
         raise
@@ -162,7 +162,7 @@ def fetch_authority_bodies(index_slug: str, triggered_by: Optional[str] = None):
             await conn.close()
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "scope_registry_bodies", index_slug, str(exc))
         raise
@@ -195,7 +195,7 @@ def classify_authority_index(index_slug: str, triggered_by: Optional[str] = None
             await conn.close()
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "scope_registry_classify", index_slug, str(exc))
         raise
@@ -225,7 +225,7 @@ def propose_index_keys(index_slug: str, triggered_by: Optional[str] = None):
             await conn.close()
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "scope_registry_propose_keys", index_slug, str(exc))
         raise
@@ -288,7 +288,7 @@ def run_scheduled_research_cycle():
             await conn.close()
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "scope_registry_research", "scheduled", str(exc))
         raise
@@ -24,6 +24,7 @@ import logging
 from typing import Optional
 
 from ..celery_app import celery_app
+from ..utils import run_async
 from ..notifications import publish_task_complete, publish_task_error
 
 logger = logging.getLogger(__name__)
@@ -124,7 +125,7 @@ def backfill_source_snapshots(
             await conn.close()
 
     try:
-        result = asyncio.run(_run())
+        result = run_async(_run())
     except Exception as exc:
         publish_task_error(CHANNEL, "source_snapshots", scope, str(exc))
         raise
@@ -6,11 +6,10 @@ and fetches data from authoritative structured sources (CSV, HTML tables)
 for the highest-trust compliance data layer.
 """
 
-import asyncio
 import logging
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection
+from ..utils import get_db_connection, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +42,7 @@ def fetch_structured_data_sources(self) -> dict:
     print("[Structured Data Fetch] Starting Tier 1 data refresh...")
 
     try:
-        result = asyncio.run(_run_structured_data_fetch())
+        result = run_async(_run_structured_data_fetch())
         print(f"[Structured Data Fetch] Completed: {result}")
         return {"status": "success", **result}
 
@@ -0,0 +1,38 @@
+"""Celery task: drop Tell-Us friend-feed inbox rows past the feed window.
+
+Feed reads already ignore anything older than the window; this only keeps
+`tellus_activity_inbox` from growing forever. Gated on
+`scheduler_settings.task_key = 'tellus_activity_inbox_prune'` and fails open
+(a missing row still prunes), since it deletes nothing a reader can see.
+"""
+
+import logging
+
+from app.tellus.services.activity_inbox_service import prune_expired
+
+from ..celery_app import celery_app
+from ..utils import get_db_connection, run_async, scheduler_enabled
+
+logger = logging.getLogger(__name__)
+
+
+async def _run() -> dict:
+    conn = await get_db_connection()
+    try:
+        if not await scheduler_enabled(conn, "tellus_activity_inbox_prune", default=True):
+            return {"pruned": 0, "skipped": True}
+        pruned = await prune_expired(conn)
+    finally:
+        await conn.close()
+    print(f"[Tellus Feed] pruned={pruned}")
+    return {"pruned": pruned}
+
+
+@celery_app.task(bind=True, max_retries=1)
+def run_tellus_activity_inbox_prune(self) -> dict:
+    """Delete inbox rows older than the friend-feed window."""
+    try:
+        return {"status": "success", **run_async(_run())}
+    except Exception as exc:
+        logger.exception("[Tellus Feed] Inbox prune failed")
+        raise self.retry(exc=exc, countdown=300)
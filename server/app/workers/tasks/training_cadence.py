@@ -17,12 +17,11 @@ via the systemd timer.
 After each insert batch, fans out assignment emails (best-effort).
 """
 
-import asyncio
 import logging
 from datetime import date, timedelta
 
 from ..celery_app import celery_app
-from ..utils import get_db_connection, scheduler_settings_row
+from ..utils import get_db_connection, scheduler_settings_row, run_async
 from app.core.feature_flags import get_company_features
 from app.matcha.services.training.training_assignment import resolve_audience, assign_training
 
@@ -248,7 +247,7 @@ async def _dispatch_training_cadence() -> dict:
 def run_training_cadence(self):
     """Dispatch CA SB 1343 cadence assignments."""
     try:
-        return asyncio.run(_dispatch_training_cadence())
+        return run_async(_dispatch_training_cadence())
     except Exception as e:
         logger.exception("[Training Cadence] Task failed")
         raise self.retry(exc=e, countdown=120)
@@ -38,7 +38,7 @@ from typing import Any, Dict, List
 
 from ..celery_app import celery_app
 from ..notifications import publish_task_complete, publish_task_error
-from ..utils import get_db_connection, scheduler_enabled
+from ..utils import get_db_connection, scheduler_enabled, run_async
 
 logger = logging.getLogger(__name__)
 
@@ -65,12 +65,11 @@ MAX_COMPANIES_PER_CYCLE = 25
 async def _worker_conn():
     """Connection FACTORY for `vertical_coverage.fill`.
 
-    Workers are deliberately pool-free (see the NOTE in celery_app.py): each task
-    runs its own `asyncio.run()` loop, and an asyncpg pool bound to one loop can't
-    be reused from another — so `app.database.get_connection` raises here. `fill`
-    takes a factory precisely so it can borrow a connection per research call
-    rather than pin one across the whole sweep, and this shim satisfies that
-    contract with a raw per-call connection.
+    Workers don't have the app pool (see the NOTE in celery_app.py), so
+    `app.database.get_connection` raises here. `fill` takes a factory precisely
+    so it can borrow a connection per research call rather than pin one across
+    the whole sweep, and this shim satisfies that contract with a per-call
+    connection from `get_db_connection` (pooled on the worker loop).
     """
     conn = await get_db_connection()
     try:
@@ -339,7 +338,7 @@ async def _dispatch(force: bool = False) -> Dict[str, Any]:
 def run_vertical_coverage_sweep(self, force: bool = False):
     """Reclaim wedged cells, then fill outstanding vertical coverage."""
     try:
-        result = asyncio.run(_dispatch(force=force))
+        result = run_async(_dispatch(force=force))
     except Exception as exc:
         publish_task_error(CHANNEL, "vertical_coverage_sweep", "scheduled", str(exc))
         logger.exception("[Vertical Sweep] Task failed")
@@ -1,15 +1,44 @@
-"""Shared utilities for Celery worker tasks."""
+"""Shared utilities for Celery worker tasks.
 
+Worker runtime: `start_worker_runtime()` (from `worker_process_init`) gives
+each worker process one persistent event loop, and `run_async()` runs task
+bodies on it instead of a fresh `asyncio.run()` loop per task. Because the
+loop outlives the task, `get_db_connection()` can hand out connections from
+a small per-process asyncpg pool bound to it — a reminder sweep no longer
+pays a TLS handshake + auth for every connection it opens. Off that loop
+(the parent process, `asyncio.run()` inside an executor thread) everything
+falls back to a raw connection exactly as before.
+"""
+
+import asyncio
+import contextlib
 import json
+import logging
 import os
 import ssl as _ssl
-from typing import Any
+import threading
+from typing import Any, Awaitable, Optional, TypeVar
 
 import asyncpg
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+WORKER_DB_POOL_MIN = int(os.getenv("WORKER_DB_POOL_MIN", "1"))
+WORKER_DB_POOL_MAX = int(os.getenv("WORKER_DB_POOL_MAX", "4"))
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread_id: Optional[int] = None
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock: Optional[asyncio.Lock] = None
+# Pooled connections handed out and not yet closed. Released after each task
+# so a caller that forgets `conn.close()` can't drain the pool.
+_checked_out: set["_PooledConnection"] = set()
+
 
 def _make_ssl_context(mode: str):
     """Build an SSL context for asyncpg based on the requested mode."""
@@ -25,13 +54,175 @@ def _make_ssl_context(mode: str):
     return None
 
 
-async def get_db_connection() -> asyncpg.Connection:
-    """Create a database connection for the worker."""
+def _database_url() -> str:
     database_url = os.getenv("DATABASE_URL", "").strip().strip('"')
     if not database_url:
         raise RuntimeError("DATABASE_URL environment variable not set")
+    return database_url
+
+
+class _PooledConnection:
+    """A pool connection that behaves like the raw one callers expect.
+
+    Every task does `conn = await get_db_connection()` ... `await conn.close()`;
+    here `close()` returns the connection to the pool (asyncpg resets session
+    state on release) instead of closing the socket. Everything else is
+    delegated to the pool's connection proxy.
+    """
+
+    __slots__ = ("_pool", "_proxy", "_released")
+
+    def __init__(self, pool: asyncpg.Pool, proxy):
+        self._pool = pool
+        self._proxy = proxy
+        self._released = False
+        _checked_out.add(self)
+
+    def __getattr__(self, name):
+        return getattr(self._proxy, name)
+
+    def is_closed(self) -> bool:
+        return self._released or self._proxy.is_closed()
+
+    async def close(self, *, timeout: Optional[float] = None) -> None:
+        if self._released:
+            return
+        self._released = True
+        _checked_out.discard(self)
+        await self._pool.release(self._proxy, timeout=timeout)
+
+
+async def _worker_pool() -> Optional[asyncpg.Pool]:
+    """This process's pool, created on first use — only on the worker loop."""
+    global _pool, _pool_lock
+    if _loop is None or asyncio.get_running_loop() is not _loop:
+        return None
+    if _pool is not None:
+        return _pool
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            from app.database import register_vector_codec
+            from app.database.pool import register_worker_pool
+
+            _pool = await asyncpg.create_pool(
+                _database_url(),
+                min_size=WORKER_DB_POOL_MIN,
+                max_size=WORKER_DB_POOL_MAX,
+                max_inactive_connection_lifetime=300,
+                ssl=_make_ssl_context(os.getenv("DATABASE_SSL", "disable")),
+                init=register_vector_codec,
+            )
+            register_worker_pool(_pool, _loop)
+            logger.info("[Worker] DB pool ready (max %d)", WORKER_DB_POOL_MAX)
+    return _pool
+
+
+async def get_db_connection() -> asyncpg.Connection:
+    """A database connection for the worker.
+
+    Pooled on the worker loop (see `run_async`), a fresh raw connection
+    anywhere else. Either way the caller closes it when done.
+    """
+    pool = await _worker_pool()
+    if pool is not None:
+        return _PooledConnection(pool, await pool.acquire())
     ssl_ctx = _make_ssl_context(os.getenv("DATABASE_SSL", "disable"))
-    return await asyncpg.connect(database_url, ssl=ssl_ctx)
+    return await asyncpg.connect(_database_url(), ssl=ssl_ctx)
+
+
+def start_worker_runtime() -> None:
+    """Create this worker process's persistent event loop.
+
+    Called from `worker_process_init`, i.e. in the forked child, so the loop
+    (and later the pool) never crosses a fork. The pool itself is opened
+    lazily by the first task that asks for a connection.
+    """
+    global _loop, _loop_thread_id
+    if _loop is not None and not _loop.is_closed():
+        return
+    _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    _loop_thread_id = threading.get_ident()
+
+
+def stop_worker_runtime() -> None:
+    """Close the pool and the loop (from `worker_process_shutdown`)."""
+    global _loop, _pool, _pool_lock
+    loop = _loop
+    if loop is None or loop.is_closed():
+        return
+    try:
+        if _pool is not None:
+            loop.run_until_complete(asyncio.wait_for(_pool.close(), timeout=5))
+    except Exception:
+        logger.warning("[Worker] DB pool did not close cleanly", exc_info=True)
+    finally:
+        from app.database.pool import register_worker_pool
+
+        register_worker_pool(None, None)
+        _pool = None
+        _pool_lock = None
+        _loop = None
+        loop.close()
+
+
+async def _release_leaked() -> None:
+    for conn in list(_checked_out):
+        logger.warning("[Worker] Releasing a connection the task never closed")
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+
+def _cancel_leftover_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    # What asyncio.run() does on the way out: a task body's fire-and-forget
+    # tasks must not sleep on the shared loop and wake up inside a later,
+    # unrelated task (or hold a pooled connection across it).
+    pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+    if not pending:
+        return
+    for t in pending:
+        t.cancel()
+    results = loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    for t, result in zip(pending, results):
+        if isinstance(result, Exception):
+            logger.warning("[Worker] Leftover task %r failed: %r", t.get_name(), result)
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Drop-in replacement for `asyncio.run()` in task bodies.
+
+    Runs on the process's persistent loop when called from the thread that
+    owns it; otherwise (no runtime started, a loop already running, an
+    executor thread) it is plain `asyncio.run()`. Like `asyncio.run()`, any
+    task the body left pending is cancelled before returning.
+    """
+    loop = _loop
+    if (
+        loop is None
+        or loop.is_closed()
+        or loop.is_running()
+        or threading.get_ident() != _loop_thread_id
+    ):
+        return asyncio.run(coro)
+    task = loop.create_task(coro)
+    try:
+        return loop.run_until_complete(task)
+    except BaseException:
+        # e.g. Celery's SoftTimeLimitExceeded raised into the loop from a
+        # signal handler — don't leave the task half-run on the shared loop.
+        if not task.done():
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                loop.run_until_complete(task)
+        raise
+    finally:
+        _cancel_leftover_tasks(loop)
+        if _checked_out:
+            loop.run_until_complete(_release_leaked())
 
 
 def parse_jsonb(value: Any) -> Any:
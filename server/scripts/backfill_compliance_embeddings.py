@@ -28,6 +28,7 @@ async def main():
     parser = argparse.ArgumentParser(description="Backfill compliance embeddings")
     parser.add_argument("--jurisdiction-id", type=str, help="Only embed this jurisdiction")
     parser.add_argument("--batch-size", type=int, default=50, help="Batch size for embedding API calls")
+    parser.add_argument("--concurrency", type=int, default=4, help="Embedding API calls in flight at once")
     parser.add_argument("--dry-run", action="store_true", help="Count requirements without embedding")
     args = parser.parse_args()
 
@@ -61,6 +62,7 @@ async def main():
         print(f"\nStarting backfill with batch_size={args.batch_size}...")
         count = await embed_requirements(
             conn, jurisdiction_id=jid, batch_size=args.batch_size,
+            concurrency=args.concurrency,
         )
         print(f"\nDone. Embedded {count} requirements.")
 
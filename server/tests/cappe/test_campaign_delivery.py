@@ -0,0 +1,286 @@
+"""Cappe campaign delivery engine — recipient state, batch claims, crash resume,
+retries, the send governor, and the fan-out task that dispatches batches.
+
+No DB, no SMTP: FakeConn models `cappe_campaign_recipients` in memory for the
+statements campaign_delivery issues (with a fake clock for stale claims), and
+the sender is a stand-in for the email service that records every delivery.
+
+    cd server && ./venv/bin/python -m pytest tests/cappe/test_campaign_delivery.py -q
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.cappe.services import campaign_delivery as cd
+from app.cappe.services.campaigns import personalize_unsubscribe, personalize_unsubscribe_bulk
+from app.workers.tasks import cappe_campaign_send as task
+
+
+class FakeConn:
+    def __init__(self, subscribers, status="sending"):
+        self.campaign = {
+            "id": uuid4(), "subject": "Hi", "body_html": "<p>News</p>", "from_name": None,
+            "status": status, "site_id": uuid4(), "slug": "shop", "site_name": "Shop",
+            "recipient_count": 0,
+        }
+        self.subscribers = subscribers
+        self.rows: dict[str, dict] = {}  # email -> recipient row
+        self.now = 0.0
+        self.statements = []
+
+    def _claimable(self, row, stale):
+        return row["status"] == "pending" or (
+            row["status"] == "sending" and row["claimed_at"] < self.now - stale
+        )
+
+    async def fetchrow(self, sql, *args):
+        self.statements.append("campaign")
+        return dict(self.campaign)
+
+    async def fetchval(self, sql, *args):
+        if "UPDATE cappe_campaigns c" in sql:
+            self.statements.append("finalize")
+            if self.campaign["status"] != "sending":
+                return None
+            if any(r["status"] in ("pending", "sending") for r in self.rows.values()):
+                return None
+            self.campaign["status"] = "sent"
+            self.campaign["recipient_count"] = sum(r["status"] == "sent" for r in self.rows.values())
+            return self.campaign["recipient_count"]
+        if "SELECT COUNT(*) FROM cappe_campaign_recipients" in sql:
+            return len(self.rows)
+        raise AssertionError(sql)
+
+    async def fetch(self, sql, *args):
+        if "FROM cappe_subscribers" in sql:
+            return self.subscribers
+        if "SELECT DISTINCT batch" in sql:
+            return [{"batch": b} for b in sorted({
+                r["batch"] for r in self.rows.values() if self._claimable(r, args[1])
+            })]
+        if "SET status = 'sending'" in sql:
+            self.statements.append("claim")
+            if self.campaign["status"] != "sending":
+                return []
+            claimed = []
+            for row in self.rows.values():
+                if row["batch"] == args[1] and self._claimable(row, args[2]):
+                    row.update(status="sending", claimed_at=self.now, attempts=row["attempts"] + 1)
+                    claimed.append({k: row[k] for k in ("email", "name", "unsubscribe_token")})
+            return claimed
+        if "HAVING MAX(r.updated_at)" in sql:
+            return [self.campaign["id"]] if self.campaign["status"] == "sending" else []
+        raise AssertionError(sql)
+
+    async def execute(self, sql, *args):
+        if "INSERT INTO cappe_campaign_recipients" in sql:
+            _, emails, names, tokens, batch_size = args
+            for i, (email, name, token) in enumerate(zip(emails, names, tokens)):
+                self.rows.setdefault(email, {
+                    "email": email, "name": name, "unsubscribe_token": token, "batch": i // batch_size,
+                    "status": "pending", "attempts": 0, "claimed_at": None, "error": None,
+                })
+        elif "FROM unnest($2::text[], $3::bool[]" in sql:
+            self.statements.append("record")
+            _, emails, oks, errors, max_attempts = args
+            for email, ok, error in zip(emails, oks, errors):
+                row = self.rows[email]
+                if row["status"] != "sending":
+                    continue
+                status = "sent" if ok else ("failed" if row["attempts"] >= max_attempts else "pending")
+                row.update(status=status, error=error, claimed_at=None)
+        elif "SET status = 'pending'" in sql:
+            self.statements.append("release")
+            for email in args[1]:
+                row = self.rows[email]
+                if row["status"] == "sending":
+                    row.update(status="pending", claimed_at=None, attempts=row["attempts"] - 1)
+        else:
+            raise AssertionError(sql)
+
+
+class Sender:
+    def __init__(self, reject=(), die_after=None):
+        self.delivered: list[str] = []
+        self.reject = set(reject)
+        self.die_after = die_after
+
+    async def __call__(self, *, to_email, to_name, subject, html_content, text_content):
+        if self.die_after is not None and len(self.delivered) >= self.die_after:
+            raise WorkerDied()
+        assert "/unsubscribe/" in html_content
+        if to_email in self.reject:
+            return False
+        self.delivered.append(to_email)
+        return True
+
+
+class WorkerDied(BaseException):
+    """Stands in for the process going away mid-batch."""
+
+
+class NoWaitGovernor(cd.SendGovernor):
+    async def acquire(self, domain):
+        return None
+
+
+def _subs(n):
+    return [{"email": f"s{i}@mail.com", "name": None, "unsubscribe_token": f"t{i}"} for i in range(n)]
+
+
+def _deliver(conn, batch, sender, **kwargs):
+    return asyncio.run(cd.deliver_batch(
+        conn, conn.campaign["id"], batch, sender=sender, from_email="news@hey-matcha.com",
+        governor=NoWaitGovernor(), **kwargs,
+    ))
+
+
+def _materialize(conn, batch_size=500):
+    return asyncio.run(cd.materialize_recipients(conn, conn.campaign["id"], conn.campaign["site_id"], batch_size=batch_size))
+
+
+def test_bulk_render_matches_single_render():
+    urls = ["https://h/u/a", 'https://h/u/b"x', ""]
+    assert personalize_unsubscribe_bulk("<p>Hi</p>", urls) == [personalize_unsubscribe("<p>Hi</p>", u) for u in urls]
+
+
+def test_large_campaign_is_batched_and_finalized_once():
+    subs = _subs(1200) + [{"email": "S1@mail.com"}, {"email": "x@example.com"}]
+    conn = FakeConn(subs)
+
+    assert _materialize(conn) == 1200
+    assert _materialize(conn) == 1200  # resumed delivery keeps the frozen list
+    assert asyncio.run(cd.open_batches(conn, conn.campaign["id"])) == [0, 1, 2]
+
+    sender = Sender()
+    for batch in (0, 1, 2):
+        conn.statements.clear()
+        result = _deliver(conn, batch, sender)
+        # One claim and one status write per RECORD_EVERY sends, not per recipient.
+        assert conn.statements.count("record") == -(-result.claimed // cd.RECORD_EVERY)
+    assert len(sender.delivered) == len(set(sender.delivered)) == 1200
+
+    assert asyncio.run(cd.finalize_if_done(conn, conn.campaign["id"])) == 1200
+    assert asyncio.run(cd.finalize_if_done(conn, conn.campaign["id"])) is None
+
+
+def test_crash_mid_batch_resumes_without_resending_recorded_rows():
+    conn = FakeConn(_subs(500))
+    _materialize(conn)
+
+    with pytest.raises(WorkerDied):
+        _deliver(conn, 0, Sender(die_after=120))
+    recorded = {e for e, r in conn.rows.items() if r["status"] == "sent"}
+    assert len(recorded) == 100  # two full windows recorded before the crash
+
+    # The dead worker's claim still holds until it goes stale.
+    assert _deliver(conn, 0, Sender()).claimed == 0
+    conn.now += cd.CLAIM_STALE_SECONDS + 1
+
+    resumed = Sender()
+    result = _deliver(conn, 0, resumed)
+    assert result.claimed == result.sent == 400
+    assert recorded.isdisjoint(resumed.delivered)
+    assert asyncio.run(cd.finalize_if_done(conn, conn.campaign["id"])) == 500
+
+
+def test_failed_sends_retry_until_max_attempts():
+    conn = FakeConn(_subs(3))
+    _materialize(conn)
+    sender = Sender(reject={"s1@mail.com"})
+
+    results = [_deliver(conn, 0, sender) for _ in range(cd.MAX_ATTEMPTS + 1)]
+    assert [r.claimed for r in results] == [3, 1, 1, 0]
+    assert results[0].needs_followup and not results[-1].needs_followup
+    assert conn.rows["s1@mail.com"]["status"] == "failed"
+    assert asyncio.run(cd.finalize_if_done(conn, conn.campaign["id"])) == 2
+
+
+def test_time_budget_hands_the_rest_back_to_pending():
+    conn = FakeConn(_subs(10))
+    _materialize(conn)
+
+    result = _deliver(conn, 0, Sender(), time_budget=-1)
+    assert (result.claimed, result.sent, result.deferred) == (10, 0, 10)
+    assert all(r["status"] == "pending" and r["attempts"] == 0 for r in conn.rows.values())
+
+
+def test_cancelled_campaign_sends_nothing():
+    conn = FakeConn(_subs(5))
+    _materialize(conn)
+    conn.campaign["status"] = "cancelled"
+    sender = Sender()
+    assert _deliver(conn, 0, sender).claimed == 0
+    assert sender.delivered == []
+
+
+def test_local_bucket_refills_at_rate():
+    bucket = cd._LocalBucket(rate=2.0, burst=2)
+    assert [bucket.take(0.0), bucket.take(0.0)] == [0.0, 0.0]
+    assert bucket.take(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5) == 0.0
+
+
+def test_governor_falls_back_to_local_bucket_when_redis_is_down():
+    class DownRedis:
+        calls = 0
+
+        async def eval(self, *args):
+            DownRedis.calls += 1
+            raise ConnectionError("redis down")
+
+    governor = cd.SendGovernor(rate=1000, burst=3, redis=DownRedis())
+
+    async def run():
+        for _ in range(5):
+            await governor.acquire("hey-matcha.com")
+
+    asyncio.run(run())
+    assert DownRedis.calls == 1  # not retried inside REDIS_RETRY_AFTER
+    assert "hey-matcha.com" in governor._local
+
+
+def test_send_task_dispatches_only_open_batches(monkeypatch):
+    conn = FakeConn(_subs(1100))
+    _materialize(conn)
+    for row in conn.rows.values():
+        if row["batch"] == 0:
+            row["status"] = "sent"
+    dispatched = []
+
+    async def get_db_connection():
+        conn.close = _noop
+        return conn
+
+    monkeypatch.setattr(task, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(task.run_cappe_campaign_batch, "delay", lambda cid, batch: dispatched.append(batch))
+
+    result = asyncio.run(task._run(str(conn.campaign["id"])))
+    assert result == {"recipients": 1100, "batches": 2}
+    assert dispatched == [1, 2]
+
+
+async def _noop():
+    return None
+
+
+def test_batch_task_that_raises_is_retried_after_the_stale_window(monkeypatch):
+    enqueued = []
+
+    async def broken(campaign_id, batch):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(task, "_run_batch", broken)
+    monkeypatch.setattr(
+        task.run_cappe_campaign_batch, "apply_async",
+        lambda args, kwargs, countdown: enqueued.append((args, kwargs, countdown)),
+    )
+    with pytest.raises(RuntimeError):
+        task.run_cappe_campaign_batch("c1", 2)
+    assert enqueued == [(("c1", 2), {"errors": 1}, task.RESUME_AFTER_SECONDS)]
+    assert task.RESUME_AFTER_SECONDS > cd.CLAIM_STALE_SECONDS
+
+    with pytest.raises(RuntimeError):
+        task.run_cappe_campaign_batch("c1", 2, errors=task.MAX_BATCH_ERRORS)
+    assert len(enqueued) == 1
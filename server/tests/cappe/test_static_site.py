@@ -0,0 +1,306 @@
+"""Cappe publish-time page artifacts: build/store/skip, encoding negotiation,
+ETag/304, and the per-worker host cache that lets a repeat view skip the DB.
+
+No DB: FakeConn models cappe_sites / cappe_pages / cappe_site_artifacts in
+memory for the statements static_site and the render route issue, and counts
+every round trip.
+
+    cd server && ./venv/bin/python -m pytest tests/cappe/test_static_site.py -q
+"""
+import asyncio
+import gzip
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from app.cappe.services import static_site as ss
+
+
+class FakeConn:
+    def __init__(self, pages=("about", "home"), status="published"):
+        self.site = {
+            "id": uuid4(), "name": "Avery", "slug": "avery", "subdomain": "avery", "custom_domain": None,
+            "theme_config": "{}", "meta_config": "{}", "status": status, "published_version": None,
+        }
+        self.pages = [
+            {"title": slug.title(), "slug": slug, "content": {"blocks": [{"type": "text", "body": f"{slug} copy"}]}}
+            for slug in pages
+        ]
+        self.artifacts: dict[tuple, dict] = {}  # (version, slug) -> row
+        self.calls = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def fetchrow(self, sql, *args):
+        self.calls += 1
+        if "WHERE subdomain = $1" in sql:
+            ok = args[0] == self.site["subdomain"] and self.site["status"] == "published"
+            return dict(self.site) if ok else None
+        if "FROM cappe_sites WHERE id = $1" in sql:
+            return dict(self.site)
+        raise AssertionError(sql)
+
+    async def fetch(self, sql, *args):
+        self.calls += 1
+        if "FROM cappe_pages" in sql:
+            return [dict(p) for p in self.pages]
+        if "FROM cappe_locations" in sql:
+            return []
+        if "FROM cappe_site_artifacts" in sql:
+            rows = [r for (v, _), r in self.artifacts.items() if v == args[1]]
+            return sorted(rows, key=lambda r: r["position"])
+        raise AssertionError(sql)
+
+    async def execute(self, sql, *args):
+        self.calls += 1
+        if "pg_advisory_xact_lock" in sql:
+            return
+        if "INSERT INTO cappe_site_artifacts" in sql:
+            _, version, slugs, positions, etags, htmls, gzips, brs = args
+            for row in zip(slugs, positions, etags, htmls, gzips, brs):
+                self.artifacts[(version, row[0])] = dict(zip(
+                    ("page_slug", "position", "etag", "html", "gzip", "br"), row
+                ))
+        elif "SET published_version = $2" in sql:
+            self.site["published_version"] = args[1]
+        elif "SET published_version = NULL" in sql:
+            self.site["published_version"] = None
+        elif "DELETE FROM cappe_site_artifacts" in sql:
+            keep = args[1] if len(args) > 1 else None
+            self.artifacts = {k: v for k, v in self.artifacts.items() if k[0] == keep}
+        else:
+            raise AssertionError(sql)
+
+
+class FakeRequest:
+    def __init__(self, host="avery.hey-matcha.com", **headers):
+        self.headers = {"host": host, **{k.replace("_", "-"): v for k, v in headers.items()}}
+
+
+@pytest.fixture
+def live_cache(monkeypatch):
+    cache = ss.StaticSiteCache()
+    monkeypatch.setattr(ss, "_cache", cache)
+    monkeypatch.setattr(ss, "_subscribed", True)
+    return cache
+
+
+@pytest.fixture
+def route(monkeypatch):
+    # Imported here, not at module level: the routes package pulls in the
+    # whole Cappe router (and WeasyPrint with it); the service tests here
+    # don't need any of that.
+    from app.cappe.routes import render
+
+    return render
+
+
+@pytest.fixture
+def conn(monkeypatch, route):
+    conn = FakeConn()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield conn
+
+    monkeypatch.setattr(route, "get_connection", get_connection)
+    return conn
+
+
+def _view(route, page_slug=None, **headers):
+    return asyncio.run(route._render(FakeRequest(**headers), page_slug))
+
+
+def test_cached_view_skips_the_db_and_answers_304(route, conn, live_cache):
+    first = _view(route, accept_encoding="gzip")
+    assert first.status_code == 200 and first.headers["content-encoding"] == "gzip"
+    assert first.headers["vary"] == "Accept-Encoding"
+    etag = first.headers["etag"]
+
+    calls = conn.calls
+    assert _view(route, "about", accept_encoding="gzip").status_code == 200
+    not_modified = _view(route, accept_encoding="gzip", if_none_match=etag)
+    assert not_modified.status_code == 304 and not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
+    assert _view(route, "missing").status_code == 404
+    assert conn.calls == calls  # every repeat view was served from memory
+
+
+def test_invalidation_drops_the_site_and_cached_misses(route, conn, live_cache):
+    _view(route, )
+    _view(route, host="ghost.hey-matcha.com")
+    assert live_cache.snapshot()["hosts"] == 2
+
+    live_cache.drop(conn.site["id"])
+    assert live_cache.snapshot()["hosts"] == 0
+    calls = conn.calls
+    assert _view(route, ).status_code == 200
+    assert conn.calls > calls
+
+
+def test_stale_renderer_version_is_rebuilt_lazily(route, conn, monkeypatch):
+    asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+    monkeypatch.setattr(ss, "RENDERER_ID", "deadbeef")
+
+    response = _view(route, )
+    assert response.status_code == 200
+    assert conn.site["published_version"].startswith("deadbeef.")
+
+
+def test_build_stores_one_version_and_skips_unchanged_rebuilds():
+    conn = FakeConn()
+    built = asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+
+    assert ss.is_current(built.version) and conn.site["published_version"] == built.version
+    assert built.home == "home" and list(built.pages) == ["about", "home"]
+    page = built.page(None)
+    assert gzip.decompress(page.gzip) == page.html and b"home copy" in page.html
+
+    stored = dict(conn.artifacts)
+    assert asyncio.run(ss.build_site_artifacts(conn, conn.site["id"])).version == built.version
+    assert conn.artifacts == stored
+    loaded = asyncio.run(ss.load_site_artifacts(conn, conn.site["id"], built.version))
+    assert loaded.pages == built.pages and loaded.home == "home"
+
+    conn.pages[0]["content"] = {"blocks": [{"type": "text", "body": "new copy"}]}
+    rebuilt = asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+    assert rebuilt.version != built.version
+    assert {v for v, _ in conn.artifacts} == {rebuilt.version}  # old version pruned
+
+
+def test_lazy_build_behind_another_returns_its_version_without_rendering(monkeypatch):
+    conn = FakeConn()
+    built = asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+
+    def render(*args):
+        raise AssertionError("rendered again")
+
+    monkeypatch.setattr(ss, "render_site_artifacts", render)
+    # A first view that saw no version, then waited on the lock for this build.
+    lazy = asyncio.run(ss.build_site_artifacts(conn, conn.site["id"], lazy=True))
+    assert lazy.version == built.version and lazy.pages == built.pages
+
+
+def test_unpublished_site_clears_its_version():
+    conn = FakeConn()
+    asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+    conn.site["status"] = "draft"
+    assert asyncio.run(ss.build_site_artifacts(conn, conn.site["id"])) is None
+    assert conn.site["published_version"] is None and conn.artifacts == {}
+
+
+def test_negotiation_and_etags():
+    page = ss.PageArtifact(etag="abc", html=b"<p>x</p>", gzip=b"gz", br=b"br")
+    assert page.negotiate("gzip, deflate, br") == (b"br", "br", '"abc-br"')
+    assert page.negotiate("gzip, br;q=0") == (b"gz", "gzip", '"abc-gz"')
+    assert page.negotiate(None) == (b"<p>x</p>", None, '"abc"')
+    no_br = ss.PageArtifact(etag="abc", html=b"<p>x</p>", gzip=b"gz")
+    assert no_br.negotiate("br")[1] is None
+
+    assert page.matches('"abc-gz"') and page.matches('W/"abc"') and page.matches('"zzz", "abc-br"')
+    assert page.matches("*")
+    assert not page.matches('"abd"') and not page.matches(None)
+
+
+def test_resolve_racing_an_invalidation_is_not_cached():
+    conn = FakeConn()
+    artifacts = asyncio.run(ss.build_site_artifacts(conn, conn.site["id"]))
+    cache = ss.StaticSiteCache()
+    epoch = cache.epoch
+    cache.drop(conn.site["id"])
+    cache.put("avery.hey-matcha.com", artifacts, epoch)
+    assert cache.lookup("avery.hey-matcha.com") == (False, None)
+
+
+def test_cache_evicts_least_recent_site_over_byte_budget():
+    page = ss.PageArtifact(etag="e", html=b"x" * 60, gzip=b"y" * 40)
+    cache = ss.StaticSiteCache(max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(f"{name}.host", ss._site_artifacts(name, "v", {"home": page}), cache.epoch)
+    assert cache.lookup("a.host") == (False, None)
+    assert cache.lookup("c.host")[0]
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_cache_is_off_until_the_subscriber_is_subscribed(monkeypatch):
+    from app.core.services import redis_cache
+
+    class FakePubSub:
+        async def subscribe(self, channel):
+            pass
+
+        async def listen(self):
+            await asyncio.Event().wait()
+            yield
+
+        async def unsubscribe(self, channel):
+            pass
+
+        async def aclose(self):
+            pass
+
+    class FakeRedis:
+        def pubsub(self):
+            return FakePubSub()
+
+    monkeypatch.setattr(ss, "_cache", ss.StaticSiteCache())
+    monkeypatch.setattr(ss, "_subscriber_task", None)
+    monkeypatch.setattr(ss, "_subscribed", False)
+    redis = None
+    monkeypatch.setattr(redis_cache, "get_redis_cache", lambda: redis)
+    page = ss.PageArtifact(etag="e", html=b"x", gzip=b"y")
+    artifacts = ss._site_artifacts("s1", "v", {"home": page})
+
+    async def run():
+        nonlocal redis
+        ss.start_static_site_subscriber()
+        await asyncio.sleep(0)
+        # Running without Redis: nothing is cached, so nothing goes stale.
+        ss.remember_host("a.host", artifacts, ss.cached_host("a.host")[2])
+        waiting = ss.cached_host("a.host")[0]
+        await ss.stop_static_site_subscriber()
+        redis = FakeRedis()
+        ss.start_static_site_subscriber()
+        await asyncio.sleep(0)
+        ss.remember_host("a.host", artifacts, ss.cached_host("a.host")[2])
+        subscribed = ss.cached_host("a.host")[0]
+        await ss.stop_static_site_subscriber()
+        return waiting, subscribed, ss.cache_enabled()
+
+    assert asyncio.run(run()) == (False, True, False)
+
+
+def test_background_geocode_republishes_after_writing_coordinates(monkeypatch):
+    from app.cappe.routes import locations
+
+    events = []
+
+    class GeoConn:
+        async def fetchrow(self, sql, *args):
+            return {"address": "1 Main St, Portland OR", "geocoded_at": None}
+
+        async def execute(self, sql, *args):
+            events.append("update")
+
+    @asynccontextmanager
+    async def get_connection():
+        yield GeoConn()
+
+    async def geocode_address(address):
+        return {"lat": 45.5, "lng": -122.6, "city": "Portland", "region": "OR"}
+
+    async def refresh_site_search(conn, site_id):
+        pass
+
+    async def invalidate(site_id):
+        events.append("republish")
+
+    monkeypatch.setattr(locations, "get_connection", get_connection)
+    monkeypatch.setattr(locations, "geocode_address", geocode_address)
+    monkeypatch.setattr(locations, "refresh_site_search", refresh_site_search)
+    monkeypatch.setattr(locations, "invalidate_site_render_cache", invalidate)
+    asyncio.run(locations._geocode_location(uuid4(), uuid4()))
+    assert events == ["update", "republish"]
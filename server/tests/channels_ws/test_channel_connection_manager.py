@@ -61,7 +61,9 @@ def _make_ws_mock():
 
 
 def _sent_payloads(ws_mock) -> list[dict]:
-    """Decode every send_text() call back into a dict for assertions."""
+    """Decode every send_text() call back into a dict for assertions.
+    Frames go out on per-socket writer tasks, so callers `await
+    manager.drain()` first."""
     return [json.loads(call.args[0]) for call in ws_mock.send_text.call_args_list]
 
 
@@ -81,6 +83,7 @@ class TestRoomBroadcastRouting:
 
         await manager.broadcast_message(room_key, {"id": "m1", "content": "hello"})
 
+        await manager.drain()
         payloads = _sent_payloads(ws)
         # First payload is the user_joined broadcast (only when more than one
         # user is in the room before us, but we still see it routed to us via
@@ -108,6 +111,7 @@ class TestRoomBroadcastRouting:
         await manager.broadcast_message(room_key, {"id": "m1", "content": "hello"})
 
         # Exactly zero `message`-type payloads delivered.
+        await manager.drain()
         msg_payloads = [p for p in _sent_payloads(ws) if p.get("type") == "message"]
         assert msg_payloads == []
 
@@ -127,9 +131,11 @@ class TestRoomBroadcastRouting:
         await manager.leave_room(user.id, room_key)
 
         # Reset mock so we only count broadcasts after leave_room.
+        await manager.drain()
         ws.send_text.reset_mock()
         await manager.broadcast_message(room_key, {"id": "m1", "content": "ghost"})
 
+        await manager.drain()
         msg_payloads = [p for p in _sent_payloads(ws) if p.get("type") == "message"]
         assert msg_payloads == [], "leave_room must stop further broadcast routing"
 
@@ -155,6 +161,7 @@ class TestRoomBroadcastRouting:
         await manager.broadcast_message(room_b, {"id": "b", "content": "from b"})
         await manager.broadcast_message(room_c, {"id": "c", "content": "from c"})
 
+        await manager.drain()
         msg_payloads = [p for p in _sent_payloads(ws) if p.get("type") == "message"]
         rooms_seen = {p["room"] for p in msg_payloads}
         assert rooms_seen == {room_a, room_b, room_c}
@@ -175,11 +182,13 @@ class TestRoomBroadcastRouting:
         await manager.leave_room(alice.id, room_key)
 
         # Reset to ignore the user_left broadcast generated by leave_room.
+        await manager.drain()
         alice_ws.send_text.reset_mock()
         bob_ws.send_text.reset_mock()
 
         await manager.broadcast_message(room_key, {"id": "x", "content": "after-leave"})
 
+        await manager.drain()
         alice_msgs = [p for p in _sent_payloads(alice_ws) if p.get("type") == "message"]
         bob_msgs = [p for p in _sent_payloads(bob_ws) if p.get("type") == "message"]
         assert alice_msgs == []
@@ -258,5 +267,6 @@ class TestSelfBroadcastIsIncluded:
             room_key, {"id": "self", "sender_id": str(user.id), "content": "hi self"}
         )
 
+        await manager.drain()
         msg_payloads = [p for p in _sent_payloads(ws) if p.get("type") == "message"]
         assert len(msg_payloads) == 1
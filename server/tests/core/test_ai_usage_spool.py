@@ -0,0 +1,202 @@
+"""ai_usage_spool: rows spooled to local disk by the ai_usage proxy and
+bulk-COPYed into ai_usage_log by `drain`.
+
+No DB: the spool lives in tmp_path and `connection_or_direct` is swapped for
+a FakeConn that records copy_records_to_table calls.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_ai_usage_spool.py -q
+"""
+import asyncio
+import fcntl
+import os
+import threading
+from contextlib import asynccontextmanager
+from decimal import Decimal
+
+import pytest
+
+import app.database as database
+from app.core.services import ai_usage, ai_usage_spool as spool
+
+
+class FakeConn:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.reject_feature = None
+        self.copies = []
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        if self.fail:
+            raise ConnectionError("db is down")
+        if any(r[2] == self.reject_feature for r in records):
+            raise ValueError("invalid input for column cost_usd")
+        self.copies.append((table, list(records), columns))
+
+    @asynccontextmanager
+    async def transaction(self):
+        committed = list(self.copies)
+        try:
+            yield
+        except BaseException:
+            self.copies = committed
+            raise
+
+
+@pytest.fixture
+def conn(monkeypatch, tmp_path):
+    fake = FakeConn()
+
+    @asynccontextmanager
+    async def fake_connection(**kwargs):
+        fake.direct = kwargs.get("force_direct", False)
+        yield fake
+
+    monkeypatch.setattr(spool, "SPOOL_ENABLED", True)
+    monkeypatch.setattr(spool, "SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(database, "connection_or_direct", fake_connection)
+    return fake
+
+
+def _row(i=0):
+    return ai_usage._build_row(
+        provider="gemini", model="models/gemini-3.6-flash", method="generate_content",
+        feature=f"feature.{i}", latency_ms=12, status="ok", usage=(10, 20, 0, 0),
+    )
+
+
+def _rows(fake):
+    return [r for _, records, _ in fake.copies for r in records]
+
+
+def test_record_spools_instead_of_inserting(conn, monkeypatch):
+    async def no_insert(row, *, direct=False):
+        raise AssertionError("spooled rows must not be inserted inline")
+
+    monkeypatch.setattr(ai_usage, "_insert_row", no_insert)
+    ai_usage._record(_row())
+    asyncio.run(ai_usage._record_async(_row(1)))
+    assert conn.copies == []
+
+    assert asyncio.run(spool.drain()) == 2
+    (table, records, columns), = conn.copies
+    assert (table, columns) == ("ai_usage_log", spool.COLUMNS)
+    first = dict(zip(columns, records[0]))
+    assert first["model"] == "gemini-3.6-flash"
+    assert isinstance(first["cost_usd"], Decimal)
+    assert first["created_at"].tzinfo is not None
+    assert spool.pending_bytes() == 0
+
+
+def test_failed_copy_keeps_rows_for_the_next_drain(conn):
+    spool.append(_row())
+    conn.fail = True
+    assert asyncio.run(spool.drain()) == 0
+    assert spool.pending_bytes() > 0
+
+    spool.append(_row(1))
+    conn.fail = False
+    assert asyncio.run(spool.drain()) == 2
+    assert [r[2] for r in _rows(conn)] == ["feature.0", "feature.1"]
+
+
+def test_rejected_batch_is_quarantined_without_blocking_later_ones(conn):
+    spool.append(_row())
+    conn.reject_feature = "feature.0"
+    assert asyncio.run(spool.drain()) == 0
+    for i in range(1, spool.MAX_BATCH_ATTEMPTS):
+        spool.append(_row(i))
+        # The bad batch is first in line; every later batch still lands.
+        assert asyncio.run(spool.drain()) == 1
+    names = os.listdir(spool.SPOOL_DIR)
+    assert [n for n in names if n.endswith(".bad")] and not [n for n in names if spool._is_batch(n)]
+    assert [r[2] for r in _rows(conn)] == [f"feature.{i}" for i in range(1, spool.MAX_BATCH_ATTEMPTS)]
+    assert spool.pending_bytes() == 0
+
+
+def test_batch_split_across_copies_is_all_or_nothing(conn, monkeypatch):
+    monkeypatch.setattr(spool, "COPY_CHUNK_ROWS", 2)
+    for i in range(4):
+        spool.append(_row(i))
+    conn.reject_feature = "feature.3"  # second chunk
+    assert asyncio.run(spool.drain()) == 0
+    assert conn.copies == []
+
+    conn.reject_feature = None
+    assert asyncio.run(spool.drain()) == 4
+    assert [r[2] for r in _rows(conn)] == [f"feature.{i}" for i in range(4)]
+
+
+def test_outage_does_not_count_toward_quarantine(conn):
+    spool.append(_row())
+    conn.fail = True
+    for _ in range(spool.MAX_BATCH_ATTEMPTS + 1):
+        assert asyncio.run(spool.drain()) == 0
+    assert not [n for n in os.listdir(spool.SPOOL_DIR) if n.endswith(".bad")]
+    conn.fail = False
+    assert asyncio.run(spool.drain()) == 1
+
+
+def test_trailing_drain_moves_rows_left_after_the_last_task(conn, monkeypatch):
+    monkeypatch.setattr(spool, "DRAIN_INTERVAL_SECONDS", 0.01)
+    spool.append(_row())
+    spool.schedule_trailing_drain()
+    spool.schedule_trailing_drain()  # already armed: no second timer
+    timer = spool._trailing_timer
+    timer.join(timeout=5)
+    assert [r[2] for r in _rows(conn)] == ["feature.0"]
+    assert conn.direct and spool._trailing_timer is None
+
+
+def test_torn_line_is_skipped(conn):
+    spool.append(_row())
+    with open(os.path.join(spool.SPOOL_DIR, "active.jsonl"), "ab") as fh:
+        fh.write(b'{"model": "gemini-3.6-fl')  # process died mid-write
+    assert asyncio.run(spool.drain()) == 1
+
+
+def test_only_one_drainer_at_a_time(conn):
+    spool.append(_row())
+    fd = os.open(os.path.join(spool.SPOOL_DIR, "drain.lock"), os.O_WRONLY | os.O_CREAT)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        assert asyncio.run(spool.drain()) == 0
+    finally:
+        os.close(fd)
+    assert asyncio.run(spool.drain()) == 1
+
+
+def test_concurrent_writers_lose_nothing_across_rotations(conn):
+    writers, per_writer = 4, 250
+
+    def write(w):
+        for i in range(per_writer):
+            assert spool.append(_row(w * per_writer + i))
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(writers)]
+
+    async def drain_while_writing():
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            await spool.drain()
+            await asyncio.sleep(0)
+        for t in threads:
+            t.join()
+        await spool.drain()
+
+    asyncio.run(drain_while_writing())
+    features = [r[2] for r in _rows(conn)]
+    assert len(features) == writers * per_writer
+    assert len(set(features)) == writers * per_writer
+
+
+def test_disabled_spool_falls_back_to_insert(conn, monkeypatch):
+    monkeypatch.setattr(spool, "SPOOL_ENABLED", False)
+    inserted = []
+
+    async def fake_insert(row, *, direct=False):
+        inserted.append(row)
+
+    monkeypatch.setattr(ai_usage, "_insert_row", fake_insert)
+    asyncio.run(ai_usage._record_async(_row()))
+    assert len(inserted) == 1
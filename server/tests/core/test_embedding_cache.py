@@ -0,0 +1,96 @@
+"""embedding_cache.embed_documents_cached: cache hits skip Gemini, misses are
+deduplicated and embedded in bounded-concurrency batches, new vectors are
+COPYed back.
+
+No DB, no Gemini: FakeConn serves the cache lookup and records the COPY;
+FakeEmbeddingService tracks how many embed calls are in flight at once.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_embedding_cache.py -q
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.core.services import embedding_cache
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class FakeConn:
+    def __init__(self, cached: dict[str, list[float]]):
+        self.cached = cached
+        self.copied: list[tuple[str, list]] = []
+
+    async def fetch(self, sql, *args):
+        hashes = args[-1]
+        return [{"content_hash": h, "embedding": self.cached[h]} for h in hashes if h in self.cached]
+
+    async def execute(self, sql, *args):
+        return "OK"
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.copied.append((table, list(records)))
+
+    @asynccontextmanager
+    async def _tx(self):
+        yield
+
+    def transaction(self):
+        return self._tx()
+
+
+class FakeEmbeddingService:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def embed_batch(self, texts, task_type=None, batch_size=100):
+        self.calls.append(list(texts))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return [[float(len(t))] for t in texts]
+
+
+def test_cache_hits_skip_embedding_and_results_keep_input_order():
+    cached_hash = embedding_cache.content_hash("old text")
+    conn = FakeConn({cached_hash: [9.0]})
+    service = FakeEmbeddingService()
+
+    vectors = _run(embedding_cache.embed_documents_cached(
+        conn, service, ["new", "old text", "new"],
+    ))
+
+    assert vectors == [[3.0], [9.0], [3.0]]
+    # "new" appears twice but is embedded once; "old text" not at all.
+    assert service.calls == [["new"]]
+    (table, records), = conn.copied
+    assert table == "_embedding_cache_stage"
+    assert records == [(embedding_cache.content_hash("new"), [3.0])]
+
+
+def test_all_cached_makes_no_gemini_call_and_no_write():
+    texts = ["a", "b"]
+    conn = FakeConn({embedding_cache.content_hash(t): [1.0] for t in texts})
+    service = FakeEmbeddingService()
+
+    _run(embedding_cache.embed_documents_cached(conn, service, texts))
+
+    assert service.calls == []
+    assert conn.copied == []
+
+
+def test_misses_are_batched_under_the_concurrency_bound():
+    texts = [f"text {i}" for i in range(25)]
+    service = FakeEmbeddingService()
+
+    _run(embedding_cache.embed_documents_cached(
+        FakeConn({}), service, texts, batch_size=5, concurrency=2,
+    ))
+
+    assert [len(c) for c in service.calls] == [5, 5, 5, 5, 5]
+    assert service.max_in_flight <= 2
@@ -0,0 +1,219 @@
+"""GeminiRateLimiter: the Redis window path, the DB fallback, and the batched
+audit drain into `api_rate_limits`.
+
+No real redis or DB: FakeRedis scripts `.eval` results (the Lua itself runs in
+Redis, so what we pin here is how the limiter reads its reply), and a FakeConn
+records the COUNT/INSERT/COPY calls.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_gemini_rate_limiter.py -q
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.services import rate_limiter as rl
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class FakeRedis:
+    def __init__(self, *, reply=(1, 0, 0, "", 0), raise_on_eval=False, audit=None):
+        self.reply = reply
+        self.raise_on_eval = raise_on_eval
+        self.audit = list(audit or [])
+        self.eval_calls: list[tuple] = []
+        self.pushed_back: list[str] = []
+
+    async def set(self, key, value, nx=False, ex=None):
+        return None  # already seeded
+
+    async def eval(self, script, numkeys, *args):
+        self.eval_calls.append(args)
+        if self.raise_on_eval:
+            raise ConnectionError("redis down")
+        return list(self.reply)
+
+    async def lpop(self, key, count):
+        items, self.audit = self.audit[:count], self.audit[count:]
+        return items or None
+
+    async def lpush(self, key, *values):
+        self.pushed_back.extend(values)
+
+
+class SeedingRedis(FakeRedis):
+    """A Redis with no seed marker yet and `live` members already windowed."""
+
+    def __init__(self, *, live=0):
+        super().__init__()
+        self.live = live
+        self.set_calls: list[tuple] = []
+        self.added: dict = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        self.set_calls.append((key, nx, ex))
+        return True
+
+    async def zcard(self, key):
+        return self.live
+
+    async def zadd(self, key, mapping):
+        self.added.update(mapping)
+
+    async def pexpire(self, key, ms):
+        pass
+
+
+class FakeConn:
+    def __init__(self, *, hourly=0, daily=0, fail_copy=False):
+        self.counts = [hourly, daily]
+        self.fail_copy = fail_copy
+        self.executed: list[tuple] = []
+        self.copied: list[tuple] = []
+        self.rows: list[dict] = []
+
+    async def fetch(self, sql, *args):
+        return self.rows
+
+    async def fetchval(self, sql, *args):
+        return self.counts.pop(0)
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        if self.fail_copy:
+            raise RuntimeError("db down")
+        self.copied.append((table, list(records), columns))
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(rl.GeminiRateLimiter, "_redis_down_until", 0.0)
+    monkeypatch.setattr(rl.GeminiRateLimiter, "_last_flush", 0.0)
+    monkeypatch.setattr(rl.GeminiRateLimiter, "_seed_checked", True)
+    obj = rl.GeminiRateLimiter.__new__(rl.GeminiRateLimiter)
+    obj.hourly_limit = 10
+    obj.daily_limit = 100
+    return obj
+
+
+def _use(monkeypatch, *, redis, conn):
+    monkeypatch.setattr(rl, "_limiter_redis", lambda: redis)
+
+    @asynccontextmanager
+    async def fake_conn():
+        yield conn
+
+    monkeypatch.setattr(rl, "get_connection", fake_conn)
+
+
+class TestRedisPath:
+    def test_allowed_check_touches_no_db(self, limiter, monkeypatch):
+        redis, conn = FakeRedis(reply=(1, 3, 40, "", 0)), FakeConn()
+        _use(monkeypatch, redis=redis, conn=conn)
+        _run(limiter.check_limit("svc", "op"))
+        assert redis.eval_calls[0][7] == "check"
+        assert conn.executed == [] and conn.counts == [0, 0]
+
+    @pytest.mark.parametrize("blocked_by,count,limit", [("hourly", 10, 10), ("daily", 100, 100)])
+    def test_blocked_raises_with_window(self, limiter, monkeypatch, blocked_by, count, limit):
+        reply = (0, 10 if blocked_by == "hourly" else 5, 100 if blocked_by == "daily" else 50, blocked_by, 0)
+        _use(monkeypatch, redis=FakeRedis(reply=reply), conn=FakeConn())
+        with pytest.raises(rl.RateLimitExceeded) as exc:
+            _run(limiter.check_limit("svc"))
+        assert exc.value.limit_type == blocked_by
+        assert exc.value.current_count == count
+        assert exc.value.limit == limit
+
+    def test_check_and_record_is_one_round_trip(self, limiter, monkeypatch):
+        redis, conn = FakeRedis(reply=(1, 1, 1, "", 1)), FakeConn()
+        _use(monkeypatch, redis=redis, conn=conn)
+        monkeypatch.setattr(rl.GeminiRateLimiter, "_last_flush", float("inf"))
+        _run(limiter.check_and_record("svc", "op"))
+        assert len(redis.eval_calls) == 1
+        args = redis.eval_calls[0]
+        assert args[:2] == (rl._CALLS_KEY, rl._AUDIT_KEY)
+        assert args[7] == "check_record"
+        assert json.loads(args[9])["service_name"] == "svc"
+        assert conn.executed == []
+
+    def test_full_audit_queue_triggers_batched_copy(self, limiter, monkeypatch):
+        rows = [
+            json.dumps({"service_name": "svc", "endpoint": "op", "called_at": "2026-01-01T00:00:00+00:00"})
+            for _ in range(rl.AUDIT_BATCH_SIZE)
+        ]
+        redis = FakeRedis(reply=(1, 1, 1, "", rl.AUDIT_BATCH_SIZE), audit=rows)
+        conn = FakeConn()
+        _use(monkeypatch, redis=redis, conn=conn)
+        monkeypatch.setattr(rl.GeminiRateLimiter, "_last_flush", float("inf"))
+        _run(limiter.record_call("svc", "op"))
+        assert len(conn.copied) == 1
+        table, records, columns = conn.copied[0]
+        assert table == "api_rate_limits"
+        assert columns == ["service_name", "endpoint", "called_at"]
+        assert len(records) == rl.AUDIT_BATCH_SIZE
+
+
+class TestSeed:
+    def _rows(self):
+        from datetime import datetime, timezone
+
+        return [{"called_at": datetime(2026, 1, 1, 12, tzinfo=timezone.utc)}] * 3
+
+    def test_empty_window_is_seeded_under_a_marker_without_ttl(self, limiter, monkeypatch):
+        redis, conn = SeedingRedis(), FakeConn()
+        conn.rows = self._rows()
+        _use(monkeypatch, redis=redis, conn=conn)
+        monkeypatch.setattr(rl.GeminiRateLimiter, "_seed_checked", False)
+        _run(limiter.check_limit("svc"))
+        assert redis.set_calls == [(rl._SEEDED_KEY, True, None)]
+        assert len(redis.added) == 3
+        assert rl.GeminiRateLimiter._seed_checked is True
+
+    def test_live_window_is_not_seeded_again(self, limiter, monkeypatch):
+        redis, conn = SeedingRedis(live=5), FakeConn()
+        conn.rows = self._rows()
+        _use(monkeypatch, redis=redis, conn=conn)
+        monkeypatch.setattr(rl.GeminiRateLimiter, "_seed_checked", False)
+        _run(limiter.check_limit("svc"))
+        assert redis.added == {}
+
+
+class TestFallback:
+    def test_redis_error_falls_back_to_db_counts(self, limiter, monkeypatch):
+        conn = FakeConn(hourly=10, daily=20)
+        _use(monkeypatch, redis=FakeRedis(raise_on_eval=True), conn=conn)
+        with pytest.raises(rl.RateLimitExceeded) as exc:
+            _run(limiter.check_limit("svc"))
+        assert exc.value.limit_type == "hourly"
+        assert rl.GeminiRateLimiter._redis_down_until > 0
+
+    def test_redis_down_skips_redis_until_retry_window(self, limiter, monkeypatch):
+        redis, conn = FakeRedis(raise_on_eval=True), FakeConn()
+        _use(monkeypatch, redis=redis, conn=conn)
+        _run(limiter.record_call("svc", "op"))
+        _run(limiter.record_call("svc", "op"))
+        assert len(redis.eval_calls) == 1
+        assert len(conn.executed) == 2
+        assert "INSERT INTO api_rate_limits" in conn.executed[0][0]
+
+
+class TestFlushAudit:
+    def test_failed_copy_requeues_rows(self, limiter, monkeypatch):
+        rows = [json.dumps({"service_name": "svc", "endpoint": None, "called_at": "2026-01-01T00:00:00+00:00"})]
+        redis = FakeRedis(audit=rows)
+        _use(monkeypatch, redis=redis, conn=FakeConn(fail_copy=True))
+        assert _run(limiter.flush_audit()) == 0
+        assert redis.pushed_back == rows
+
+    def test_empty_queue_is_noop(self, limiter, monkeypatch):
+        conn = FakeConn()
+        _use(monkeypatch, redis=FakeRedis(), conn=conn)
+        assert _run(limiter.flush_audit()) == 0
+        assert conn.copied == []
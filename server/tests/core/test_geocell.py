@@ -0,0 +1,81 @@
+"""geocell: geohash encoding (which must agree with the migration's SQL
+function), radius covers that never miss an in-radius point, and the merged
+range arrays the radius queries unnest.
+
+Pure — no DB.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_geocell.py -q
+"""
+import math
+import random
+from pathlib import Path
+
+from app.core.services import geocell
+
+MIGRATION = Path(__file__).parents[2] / "alembic" / "versions" / "geocell01_store_location_geocells.py"
+
+
+def _haversine_km(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    cos_c = math.sin(p1) * math.sin(p2) + math.cos(p1) * math.cos(p2) * math.cos(math.radians(lng2 - lng1))
+    return 6371.0 * math.acos(min(1.0, max(-1.0, cos_c)))
+
+
+def _in_ranges(cell, ranges):
+    return any(lo <= cell < hi for lo, hi in zip(*ranges))
+
+
+def test_encode_matches_reference_geohashes():
+    assert geocell.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geocell.encode(37.7749, -122.4194, 5) == "9q8yy"
+    assert geocell.encode(-90.0, -180.0, 3) == "000"
+    assert geocell.encode(90.0, 180.0, 3) == "zzz"
+    assert len(geocell.encode(0.0, 0.0)) == geocell.GEOCELL_PRECISION
+
+
+def test_stored_precision_matches_the_generated_column():
+    assert f"geohash_encode(lat, lng, {geocell.GEOCELL_PRECISION})" in MIGRATION.read_text()
+
+
+def test_cover_contains_every_point_inside_the_radius():
+    rng = random.Random(7)
+    for _ in range(300):
+        lat, lng = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        radius = rng.choice([0.3, 2.0, 15.0, 50.0, 500.0])
+        ranges = geocell.cover_ranges(lat, lng, radius)
+        for _ in range(40):
+            # Random points of the bounding box, kept if inside the circle.
+            plat = lat + rng.uniform(-1, 1) * radius / 111.045
+            plng = lng + rng.uniform(-1, 1) * radius / (111.045 * math.cos(math.radians(lat)))
+            plng = (plng + 180.0) % 360.0 - 180.0
+            if abs(plat) < 90 and _haversine_km(lat, lng, plat, plng) <= radius:
+                assert _in_ranges(geocell.encode(plat, plng), ranges), (lat, lng, radius, plat, plng)
+
+
+def test_cover_is_bounded_and_tightens_with_radius():
+    la = (34.0522, -118.2437)
+    assert len(geocell.cover_cells(*la, 500.0)) <= geocell.MAX_COVER_CELLS
+    assert len(geocell.cover_cells(*la, 1.0)) <= geocell.MAX_COVER_CELLS
+    assert len(geocell.cover_cells(*la, 1.0)[0]) > len(geocell.cover_cells(*la, 50.0)[0])
+    assert all(len(c) == 1 for c in geocell.cover_cells(0.0, 0.0, 20_000.0))
+
+
+def test_cover_wraps_the_antimeridian():
+    ranges = geocell.cover_ranges(0.0, 179.99, 30.0)
+    assert _in_ranges(geocell.encode(0.0, -179.9), ranges)
+    assert _in_ranges(geocell.encode(0.0, 179.9), ranges)
+
+
+def test_ranges_merge_adjacent_cells_and_do_not_overlap():
+    lows, highs = geocell.cover_ranges(34.05, -118.24, 15.0)
+    assert len(lows) < len(geocell.cover_cells(34.05, -118.24, 15.0))
+    assert all(lo < hi for lo, hi in zip(lows, highs))
+    assert all(highs[i] < lows[i + 1] for i in range(len(lows) - 1))
+    assert geocell._successor("9q") == "9r" and geocell._successor("rzz") == "s"
+    assert geocell._successor("zz") == "{"
+
+
+def test_covering_scan_binds_the_given_placeholders():
+    sql = geocell.covering_scan("tellus_stores", "st", "$4", "$5")
+    assert "unnest($4::text[], $5::text[])" in sql
+    assert "st.geocell >= cell.lo AND st.geocell < cell.hi" in sql
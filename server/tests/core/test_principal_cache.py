@@ -0,0 +1,165 @@
+"""principal_cache: versioned two-tier cache behind get_current_user and
+resolve_accessible_company_scope.
+
+No redis: FakeRedis is a dict with INCR, pipelines and a publish log.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_principal_cache.py -q
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core.services import principal_cache as pc
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [await m(*a, **k) for m, a, k in self.calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict = {}
+        self.published: list = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(pc, "get_redis_cache", lambda: fake)
+    monkeypatch.setattr(pc, "_subscribed", True)
+    pc._local.clear()
+    pc._floors.clear()
+    yield fake
+    pc._local.clear()
+    pc._floors.clear()
+
+
+FIELDS = {"id": "u", "email": "a@b.c", "role": "client", "beta_features": {},
+          "interview_prep_tokens": 0, "allowed_interview_roles": []}
+
+
+def test_miss_then_hit_from_both_tiers(redis):
+    uid = uuid4()
+
+    async def run():
+        cached, version = await pc.lookup_user(uid, 100)
+        assert cached is None and version == 0
+        await pc.store_user(uid, 100, version, FIELDS)
+        assert (await pc.lookup_user(uid, 100))[0] == FIELDS
+        pc._local.clear()  # another worker: only Redis has it
+        assert (await pc.lookup_user(uid, 100))[0] == FIELDS
+        # A different token for the same user is its own entry.
+        assert (await pc.lookup_user(uid, 200))[0] is None
+
+    asyncio.run(run())
+
+
+def test_bump_invalidates_every_tier(redis):
+    uid = uuid4()
+
+    async def run():
+        _, version = await pc.lookup_user(uid, 100)
+        await pc.store_user(uid, 100, version, FIELDS)
+        await pc.bump_principal_version(uid)
+        assert str(uid) not in pc._local
+        assert (await pc.lookup_user(uid, 100))[0] is None
+
+    asyncio.run(run())
+    assert redis.published == [(pc.INVALIDATE_CHANNEL, f'{{"{uid}": 1}}')]
+
+
+def test_store_racing_a_bump_is_not_served(redis):
+    uid = uuid4()
+
+    async def run():
+        _, version = await pc.lookup_user(uid, 100)  # read before the bump
+        await pc.bump_principal_version(uid)
+        await pc.store_user(uid, 100, version, FIELDS)  # loaded pre-bump state
+        assert (await pc.lookup_user(uid, 100))[0] is None
+
+    asyncio.run(run())
+
+
+def test_no_redis_means_no_cache(monkeypatch):
+    monkeypatch.setattr(pc, "get_redis_cache", lambda: None)
+    uid = uuid4()
+
+    async def run():
+        await pc.store_user(uid, 1, 0, FIELDS)
+        return await pc.lookup_user(uid, 1)
+
+    assert asyncio.run(run()) == (None, None)
+
+
+def test_scope_round_trips_uuids(redis):
+    uid, cid = uuid4(), uuid4()
+    scope = {"company_id": cid, "company_ids": [cid], "actor_role": "client",
+             "broker_id": None, "broker_member_role": None,
+             "link_permissions": {}, "terms_accepted": True}
+
+    async def run():
+        _, version = await pc.lookup_scope(uid)
+        await pc.store_scope(uid, version, scope)
+        pc._local.clear()
+        return (await pc.lookup_scope(uid))[0]
+
+    assert asyncio.run(run()) == scope
+
+
+def test_local_tier_is_off_while_unsubscribed(redis, monkeypatch):
+    monkeypatch.setattr(pc, "_subscribed", False)
+    uid = uuid4()
+
+    async def run():
+        _, version = await pc.lookup_user(uid, 100)
+        await pc.store_user(uid, 100, version, FIELDS)
+        assert str(uid) not in pc._local
+        # Still served from Redis, where the version stamp guards it.
+        return (await pc.lookup_user(uid, 100))[0]
+
+    assert asyncio.run(run()) == FIELDS
+    assert str(uid) not in pc._local
+
+
+def test_store_spanning_a_lost_subscription_stays_out_of_the_local_tier(redis):
+    uid = uuid4()
+
+    async def run():
+        _, version = await pc.lookup_user(uid, 100)
+        # The subscriber drops and comes back; a broadcast may have been missed.
+        pc._mark_unsubscribed()
+        pc._subscribed = True
+        await pc.store_user(uid, 100, version, FIELDS)
+
+    asyncio.run(run())
+    assert str(uid) not in pc._local
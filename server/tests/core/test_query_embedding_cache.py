@@ -0,0 +1,115 @@
+"""EmbeddingService.embed_text query cache: local LRU + TTL, the Redis tier,
+key normalisation and the hit/miss counters.
+
+No Gemini, no redis: FakeClient counts embed_content calls, FakeRedis is a dict.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_query_embedding_cache.py -q
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.services import embedding_service as es
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls: list[tuple] = []
+
+    async def embed_content(self, *, model, contents, config):
+        self.calls.append((contents, config["task_type"]))
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[float(len(contents)), 0.5])])
+
+
+class FakeSyncModels:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def embed_content(self, *, model, contents, config):
+        self.calls.append(contents)
+        return SimpleNamespace(embeddings=[SimpleNamespace(values=[float(len(contents)), 0.5])])
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(es, "_query_cache", es.QueryEmbeddingCache(max_size=2, ttl=60))
+    monkeypatch.setattr(es, "_query_cache_redis", lambda: None)
+    svc = es.EmbeddingService.__new__(es.EmbeddingService)
+    models = FakeModels()
+    svc.client = SimpleNamespace(aio=SimpleNamespace(models=models), models=FakeSyncModels())
+    return svc, models
+
+
+def test_repeat_query_is_served_locally(service):
+    svc, models = service
+    first = _run(svc.embed_text("What is  the overtime rule?", task_type="RETRIEVAL_QUERY"))
+    second = _run(svc.embed_text("what is the overtime rule?  ", task_type="RETRIEVAL_QUERY"))
+    assert first == second
+    assert len(models.calls) == 1
+    stats = es.get_query_cache_stats()
+    assert stats["local_hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_task_type_is_part_of_the_key(service):
+    svc, models = service
+    _run(svc.embed_text("q", task_type="RETRIEVAL_QUERY"))
+    _run(svc.embed_text("q", task_type="RETRIEVAL_DOCUMENT"))
+    assert len(models.calls) == 2
+
+
+def test_lru_evicts_oldest(service):
+    svc, models = service
+    for text in ("a", "b", "a", "c", "b"):
+        _run(svc.embed_text(text))
+    # "b" was the least recently used when "c" arrived, so it re-embeds.
+    assert [c[0] for c in models.calls] == ["a", "b", "c", "b"]
+
+
+def test_expired_entry_re_embeds(service, monkeypatch):
+    svc, models = service
+    _run(svc.embed_text("q"))
+    now = es.time.monotonic()
+    monkeypatch.setattr(es.time, "monotonic", lambda: now + 61)
+    _run(svc.embed_text("q"))
+    assert len(models.calls) == 2
+
+
+def test_redis_tier_shared_across_processes(service, monkeypatch):
+    svc, models = service
+    redis = FakeRedis()
+    monkeypatch.setattr(es, "_query_cache_redis", lambda: redis)
+    vector = _run(svc.embed_text("shared question"))
+    assert len(redis.store) == 1
+
+    # A fresh process: empty local tier, same Redis.
+    monkeypatch.setattr(es, "_query_cache", es.QueryEmbeddingCache(max_size=2, ttl=60))
+    assert _run(svc.embed_text("shared question")) == vector
+    assert len(models.calls) == 1
+    assert es.get_query_cache_stats()["redis_hits"] == 1
+
+
+def test_sync_path_counts_hits_and_misses(service):
+    svc, _ = service
+    svc.embed_text_sync("q")
+    svc.embed_text_sync("q")
+    assert len(svc.client.models.calls) == 1
+    stats = es.get_query_cache_stats()
+    assert stats["local_hits"] == 1 and stats["misses"] == 1
@@ -0,0 +1,233 @@
+"""redis_cache: tag sets, single-flight recompute and stale-while-revalidate
+behind `cached` / `get_or_compute`.
+
+No redis: FakeRedis is a dict plus sets, with just enough of SET NX PX and
+pipelines for the cache layer.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_redis_cache_tags.py -q
+"""
+import asyncio
+
+import pytest
+
+from app.core.services import redis_cache as rc
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def queue(*args, **kwargs):
+            self.calls.append((method, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        return [await m(*a, **k) for m, a, k in self.calls]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict = {}
+        self.sets: dict[str, set] = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def delete(self, *keys):
+        n = 0
+        for k in keys:
+            n += self.store.pop(k, None) is not None
+            n += self.sets.pop(k, None) is not None
+        return n
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    async def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def expire(self, key, ttl, nx=False, gt=False):
+        return True
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+    async def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    r = FakeRedis()
+    monkeypatch.setattr(rc, "get_redis_cache", lambda: r)
+    return r
+
+
+class TestTags:
+    def test_invalidate_deletes_only_tagged_keys(self, redis):
+        async def run():
+            await rc.cache_set_tagged(redis, "a", 1, tags=["company:1"])
+            await rc.cache_set_tagged(redis, "b", 2, tags=["company:1", "x"])
+            await rc.cache_set_tagged(redis, "c", 3, tags=["company:2"])
+            assert await rc.invalidate_tags(redis, "company:1") == 2
+
+        asyncio.run(run())
+        assert {k for k in redis.store if not k.startswith("cache:tagver:")} == {"c"}
+        assert redis.store["cache:tagver:company:1"] == "1"
+        assert redis.sets["cache:tag:company:1"] == set()
+        # "b" stays listed under "x"; deleting a missing key later is harmless.
+        assert redis.sets["cache:tag:x"] == {"b"}
+
+    def test_invalidate_unknown_tag_is_a_noop(self, redis):
+        assert asyncio.run(rc.invalidate_tags(redis, "nothing")) == 0
+
+    def test_invalidation_during_recompute_is_not_overwritten(self, redis):
+        @rc.cached(lambda cid: f"k:{cid}", ttl=60, tags=lambda cid: [rc.company_cache_tag(cid)])
+        async def load(cid):
+            # The write lands and invalidates while this read is in flight.
+            await rc.invalidate_company_cache(cid)
+            return "pre-invalidation"
+
+        assert asyncio.run(load(7)) == "pre-invalidation"
+        assert "k:7" not in redis.store
+
+    def test_stale_refresh_racing_an_invalidation_is_dropped(self, redis):
+        async def compute():
+            await rc.invalidate_tags(redis, "t")
+            return "old"
+
+        async def run():
+            await rc._write_entry(redis, "k", "stale", -1, 60, ("t",))
+            await rc._refresh(redis, "k", compute, 60, 60, ("t",), 1.0)
+
+        asyncio.run(run())
+        assert "k" not in redis.store
+
+
+class TestCached:
+    def test_concurrent_misses_compute_once(self, redis):
+        calls = []
+
+        @rc.cached(lambda cid: f"k:{cid}", ttl=60, tags=lambda cid: [rc.company_cache_tag(cid)])
+        async def load(cid):
+            calls.append(cid)
+            await asyncio.sleep(0.01)
+            return {"cid": cid}
+
+        async def run():
+            return await asyncio.gather(*(load(7) for _ in range(5)))
+
+        assert asyncio.run(run()) == [{"cid": 7}] * 5
+        assert calls == [7]
+        assert redis.sets["cache:tag:company:7"] == {"k:7"}
+        assert "cache:lock:k:7" not in redis.store
+
+    def test_waits_for_other_worker_holding_the_lock(self, redis, monkeypatch):
+        monkeypatch.setattr(rc, "_LOCK_POLL_SECONDS", 0.001)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return "mine"
+
+        async def run():
+            redis.store["cache:lock:k"] = "other-worker"
+
+            async def other_worker_finishes():
+                await asyncio.sleep(0.01)
+                await rc._write_entry(redis, "k", "theirs", 60, 0, ())
+
+            asyncio.create_task(other_worker_finishes())
+            return await rc.get_or_compute(redis, "k", compute, ttl=60)
+
+        assert asyncio.run(run()) == "theirs"
+        assert calls == []
+
+    def test_stale_hit_is_served_then_refreshed(self, redis, monkeypatch):
+        versions = iter(["v1", "v2"])
+
+        @rc.cached(lambda: "k", ttl=10, stale_ttl=60)
+        async def load():
+            return next(versions)
+
+        now = rc._time.time()
+
+        async def run():
+            assert await load() == "v1"
+            monkeypatch.setattr(rc._time, "time", lambda: now + 11)
+            assert await load() == "v1"  # stale, served while refreshing
+            await asyncio.gather(*rc._refreshing.values())
+            return await rc.cache_get(redis, "k")
+
+        assert asyncio.run(run())["value"] == "v2"
+
+    def test_compute_error_reaches_every_waiter_and_is_not_cached(self, redis):
+        @rc.cached(lambda: "k", ttl=60)
+        async def load():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        async def run():
+            return await asyncio.gather(load(), load(), return_exceptions=True)
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert redis.store == {}
+
+    def test_cancelled_leader_hands_off_to_a_waiter(self, redis):
+        calls = []
+
+        @rc.cached(lambda: "k", ttl=60)
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "fresh"
+
+        async def run():
+            leader = asyncio.create_task(load())
+            await asyncio.sleep(0)
+            waiters = [asyncio.create_task(load()) for _ in range(3)]
+            await asyncio.sleep(0)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            assert leader.cancelled()
+            return results
+
+        assert asyncio.run(run()) == ["fresh"] * 3
+        assert calls == [1, 1]
+
+    def test_legacy_plain_value_is_a_miss(self, redis):
+        redis.store["k"] = '{"total": 3}'
+
+        @rc.cached(lambda: "k", ttl=60)
+        async def load():
+            return {"total": 4}
+
+        assert asyncio.run(load()) == {"total": 4}
+
+    def test_no_redis_calls_through(self, monkeypatch):
+        monkeypatch.setattr(rc, "get_redis_cache", lambda: None)
+
+        @rc.cached(lambda: "k", ttl=60)
+        async def load():
+            return 1
+
+        assert asyncio.run(load()) == 1
@@ -0,0 +1,110 @@
+"""Binary pgvector codec + the shared nearest-neighbour query builder.
+
+No DB: the codec is pure bytes, and FakeConn records the SQL/params
+`search_nearest` sends plus the codec registration it triggers.
+
+    cd server && ./venv/bin/python -m pytest tests/core/test_vector_search.py -q
+"""
+
+import asyncio
+import struct
+
+import pytest
+
+from app.core.services import vector_search
+from app.database import vector
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class FakeConn:
+    def __init__(self, *, has_extension=True):
+        self.has_extension = has_extension
+        self.codecs: list[tuple] = []
+        self.fetched: list[tuple] = []
+
+    async def fetchval(self, sql, *args):
+        return "public" if self.has_extension else None
+
+    async def set_type_codec(self, name, *, schema, encoder, decoder, format):
+        self.codecs.append((name, schema, format))
+
+    async def fetch(self, sql, *args):
+        self.fetched.append((sql, args))
+        return []
+
+
+class TestCodec:
+    def test_roundtrip(self):
+        data = vector.encode_vector([0.5, -1.25, 3.0])
+        assert data[:4] == struct.pack(">HH", 3, 0)
+        assert len(data) == 4 + 3 * 4
+        assert vector.decode_vector(data) == [0.5, -1.25, 3.0]
+
+    def test_accepts_legacy_text_literal(self):
+        assert vector.encode_vector("[0.5, 2]") == vector.encode_vector([0.5, 2.0])
+        assert vector.decode_vector(vector.encode_vector("[]")) == []
+
+    def test_registers_once_per_connection(self):
+        conn = FakeConn()
+        assert _run(vector.ensure_vector_codec(conn)) is True
+        assert _run(vector.ensure_vector_codec(conn)) is True
+        assert conn.codecs == [("vector", "public", "binary")]
+
+    def test_missing_extension_is_not_registered(self):
+        conn = FakeConn(has_extension=False)
+        assert _run(vector.ensure_vector_codec(conn)) is False
+        assert conn.codecs == []
+
+
+class TestBuildNearestQuery:
+    def test_skips_empty_filters_and_numbers_placeholders(self):
+        sql, params = vector_search.build_nearest_query(
+            select="t.id",
+            from_="things t",
+            embedding_column="t.embedding",
+            where=["t.active"],
+            scope=[("t.case_id = {}", "case-1")],
+            filters=[("t.kind = ANY({})", []), ("t.tag = ANY({})", ("a",))],
+            top_k=5,
+            min_similarity=0.25,
+        )
+        assert params == ["case-1", ["a"], 0.75, 5]
+        assert "t.active AND t.case_id = $2 AND t.tag = ANY($3)" in sql
+        assert "t.embedding <=> $1::vector <= $4" in sql
+        assert sql.endswith("ORDER BY t.embedding <=> $1::vector LIMIT $5")
+
+    def test_scope_is_bound_even_when_empty(self):
+        sql, params = vector_search.build_nearest_query(
+            select="t.id", from_="things t", embedding_column="t.embedding",
+            scope=[("t.case_id = {}", None)], top_k=3,
+        )
+        assert params == [None, 3]
+        assert "WHERE t.case_id = $2" in sql
+
+
+class TestSearchNearest:
+    def test_binds_vector_as_list_and_strips_gate_prefix(self):
+        conn = FakeConn()
+        _run(vector_search.search_nearest(
+            conn, [0.1, 0.2], select="t.id", from_="things t",
+            embedding_column="t.embedding", extra_where=" AND t.codified",
+        ))
+        (sql, args), = conn.fetched
+        assert args[0] == [0.1, 0.2]
+        assert "WHERE (t.codified)" in sql
+
+    def test_falls_back_to_text_literal_without_extension(self):
+        conn = FakeConn(has_extension=False)
+        _run(vector_search.search_nearest(
+            conn, [1.0, 2.0], select="t.id", from_="things t",
+            embedding_column="t.embedding",
+        ))
+        assert conn.fetched[0][1][0] == "[1.0,2.0]"
+
+
+@pytest.mark.parametrize("dim", [1, 768, 3072])
+def test_wire_size_is_fixed_width(dim):
+    assert len(vector.encode_vector([0.123456789] * dim)) == 4 + 4 * dim
@@ -2,6 +2,8 @@ import asyncio
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import pytest
+
 from app.matcha.services.scheduling import schedule_eligibility, shift_compliance
 
 
@@ -50,3 +52,110 @@ def test_assigned_shift_keeps_schedule_eligibility_violations(monkeypatch):
     ))
 
     assert eligibility_violation in result
+
+
+class _BatchConn:
+    """Answers the batch evaluator's set-based queries from canned rows and
+    counts them, so the test can pin 'a handful of queries, not ~7 per shift'."""
+
+    def __init__(self, *, location_id, employee_id, existing, dob=None, credentials=()):
+        self.location_id = location_id
+        self.employee_id = employee_id
+        self.existing = existing
+        self.dob = dob
+        self.credentials = list(credentials)
+        self.queries: list[str] = []
+
+    async def fetch(self, query, *args):
+        self.queries.append(query)
+        if "FROM business_locations" in query:
+            return [{"id": self.location_id, "state": "CA", "city": "Fresno"}]
+        if "employee_credential_requirements" in query:
+            return self.credentials
+        if "employee_work_permits" in query:
+            return []
+        if "FROM schedule_shifts" in query:
+            return self.existing
+        if "employee_demographics" in query:
+            return [{"employee_id": self.employee_id, "date_of_birth": self.dob}] if self.dob else []
+        raise AssertionError(query)
+
+    async def fetchrow(self, query, *args):
+        self.queries.append(query)
+        return {"industry": "retail"}
+
+
+def _existing_shift(employee_id, day, *, shift_id=None):
+    return {
+        "employee_id": employee_id, "id": shift_id or uuid4(),
+        "starts_at": datetime(2026, 8, day, 9, tzinfo=timezone.utc),
+        "ends_at": datetime(2026, 8, day, 19, tzinfo=timezone.utc),
+        "break_minutes": 0,
+    }
+
+
+def test_batch_evaluates_every_shift_with_a_fixed_query_count():
+    from datetime import date
+
+    company_id, employee_id, location_id = uuid4(), uuid4(), uuid4()
+    excluded = uuid4()
+    # Sun 16 – Sat 22 Aug 2026: four 10h shifts already on the books, one of
+    # which is the shift being edited (excluded from its own week total).
+    existing = [_existing_shift(employee_id, d) for d in (17, 18, 19)]
+    existing.append(_existing_shift(employee_id, 20, shift_id=excluded))
+    credential = {
+        "employee_id": employee_id, "id": uuid4(), "due_date": date(2026, 8, 21),
+        "label": "Food handler card", "legal_basis": None,
+    }
+    conn = _BatchConn(
+        location_id=location_id, employee_id=employee_id, existing=existing,
+        credentials=[credential],
+    )
+
+    def proposed(day, **extra):
+        return {
+            "location_id": location_id,
+            "starts_at": datetime(2026, 8, day, 9, tzinfo=timezone.utc),
+            "ends_at": datetime(2026, 8, day, 17, tzinfo=timezone.utc),
+            "break_minutes": 30, "employee_id": employee_id, "lapse_items": [], **extra,
+        }
+
+    shifts = [proposed(21), proposed(22, exclude_shift_id=excluded)] * 30
+    results = asyncio.run(shift_compliance.check_schedule_compliance_batch(
+        conn, company_id, shifts=shifts,
+    ))
+
+    assert len(results) == len(shifts)
+    # 21 Aug: 40h already scheduled + 7.5h → over 40 → weekly OT.
+    first_checks = {v["check"] for v in results[0]}
+    assert "weekly_overtime" in first_checks
+    # Credential lapsed 21 Aug only blocks shifts AFTER that date.
+    assert not any(v["check"] == "schedule_eligibility" for v in results[0])
+    assert any(v["check"] == "schedule_eligibility" for v in results[1])
+    # Excluding the edited shift drops its 10h from the week total: 30 + 7.5.
+    assert "weekly_overtime" not in {v["check"] for v in results[1]}
+    assert len(conn.queries) <= 6
+
+
+def test_batch_matches_single_shift_path_for_unassigned_shift():
+    company_id, location_id = uuid4(), uuid4()
+    conn = _BatchConn(location_id=location_id, employee_id=None, existing=[])
+    shift = {
+        "location_id": location_id,
+        "starts_at": datetime(2026, 8, 21, 6, tzinfo=timezone.utc),
+        "ends_at": datetime(2026, 8, 21, 20, tzinfo=timezone.utc),
+        "break_minutes": 0,
+    }
+
+    (batched,) = asyncio.run(shift_compliance.check_schedule_compliance_batch(
+        conn, company_id, shifts=[shift],
+    ))
+
+    async def fake_location_state(*_args):
+        return "CA", "Fresno"
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(shift_compliance, "_location_state", fake_location_state)
+        single = asyncio.run(shift_compliance.check_shift_compliance(conn, company_id, **shift))
+    assert batched == single
+    assert {v["check"] for v in batched} >= {"meal_break", "daily_overtime"}
@@ -0,0 +1,179 @@
+"""services/employees/bulk_import.py — the staged engine behind the employee
+CSV bulk-upload routes — and the set-based `BulkImporter.import_companies`.
+
+No DB: FakeConn keeps the COPYed staging rows in memory and answers the merge
+statements from them, so the tests can count statements per import (constant,
+not per row) and force a database error to exercise the row-by-row replay.
+
+    cd server && ./venv/bin/python -m pytest tests/employees/test_employee_bulk_import.py -q
+"""
+import asyncio
+import io
+from uuid import uuid4
+
+import asyncpg
+import pytest
+
+from app.core.services.bulk_importer import BulkImporter
+from app.matcha.services.employees import bulk_import as bi
+
+HEADER = "email,first_name,last_name,work_state,manager_email,license_number,pay_rate,pay_classification\n"
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.stage.clear()  # ON COMMIT DELETE ROWS, or rollback
+        if exc_type is None:
+            self.conn.existing.update(self.conn.pending)
+        self.conn.pending.clear()
+        return False
+
+
+class FakeConn:
+    def __init__(self, existing=(), bad=()):
+        self.existing = {email: uuid4() for email in existing}
+        self.bad = set(bad)
+        self.stage: dict[str, list[dict]] = {}
+        self.pending: dict = {}
+        self.statements = []
+
+    def transaction(self):
+        return _Transaction(self)
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.statements.append(f"COPY {table}")
+        self.stage.setdefault(table, []).extend(dict(zip(columns, r)) for r in records)
+
+    async def execute(self, query, *args):
+        self.statements.append(query.split()[0])
+
+    async def fetch(self, query, *args):
+        self.statements.append(query.split()[0])
+        if "DELETE FROM _employee_import_stage" in query or "DELETE FROM _company_import_stage" in query:
+            table = "_employee_import_stage" if "employee" in query else "_company_import_stage"
+            key = "email" if "employee" in query else "name"
+            rows = self.stage.get(table, [])
+            dupes = [r for r in rows if r[key] in self.existing]
+            self.stage[table] = [r for r in rows if r[key] not in self.existing]
+            return [{"row_num": r["row_num"], key: r[key]} for r in dupes]
+        if "DELETE FROM _employee_credentials_stage" in query:
+            rows = self.stage.get("_employee_credentials_stage", [])
+            return [{"row_num": r["row_num"], "email": r["email"]} for r in rows if r["email"] not in self.existing]
+        if "INSERT INTO employees" in query or "INSERT INTO companies" in query:
+            table, key = (
+                ("_employee_import_stage", "email") if "employees" in query else ("_company_import_stage", "name")
+            )
+            rows = self.stage.get(table, [])
+            if any(r[key] in self.bad for r in rows):
+                raise asyncpg.exceptions.StringDataRightTruncationError("value too long for type character varying(100)")
+            inserted = [{"id": uuid4(), key: r[key]} for r in rows]
+            self.pending.update({r[key]: r["id"] for r in inserted})
+            return inserted
+        raise AssertionError(f"unexpected fetch: {query}")
+
+
+def _parse(csv_text, max_rows=100):
+    return bi.parse_employee_csv(io.StringIO(csv_text), max_rows=max_rows)
+
+
+def test_parse_validates_rows_and_reports_errors_in_place():
+    parsed = _parse(
+        HEADER
+        + "a@x.com,Ann,Lee,California,,RN1,,\n"
+        + "bad-email,Bo,Ng,CA,,,,\n"
+        + "b@x.com,Bo,Ng,ZZ,,,,\n"
+        + "a@x.com,Ann,Again,CA,,,,\n"
+        + "c@x.com,Cy,Po,,,,12,\n"
+        + "d@x.com,Di,Ro,,,,,\n"
+    )
+
+    assert parsed.total_rows == 6
+    assert [(r.row_num, r.email, r.work_state) for r in parsed.rows] == [(2, "a@x.com", "CA"), (7, "d@x.com", None)]
+    assert parsed.rows[0].credentials["license_number"] == "RN1"
+    assert parsed.rows[1].credentials is None
+    assert [(e["row"], e["error"][:20]) for e in parsed.errors] == [
+        (3, "Invalid email format"),
+        (4, "Invalid work_state '"),
+        (5, bi.DUPLICATE_EMAIL_ERROR[:20]),
+        (6, "pay_classification i"),
+    ]
+    assert parsed.rows_missing_work_location == 1
+
+
+def test_parse_enforces_header_and_row_cap():
+    with pytest.raises(ValueError, match="Missing required columns: last_name"):
+        _parse("email,first_name\nx@y.com,X\n")
+    with pytest.raises(bi.CSVTooLarge):
+        _parse(HEADER + "".join(f"e{i}@x.com,A,B,,,,,\n" for i in range(3)), max_rows=2)
+
+
+def test_merge_is_set_based_and_skips_existing_emails():
+    rows = [f"e{i}@x.com,First,Last,CA,boss@x.com,LIC{i},,\n" for i in range(500)]
+    parsed = _parse(HEADER + "".join(rows) + "old@x.com,Old,Timer,,,,,\n", max_rows=1000)
+    conn = FakeConn(existing=["old@x.com", "boss@x.com"])
+
+    result = asyncio.run(bi.merge_employees(
+        conn, uuid4(), parsed.rows, compensation_fields=True, org_fields=True, external_uid=False,
+    ))
+
+    assert len(result.created) == 500
+    assert [s.row_num for s, _ in result.created] == list(range(2, 502))
+    assert result.errors == [{"row": 502, "email": "old@x.com", "error": bi.DUPLICATE_EMAIL_ERROR}]
+    assert result.credentials_written == 500
+    # Statement count is independent of the row count.
+    assert len(conn.statements) <= 10
+
+
+def test_database_error_replays_row_by_row():
+    parsed = _parse(HEADER + "a@x.com,A,A,,,,,\nbad@x.com,B,B,,,,,\nc@x.com,C,C,,,,,\n")
+    conn = FakeConn(bad=["bad@x.com"])
+
+    result = asyncio.run(bi.merge_employees(
+        conn, uuid4(), parsed.rows, compensation_fields=False, org_fields=False, external_uid=False,
+    ))
+
+    assert [s.email for s, _ in result.created] == ["a@x.com", "c@x.com"]
+    assert [(e["row"], e["email"]) for e in result.errors] == [(3, "bad@x.com")]
+    assert "value too long" in result.errors[0]["error"]
+    assert set(conn.existing) == {"a@x.com", "c@x.com"}
+
+
+def test_credentials_merge_folds_repeated_emails_and_reports_missing():
+    parsed = bi.parse_credentials_csv(io.StringIO(
+        "email,license_type,license_number\n"
+        "a@x.com,RN,\n"
+        ",RN,1\n"
+        "a@x.com,,LIC-2\n"
+        "ghost@x.com,MD,9\n"
+    ), max_rows=100)
+    conn = FakeConn(existing=["a@x.com"])
+
+    updated, not_found, failed = asyncio.run(bi.merge_credentials(conn, uuid4(), parsed.rows))
+
+    assert parsed.errors == [{"row": 3, "email": "", "error": "Email is required"}]
+    assert (updated, failed) == (2, [])
+    assert not_found == [{"row": 5, "email": "ghost@x.com", "error": "Employee not found"}]
+    (first, email, creds, row_nums), _ = bi._collapse_credentials(parsed.rows)
+    assert (first, email, row_nums) == (2, "a@x.com", [2, 4])
+    assert (creds["license_type"], creds["license_number"]) == ("RN", "LIC-2")
+
+
+def test_import_companies_merges_in_one_pass():
+    conn = FakeConn(existing=["Acme"])
+    rows = [{"name": "Acme"}, {"name": "Beta", "size": "mid"}, {"industry": "no name"}, {"name": "Beta"}, {"name": "Gamma"}]
+
+    result = asyncio.run(BulkImporter().import_companies(rows, conn))
+
+    assert result.success_count == 2
+    assert [(e.row, e.error.split(":")[0]) for e in result.errors] == [
+        (1, "Company 'Acme' already exists"),
+        (3, "Validation error"),
+        (4, "Company 'Beta' already exists"),
+    ]
+    assert [s for s in conn.statements if s.startswith("COPY")] == ["COPY _company_import_stage"]
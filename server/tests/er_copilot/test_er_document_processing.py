@@ -27,6 +27,16 @@ class _FakeConn:
     async def execute(self, query, *args):
         self.executed.append((query, args))
 
+    async def executemany(self, query, args_list):
+        for args in args_list:
+            self.executed.append((query, tuple(args)))
+
+    async def fetchval(self, query, *args):
+        return "public"  # pg_type lookup for the vector codec
+
+    async def set_type_codec(self, *args, **kwargs):
+        pass
+
     async def fetchrow(self, query, *args):
         return self._doc_row
 
@@ -0,0 +1,253 @@
+"""start_hris_sync's incremental path — worker fingerprints, the set-based page
+apply, and resuming a run the provider cut short.
+
+No DB and no provider: FakeDB answers the orchestrator's statements from a few
+dicts (employees, stored fingerprints, the run row) and keeps the COPYed stage
+rows in memory; FakeService serves worker pages and can time out part-way.
+
+    cd server && ./venv/bin/python -m pytest tests/hris/test_incremental_sync.py -q
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from app.matcha.services.hris import hris_sync_orchestrator as orch
+from app.matcha.services.hris.hris_service import HRISProvisioningError
+from app.matcha.services.training import training_assignment
+
+
+class _Transaction:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.db.stage.clear()  # ON COMMIT DELETE ROWS, or rollback
+        return False
+
+
+class FakeDB:
+    def __init__(self):
+        self.employees: dict[str, dict] = {}  # hris_id -> row
+        self.fingerprints: dict[str, str] = {}  # hris_id -> stored fingerprint
+        self.run: dict | None = None
+        self.stage: list[dict] = []
+        self.statements: list[str] = []
+        self.single_path_calls = 0
+
+    def transaction(self):
+        return _Transaction(self)
+
+    def _log(self, sql):
+        self.statements.append(" ".join(sql.split())[:60])
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self._log(f"COPY {table}")
+        self.stage.extend(dict(zip(columns, r)) for r in records)
+
+    async def fetchval(self, sql, *args):
+        self._log(sql)
+        if "FROM hris_sync_runs" in sql:
+            return int(bool(self.run and self.run["status"] == "running"))
+        raise AssertionError(sql)
+
+    async def fetchrow(self, sql, *args):
+        self._log(sql)
+        if "FROM integration_connections" in sql:
+            return {"id": "conn-1", "config": {"mode": "fake"}, "secrets": {}}
+        if "SET status = 'running'" in sql:  # resume
+            checkpoint = json.loads(self.run["metadata"]).get("checkpoint") if self.run else None
+            if self.run and self.run["status"] == "failed" and checkpoint and checkpoint.get("cursor"):
+                self.run["status"] = "running"
+                return dict(self.run)
+            return None
+        if "INSERT INTO hris_sync_runs" in sql:
+            self.run = {
+                "id": uuid4(), "status": "running", "metadata": "{}", "errors": "[]",
+                "total_records": 0, "created_count": 0, "updated_count": 0,
+                "skipped_count": 0, "error_count": 0,
+                "started_at": None, "completed_at": None, "created_at": None,
+            }
+            return dict(self.run)
+        if "UPDATE hris_sync_runs" in sql:  # finalize
+            self.run.update(status=args[1], total_records=args[2], created_count=args[3],
+                            updated_count=args[4], skipped_count=args[5], error_count=args[6])
+            metadata = json.loads(self.run["metadata"])
+            metadata.pop("checkpoint", None)
+            self.run["metadata"] = json.dumps({**metadata, **json.loads(args[8])})
+            return dict(self.run)
+        raise AssertionError(sql)
+
+    async def fetch(self, sql, *args):
+        self._log(sql)
+        if "FROM external_identities ei" in sql:
+            return [
+                {"external_user_id": h, "sync_fingerprint": self.fingerprints[h]}
+                for h in args[2] if h in self.fingerprints
+            ]
+        if "SELECT id, hris_id, email FROM employees" in sql:
+            return [dict(e) for e in self.employees.values()]
+        if "INSERT INTO employees" in sql:
+            out = []
+            for row in self.stage:
+                if row["employee_id"] is None:
+                    row["employee_id"] = uuid4()
+                    self.employees[row["hris_id"]] = {"id": row["employee_id"], "hris_id": row["hris_id"], "email": row["email"]}
+                    out.append({"seq": row["seq"], "employee_id": row["employee_id"]})
+            return out
+        return []  # locations, manager edges, credential requirements
+
+    async def execute(self, sql, *args):
+        self._log(sql)
+        if "INSERT INTO external_identities" in sql:
+            for row in self.stage:
+                self.fingerprints[row["hris_id"]] = row["fingerprint"]
+        elif "UPDATE hris_sync_runs" in sql and "checkpoint" in sql:
+            self.run.update(total_records=args[1], created_count=args[2], updated_count=args[3],
+                            skipped_count=args[4], error_count=args[5], errors=args[6])
+            metadata = json.loads(self.run["metadata"])
+            metadata["checkpoint"] = json.loads(args[7])
+            self.run["metadata"] = json.dumps(metadata)
+        elif "UPDATE hris_sync_runs" in sql and "'failed'" in sql:
+            self.run.update(status="failed", errors=args[1])
+        return "OK"
+
+
+def _worker(i, title="Cook"):
+    return {"id": f"w{i}", "email": f"w{i}@x.com", "title": title}
+
+
+class FakeService:
+    def __init__(self, workers, page_size=3, fail_at_page=None, error=None):
+        self.workers = workers
+        self.page_size = page_size
+        self.fail_at_page = fail_at_page
+        self.error = error or HRISProvisioningError("fetch_error", "Finch fetch error: ReadTimeout")
+        self.cursors = []
+
+    async def fetch_worker_pages(self, config, secrets, cursor=None):
+        self.cursors.append(cursor)
+        start = (cursor or {}).get("offset", 0)
+        for page, offset in enumerate(range(start, len(self.workers), self.page_size)):
+            if self.fail_at_page is not None and page == self.fail_at_page:
+                self.fail_at_page = None
+                raise self.error
+            end = offset + self.page_size
+            yield self.workers[offset:end], {"offset": end} if end < len(self.workers) else None
+
+    @staticmethod
+    def normalize_worker(raw):
+        return {"hris_id": raw["id"], "email": raw["email"], "job_title": raw["title"], "first_name": "A"}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB()
+
+    @asynccontextmanager
+    async def get_connection():
+        yield fake
+
+    async def no_op(*args, **kwargs):
+        return None
+
+    async def single(conn, **kwargs):
+        fake.single_path_calls += 1
+        return "updated"
+
+    monkeypatch.setattr(orch, "get_connection", get_connection)
+    monkeypatch.setattr(orch, "run_jurisdiction_drift_check", no_op)
+    monkeypatch.setattr(orch, "_sync_single_employee", single)
+    monkeypatch.setattr(orch, "_assign_credential_requirements_bulk", no_op)
+    monkeypatch.setattr(training_assignment, "evaluate_new_hire_rules_bulk", no_op)
+    return fake
+
+
+def _sync(monkeypatch, service, **kwargs):
+    monkeypatch.setattr(orch, "get_hris_service", lambda mode: service)
+    return asyncio.run(orch.start_hris_sync(company_id=uuid4(), **kwargs))
+
+
+def test_fingerprint_ignores_key_order_and_tracks_values():
+    a = {"hris_id": "1", "email": "a@x.com", "demographics": {"gender": "f", "ethnicity": None}}
+    b = {"demographics": {"ethnicity": None, "gender": "f"}, "email": "a@x.com", "hris_id": "1"}
+    assert orch._worker_fingerprint(a) == orch._worker_fingerprint(b)
+    assert orch._worker_fingerprint(a) != orch._worker_fingerprint({**a, "email": "b@x.com"})
+
+
+def test_unchanged_workers_are_skipped_and_changed_ones_applied_set_based(db, monkeypatch):
+    workers = [_worker(i) for i in range(9)]
+
+    first = _sync(monkeypatch, FakeService(workers))
+    assert (first["created_count"], first["unchanged_count"]) == (9, 0)
+    # One COPY per page; the statement count doesn't grow with the page.
+    assert sum(s.startswith("COPY") for s in db.statements) == 3
+    assert db.single_path_calls == 0
+
+    workers[4] = _worker(4, title="Chef")
+    db.statements.clear()
+    second = _sync(monkeypatch, FakeService(workers))
+    assert second["status"] == "completed"
+    assert (second["updated_count"], second["unchanged_count"], second["skipped_count"]) == (1, 8, 8)
+    assert sum(s.startswith("COPY") for s in db.statements) == 1
+    # Every worker keeps a stored fingerprint for the next run.
+    assert set(db.fingerprints) == {f"w{i}" for i in range(9)}
+
+    forced = _sync(monkeypatch, FakeService(workers), full_resync=True)
+    assert (forced["updated_count"], forced["unchanged_count"]) == (9, 0)
+
+
+def test_repeated_worker_in_a_page_is_deferred_to_the_single_path(db, monkeypatch):
+    workers = [_worker(1), _worker(2), {"id": "w1", "email": "w1@x.com", "title": "Chef"}]
+    result = _sync(monkeypatch, FakeService(workers))
+    assert (result["created_count"], result["updated_count"]) == (2, 1)
+    assert db.single_path_calls == 1
+
+
+def test_provider_timeout_leaves_a_checkpoint_and_the_next_sync_resumes(db, monkeypatch):
+    workers = [_worker(i) for i in range(8)]
+    service = FakeService(workers, fail_at_page=2)
+
+    failed = _sync(monkeypatch, service)
+    assert failed["status"] == "failed" and failed["resumable"] is True
+    assert failed["errors"][-1]["code"] == "fetch_error"
+    assert json.loads(db.run["metadata"])["checkpoint"]["cursor"] == {"offset": 6}
+    run_id = failed["run_id"]
+
+    resumed = _sync(monkeypatch, service)
+    assert resumed["run_id"] == run_id
+    assert service.cursors == [None, {"offset": 6}]
+    assert resumed["status"] == "completed"
+    assert (resumed["total_records"], resumed["created_count"]) == (8, 8)
+    assert resumed["errors"] == []
+    assert "checkpoint" not in json.loads(db.run["metadata"])
+    assert json.loads(db.run["metadata"])["resumed"] is True
+
+
+def test_timeout_before_any_page_is_not_resumable(db, monkeypatch):
+    service = FakeService([_worker(1)], fail_at_page=0)
+    failed = _sync(monkeypatch, service)
+    assert failed["resumable"] is False
+
+    fresh = _sync(monkeypatch, service)
+    assert fresh["run_id"] != failed["run_id"]
+    assert service.cursors == [None, None]
+
+
+def test_unexpected_error_fails_the_run_and_the_next_sync_resumes(db, monkeypatch):
+    workers = [_worker(i) for i in range(8)]
+    service = FakeService(workers, fail_at_page=2, error=RuntimeError("connection reset"))
+
+    with pytest.raises(RuntimeError):
+        _sync(monkeypatch, service)
+    assert db.run["status"] == "failed"
+    assert json.loads(db.run["metadata"])["checkpoint"]["cursor"] == {"offset": 6}
+
+    resumed = _sync(monkeypatch, service)
+    assert service.cursors == [None, {"offset": 6}]
+    assert resumed["status"] == "completed"
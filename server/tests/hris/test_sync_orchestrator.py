@@ -178,6 +178,32 @@ def test_insert_placeholder_count_matches_columns_and_args():
     )
 
 
+def test_every_normalized_key_reaches_the_bulk_stage():
+    """The same guard for the set-based path (`_merge_worker_batch`), whose staged
+    row is a third hand-maintained list."""
+    normalized = FinchHRISService.normalize_worker(_finch_worker())
+    normalized["credentials"] = {"license_number": "RN-1", "npi_number": "123"}
+    record = orch._stage_record(
+        0, None, normalized, work_state="TX", work_location_id=None, raw_worker={}, fingerprint="fp",
+    )
+    assert len(record) == len(orch._WORKER_STAGE_COLUMNS)
+    staged = dict(zip(orch._WORKER_STAGE_COLUMNS, record))
+    bound = {str(v) for v in staged.values()}
+
+    for key, value in normalized.items():
+        if key in ("credentials", "demographics"):
+            for sub_value in (value or {}).values():
+                assert str(sub_value) in bound, f"{key}.{sub_value!r} never reaches the stage"
+            continue
+        if key == "manager_hris_id" or value is None:
+            continue
+        assert str(value) in bound or str(value).lower() in bound, (
+            f"normalize_worker emits {key!r}={value!r} but _stage_record drops it"
+        )
+    for column in orch._WORKER_STAGE_COLUMNS:
+        assert column in orch._CREATE_WORKER_STAGE
+
+
 # ── Finch is the reference contract ───────────────────────────────────────────
 
 def test_normalizer_key_sets_match_finch():
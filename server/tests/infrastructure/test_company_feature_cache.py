@@ -0,0 +1,147 @@
+"""company_feature_cache behind get_company_features / fetch_company_features:
+per-worker TTL cache of merged flags, live only while the invalidation
+subscriber runs, with epoch-guarded fills and hit/miss counters.
+
+    cd server && ./venv/bin/python -m pytest tests/infrastructure/test_company_feature_cache.py -q
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core import feature_flags
+from app.core.services import company_feature_cache as fc
+
+
+class FakeConn:
+    def __init__(self, row):
+        self.row = row
+        self.queries = 0
+
+    async def fetchrow(self, sql, *args):
+        self.queries += 1
+        return self.row
+
+
+@pytest.fixture
+def live_cache(monkeypatch):
+    monkeypatch.setattr(fc, "_cache", fc.CompanyFeatureCache())
+    monkeypatch.setattr(fc, "_subscribed", True)
+    return fc._cache
+
+
+ROW = {"enabled_features": {"matcha_work": True}, "signup_source": None}
+
+
+def test_disabled_without_subscriber_always_reads_the_row(monkeypatch):
+    monkeypatch.setattr(fc, "_subscribed", False)
+    conn = FakeConn(ROW)
+    company_id = uuid4()
+
+    async def run():
+        for _ in range(3):
+            await feature_flags.get_company_features(company_id, conn=conn)
+
+    asyncio.run(run())
+    assert conn.queries == 3
+
+
+def test_hit_after_first_read_and_counters(live_cache):
+    conn = FakeConn(ROW)
+    company_id = uuid4()
+
+    async def run():
+        first = await feature_flags.get_company_features(company_id, conn=conn)
+        first["matcha_work"] = False  # caller mutation must not leak into the cache
+        return await feature_flags.get_company_features(company_id, conn=conn)
+
+    assert asyncio.run(run())["matcha_work"] is True
+    assert conn.queries == 1
+    stats = fc.get_feature_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["enabled"]) == (1, 1, True)
+
+
+def test_invalidation_forces_a_reread(live_cache):
+    conn = FakeConn(ROW)
+    company_id = uuid4()
+
+    async def run():
+        await feature_flags.get_company_features(company_id, conn=conn)
+        await fc.invalidate_company_features(company_id)
+        await feature_flags.get_company_features(company_id, conn=conn)
+
+    asyncio.run(run())
+    assert conn.queries == 2
+    assert fc.get_feature_cache_stats()["invalidations"] == 1
+
+
+def test_fill_that_raced_an_invalidation_is_discarded(live_cache):
+    company_id = uuid4()
+    _, epoch = fc.get_cached(company_id)
+    live_cache.drop(uuid4())  # any invalidation lands while the read is in flight
+    fc.put_cached(company_id, {"matcha_work": True}, epoch)
+    assert fc.get_cached(company_id)[0] is None
+
+
+def test_missing_company_is_none_and_not_cached(live_cache):
+    conn = FakeConn(None)
+    company_id = uuid4()
+
+    async def run():
+        assert await feature_flags.fetch_company_features(company_id, conn=conn) is None
+        # get_company_features keeps its merge-to-defaults contract.
+        return await feature_flags.get_company_features(company_id, conn=conn)
+
+    assert asyncio.run(run()) == feature_flags.merge_company_features(None)
+    assert conn.queries == 2
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+    async def unsubscribe(self, channel):
+        pass
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def pubsub(self):
+        return FakePubSub()
+
+
+def test_enabled_only_while_subscribed(monkeypatch):
+    from app.core.services import redis_cache
+
+    monkeypatch.setattr(fc, "_cache", fc.CompanyFeatureCache())
+    monkeypatch.setattr(fc, "_subscriber_task", None)
+    monkeypatch.setattr(fc, "_subscribed", False)
+    redis = None
+    monkeypatch.setattr(redis_cache, "get_redis_cache", lambda: redis)
+
+    async def run():
+        nonlocal redis
+        fc.start_feature_invalidation_subscriber()
+        await asyncio.sleep(0)
+        # Running, but with no Redis it hears no invalidations.
+        waiting = fc.cache_enabled()
+        fc._subscriber_task.cancel()
+        await asyncio.gather(fc._subscriber_task, return_exceptions=True)
+        redis = FakeRedis()
+        fc.start_feature_invalidation_subscriber()
+        await asyncio.sleep(0)
+        subscribed = fc.cache_enabled()
+        fc._cache.put("c1", {"x": True}, fc._cache.epoch)
+        await fc.stop_feature_invalidation_subscriber()
+        return waiting, subscribed, fc.cache_enabled(), fc._cache.snapshot()["size"]
+
+    assert asyncio.run(run()) == (False, True, False, 0)
@@ -0,0 +1,194 @@
+"""DB pool instrumentation (acquire-wait / hold histograms, in-use, waiters),
+role-based pool sizing from settings, and `get_read_connection`'s routing to
+the read-only pool with fallback to the primary.
+
+No database: LimitedPool hands out a fixed number of FakeConns and makes any
+further acquire wait, like asyncpg's pool at max_size.
+
+    cd server && ./venv/bin/python -m pytest tests/infrastructure/test_db_pool_metrics.py -q
+"""
+import asyncio
+import contextvars
+
+import pytest
+
+from app import config
+from app.database import pool as db_pool
+from app.database.pool_metrics import LatencyHistogram, PoolMetrics
+
+
+class FakeConn:
+    def __init__(self, name):
+        self.name = name
+        self.executed = []
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+
+class LimitedPool:
+    def __init__(self, name, size=1, fail=None):
+        self.free = asyncio.Queue()
+        for i in range(size):
+            self.free.put_nowait(FakeConn(f"{name}-{i}"))
+        self.size = size
+        self.fail = fail
+
+    async def acquire(self, *, timeout=None):
+        if self.fail:
+            raise self.fail
+        return await asyncio.wait_for(self.free.get(), timeout)
+
+    async def release(self, conn):
+        self.free.put_nowait(conn)
+
+    def get_size(self):
+        return self.size
+
+    def get_idle_size(self):
+        return self.free.qsize()
+
+    def get_min_size(self):
+        return 0
+
+    def get_max_size(self):
+        return self.size
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics(monkeypatch):
+    monkeypatch.setattr(db_pool, "_metrics", PoolMetrics())
+    monkeypatch.setattr(db_pool, "_read_metrics", PoolMetrics())
+    monkeypatch.setattr(db_pool, "_read_pool", None)
+    monkeypatch.setattr(db_pool, "_acquire_timeout", None)
+    monkeypatch.setattr(db_pool, "_read_acquire_timeout", db_pool.DEFAULT_READ_ACQUIRE_TIMEOUT)
+
+
+def _run(coro):
+    return contextvars.Context().run(asyncio.run, coro)
+
+
+def test_histogram_buckets_and_percentiles():
+    hist = LatencyHistogram(buckets_ms=(1, 10, 100))
+    for seconds in [0.0005] * 90 + [0.05] * 9 + [2.0]:
+        hist.observe(seconds)
+
+    snap = hist.snapshot()
+    assert snap["buckets"] == {"le_1ms": 90, "le_10ms": 0, "le_100ms": 9, "inf": 1}
+    assert (snap["p50_ms"], snap["p95_ms"], snap["p99_ms"]) == (1, 100, 100)
+    assert hist.percentile(1.0) == 2000.0
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_waiters_in_use_and_hold_times_are_tracked(monkeypatch):
+    async def run():
+        pool = LimitedPool("primary", size=1)
+        monkeypatch.setattr(db_pool, "_pool", pool)
+        seen = []
+
+        async def hold():
+            async with db_pool.get_connection():
+                await asyncio.sleep(0.01)
+                seen.append((db_pool._metrics.in_use, db_pool._metrics.waiting))
+
+        await asyncio.gather(hold(), hold(), hold())
+        return seen, db_pool.get_pool_stats()
+
+    seen, stats = _run(run())
+    # One connection: the first holder sees the other two queued behind it.
+    assert seen == [(1, 2), (1, 1), (1, 0)]
+    primary = stats["primary"]
+    assert (primary["in_use"], primary["waiting"], primary["waiting_peak"]) == (0, 0, 2)
+    assert primary["acquires"] == 3 and primary["idle"] == 1
+    assert primary["acquire_wait"]["count"] == 3 and primary["hold"]["count"] == 3
+    assert primary["acquire_wait"]["max_ms"] >= 10
+    assert stats["replica"] is None
+
+
+def test_acquire_timeout_is_counted_and_raised(monkeypatch):
+    async def run():
+        monkeypatch.setattr(db_pool, "_pool", LimitedPool("primary", size=0))
+        monkeypatch.setattr(db_pool, "_acquire_timeout", 0.01)
+        async with db_pool.get_connection():
+            pass
+
+    with pytest.raises(asyncio.TimeoutError):
+        _run(run())
+    metrics = db_pool._metrics
+    assert (metrics.timeouts, metrics.acquires, metrics.waiting, metrics.in_use) == (1, 0, 0, 0)
+
+
+def test_read_connection_uses_replica_with_rls_context(monkeypatch):
+    primary, replica = LimitedPool("primary"), LimitedPool("replica")
+    monkeypatch.setattr(db_pool, "_pool", primary)
+    monkeypatch.setattr(db_pool, "_read_pool", replica)
+
+    async def run():
+        db_pool.set_tenant_id("t1")
+        async with db_pool.get_read_connection() as conn:
+            return conn
+
+    conn = _run(run())
+    assert conn.name == "replica-0"
+    assert [sql for sql, _ in conn.executed] == [db_pool._APPLY_RLS_CONTEXT_SQL, db_pool._RESET_RLS_CONTEXT_SQL]
+    stats = db_pool.get_pool_stats()
+    assert (stats["replica"]["acquires"], stats["primary"]["acquires"]) == (1, 0)
+
+
+def test_read_connection_falls_back_to_primary(monkeypatch):
+    monkeypatch.setattr(db_pool, "_pool", LimitedPool("primary"))
+
+    async def read():
+        async with db_pool.get_read_connection() as conn:
+            return conn.name
+
+    # No replica configured: plain get_connection.
+    assert _run(read()) == "primary-0"
+
+    monkeypatch.setattr(db_pool, "_read_pool", LimitedPool("replica", fail=ConnectionRefusedError()))
+    assert _run(read()) == "primary-0"
+    assert db_pool._read_metrics.fallbacks == 1
+    assert db_pool._read_metrics.errors == 1
+
+
+def test_saturated_replica_falls_back_without_a_primary_timeout(monkeypatch):
+    monkeypatch.setattr(db_pool, "_pool", LimitedPool("primary"))
+    monkeypatch.setattr(db_pool, "_read_pool", LimitedPool("replica", size=0))
+    monkeypatch.setattr(db_pool, "_read_acquire_timeout", 0.01)
+
+    async def read():
+        async with db_pool.get_read_connection() as conn:
+            return conn.name
+
+    assert _run(read()) == "primary-0"
+    assert db_pool._read_metrics.fallbacks == 1
+    assert db_pool._read_metrics.timeouts == 1
+
+
+def test_unreachable_replica_at_startup_leaves_reads_on_the_primary(monkeypatch):
+    primary = LimitedPool("primary")
+
+    async def create_pool(dsn, **kwargs):
+        if dsn == "postgres://replica":
+            raise ConnectionRefusedError()
+        return primary
+
+    monkeypatch.setattr(db_pool, "_pool", None)
+    monkeypatch.setattr(db_pool.asyncpg, "create_pool", create_pool)
+    assert _run(db_pool.init_pool("postgres://primary", read_url="postgres://replica")) is primary
+    assert not db_pool.has_read_pool()
+
+
+@pytest.mark.parametrize("env, expected", [
+    ({}, ("api", 2, 10)),
+    ({"DATABASE_POOL_ROLE": "realtime"}, ("realtime", 4, 30)),
+    ({"DATABASE_POOL_ROLE": "script", "DATABASE_POOL_MAX_SIZE": "2"}, ("script", 1, 2)),
+    ({"DATABASE_POOL_MIN_SIZE": "20"}, ("api", 10, 10)),
+    ({"DATABASE_POOL_ROLE": "bogus"}, ("api", 2, 10)),
+])
+def test_pool_sizes_follow_role_and_overrides(monkeypatch, env, expected):
+    for key in ("DATABASE_POOL_ROLE", "DATABASE_POOL_MIN_SIZE", "DATABASE_POOL_MAX_SIZE"):
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    assert config._db_pool_sizes() == expected
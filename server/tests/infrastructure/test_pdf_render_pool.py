@@ -0,0 +1,130 @@
+"""RendererPool — the worker-process pool behind `render_pdf_async`: the
+content-hash output cache, coalescing of identical renders, bounded admission
+and recovery from a worker that dies mid-render.
+
+No WeasyPrint: the pool takes its render function as an argument, so these
+use stand-ins. The process tests use real spawned workers, which need the
+stand-ins at module level (they are pickled by reference).
+
+    cd server && ./venv/bin/python -m pytest tests/infrastructure/test_pdf_render_pool.py -q
+"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.core.services.pdf_render_pool import PdfRendererBusy, RendererPool
+
+
+def _pid_render(html_string, stylesheets):
+    if html_string == "crash":
+        os._exit(1)
+    return f"{os.getpid()}:{html_string}:{'|'.join(stylesheets)}".encode()
+
+
+class CountingRender:
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+        self._lock = threading.Lock()
+
+    def __call__(self, html_string, stylesheets):
+        with self._lock:
+            self.calls.append((html_string, stylesheets))
+        if self.gate is not None:
+            self.gate.wait(5)
+        return f"%PDF {html_string} {stylesheets}".encode()
+
+
+def _thread_pool(render, **kwargs):
+    return RendererPool(processes=0, render_fn=render, initializer=None, **kwargs)
+
+
+def test_identical_input_returns_cached_bytes_without_rendering():
+    render = CountingRender()
+    pool = _thread_pool(render)
+
+    async def run():
+        first = await pool.render("<h1>Handbook</h1>", ["@page { size: A4 }"])
+        second = await pool.render("<h1>Handbook</h1>", ("@page { size: A4 }",))
+        other = await pool.render("<h1>Handbook</h1>", ["@page { size: letter }"])
+        return first, second, other
+
+    first, second, other = asyncio.run(run())
+    assert first == second
+    assert other != first
+    assert len(render.calls) == 2
+    snap = pool.snapshot()
+    assert (snap["cache_hits"], snap["cache_entries"], snap["thread_renders"]) == (1, 2, 2)
+
+
+def test_concurrent_identical_renders_are_coalesced():
+    gate = threading.Event()
+    render = CountingRender(gate)
+    pool = _thread_pool(render)
+
+    async def run():
+        tasks = [asyncio.create_task(pool.render("<p>same</p>")) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(run())
+    assert len(set(results)) == 1
+    assert len(render.calls) == 1
+    assert pool.snapshot()["coalesced"] == 4
+
+
+def test_cache_is_bounded_lru():
+    render = CountingRender()
+    pool = _thread_pool(render, cache_max_bytes=20)
+
+    async def run():
+        for html in ("a", "b", "a", "c"):  # room for two; "b" is LRU when "c" lands
+            await pool.render(html)
+        await pool.render("b")
+
+    asyncio.run(run())
+    assert [html for html, _ in render.calls] == ["a", "b", "c", "b"]
+    assert pool.snapshot()["cache_bytes"] <= 20
+
+
+def test_full_queue_rejects_instead_of_growing(monkeypatch):
+    gate = threading.Event()
+    render = CountingRender(gate)
+    pool = RendererPool(processes=1, max_queued=1, render_fn=render, initializer=None)
+    monkeypatch.setattr(pool, "uses_processes", lambda: False)
+
+    async def run():
+        # 2 slots (one running + one staged per worker), then 1 waiter.
+        admitted = [asyncio.create_task(pool.render(f"doc {i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(PdfRendererBusy):
+            await pool.render("doc 3")
+        assert pool.snapshot()["waiting"] == 1
+        gate.set()
+        return await asyncio.gather(*admitted)
+
+    assert len(asyncio.run(run())) == 3
+    assert pool.snapshot()["rejected"] == 1
+
+
+def test_renders_in_worker_processes_and_survives_a_crash():
+    pool = RendererPool(processes=1, render_fn=_pid_render, initializer=None)
+
+    async def run():
+        try:
+            ok = await pool.render("<p>x</p>", ["a{}"])
+            with pytest.raises(RuntimeError, match="died mid-render"):
+                await pool.render("crash")
+            again = await pool.render("<p>y</p>")
+            return ok, again
+        finally:
+            await pool.shutdown()
+
+    ok, again = asyncio.run(run())
+    assert ok.endswith(b":<p>x</p>:a{}")
+    assert int(ok.split(b":")[0]) != os.getpid()
+    assert again.endswith(b":<p>y</p>:")
+    assert pool.snapshot()["pool_restarts"] == 1
@@ -0,0 +1,164 @@
+"""get_connection's RLS session context — one combined set_config on the way in
+and one on the way out — and the opt-in `request_connection` scope that reuses
+a single pooled connection across a request's `get_connection()` blocks.
+
+No database: FakePool hands out FakeConns that record the SQL they were sent.
+
+    cd server && ./venv/bin/python -m pytest tests/infrastructure/test_request_connection.py -q
+"""
+import asyncio
+import contextvars
+
+import pytest
+
+from app.database import pool as db_pool
+
+
+class FakeConn:
+    def __init__(self):
+        self.executed = []
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+
+class FakePool:
+    def __init__(self):
+        self.conns = []
+        self.released = []
+
+    async def _acquire(self):
+        conn = FakeConn()
+        self.conns.append(conn)
+        return conn
+
+    def acquire(self, *, timeout=None):
+        pool = self
+
+        class _Acquire:
+            def __await__(self):
+                return pool._acquire().__await__()
+
+            async def __aenter__(self):
+                self.conn = await pool._acquire()
+                return self.conn
+
+            async def __aexit__(self, *exc):
+                pool.released.append(self.conn)
+
+        return _Acquire()
+
+    async def release(self, conn):
+        self.released.append(conn)
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakePool()
+    monkeypatch.setattr(db_pool, "_pool", fake)
+    return fake
+
+
+def _run(coro):
+    # Fresh context per test so the tenant/user/admin contextvars don't leak.
+    return contextvars.Context().run(asyncio.run, coro)
+
+
+def test_rls_context_is_one_statement_each_way(pool):
+    async def run():
+        db_pool.set_tenant_id("t1")
+        db_pool.set_user_id("u1")
+        db_pool.set_is_admin(True)
+        async with db_pool.get_connection():
+            pass
+
+    _run(run())
+    (conn,) = pool.conns
+    assert conn.executed == [
+        (db_pool._APPLY_RLS_CONTEXT_SQL, ("t1", "u1", "true")),
+        (db_pool._RESET_RLS_CONTEXT_SQL, ()),
+    ]
+
+
+def test_no_context_sends_nothing(pool):
+    async def run():
+        async with db_pool.get_connection():
+            pass
+
+    _run(run())
+    assert pool.conns[0].executed == []
+
+
+def test_request_scope_reuses_one_connection(pool):
+    async def run():
+        async with db_pool.request_connection():
+            async with db_pool.get_connection():
+                pass
+            db_pool.set_user_id("u1")
+            async with db_pool.get_connection():
+                pass
+            async with db_pool.get_connection():
+                pass
+            db_pool.set_tenant_id("t1")
+            async with db_pool.get_connection():
+                pass
+
+    _run(run())
+    (conn,) = pool.conns
+    assert pool.released == [conn]
+    # Only re-sent when the context changed; reset once at release.
+    assert conn.executed == [
+        (db_pool._APPLY_RLS_CONTEXT_SQL, ("", "u1", "")),
+        (db_pool._APPLY_RLS_CONTEXT_SQL, ("t1", "u1", "")),
+        (db_pool._RESET_RLS_CONTEXT_SQL, ()),
+    ]
+
+
+def test_request_scope_never_used_acquires_nothing(pool):
+    async def run():
+        async with db_pool.request_connection():
+            pass
+
+    _run(run())
+    assert pool.conns == []
+
+
+def test_nested_and_concurrent_blocks_get_their_own_connection(pool):
+    async def run():
+        async with db_pool.request_connection():
+            async with db_pool.get_connection() as outer:
+                async with db_pool.get_connection() as inner:
+                    assert inner is not outer
+
+            async def use():
+                async with db_pool.get_connection() as conn:
+                    await asyncio.sleep(0.01)
+                    return conn
+
+            a, b = await asyncio.gather(use(), use())
+            assert a is not b
+
+    _run(run())
+    assert len(pool.released) == len(pool.conns)
+
+
+def test_scope_exit_defers_release_to_a_spawned_task_still_using_it(pool):
+    async def run():
+        started, finish = asyncio.Event(), asyncio.Event()
+
+        async def background():
+            async with db_pool.get_connection() as conn:
+                started.set()
+                await finish.wait()
+                assert pool.released == []  # not pulled out from under us
+                return conn
+
+        async with db_pool.request_connection():
+            task = asyncio.create_task(background())
+            await started.wait()
+        assert pool.released == []
+        finish.set()
+        return await task
+
+    conn = _run(run())
+    assert pool.conns == [conn] and pool.released == [conn]
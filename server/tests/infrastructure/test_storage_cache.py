@@ -0,0 +1,190 @@
+"""StorageService's async paths — off-loop S3 calls, the on-disk object cache,
+streamed reads/writes and concurrent multi-object fetches.
+
+No AWS: FakeS3 is an in-memory bucket map standing in for the boto3 client
+(MinIO-style), and the cache lives in tmp_path.
+
+    cd server && ./venv/bin/python -m pytest tests/infrastructure/test_storage_cache.py -q
+"""
+import asyncio
+import io
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.core.services import storage as storage_mod
+from app.core.services import storage_cache
+from app.core.services.storage_cache import ObjectCache
+
+
+class FakeS3:
+    def __init__(self, delay=0.0):
+        self.objects: dict = {}
+        self.gets = 0
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_object(self, Bucket, Key):
+        with self._lock:
+            self.gets += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if (Bucket, Key) not in self.objects:
+                raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+            return {"Body": io.BytesIO(self.objects[Bucket, Key]), "ETag": '"etag"'}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Bucket, Key] = bytes(Body)
+        return {"ETag": '"etag"'}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.objects[bucket, key] = fileobj.read()
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+SETTINGS = SimpleNamespace(
+    s3_bucket="public", s3_private_bucket="private", s3_region="us-east-1",
+    cloudfront_domain="cdn.example.com", aws_access_key_id=None, aws_secret_access_key=None,
+)
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    object_cache = ObjectCache(root=str(tmp_path / "cache"))
+    monkeypatch.setattr(storage_cache, "_cache", object_cache)
+    return object_cache
+
+
+@pytest.fixture
+def s3(monkeypatch, cache):
+    fake = FakeS3()
+    monkeypatch.setattr(storage_mod, "get_settings", lambda: SETTINGS)
+    monkeypatch.setattr(storage_mod.boto3, "client", lambda *a, **k: fake)
+    return fake
+
+
+def test_public_reads_are_cached_across_instances(s3, cache):
+    s3.objects["public", "logos/a.png"] = b"logo"
+    url = "https://cdn.example.com/logos/a.png"
+
+    async def run():
+        first = await storage_mod.StorageService().download_file(url)
+        # A second service (another worker process) shares the disk cache.
+        second = await storage_mod.StorageService().download_file(url)
+        return first, second
+
+    assert asyncio.run(run()) == (b"logo", b"logo")
+    assert s3.gets == 1
+    assert cache.snapshot()["hits"] == 1
+
+
+def test_private_bucket_is_never_cached(s3, cache):
+    s3.objects["private", "documents/x.pdf"] = b"medical"
+    svc = storage_mod.StorageService()
+
+    async def run():
+        for _ in range(2):
+            await svc.download_file("s3://private/documents/x.pdf")
+
+    asyncio.run(run())
+    assert s3.gets == 2
+    assert cache.snapshot()["stores"] == 0
+
+
+def test_upload_writes_through_and_delete_evicts(s3, cache):
+    svc = storage_mod.StorageService()
+
+    async def run():
+        url = await svc.upload_file(b"handbook", "h.pdf", prefix="handbooks")
+        assert await svc.download_file(url) == b"handbook"
+        assert s3.gets == 0
+        await svc.delete_file(url)
+        with pytest.raises(RuntimeError, match="Failed to download from S3"):
+            await svc.download_file(url)
+
+    asyncio.run(run())
+
+
+def test_open_stream_chunks_and_fails_before_yielding(s3):
+    s3.objects["private", "packets/p.zip"] = b"x" * 2500
+    svc = storage_mod.StorageService()
+
+    async def run():
+        body = await svc.open_stream("s3://private/packets/p.zip", chunk_size=1000)
+        chunks = [c async for c in body]
+        with pytest.raises(RuntimeError):
+            await svc.open_stream("s3://private/packets/missing.zip")
+        return chunks
+
+    assert [len(c) for c in asyncio.run(run())] == [1000, 1000, 500]
+
+
+def test_download_many_is_concurrent_and_keeps_order(s3, monkeypatch):
+    s3.delay = 0.05
+    for i in range(6):
+        s3.objects["private", f"f/{i}"] = str(i).encode()
+    svc = storage_mod.StorageService()
+    paths = [f"s3://private/f/{i}" for i in range(6)] + ["s3://private/f/missing"]
+
+    results = asyncio.run(svc.download_many(paths, concurrency=3))
+
+    assert results[:6] == [str(i).encode() for i in range(6)]
+    assert isinstance(results[6], RuntimeError)
+    assert s3.max_in_flight == 3
+
+
+def test_inline_storage_images_fetches_each_src_once(s3):
+    s3.objects["public", "img/a.png"] = b"A"
+    s3.objects["public", "img/b.png"] = b"B"
+    html = ('<img src="https://cdn.example.com/img/a.png"><img src="https://cdn.example.com/img/b.png">'
+            '<img src="https://cdn.example.com/img/a.png"><img src="https://evil.test/x.png">')
+
+    out = asyncio.run(storage_mod.StorageService().inline_storage_images(html))
+
+    assert out.count("data:image/png;base64,QQ==") == 2
+    assert "data:image/png;base64,Qg==" in out
+    assert 'src="https://evil.test/x.png"' in out
+    assert s3.gets == 2
+
+
+def test_upload_stream_local_backend(monkeypatch, tmp_path, cache):
+    local = SimpleNamespace(**{**vars(SETTINGS), "s3_bucket": None, "s3_private_bucket": None})
+    monkeypatch.setattr(storage_mod, "get_settings", lambda: local)
+    svc = storage_mod.StorageService()
+    svc.uploads_root = str(tmp_path)
+    svc.app_root = str(tmp_path.parent)
+    svc.local_dir = str(tmp_path)
+    path = asyncio.run(svc.upload_stream(io.BytesIO(b"streamed"), "a.txt"))
+    filename = path.rsplit("/", 1)[-1]
+    assert (tmp_path / filename).read_bytes() == b"streamed"
+
+
+def test_object_cache_lru_eviction_and_dedupe(tmp_path):
+    cache = ObjectCache(root=str(tmp_path), max_bytes=250, max_object_bytes=100)
+    cache.put("a", b"a" * 100)
+    cache.put("a-copy", b"a" * 100)  # same content: one blob
+    time.sleep(0.01)
+    cache.put("b", b"b" * 100)
+    time.sleep(0.01)
+    assert cache.get("a") is not None  # a is now the most recently used
+    time.sleep(0.01)
+    cache.put("c", b"c" * 100)  # 300 bytes of blobs > 250: evict LRU
+    cache.put("huge", b"h" * 101)  # over the per-object cap: never stored
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a" * 100
+    assert cache.get("c") == b"c" * 100
+    assert cache.get("huge") is None
+    assert len(list((tmp_path / "blobs").iterdir())) == 2
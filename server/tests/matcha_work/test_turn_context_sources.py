@@ -0,0 +1,133 @@
+"""`_inject_mode_contexts`: grounding sources run as one concurrent set under
+per-source budgets — a slow source is omitted, not waited on — and the
+per-turn timings that feed `turn_timing.get_turn_latency_stats`.
+
+No DB/Gemini: the mode registry and the feature lookup are monkeypatched on
+turn_pipeline, which imports them by name.
+
+    cd server && ./venv/bin/python -m pytest tests/matcha_work/test_turn_context_sources.py -q
+"""
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.matcha.services.matcha_work import turn_pipeline as tp
+from app.matcha.services.matcha_work import turn_timing
+from app.matcha.services.matcha_work.matcha_work_modes import ThreadMode
+
+
+def _mode(key, delay, text, required_feature=None):
+    async def build(company_id):
+        await asyncio.sleep(delay)
+        return text
+
+    return ThreadMode(
+        key=key, column=f"{key}_mode", label=key.title(),
+        status_loading=f"loading {key}", status_unavailable=f"{key} unavailable",
+        build_context=build, required_feature=required_feature,
+    )
+
+
+def _tc(**columns):
+    return tp.TurnContext(
+        thread_id=uuid4(), body=None, current_user=None,
+        thread=columns, company_id=uuid4(),
+    )
+
+
+async def _collect(tc):
+    return [json.loads(evt[len("data: "):]) async for evt in tp._inject_mode_contexts(tc)]
+
+
+@pytest.fixture
+def budgets(monkeypatch):
+    monkeypatch.setitem(tp.CONTEXT_SOURCE_BUDGETS, "mode", 0.2)
+    monkeypatch.setitem(tp.CONTEXT_SOURCE_BUDGETS, "features", 0.2)
+
+
+def test_sources_run_concurrently_and_slow_one_is_omitted(monkeypatch, budgets):
+    modes = [_mode("alpha", 0.1, "ALPHA"), _mode("beta", 0.1, "BETA"), _mode("slow", 5, "SLOW")]
+    monkeypatch.setattr(tp, "THREAD_MODES", modes)
+    tc = _tc(alpha_mode=True, beta_mode=True, slow_mode=True)
+
+    started = time.monotonic()
+    events = asyncio.run(_collect(tc))
+    elapsed = time.monotonic() - started
+
+    # Bounded by the budget, not the sum of the sources (or the slow one).
+    assert elapsed < 0.6
+    assert tc.dyn_ctx == "\n\nALPHA\n\nBETA"
+    assert tc.omitted_sources == ["mode.slow"]
+    assert [m.key for m in tc.active_modes] == ["alpha", "beta", "slow"]
+    messages = [e["message"] for e in events]
+    assert "Slow data is taking too long — continuing without it..." in messages
+    assert {"context", "prepare", "context.mode.alpha", "context.mode.slow"} <= set(tc.stage_timings)
+
+
+def test_feature_gate_drops_revoked_mode_and_keeps_registry_order(monkeypatch, budgets):
+    modes = [_mode("paid", 0.05, "PAID", "paid_feature"), _mode("free", 0, "FREE"),
+             _mode("hr_pilot", 0.01, "HR", "hr_pilot")]
+    monkeypatch.setattr(tp, "THREAD_MODES", modes)
+
+    async def features(company_id):
+        return {"hr_pilot": True}
+
+    monkeypatch.setattr(tp, "get_company_features", features)
+    tc = _tc(paid_mode=True, free_mode=True, hr_pilot_mode=True)
+    events = asyncio.run(_collect(tc))
+
+    assert [m.key for m in tc.active_modes] == ["free", "hr_pilot"]
+    assert tc.hr_pilot_mode_active is True
+    assert tc.dyn_ctx == "\n\nFREE\n\nHR"
+    assert "loading paid" not in [e["message"] for e in events]
+
+
+def test_failed_feature_lookup_fails_closed(monkeypatch, budgets):
+    monkeypatch.setattr(tp, "THREAD_MODES", [_mode("paid", 0, "PAID", "paid_feature"), _mode("free", 0, "FREE")])
+
+    async def features(company_id):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(tp, "get_company_features", features)
+    tc = _tc(paid_mode=True, free_mode=True)
+    asyncio.run(_collect(tc))
+
+    assert tc.dyn_ctx == "\n\nFREE"
+    assert tc.omitted_sources == ["features"]
+
+
+def test_failed_rag_keeps_the_compliance_dump(monkeypatch, budgets, caplog):
+    monkeypatch.setattr(tp, "THREAD_MODES", [])
+
+    async def dump(company_id):
+        return tp.ComplianceContextResult(context_text="DUMP", truncated=True)
+
+    async def rag(content, company_id):
+        raise RuntimeError("embedding service down")
+
+    monkeypatch.setattr(tp, "build_compliance_context", dump)
+    monkeypatch.setattr(tp, "_get_rag_context", rag)
+    tc = _tc(compliance_mode=True)
+    tc.body = SimpleNamespace(content="overtime rules?")
+    asyncio.run(_collect(tc))
+
+    assert tc.dyn_ctx == "\n\nDUMP"
+    assert tc.omitted_sources == ["compliance_rag"]
+    # Handled inside the source, not left as an unretrieved task exception.
+    assert "Compliance RAG context failed" in caplog.text
+
+
+def test_turn_latency_stats_percentiles():
+    stats = turn_timing.TurnLatencyStats(window=3)
+    for ttft in (1.0, 2.0, 3.0, 4.0):
+        stats.record({"generate": ttft}, ttft, ["mode.node"] if ttft > 3 else [])
+    snap = stats.snapshot()
+
+    assert (snap["turns"], snap["window"]) == (4, 3)
+    assert (snap["ttft_p50"], snap["ttft_p95"]) == (3.0, 4.0)
+    assert snap["stages"]["generate"] == {"p50": 3.0, "p95": 4.0}
+    assert snap["omitted_sources"] == {"mode.node": 1}
@@ -0,0 +1,126 @@
+"""Friend-activity inbox: fan-out decisions, the high-degree read fallback, and
+the merge that combines both into one keyset page. No database — FakeConn
+answers the few lookups the service makes and records every write.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from app.tellus.services import activity_inbox_service as inbox
+
+NOW = datetime(2026, 10, 16, tzinfo=timezone.utc)
+VIEWER = UUID("00000000-0000-0000-0000-000000000001")
+FRIEND = UUID("00000000-0000-0000-0000-000000000002")
+STAR = UUID("00000000-0000-0000-0000-000000000003")
+
+
+class FakeConn:
+    def __init__(self, degrees=None, pull=(), inbox_rows=(), pulled_rows=()):
+        self.degrees = degrees or {}
+        self.pull = set(pull)
+        self.inbox_rows = list(inbox_rows)
+        self.pulled_rows = list(pulled_rows)
+        self.writes: list[tuple[str, tuple]] = []
+
+    async def fetchval(self, sql, *args):
+        if "FROM tellus_activity_pull_actors" in sql:
+            return 1 if args[0] in self.pull else None
+        if "FROM tellus_friendships" in sql:
+            return min(self.degrees.get(args[0], 0), args[1])
+        raise AssertionError(sql)
+
+    async def fetch(self, sql, *args):
+        if sql is inbox._INBOX_PAGE:
+            return self.inbox_rows[: args[3]]
+        if sql is inbox._PULL_PAGE:
+            assert args[4] == sorted(self.pull & {STAR})
+            return self.pulled_rows
+        if "JOIN tellus_friendships f ON f.friend_account_id = p.account_id" in sql:
+            return [{"account_id": a} for a in sorted(self.pull & {STAR})]
+        raise AssertionError(sql)
+
+    async def execute(self, sql, *args):
+        if "INSERT INTO tellus_activity_pull_actors" in sql:
+            self.pull.add(args[0])
+        self.writes.append((sql, args))
+        return "DELETE 7"
+
+
+def _row(kind, item_id, actor, minutes_ago):
+    return {"kind": kind, "item_id": item_id, "actor_id": actor,
+            "happened_at": NOW - timedelta(minutes=minutes_ago)}
+
+
+def _inbox_inserts(conn):
+    return [w for w in conn.writes if "INSERT INTO tellus_activity_inbox" in w[0]]
+
+
+def test_review_fans_out_only_for_held_reviews_by_regular_accounts():
+    report = {"id": uuid4(), "reporter_account_id": FRIEND, "brand_id": uuid4(),
+              "review_state": "held", "publish_at": NOW + timedelta(hours=48)}
+    conn = FakeConn(degrees={FRIEND: 12})
+    asyncio.run(inbox.fan_out_review(conn, report))
+    [(sql, args)] = _inbox_inserts(conn)
+    assert "f.friend_account_id = $1" in sql
+    assert args == (FRIEND, report["id"], report["brand_id"], report["publish_at"])
+
+    private = FakeConn()
+    asyncio.run(inbox.fan_out_review(private, {**report, "review_state": None}))
+    asyncio.run(inbox.fan_out_review(private, {**report, "reporter_account_id": None}))
+    assert private.writes == []
+
+
+def test_high_degree_account_switches_to_read_path_and_stays_there():
+    conn = FakeConn(degrees={STAR: inbox.FANOUT_MAX_FRIENDS + 1})
+    asyncio.run(inbox.fan_out_follow(conn, STAR, uuid4(), NOW))
+    assert STAR in conn.pull and _inbox_inserts(conn) == []
+
+    conn.degrees[STAR] = 3  # dropping back under the bar doesn't flap
+    assert asyncio.run(inbox.fans_out_on_read(conn, STAR)) is True
+
+
+def test_new_friendship_backfills_only_the_push_side():
+    conn = FakeConn(degrees={VIEWER: 5}, pull={STAR})
+    asyncio.run(inbox.link_friends(conn, VIEWER, STAR))
+    inserts = _inbox_inserts(conn)
+    # STAR's activity is read on demand; VIEWER's reviews + follows go to STAR.
+    assert len(inserts) == 2
+    assert all(args == (VIEWER, STAR) for _, args in inserts)
+
+
+def test_visibility_rewrites_follow_rows_only_on_a_private_flip():
+    conn = FakeConn(degrees={FRIEND: 4})
+    asyncio.run(inbox.rewrite_for_visibility(conn, FRIEND, was_private=False, is_private=False))
+    assert conn.writes == []
+
+    asyncio.run(inbox.rewrite_for_visibility(conn, FRIEND, was_private=False, is_private=True))
+    assert "DELETE FROM tellus_activity_inbox" in conn.writes[-1][0]
+    assert "kind = 'place_followed'" in conn.writes[-1][0]
+
+    asyncio.run(inbox.rewrite_for_visibility(conn, FRIEND, was_private=True, is_private=False))
+    sql, args = conn.writes[-1]
+    assert "tellus_brand_follows" in sql and inbox._ALL_FRIENDS in sql and args == (FRIEND,)
+
+
+def test_feed_without_high_degree_friends_is_the_inbox_read_alone():
+    rows = [_row("review_published", uuid4(), FRIEND, m) for m in (1, 2, 3)]
+    conn = FakeConn(inbox_rows=rows)
+    assert asyncio.run(inbox.read_feed(conn, VIEWER, None, None, 2)) == rows[:2]
+
+
+def test_feed_merges_pulled_activity_in_keyset_order_without_duplicates():
+    shared = uuid4()
+    pushed = [_row("review_published", uuid4(), FRIEND, 5), _row("review_published", shared, STAR, 20)]
+    pulled = [_row("place_followed", uuid4(), STAR, 1), _row("review_published", shared, STAR, 20),
+              _row("review_published", uuid4(), STAR, 30)]
+    conn = FakeConn(pull={STAR}, inbox_rows=pushed, pulled_rows=pulled)
+
+    page = asyncio.run(inbox.read_feed(conn, VIEWER, None, None, 3))
+    assert [r["happened_at"] for r in page] == [NOW - timedelta(minutes=m) for m in (1, 5, 20)]
+    assert [r["item_id"] for r in page].count(shared) == 1
+
+
+def test_prune_reports_deleted_rows():
+    conn = FakeConn()
+    assert asyncio.run(inbox.prune_expired(conn)) == 7
+    assert "happened_at < NOW() - INTERVAL '90 days'" in conn.writes[0][0]
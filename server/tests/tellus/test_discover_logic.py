@@ -18,11 +18,12 @@ from app.tellus.models.tellus import (
 from app.tellus.services.discover_service import (
     BRAND_CATEGORIES,
     GOOGLE_TYPE_LABELS,
-    bbox_predicate,
+    NearbyRankCache,
     dedupe_google,
     discover_cache_key,
     normalize_brand_category,
     normalize_google_type,
+    rank_point,
 )
 
 
@@ -85,15 +86,32 @@ class TestDedupeGoogle:
         assert dedupe_google(rows, set()) == [{"place_id": "B"}]
 
 
-class TestBboxPredicate:
-    def test_uses_supplied_placeholders(self):
-        sql = bbox_predicate("$4", "$5", "$6")
-        assert "$4" in sql and "$5" in sql and "$6" in sql
-        assert "st.lat" in sql and "st.lng" in sql
-
-    def test_guards_the_pole_singularity(self):
-        sql = bbox_predicate("$1", "$2", "$3")
-        assert "greatest(cos(radians($1)), 0.01)" in sql
+class TestNearbyRanking:
+    def test_rank_point_is_the_cache_key_bucket(self):
+        assert rank_point(34.05223, -118.24371) == (34.052, -118.244)
+        assert discover_cache_key(34.05223, -118.24371, 15.0, None).startswith("tellus:discover:34.052:-118.244:")
+
+    def test_rank_sql_scans_geocells_not_a_lat_lng_box(self):
+        sql = discover_route._NEARBY_RANK_SQL
+        assert "JOIN tellus_stores st ON st.geocell >= cell.lo AND st.geocell < cell.hi" in sql
+        assert "st.lat BETWEEN" not in sql
+        assert f"LIMIT {discover_route._MAX_DEPTH}" in sql
+
+    def test_cache_expires_after_ttl(self):
+        cache = NearbyRankCache(ttl_s=60)
+        cache.put("k", (("brand", "LA", "CA", 1.2),), now=100.0)
+        assert cache.get("k", now=159.0) == (("brand", "LA", "CA", 1.2),)
+        assert cache.get("k", now=161.0) is None
+        assert len(cache) == 0
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = NearbyRankCache(max_entries=2)
+        cache.put("a", (), now=0.0)
+        cache.put("b", (), now=0.0)
+        cache.get("a", now=1.0)
+        cache.put("c", (), now=1.0)
+        assert cache.get("b", now=1.0) is None
+        assert cache.get("a", now=1.0) == () and cache.get("c", now=1.0) == ()
 
 
 class TestNormalizeBrandCategory:
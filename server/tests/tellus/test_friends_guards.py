@@ -12,11 +12,14 @@ def _code_only(obj) -> str:
 
 def test_feed_copies_public_review_predicate():
     from app.tellus.routes import friends
+    from app.tellus.services import activity_inbox_service as inbox
 
-    source = _code_only(friends.friend_activity_feed)
-    assert "review_state = 'held'" in source
-    assert "publish_at <= NOW()" in source
-    assert "moderation_status = 'visible'" in source
+    assert "read_feed" in _code_only(friends.friend_activity_feed)
+    for source in (inbox._INBOX_PAGE, inbox._PULL_PAGE):
+        assert "review_state = 'held'" in source
+        assert "publish_at <= NOW()" in source
+        assert "moderation_status = 'visible'" in source
+        assert "profile_visibility <> 'private'" in source
 
 
 def test_friends_routes_never_select_email():
@@ -28,10 +31,12 @@ def test_friends_routes_never_select_email():
 def test_feed_uses_keyset_cursor_and_bounded_branch_limits():
     from app.tellus.routes import friends
 
-    source = _code_only(friends.friend_activity_feed)
-    assert "decode_cursor" in source
-    assert "ORDER BY r.publish_at DESC, r.id DESC LIMIT $4" in source
-    assert "ORDER BY bf.created_at DESC, bf.brand_id DESC LIMIT $4" in source
+    from app.tellus.services import activity_inbox_service as inbox
+
+    assert "decode_cursor" in _code_only(friends.friend_activity_feed)
+    assert "ORDER BY i.happened_at DESC, i.item_id DESC LIMIT $4" in inbox._INBOX_PAGE
+    assert "ORDER BY r.publish_at DESC, r.id DESC LIMIT $4" in inbox._PULL_PAGE
+    assert "ORDER BY bf.created_at DESC, bf.brand_id DESC LIMIT $4" in inbox._PULL_PAGE
 
 
 def test_person_summaries_gate_scores_and_cached_suggestions_are_refiltered():
@@ -70,4 +75,7 @@ def test_social_mutations_hold_the_pair_lock_inside_a_transaction():
         source = _code_only(getattr(friends_service, name))
         assert "async with conn.transaction()" in source
         assert "lock_pair" in source
+    # The inbox rewrite rides the same transaction as the friendship change.
+    assert "link_friends" in _code_only(friends_service.create_friendship)
+    assert "unlink_friends" in _code_only(friends_service.remove_friendship)
     assert "lock_pair" in _code_only(friends.accept_friend_request)
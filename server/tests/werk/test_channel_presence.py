@@ -0,0 +1,150 @@
+"""channel_presence: timing-wheel liveness expiry and the coalesced, pipelined
+writer for `channels_ws:online:<user>`.
+
+No redis: FakeRedis hands out a pipeline that records commands.
+
+    cd server && ./venv/bin/python -m pytest tests/werk/test_channel_presence.py -q
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.werk.services import channel_presence as cp
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands: list[tuple] = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(("setex", key, ttl))
+
+    def delete(self, *keys):
+        self.commands.append(("delete", *sorted(keys)))
+
+    async def execute(self):
+        if self.redis.fail:
+            raise ConnectionError("redis down")
+        self.redis.executed.append(self.commands)
+
+
+class FakeRedis:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed: list[list[tuple]] = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    r = FakeRedis()
+    monkeypatch.setattr(cp, "get_redis_cache", lambda: r)
+    return r
+
+
+class TestTimingWheel:
+    def test_expire_returns_only_untouched_keys(self):
+        wheel = cp.TimingWheel(resolution=5)
+        wheel.touch("a", now=0)
+        wheel.touch("b", now=0)
+        wheel.touch("b", now=80)
+        assert wheel.expire(90, now=100) == ["a"]
+        assert "a" in wheel and "b" in wheel
+
+    def test_expired_key_is_rearmed_until_popped(self):
+        wheel = cp.TimingWheel(resolution=5)
+        wheel.touch("a", now=0)
+        assert wheel.expire(90, now=100) == ["a"]
+        assert wheel.expire(90, now=150) == []
+        assert wheel.expire(90, now=195) == ["a"]
+        wheel.pop("a")
+        assert wheel.expire(90, now=1000) == []
+
+    def test_due_lists_idle_keys_without_removing_them(self):
+        wheel = cp.TimingWheel(resolution=5)
+        wheel.touch("idle", now=0)
+        wheel.touch("busy", now=0)
+        wheel.touch("busy", now=28)
+        assert wheel.due(25, now=30) == ["idle"]
+        assert wheel.due(25, now=30) == ["idle"]
+        assert len(wheel) == 2
+
+    def test_pop_removes_from_wheel(self):
+        wheel = cp.TimingWheel(resolution=5)
+        wheel.touch("a", now=0)
+        wheel.pop("a")
+        assert wheel.expire(1, now=1000) == []
+        assert len(wheel) == 0
+
+    def test_touch_within_slot_is_a_noop(self):
+        wheel = cp.TimingWheel(resolution=5)
+        wheel.touch("a", now=10.0)
+        wheel.touch("a", now=14.9)
+        assert wheel._slots == {2: {"a"}}
+
+
+class TestPresenceWriter:
+    def test_frames_within_interval_coalesce_into_one_write(self, redis):
+        async def run():
+            writer = cp.PresenceWriter(flush_interval=0)
+            uid = uuid4()
+            for t in (0, 1, 5, 19):
+                writer.mark_online(uid, now=t)
+            await writer.flush()
+            writer.mark_online(uid, now=21)
+            await writer.flush()
+            return uid
+
+        uid = asyncio.run(run())
+        key = f"channels_ws:online:{uid}"
+        assert redis.executed == [[("setex", key, 60)], [("setex", key, 60)]]
+
+    def test_many_users_flush_in_one_pipeline(self, redis):
+        async def run():
+            writer = cp.PresenceWriter()
+            online = [uuid4() for _ in range(3)]
+            gone = uuid4()
+            for uid in online:
+                writer.mark_online(uid, now=0)
+            writer.mark_offline(gone)
+            assert await writer.flush() == 4
+            await writer.close()
+
+        asyncio.run(run())
+        (commands,) = redis.executed
+        assert sum(1 for c in commands if c[0] == "setex") == 3
+        assert commands[-1][0] == "delete"
+
+    def test_offline_cancels_pending_online_and_reconnect_rewrites(self, redis):
+        async def run():
+            writer = cp.PresenceWriter()
+            uid = uuid4()
+            writer.mark_online(uid, now=0)
+            writer.mark_offline(uid)
+            await writer.flush()
+            writer.mark_online(uid, now=1)  # reconnect right away
+            await writer.flush()
+            await writer.close()
+            return uid
+
+        uid = asyncio.run(run())
+        key = f"channels_ws:online:{uid}"
+        assert redis.executed == [[("delete", key)], [("setex", key, 60)]]
+
+    def test_failed_flush_lets_next_frame_retry(self, redis):
+        async def run():
+            writer = cp.PresenceWriter()
+            uid = uuid4()
+            writer.mark_online(uid, now=0)
+            redis.fail = True
+            assert await writer.flush() == 0
+            redis.fail = False
+            writer.mark_online(uid, now=1)
+            assert await writer.flush() == 1
+            await writer.close()
+
+        asyncio.run(run())
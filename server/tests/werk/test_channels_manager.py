@@ -84,6 +84,7 @@ class TestLocalFirstDelivery:
         await m.connect(ws, _user(uid))
         await m.join_room(uid, "room1")
         await m._broadcast_to_room("room1", {"type": "message", "x": 1})
+        await m.drain()
         ws.send_text.assert_awaited()
 
     @pytest.mark.asyncio
@@ -93,6 +94,7 @@ class TestLocalFirstDelivery:
         ws = _fake_ws()
         await m.connect(ws, _user(uid))
         await m.send_to_user(uid, {"type": "notification"})
+        await m.drain()
         ws.send_text.assert_awaited()
 
     @pytest.mark.asyncio
@@ -103,6 +105,7 @@ class TestLocalFirstDelivery:
         await m.connect(ws1, _user(uid1))
         await m.connect(ws2, _user(uid2))
         await m.send_to_users({uid1: {"type": "notification", "n": 1}, uid2: {"type": "notification", "n": 2}})
+        await m.drain()
         ws1.send_text.assert_awaited()
         ws2.send_text.assert_awaited()
 
@@ -137,6 +140,7 @@ class TestProcessEnvelopeUsersKind:
             },
         }
         await asyncio.wait_for(_process_envelope(envelope), timeout=5)
+        await m.drain()
         ws1.send_text.assert_awaited()
         ws2.send_text.assert_awaited()
         ws3.send_text.assert_awaited()
@@ -175,6 +179,194 @@ class TestProcessEnvelopeUsersKind:
         await asyncio.wait_for(task, timeout=5)
 
 
+async def _hang(*_args, **_kwargs):
+    await asyncio.sleep(60)
+
+
+class TestOutboundQueues:
+    @pytest.mark.asyncio
+    async def test_room_fanout_does_not_wait_on_a_hung_socket(self):
+        m = ChannelConnectionManager()
+        uid_hung, uid_ok = uuid4(), uuid4()
+        hung, ok = _fake_ws(), _fake_ws()
+        hung.send_text = AsyncMock(side_effect=_hang)
+        await m.connect(hung, _user(uid_hung))
+        await m.connect(ok, _user(uid_ok))
+        await m.join_room(uid_hung, "room1")
+        await m.join_room(uid_ok, "room1")
+        # Enqueue-only: returns immediately even though one write never ends.
+        await asyncio.wait_for(m._local_broadcast_to_room("room1", {"type": "message"}), timeout=0.1)
+        await asyncio.sleep(0.01)
+        ok.send_text.assert_awaited()
+        await m.disconnect(hung, uid_hung)
+
+    @pytest.mark.asyncio
+    async def test_full_queue_sheds_typing_but_closes_on_message(self, monkeypatch):
+        monkeypatch.setattr(ws_mod, "_WS_QUEUE_MAX", 1)
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        ws = _fake_ws()
+        ws.send_text = AsyncMock(side_effect=_hang)
+        await m.connect(ws, _user(uid))
+        await m.join_room(uid, "room1")
+        await asyncio.sleep(0)  # writer picks up nothing yet; queue empty
+
+        await m._local_broadcast_to_room("room1", {"type": "typing"})
+        await asyncio.sleep(0)  # writer now blocked inside the hung send
+        await m._local_broadcast_to_room("room1", {"type": "typing"})
+        await m._local_broadcast_to_room("room1", {"type": "typing"})
+        writer = m.writers[ws]
+        assert writer.dropped == 1 and not writer.closed
+        ws.close.assert_not_awaited()
+
+        await m._local_broadcast_to_room("room1", {"type": "message"})
+        await asyncio.sleep(0.01)
+        ws.close.assert_awaited()
+        assert ws not in m.active_connections.get(uid, set())
+        assert ws not in m.writers
+
+    @pytest.mark.asyncio
+    async def test_failed_send_forgets_the_socket(self):
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        dead = _fake_ws(send_fails=True)
+        await m.connect(dead, _user(uid))
+        await m.send_to_user(uid, {"type": "notification"})
+        await asyncio.sleep(0.01)
+        assert dead not in m.active_connections.get(uid, set())
+        assert dead not in m.writers
+        assert dead not in m.last_seen
+
+    @pytest.mark.asyncio
+    async def test_offer_to_a_torn_down_socket_does_not_resurrect_it(self):
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        ws = _fake_ws()
+        await m.connect(ws, _user(uid))
+        await m.disconnect(ws, uid)
+        assert m._offer(uid, ws, "{}", droppable=False) is False
+        assert ws not in m.writers
+        await asyncio.sleep(0.01)
+        ws.send_text.assert_not_awaited()
+
+
+class _FakePubSub:
+    def __init__(self):
+        self.channels: set[str] = set()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels):
+        self.channels.difference_update(channels)
+
+
+class _FakePublisher:
+    def __init__(self):
+        self.published: list[str] = []
+
+    async def publish(self, channel, data):
+        self.published.append(channel)
+
+
+class TestRoomSubscriptions:
+    @pytest.fixture
+    def subs(self, monkeypatch):
+        subs = ws_mod._RoomSubscriptions(ws_mod._ROOM_CHANNEL_PREFIX)
+        monkeypatch.setattr(ws_mod, "_room_subscriptions", subs)
+        monkeypatch.setattr(
+            ws_mod, "_typing_subscriptions",
+            ws_mod._RoomSubscriptions(ws_mod._TYPING_CHANNEL_PREFIX, rooms=subs.rooms),
+        )
+        return subs
+
+    @pytest.mark.asyncio
+    async def test_first_join_subscribes_last_leave_unsubscribes(self, subs):
+        pubsub = _FakePubSub()
+        await subs.attach(pubsub)
+        m = ChannelConnectionManager()
+        uid_a, uid_b = uuid4(), uuid4()
+        await m.connect(_fake_ws(), _user(uid_a))
+        await m.connect(_fake_ws(), _user(uid_b))
+
+        await m.join_room(uid_a, "room1")
+        await m.join_room(uid_b, "room1")
+        assert pubsub.channels == {subs.channel("room1")}
+
+        await m.leave_room(uid_a, "room1")
+        assert pubsub.channels  # uid_b is still a local member
+        await m.leave_room(uid_b, "room1")
+        assert pubsub.channels == set()
+
+    @pytest.mark.asyncio
+    async def test_join_during_last_leave_broadcast_stays_subscribed(self, subs):
+        pubsub = _FakePubSub()
+        await subs.attach(pubsub)
+        m = ChannelConnectionManager()
+        uid_a, uid_b = uuid4(), uuid4()
+        await m.connect(_fake_ws(), _user(uid_a))
+        await m.connect(_fake_ws(), _user(uid_b))
+        await m.join_room(uid_a, "room1")
+        broadcast = m._broadcast_to_room
+
+        async def join_mid_broadcast(room_key, payload, **kwargs):
+            # uid_b joins in the gap between the leave emptying the room
+            # and the leave's subscription update.
+            if payload["type"] == "user_left":
+                await m.join_room(uid_b, room_key)
+            await broadcast(room_key, payload, **kwargs)
+
+        m._broadcast_to_room = join_mid_broadcast
+        await m.leave_room(uid_a, "room1")
+        assert subs.rooms == {"room1"}
+        assert pubsub.channels == {subs.channel("room1")}
+
+    @pytest.mark.asyncio
+    async def test_disconnect_drops_emptied_rooms(self, subs):
+        pubsub = _FakePubSub()
+        await subs.attach(pubsub)
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        ws = _fake_ws()
+        await m.connect(ws, _user(uid))
+        await m.join_room(uid, "room1")
+        await m.disconnect(ws, uid)
+        assert pubsub.channels == set() and subs.rooms == set()
+
+    @pytest.mark.asyncio
+    async def test_typing_channels_ride_their_own_connection(self, subs):
+        messages, typing = _FakePubSub(), _FakePubSub()
+        await subs.attach(messages)
+        await ws_mod._typing_subscriptions.attach(typing)
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        await m.connect(_fake_ws(), _user(uid))
+        await m.join_room(uid, "room1")
+        assert messages.channels == set(ws_mod._room_channels("room1")[:1])
+        assert typing.channels == set(ws_mod._room_channels("room1")[1:])
+        await m.leave_room(uid, "room1")
+        assert messages.channels == typing.channels == set()
+
+    @pytest.mark.asyncio
+    async def test_rooms_joined_while_detached_subscribe_on_attach(self, subs):
+        m = ChannelConnectionManager()
+        uid = uuid4()
+        await m.connect(_fake_ws(), _user(uid))
+        await m.join_room(uid, "room1")
+        pubsub = _FakePubSub()
+        await subs.attach(pubsub)
+        assert pubsub.channels == {subs.channel("room1")}
+
+    @pytest.mark.asyncio
+    async def test_room_and_typing_publish_on_the_rooms_own_channels(self, monkeypatch, subs):
+        redis = _FakePublisher()
+        monkeypatch.setattr(ws_mod, "get_redis_cache", lambda: redis)
+        m = ChannelConnectionManager()
+        await m.broadcast_message("room1", {"id": "m1"})
+        await m.broadcast_typing("room1", _user(uuid4()))
+        assert redis.published == list(ws_mod._room_channels("room1"))
+
+
 class TestTokenBucket:
     def test_burst_then_deny(self):
         b = _TokenBucket(burst=10, refill_per_sec=1.0)
@@ -0,0 +1,120 @@
+"""workers/utils runtime — the persistent per-process loop that `run_async`
+runs task bodies on, and the `_PooledConnection` shim that lets every task's
+`conn = await get_db_connection()` ... `await conn.close()` hand pooled
+connections back instead of closing them.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.workers import utils
+
+
+class _FakeProxy:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def fetchval(self, query):
+        return 1
+
+
+class _FakePool:
+    def __init__(self):
+        self.released = []
+
+    async def acquire(self):
+        return _FakeProxy()
+
+    async def release(self, proxy, timeout=None):
+        self.released.append(proxy)
+
+
+@pytest.fixture
+def runtime():
+    utils.start_worker_runtime()
+    try:
+        yield
+    finally:
+        utils.stop_worker_runtime()
+        asyncio.set_event_loop(None)
+
+
+def test_run_async_reuses_one_loop_across_tasks(runtime):
+    async def current():
+        return asyncio.get_running_loop()
+
+    first = utils.run_async(current())
+    second = utils.run_async(current())
+    assert first is second is utils._loop
+
+
+def test_run_async_cancels_tasks_the_body_left_behind(runtime):
+    woke = []
+
+    async def straggler():
+        await asyncio.sleep(0.05)
+        woke.append(1)
+
+    async def body():
+        asyncio.get_running_loop().create_task(straggler())
+
+    utils.run_async(body())
+    assert not asyncio.all_tasks(utils._loop)
+
+    async def later():
+        await asyncio.sleep(0.1)
+
+    utils.run_async(later())
+    assert woke == []
+
+
+def test_run_async_falls_back_without_runtime():
+    async def answer():
+        return 42
+
+    assert utils._loop is None
+    assert utils.run_async(answer()) == 42
+
+
+def test_run_async_from_other_thread_uses_own_loop(runtime):
+    seen = {}
+
+    async def current():
+        return asyncio.get_running_loop()
+
+    t = threading.Thread(target=lambda: seen.setdefault("loop", utils.run_async(current())))
+    t.start()
+    t.join()
+    assert seen["loop"] is not utils._loop
+
+
+def test_close_releases_to_pool_once(runtime):
+    pool = _FakePool()
+
+    async def body():
+        conn = utils._PooledConnection(pool, await pool.acquire())
+        assert await conn.fetchval("SELECT 1") == 1
+        await conn.close()
+        await conn.close()
+        return conn
+
+    conn = utils.run_async(body())
+    assert len(pool.released) == 1
+    assert conn.is_closed()
+    assert not utils._checked_out
+
+
+def test_leaked_connection_released_after_task(runtime):
+    pool = _FakePool()
+
+    async def body():
+        utils._PooledConnection(pool, await pool.acquire())  # never closed
+
+    utils.run_async(body())
+    assert len(pool.released) == 1
+    assert not utils._checked_out